@@ -0,0 +1,371 @@
+use crate::{MappedArchive, Result};
+use pytecode_engine::analysis::{
+    AnalysisError, ClassResolver, HierarchyMemo, JAVA_LANG_OBJECT, ResolvedClass,
+};
+use std::collections::hash_map::Entry;
+use std::collections::{HashMap, HashSet};
+use std::fmt;
+use std::fs;
+use std::path::{Path, PathBuf};
+use std::sync::{Arc, Mutex, MutexGuard};
+
+/// Number of parsed classes a [`ClasspathResolver`] keeps by default.
+pub const DEFAULT_CLASSPATH_CACHE_CAPACITY: usize = 4096;
+
+/// A [`ClassResolver`] over a classpath of JAR files and class directories.
+///
+/// Construction only indexes names: JAR central directories are read through
+/// a [`MappedArchive`] and directories are walked for `.class` files, so no
+/// class is parsed up front. A class is read at
+/// [`ReadLevel::Members`](pytecode_engine::ReadLevel::Members) the first time
+/// it is resolved and kept in a least-recently-used cache shared by every
+/// clone, so a classpath of hundreds of JARs costs memory in proportion to the
+/// classes actually visited. Superclass chains, supertype sets and
+/// common-superclass results are memoized as in
+/// [`MappingClassResolver`](pytecode_engine::analysis::MappingClassResolver)
+/// and outlive cache evictions.
+///
+/// As on a JVM classpath the first root that defines a name wins. Directory
+/// roots map relative paths to class names, so a `jimage extract` dump needs
+/// one root per module directory. Entries under `META-INF/` are not indexed.
+/// When no root defines `java/lang/Object` the implicit one is used, as with
+/// [`MappingClassResolver`](pytecode_engine::analysis::MappingClassResolver).
+#[derive(Clone)]
+pub struct ClasspathResolver {
+    state: Arc<ClasspathState>,
+}
+
+struct ClasspathState {
+    archives: Vec<MappedArchive>,
+    slots: HashMap<String, usize>,
+    locations: Vec<ClassLocation>,
+    cache: Mutex<LruCache>,
+    memo: HierarchyMemo,
+}
+
+enum ClassLocation {
+    Entry { archive: usize, index: usize },
+    File(PathBuf),
+}
+
+impl ClasspathResolver {
+    /// Index `roots` with a cache of [`DEFAULT_CLASSPATH_CACHE_CAPACITY`] classes.
+    pub fn new(roots: &[PathBuf]) -> Result<Self> {
+        Self::with_capacity(roots, DEFAULT_CLASSPATH_CACHE_CAPACITY)
+    }
+
+    /// Index `roots`, keeping at most `capacity` parsed classes (`0` disables caching).
+    ///
+    /// Each root is a directory of classes or a JAR/ZIP archive; anything that
+    /// is not a directory is opened as an archive.
+    pub fn with_capacity(roots: &[PathBuf], capacity: usize) -> Result<Self> {
+        let mut archives = Vec::new();
+        let mut slots = HashMap::new();
+        let mut locations = Vec::new();
+        let mut add = |name: String, location: ClassLocation| {
+            if let Entry::Vacant(slot) = slots.entry(name) {
+                slot.insert(locations.len());
+                locations.push(location);
+            }
+        };
+        for root in roots {
+            if root.is_dir() {
+                for (name, path) in directory_classes(root)? {
+                    add(name, ClassLocation::File(path));
+                }
+                continue;
+            }
+            let archive = MappedArchive::open(root)?;
+            for (index, entry) in archive.entries().iter().enumerate() {
+                if let Some(name) = entry
+                    .is_class()
+                    .then(|| class_name_of_path(&entry.filename))
+                    .flatten()
+                {
+                    add(
+                        name.to_owned(),
+                        ClassLocation::Entry {
+                            archive: archives.len(),
+                            index,
+                        },
+                    );
+                }
+            }
+            archives.push(archive);
+        }
+        let cache = Mutex::new(LruCache::new(capacity, locations.len()));
+        let memo = HierarchyMemo::new(locations.len() + 1);
+        Ok(Self {
+            state: Arc::new(ClasspathState {
+                archives,
+                slots,
+                locations,
+                cache,
+                memo,
+            }),
+        })
+    }
+
+    /// Number of distinct class names on the classpath.
+    pub fn len(&self) -> usize {
+        self.state.locations.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.state.locations.is_empty()
+    }
+
+    /// Whether some root defines `class_name`, without parsing it.
+    pub fn contains(&self, class_name: &str) -> bool {
+        self.state.slots.contains_key(class_name)
+    }
+
+    /// Number of parsed classes currently held in the cache.
+    pub fn cached_len(&self) -> usize {
+        self.cache().len()
+    }
+
+    fn cache(&self) -> MutexGuard<'_, LruCache> {
+        self.state
+            .cache
+            .lock()
+            .expect("classpath cache mutex poisoned")
+    }
+
+    /// Memo id of `class_name`; an implicit `java/lang/Object` takes the id after the last slot.
+    fn id(&self, class_name: &str) -> Option<usize> {
+        match self.state.slots.get(class_name) {
+            Some(&slot) => Some(slot),
+            None => (class_name == JAVA_LANG_OBJECT).then_some(self.state.locations.len()),
+        }
+    }
+
+    /// Resolve `class_name` to its cached copy, parsing it on a miss.
+    fn lookup(&self, class_name: &str) -> Option<Arc<ResolvedClass>> {
+        let Some(&slot) = self.state.slots.get(class_name) else {
+            return (class_name == JAVA_LANG_OBJECT)
+                .then(|| Arc::new(ResolvedClass::java_lang_object().clone()));
+        };
+        if let Some(resolved) = self.cache().get(slot) {
+            return Some(resolved);
+        }
+        // Parse outside the lock; a racing thread may insert the same class first.
+        let resolved = Arc::new(self.load(slot, class_name)?);
+        Some(self.cache().insert(slot, resolved))
+    }
+
+    /// Parse the class in `slot`, or `None` if it is unreadable or misnamed.
+    fn load(&self, slot: usize, class_name: &str) -> Option<ResolvedClass> {
+        let resolved = match &self.state.locations[slot] {
+            ClassLocation::Entry { archive, index } => {
+                let bytes = self.state.archives[*archive].entry_bytes(*index).ok()?;
+                ResolvedClass::from_bytes(&bytes).ok()?
+            }
+            ClassLocation::File(path) => ResolvedClass::from_bytes(&fs::read(path).ok()?).ok()?,
+        };
+        (resolved.name == class_name).then_some(resolved)
+    }
+}
+
+impl ClassResolver for ClasspathResolver {
+    /// Resolve `class_name`, parsing it on first use.
+    ///
+    /// Classes that cannot be read or parsed, or whose `this_class` does not
+    /// match their path, resolve to `None` like undefined names; failures are
+    /// not cached.
+    fn resolve_class(&self, class_name: &str) -> Option<ResolvedClass> {
+        self.lookup(class_name)
+            .map(|resolved| ResolvedClass::clone(&resolved))
+    }
+
+    fn superclass_names(
+        &self,
+        class_name: &str,
+    ) -> std::result::Result<Arc<[String]>, AnalysisError> {
+        self.state
+            .memo
+            .superclass_names(self.id(class_name), class_name, |name| self.lookup(name))
+    }
+
+    fn supertype_names(
+        &self,
+        class_name: &str,
+    ) -> std::result::Result<Arc<HashSet<String>>, AnalysisError> {
+        self.state
+            .memo
+            .supertype_names(self.id(class_name), class_name, |name| self.lookup(name))
+    }
+
+    fn common_superclass(
+        &self,
+        left_name: &str,
+        right_name: &str,
+    ) -> std::result::Result<String, AnalysisError> {
+        let ids = (self.id(left_name), self.id(right_name));
+        self.state
+            .memo
+            .common_superclass(ids, left_name, right_name, |name| {
+                self.superclass_names(name)
+            })
+    }
+}
+
+impl fmt::Debug for ClasspathResolver {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        f.debug_struct("ClasspathResolver")
+            .field("archives", &self.state.archives.len())
+            .field("classes", &self.len())
+            .field("cached", &self.cached_len())
+            .finish()
+    }
+}
+
+/// The class name a `.class` path inside a root stands for.
+fn class_name_of_path(path: &str) -> Option<&str> {
+    if path.starts_with("META-INF/") {
+        return None;
+    }
+    path.strip_suffix(".class").filter(|name| !name.is_empty())
+}
+
+/// Every `.class` file below `root` with its class name, sorted by name.
+///
+/// Symlinked directories are not entered.
+pub(crate) fn directory_classes(root: &Path) -> Result<Vec<(String, PathBuf)>> {
+    let mut classes = Vec::new();
+    let mut pending = vec![root.to_path_buf()];
+    while let Some(dir) = pending.pop() {
+        for entry in fs::read_dir(&dir)? {
+            let entry = entry?;
+            let path = entry.path();
+            // `DirEntry::file_type` does not follow symlinks, so a link back
+            // up the tree cannot send the walk round forever.
+            if entry.file_type()?.is_dir() {
+                pending.push(path);
+                continue;
+            }
+            let Ok(relative) = path.strip_prefix(root) else {
+                continue;
+            };
+            let Some(relative) = relative
+                .iter()
+                .map(|part| part.to_str())
+                .collect::<Option<Vec<_>>>()
+            else {
+                continue;
+            };
+            if let Some(name) = class_name_of_path(&relative.join("/")) {
+                classes.push((name.to_owned(), path));
+            }
+        }
+    }
+    classes.sort();
+    Ok(classes)
+}
+
+const NIL: usize = usize::MAX;
+
+/// Least-recently-used cache of parsed classes keyed by classpath slot.
+///
+/// Nodes form a doubly linked list threaded through `nodes`, most recently
+/// used first; `node_of` maps each slot to its node or [`NIL`].
+struct LruCache {
+    capacity: usize,
+    nodes: Vec<LruNode>,
+    node_of: Vec<usize>,
+    head: usize,
+    tail: usize,
+}
+
+struct LruNode {
+    slot: usize,
+    class: Arc<ResolvedClass>,
+    prev: usize,
+    next: usize,
+}
+
+impl LruCache {
+    fn new(capacity: usize, slots: usize) -> Self {
+        Self {
+            capacity,
+            nodes: Vec::new(),
+            node_of: vec![NIL; slots],
+            head: NIL,
+            tail: NIL,
+        }
+    }
+
+    fn len(&self) -> usize {
+        self.nodes.len()
+    }
+
+    fn get(&mut self, slot: usize) -> Option<Arc<ResolvedClass>> {
+        let node = self.node_of[slot];
+        if node == NIL {
+            return None;
+        }
+        self.touch(node);
+        Some(Arc::clone(&self.nodes[node].class))
+    }
+
+    /// Cache `class` for `slot`, returning whichever copy ends up cached.
+    fn insert(&mut self, slot: usize, class: Arc<ResolvedClass>) -> Arc<ResolvedClass> {
+        if let Some(cached) = self.get(slot) {
+            return cached;
+        }
+        if self.capacity == 0 {
+            return class;
+        }
+        let node = if self.nodes.len() < self.capacity {
+            self.nodes.push(LruNode {
+                slot,
+                class: Arc::clone(&class),
+                prev: NIL,
+                next: NIL,
+            });
+            self.nodes.len() - 1
+        } else {
+            let node = self.tail;
+            self.unlink(node);
+            self.node_of[self.nodes[node].slot] = NIL;
+            self.nodes[node].slot = slot;
+            self.nodes[node].class = Arc::clone(&class);
+            node
+        };
+        self.node_of[slot] = node;
+        self.push_front(node);
+        class
+    }
+
+    fn touch(&mut self, node: usize) {
+        if self.head != node {
+            self.unlink(node);
+            self.push_front(node);
+        }
+    }
+
+    fn unlink(&mut self, node: usize) {
+        let LruNode { prev, next, .. } = self.nodes[node];
+        if prev == NIL {
+            self.head = next;
+        } else {
+            self.nodes[prev].next = next;
+        }
+        if next == NIL {
+            self.tail = prev;
+        } else {
+            self.nodes[next].prev = prev;
+        }
+    }
+
+    fn push_front(&mut self, node: usize) {
+        self.nodes[node].prev = NIL;
+        self.nodes[node].next = self.head;
+        if self.head == NIL {
+            self.tail = node;
+        } else {
+            self.nodes[self.head].prev = node;
+        }
+        self.head = node;
+    }
+}
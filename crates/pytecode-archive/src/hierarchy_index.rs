@@ -0,0 +1,560 @@
+use crate::classpath::directory_classes;
+use crate::{ArchiveError, Result, resolve_archive_classes, temporary_archive_path};
+use memmap2::Mmap;
+use pytecode_engine::analysis::{
+    AnalysisError, ClassResolver, HierarchyMemo, JAVA_LANG_OBJECT, MappingClassResolver,
+    ResolvedClass, ResolvedMethod,
+};
+use pytecode_engine::constants::{ClassAccessFlags, MethodAccessFlags};
+use pytecode_engine::parallel::{try_parallel_map, worker_count};
+use std::borrow::Cow;
+use std::collections::hash_map::Entry;
+use std::collections::{HashMap, HashSet};
+use std::fmt;
+use std::fs::{self, File};
+use std::io::{BufWriter, Write};
+use std::ops::Range;
+use std::path::{Path, PathBuf};
+use std::sync::Arc;
+
+const MAGIC: [u8; 8] = *b"PYTCHIDX";
+const HEADER_LEN: usize = 40;
+const CLASS_RECORD_LEN: usize = 36;
+const STRING_REF_LEN: usize = 8;
+const METHOD_RECORD_LEN: usize = 20;
+/// String offset marking an absent superclass.
+const NO_STRING: u32 = u32::MAX;
+
+/// A memory-mapped, on-disk table of [`ResolvedClass`] data for a classpath.
+///
+/// Opening an index validates its header and maps it; classes are decoded
+/// from the mapping one at a time as they are resolved, so loading costs the
+/// same however many classes the classpath holds. Superclass chains,
+/// supertype sets and common-superclass results are memoized as in
+/// [`MappingClassResolver`] and shared by every clone, but
+/// [`ClassResolver::resolve_class`] decodes on every call; callers that look
+/// up the same classes' methods repeatedly should load them once with
+/// [`HierarchyIndex::to_mapping_resolver`]. Use
+/// [`HierarchyIndex::load_or_build`] to keep one index per classpath up to
+/// date across runs.
+///
+/// # Format
+///
+/// All integers are little-endian `u32` unless noted, and strings are
+/// `(offset, len)` pairs into a deduplicated UTF-8 string section.
+///
+/// | Section    | Contents |
+/// |------------|----------|
+/// | header     | magic `PYTCHIDX`, [`HierarchyIndex::VERSION`], class, interface and method counts, string section length, reserved, `u64` key |
+/// | classes    | per class, sorted by name: name, superclass (offset `u32::MAX` when absent), access flags, first interface, interface count, first method, method count |
+/// | interfaces | one string per interface |
+/// | methods    | name, descriptor, access flags |
+/// | strings    | UTF-8 bytes |
+///
+/// Readers reject any other version, so the layout can change freely
+/// between versions.
+#[derive(Clone)]
+pub struct HierarchyIndex {
+    map: Arc<Mmap>,
+    class_count: usize,
+    classes: Range<usize>,
+    interfaces: Range<usize>,
+    methods: Range<usize>,
+    strings: Range<usize>,
+    key: u64,
+    memo: Arc<HierarchyMemo>,
+}
+
+impl HierarchyIndex {
+    /// Current on-disk format version.
+    pub const VERSION: u32 = 1;
+
+    /// Map and validate the index at `path`.
+    pub fn open(path: &Path) -> Result<Self> {
+        let file = File::open(path)?;
+        // SAFETY: the mapping is read-only; indexes are replaced by renaming a
+        // new file into place, never modified in place. Windows refuses that
+        // rename while the old file is mapped, and `load_or_build` then maps
+        // the new file under its temporary name instead.
+        let map = Arc::new(unsafe { Mmap::map(&file)? });
+        let header = map
+            .get(..HEADER_LEN)
+            .ok_or_else(|| invalid("file is shorter than the header"))?;
+        if header[..8] != MAGIC {
+            return Err(invalid("bad magic"));
+        }
+        let version = read_u32(header, 8);
+        if version != Self::VERSION {
+            return Err(invalid(format!(
+                "unsupported version {version}, expected {}",
+                Self::VERSION
+            )));
+        }
+        let class_count = read_u32(header, 12) as usize;
+        let interface_count = read_u32(header, 16) as usize;
+        let method_count = read_u32(header, 20) as usize;
+        let strings_len = read_u32(header, 24) as usize;
+        let key = read_u64(header, 32);
+        let classes = HEADER_LEN..HEADER_LEN + class_count * CLASS_RECORD_LEN;
+        let interfaces = classes.end..classes.end + interface_count * STRING_REF_LEN;
+        let methods = interfaces.end..interfaces.end + method_count * METHOD_RECORD_LEN;
+        let strings = methods.end..methods.end + strings_len;
+        if strings.end != map.len() {
+            return Err(invalid("section lengths do not match the file size"));
+        }
+        Ok(Self {
+            map,
+            class_count,
+            classes,
+            interfaces,
+            methods,
+            strings,
+            key,
+            memo: Arc::new(HierarchyMemo::new(class_count + 1)),
+        })
+    }
+
+    /// Write `classes` as an index for `key`, replacing `path` atomically.
+    ///
+    /// As on a classpath, the first class with a given name wins. On Windows
+    /// this fails while any [`HierarchyIndex`] still maps `path`.
+    pub fn write<'a>(
+        path: &Path,
+        key: u64,
+        classes: impl IntoIterator<Item = &'a ResolvedClass>,
+    ) -> Result<()> {
+        let temp_path = Self::write_temporary(path, key, classes)?;
+        if let Err(error) = fs::rename(&temp_path, path) {
+            let _ = fs::remove_file(&temp_path);
+            return Err(error.into());
+        }
+        Ok(())
+    }
+
+    /// Write an index beside `path` under a fresh temporary name and return that name.
+    fn write_temporary<'a>(
+        path: &Path,
+        key: u64,
+        classes: impl IntoIterator<Item = &'a ResolvedClass>,
+    ) -> Result<PathBuf> {
+        let mut seen = HashSet::new();
+        let mut unique = Vec::new();
+        for class in classes {
+            if seen.insert(class.name.as_str()) {
+                unique.push(class);
+            }
+        }
+        unique.sort_by(|left, right| left.name.cmp(&right.name));
+
+        let mut strings = StringTable::default();
+        let mut class_table = Vec::with_capacity(unique.len() * CLASS_RECORD_LEN);
+        let mut interface_table = Vec::new();
+        let mut method_table = Vec::new();
+        let mut interface_count = 0usize;
+        let mut method_count = 0usize;
+        for class in unique {
+            strings.push_ref(&mut class_table, &class.name)?;
+            match &class.super_name {
+                Some(super_name) => strings.push_ref(&mut class_table, super_name)?,
+                None => {
+                    push_u32(&mut class_table, NO_STRING);
+                    push_u32(&mut class_table, 0);
+                }
+            }
+            push_u32(&mut class_table, u32::from(class.access_flags.bits()));
+            push_u32(&mut class_table, to_u32(interface_count)?);
+            push_u32(&mut class_table, to_u32(class.interfaces.len())?);
+            push_u32(&mut class_table, to_u32(method_count)?);
+            push_u32(&mut class_table, to_u32(class.methods.len())?);
+            for interface in &class.interfaces {
+                strings.push_ref(&mut interface_table, interface)?;
+            }
+            for method in &class.methods {
+                strings.push_ref(&mut method_table, &method.name)?;
+                strings.push_ref(&mut method_table, &method.descriptor)?;
+                push_u32(&mut method_table, u32::from(method.access_flags.bits()));
+            }
+            interface_count += class.interfaces.len();
+            method_count += class.methods.len();
+        }
+
+        let mut header = Vec::with_capacity(HEADER_LEN);
+        header.extend_from_slice(&MAGIC);
+        push_u32(&mut header, Self::VERSION);
+        push_u32(&mut header, to_u32(class_table.len() / CLASS_RECORD_LEN)?);
+        push_u32(&mut header, to_u32(interface_count)?);
+        push_u32(&mut header, to_u32(method_count)?);
+        push_u32(&mut header, to_u32(strings.bytes.len())?);
+        push_u32(&mut header, 0);
+        header.extend_from_slice(&key.to_le_bytes());
+        debug_assert_eq!(header.len(), HEADER_LEN);
+
+        if let Some(parent) = path.parent() {
+            fs::create_dir_all(parent)?;
+        }
+        let temp_path = temporary_archive_path(path);
+        let sections = [
+            &header,
+            &class_table,
+            &interface_table,
+            &method_table,
+            &strings.bytes,
+        ];
+        if let Err(error) = write_sections(&temp_path, &sections) {
+            let _ = fs::remove_file(&temp_path);
+            return Err(error);
+        }
+        Ok(temp_path)
+    }
+
+    /// Open the index at `cache_path` for `classpath`, rebuilding it when stale.
+    ///
+    /// The index is reused only when its version and its key, as computed by
+    /// [`classpath_key`], match; otherwise every class on `classpath` is read
+    /// at [`ReadLevel::Members`](pytecode_engine::ReadLevel::Members) on up to
+    /// `workers` threads (`0` = all cores) and a fresh index is written. As
+    /// with [`ClasspathResolver`](crate::ClasspathResolver), each root is a
+    /// directory of classes or a JAR/ZIP archive. When the stale index cannot
+    /// be replaced, as on Windows while it is still mapped, the fresh index is
+    /// returned without replacing it.
+    pub fn load_or_build(classpath: &[PathBuf], cache_path: &Path, workers: usize) -> Result<Self> {
+        let key = classpath_key(classpath)?;
+        if let Ok(index) = Self::open(cache_path)
+            && index.key == key
+        {
+            return Ok(index);
+        }
+        let mut classes = Vec::new();
+        for root in classpath {
+            if root.is_dir() {
+                classes.extend(resolve_directory_classes(root, workers)?);
+            } else {
+                classes.extend(resolve_archive_classes(root, workers)?);
+            }
+        }
+        let temp_path = Self::write_temporary(cache_path, key, &classes)?;
+        if fs::rename(&temp_path, cache_path).is_ok() {
+            return Self::open(cache_path);
+        }
+        // Windows cannot replace an index that is still mapped, for instance by
+        // an earlier `HierarchyIndex` in this process. Serve this run from the
+        // fresh file; a later run replaces the stale index once it is unmapped.
+        let index = Self::open(&temp_path);
+        // Unlinking a mapped file succeeds everywhere but Windows, where the
+        // temporary file is left beside the cache.
+        let _ = fs::remove_file(&temp_path);
+        index
+    }
+
+    /// The classpath key the index was written for.
+    pub const fn key(&self) -> u64 {
+        self.key
+    }
+
+    pub const fn len(&self) -> usize {
+        self.class_count
+    }
+
+    pub const fn is_empty(&self) -> bool {
+        self.class_count == 0
+    }
+
+    /// Whether the index holds `class_name`, without decoding it.
+    pub fn contains(&self, class_name: &str) -> bool {
+        self.find(class_name).is_some()
+    }
+
+    /// Decode every class in the index, in name order.
+    pub fn classes(&self) -> impl Iterator<Item = ResolvedClass> + '_ {
+        (0..self.class_count).filter_map(|slot| self.decode(slot))
+    }
+
+    /// Load every class into a [`MappingClassResolver`] with memoized hierarchy queries.
+    pub fn to_mapping_resolver(&self) -> MappingClassResolver {
+        MappingClassResolver::from_classpath(self.classes())
+    }
+
+    /// Memo id of `class_name`; an implicit `java/lang/Object` takes the id after the last slot.
+    fn id(&self, class_name: &str) -> Option<usize> {
+        self.find(class_name)
+            .or_else(|| (class_name == JAVA_LANG_OBJECT).then_some(self.class_count))
+    }
+
+    fn find(&self, class_name: &str) -> Option<usize> {
+        let (mut low, mut high) = (0, self.class_count);
+        while low < high {
+            let mid = low + (high - low) / 2;
+            match self.class_field_str(mid, 0)?.cmp(class_name) {
+                std::cmp::Ordering::Less => low = mid + 1,
+                std::cmp::Ordering::Greater => high = mid,
+                std::cmp::Ordering::Equal => return Some(mid),
+            }
+        }
+        None
+    }
+
+    fn class_field(&self, slot: usize, field: usize) -> u32 {
+        read_u32(
+            &self.map,
+            self.classes.start + slot * CLASS_RECORD_LEN + field * 4,
+        )
+    }
+
+    fn class_field_str(&self, slot: usize, field: usize) -> Option<&str> {
+        self.string(
+            self.class_field(slot, field),
+            self.class_field(slot, field + 1),
+        )
+    }
+
+    fn string(&self, offset: u32, len: u32) -> Option<&str> {
+        let start = self.strings.start.checked_add(offset as usize)?;
+        let end = start.checked_add(len as usize)?;
+        if end > self.strings.end {
+            return None;
+        }
+        std::str::from_utf8(&self.map[start..end]).ok()
+    }
+
+    /// Decode the class in `slot`, or `None` if its record is corrupt.
+    fn decode(&self, slot: usize) -> Option<ResolvedClass> {
+        let name = self.class_field_str(slot, 0)?.to_owned();
+        let super_name = match self.class_field(slot, 2) {
+            NO_STRING => None,
+            offset => Some(self.string(offset, self.class_field(slot, 3))?.to_owned()),
+        };
+        let access_flags = ClassAccessFlags::from_bits_retain(self.class_field(slot, 4) as u16);
+        let interfaces = self
+            .records(&self.interfaces, STRING_REF_LEN, slot, 5)?
+            .map(|at| self.string(read_u32(&self.map, at), read_u32(&self.map, at + 4)))
+            .map(|name| name.map(str::to_owned))
+            .collect::<Option<Vec<_>>>()?;
+        let methods = self
+            .records(&self.methods, METHOD_RECORD_LEN, slot, 7)?
+            .map(|at| {
+                let field = |index: usize| read_u32(&self.map, at + index * 4);
+                Some(ResolvedMethod {
+                    name: self.string(field(0), field(1))?.to_owned(),
+                    descriptor: self.string(field(2), field(3))?.to_owned(),
+                    access_flags: MethodAccessFlags::from_bits_retain(field(4) as u16),
+                })
+            })
+            .collect::<Option<Vec<_>>>()?;
+        Some(ResolvedClass {
+            name,
+            super_name,
+            interfaces,
+            access_flags,
+            methods,
+        })
+    }
+
+    /// Byte offsets of the records a class references from `section`.
+    fn records(
+        &self,
+        section: &Range<usize>,
+        record_len: usize,
+        slot: usize,
+        field: usize,
+    ) -> Option<impl Iterator<Item = usize>> {
+        let first = self.class_field(slot, field) as usize;
+        let count = self.class_field(slot, field + 1) as usize;
+        let start = section.start.checked_add(first.checked_mul(record_len)?)?;
+        let end = start.checked_add(count.checked_mul(record_len)?)?;
+        (end <= section.end).then(|| (start..end).step_by(record_len))
+    }
+}
+
+impl ClassResolver for HierarchyIndex {
+    fn resolve_class(&self, class_name: &str) -> Option<ResolvedClass> {
+        match self.find(class_name) {
+            Some(slot) => self.decode(slot),
+            None => {
+                (class_name == JAVA_LANG_OBJECT).then(|| ResolvedClass::java_lang_object().clone())
+            }
+        }
+    }
+
+    fn superclass_names(
+        &self,
+        class_name: &str,
+    ) -> std::result::Result<Arc<[String]>, AnalysisError> {
+        self.memo
+            .superclass_names(self.id(class_name), class_name, |name| {
+                self.resolve_class(name).map(Cow::Owned)
+            })
+    }
+
+    fn supertype_names(
+        &self,
+        class_name: &str,
+    ) -> std::result::Result<Arc<HashSet<String>>, AnalysisError> {
+        self.memo
+            .supertype_names(self.id(class_name), class_name, |name| {
+                self.resolve_class(name).map(Cow::Owned)
+            })
+    }
+
+    fn common_superclass(
+        &self,
+        left_name: &str,
+        right_name: &str,
+    ) -> std::result::Result<String, AnalysisError> {
+        let ids = (self.id(left_name), self.id(right_name));
+        self.memo
+            .common_superclass(ids, left_name, right_name, |name| {
+                self.superclass_names(name)
+            })
+    }
+}
+
+impl fmt::Debug for HierarchyIndex {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        f.debug_struct("HierarchyIndex")
+            .field("classes", &self.class_count)
+            .field("key", &format_args!("{:#018x}", self.key))
+            .finish()
+    }
+}
+
+/// Read every class file below `root` at [`ReadLevel::Members`](pytecode_engine::ReadLevel::Members).
+fn resolve_directory_classes(root: &Path, workers: usize) -> Result<Vec<ResolvedClass>> {
+    let files = directory_classes(root)?;
+    try_parallel_map(&files, worker_count(workers), |(_, path)| {
+        Ok(ResolvedClass::from_bytes(&fs::read(path)?)?)
+    })
+}
+
+/// Key identifying the exact contents of `classpath`, in order.
+///
+/// Every file is hashed in full through a memory mapping; directory roots
+/// hash each `.class` file below them together with its class name. The hash
+/// is stable across runs and platforms but not cryptographic; it only guards
+/// against reusing an index after a class changed.
+pub fn classpath_key(classpath: &[PathBuf]) -> Result<u64> {
+    let mut key = ContentHasher::new(u64::from(HierarchyIndex::VERSION));
+    for root in classpath {
+        if !root.is_dir() {
+            key.write_file(root)?;
+            continue;
+        }
+        let files = directory_classes(root)?;
+        // Marks the root as a directory, since no file is this long.
+        key.write_u64(u64::MAX);
+        key.write_u64(files.len() as u64);
+        for (name, path) in files {
+            key.write_u64(ContentHasher::hash(name.as_bytes()));
+            key.write_file(&path)?;
+        }
+    }
+    Ok(key.finish())
+}
+
+/// Word-at-a-time 64-bit hash with a murmur3 finalizer.
+struct ContentHasher(u64);
+
+impl ContentHasher {
+    const MULTIPLIER: u64 = 0x9E37_79B9_7F4A_7C15;
+
+    const fn new(seed: u64) -> Self {
+        Self(seed ^ 0xCBF2_9CE4_8422_2325)
+    }
+
+    fn hash(bytes: &[u8]) -> u64 {
+        let mut hasher = Self::new(bytes.len() as u64);
+        let mut chunks = bytes.chunks_exact(8);
+        for chunk in &mut chunks {
+            hasher.write_u64(u64::from_le_bytes(chunk.try_into().expect("8-byte chunk")));
+        }
+        let mut tail = [0u8; 8];
+        tail[..chunks.remainder().len()].copy_from_slice(chunks.remainder());
+        hasher.write_u64(u64::from_le_bytes(tail));
+        hasher.finish()
+    }
+
+    /// Mix in the length and contents of the file at `path`.
+    fn write_file(&mut self, path: &Path) -> Result<()> {
+        let file = File::open(path)?;
+        let len = file.metadata()?.len();
+        self.write_u64(len);
+        if len > 0 {
+            // SAFETY: read-only mapping that does not outlive this call.
+            let map = unsafe { Mmap::map(&file)? };
+            self.write_u64(Self::hash(&map));
+        }
+        Ok(())
+    }
+
+    fn write_u64(&mut self, word: u64) {
+        self.0 = (self.0 ^ word)
+            .wrapping_mul(Self::MULTIPLIER)
+            .rotate_left(29);
+    }
+
+    const fn finish(&self) -> u64 {
+        let mut hash = self.0;
+        hash ^= hash >> 33;
+        hash = hash.wrapping_mul(0xFF51_AFD7_ED55_8CCD);
+        hash ^= hash >> 33;
+        hash = hash.wrapping_mul(0xC4CE_B9FE_1A85_EC53);
+        hash ^ (hash >> 33)
+    }
+}
+
+/// Deduplicated string section under construction.
+#[derive(Default)]
+struct StringTable<'a> {
+    bytes: Vec<u8>,
+    offsets: HashMap<&'a str, u32>,
+}
+
+impl<'a> StringTable<'a> {
+    /// Append the `(offset, len)` reference for `value` to `table`.
+    fn push_ref(&mut self, table: &mut Vec<u8>, value: &'a str) -> Result<()> {
+        let offset = match self.offsets.entry(value) {
+            Entry::Occupied(entry) => *entry.get(),
+            Entry::Vacant(entry) => {
+                let offset = to_u32(self.bytes.len())?;
+                // Readers address the whole string, so its end must fit as well.
+                to_u32(self.bytes.len() + value.len())?;
+                self.bytes.extend_from_slice(value.as_bytes());
+                *entry.insert(offset)
+            }
+        };
+        push_u32(table, offset);
+        push_u32(table, to_u32(value.len())?);
+        Ok(())
+    }
+}
+
+fn write_sections(path: &Path, sections: &[&Vec<u8>]) -> Result<()> {
+    let mut writer = BufWriter::new(File::create(path)?);
+    for section in sections {
+        writer.write_all(section)?;
+    }
+    writer
+        .into_inner()
+        .map_err(|error| error.into_error())?
+        .sync_all()?;
+    Ok(())
+}
+
+fn invalid(reason: impl Into<String>) -> ArchiveError {
+    ArchiveError::InvalidHierarchyIndex(reason.into())
+}
+
+fn to_u32(value: usize) -> Result<u32> {
+    u32::try_from(value).map_err(|_| invalid("index exceeds u32 limits"))
+}
+
+fn push_u32(out: &mut Vec<u8>, value: u32) {
+    out.extend_from_slice(&value.to_le_bytes());
+}
+
+fn read_u32(bytes: &[u8], at: usize) -> u32 {
+    u32::from_le_bytes(bytes[at..at + 4].try_into().expect("4-byte field"))
+}
+
+fn read_u64(bytes: &[u8], at: usize) -> u64 {
+    u64::from_le_bytes(bytes[at..at + 8].try_into().expect("8-byte field"))
+}
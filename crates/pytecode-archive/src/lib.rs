@@ -1,13 +1,26 @@
-use pytecode_engine::analysis::ClassResolver;
-use pytecode_engine::model::{DebugInfoPolicy, FrameComputationMode};
+mod classpath;
+mod hierarchy_index;
+
+pub use classpath::{ClasspathResolver, DEFAULT_CLASSPATH_CACHE_CAPACITY};
+pub use hierarchy_index::{HierarchyIndex, classpath_key};
+
+use memmap2::Mmap;
+use pytecode_engine::analysis::{
+    ClassResolver, MappingClassResolver, ReferenceTable, ResolvedClass, scan_class_references,
+    scan_references,
+};
+use pytecode_engine::model::{ClassModel, DebugInfoPolicy, FrameComputationMode};
+use pytecode_engine::parallel::{parallel_map, try_parallel_map, worker_count};
 use pytecode_engine::raw::RawClassStub;
-use pytecode_engine::transform::ApplyClassTransform;
+use pytecode_engine::transform::{ApplyClassTransform, ApplySharedClassTransform};
 use serde::{Deserialize, Serialize};
 use std::borrow::Cow;
 use std::fs;
 use std::fs::File;
-use std::io::{self, Read, Write};
+use std::io::{self, Read, Seek, Write};
+use std::ops::Range;
 use std::path::{Path, PathBuf};
+use std::sync::Arc;
 use std::time::{SystemTime, UNIX_EPOCH};
 use thiserror::Error;
 use zip::write::FullFileOptions;
@@ -19,13 +32,30 @@ pub struct ResourceEntryStub {
     pub byte_len: usize,
 }
 
-#[derive(Debug, Clone, PartialEq, Eq, Serialize, Deserialize)]
-pub struct JarInventory {
-    pub class_entries: Vec<RawClassStub>,
+/// Class entries and resource sizes of a [`MappedArchive`].
+#[derive(Debug, Clone, PartialEq, Eq, Serialize)]
+pub struct JarInventory<'a> {
+    pub class_entries: Vec<MappedClassStub<'a>>,
     pub resource_entries: Vec<ResourceEntryStub>,
     pub total_bytes: usize,
 }
 
+/// A class entry whose bytes are borrowed from the mapping when stored.
+#[derive(Debug, Clone, PartialEq, Eq, Serialize)]
+pub struct MappedClassStub<'a> {
+    pub entry_name: String,
+    pub bytes: Cow<'a, [u8]>,
+}
+
+impl MappedClassStub<'_> {
+    pub fn into_owned(self) -> RawClassStub {
+        RawClassStub {
+            entry_name: self.entry_name,
+            bytes: self.bytes.into_owned(),
+        }
+    }
+}
+
 #[derive(Debug, Clone, Copy, PartialEq, Eq)]
 pub struct ArchiveSupport {
     pub can_read: bool,
@@ -71,11 +101,26 @@ impl JarInfo {
     }
 }
 
+/// Class entries buffered per worker thread before a parallel rewrite flushes them in order.
+const PARALLEL_WINDOW_PER_WORKER: usize = 32;
+
 #[derive(Clone, Copy)]
 pub struct RewriteOptions<'a> {
     pub frame_mode: FrameComputationMode,
-    pub resolver: Option<&'a dyn ClassResolver>,
+    pub resolver: Option<&'a (dyn ClassResolver + Sync)>,
     pub debug_info: DebugInfoPolicy,
+    /// Worker threads used to lift, transform, and lower classes.
+    ///
+    /// `1` rewrites serially and `0` uses the machine's available parallelism.
+    /// Entries are always written in their original order.
+    pub workers: usize,
+}
+
+impl RewriteOptions<'_> {
+    /// Resolve [`RewriteOptions::workers`] into a concrete thread count.
+    pub fn worker_count(&self) -> usize {
+        worker_count(self.workers)
+    }
 }
 
 impl Default for RewriteOptions<'_> {
@@ -84,10 +129,27 @@ impl Default for RewriteOptions<'_> {
             frame_mode: FrameComputationMode::Preserve,
             resolver: None,
             debug_info: DebugInfoPolicy::Preserve,
+            workers: 1,
         }
     }
 }
 
+/// The class transform driving one rewrite.
+///
+/// Exclusive transforms run on the calling thread in entry order while lifting
+/// and lowering still fan out to workers; shared transforms run on the workers.
+enum EntryTransform<'t> {
+    None,
+    Exclusive(&'t mut dyn ApplyClassTransform),
+    Shared(&'t dyn ApplySharedClassTransform),
+}
+
+impl EntryTransform<'_> {
+    const fn is_none(&self) -> bool {
+        matches!(self, Self::None)
+    }
+}
+
 #[derive(Debug, Error)]
 pub enum ArchiveError {
     #[error(transparent)]
@@ -106,6 +168,10 @@ pub enum ArchiveError {
     InvalidTimestamp(String),
     #[error("archive entry comment must be valid UTF-8 to rewrite natively: {0}")]
     NonUtf8Comment(String),
+    #[error("invalid hierarchy index: {0}")]
+    InvalidHierarchyIndex(String),
+    #[error("archive entry changed on disk since the archive was opened: {0}")]
+    EntryChanged(String),
 }
 
 pub type Result<T> = std::result::Result<T, ArchiveError>;
@@ -217,29 +283,117 @@ impl JarFile {
         Ok(self.entries.remove(index))
     }
 
-    pub fn parse_classes(&self) -> (Vec<(JarInfo, RawClassStub)>, Vec<JarInfo>) {
+    /// Split entries into class stubs and non-directory resources.
+    ///
+    /// Entries are borrowed; only the class bytes are copied into each stub.
+    pub fn parse_classes(&self) -> (Vec<(&JarInfo, RawClassStub)>, Vec<&JarInfo>) {
         let mut classes = Vec::new();
         let mut others = Vec::new();
         for entry in &self.entries {
             if is_class_filename(entry) {
                 classes.push((
-                    entry.clone(),
+                    entry,
                     RawClassStub {
                         entry_name: entry.filename.clone(),
                         bytes: entry.bytes.clone(),
                     },
                 ));
             } else if !entry.metadata.is_dir {
-                others.push(entry.clone());
+                others.push(entry);
             }
         }
         (classes, others)
     }
 
+    /// Lift every class entry on up to `workers` threads (`0` = all cores).
+    ///
+    /// Classes are lifted straight from the entry bytes and returned in archive
+    /// order; the first failing entry in that order is reported.
+    pub fn lift_classes(&self, workers: usize) -> Result<Vec<(&JarInfo, ClassModel)>> {
+        let classes = self
+            .entries
+            .iter()
+            .filter(|entry| is_class_filename(entry))
+            .collect::<Vec<_>>();
+        try_parallel_map(&classes, worker_count(workers), |entry| {
+            Ok((*entry, ClassModel::from_bytes(&entry.bytes)?))
+        })
+    }
+
+    /// Collect every field, method and type reference made by the class entries.
+    ///
+    /// Classes are scanned on up to `workers` threads (`0` = all cores) without
+    /// lifting a `ClassModel`; rows follow archive order.
+    pub fn scan_references(&self, workers: usize) -> Result<ReferenceTable> {
+        let classes = self
+            .entries
+            .iter()
+            .filter(|entry| is_class_filename(entry))
+            .map(|entry| entry.bytes.as_slice())
+            .collect::<Vec<_>>();
+        Ok(scan_references(&classes, workers)?)
+    }
+
+    /// Build a resolver over this archive's classes followed by the `classpath` archives.
+    ///
+    /// Every class is read on up to `workers` threads (`0` = all cores) at
+    /// [`ReadLevel::Members`](pytecode_engine::ReadLevel::Members), so no
+    /// `ClassModel` is lifted and `Code` is never decoded. The first definition
+    /// of a name wins, so this archive's classes shadow the classpath.
+    pub fn class_resolver(
+        &self,
+        classpath: &[PathBuf],
+        workers: usize,
+    ) -> Result<MappingClassResolver> {
+        let classes = self
+            .entries
+            .iter()
+            .filter(|entry| is_class_filename(entry))
+            .collect::<Vec<_>>();
+        let mut resolved = try_parallel_map(&classes, worker_count(workers), |entry| {
+            Ok::<_, ArchiveError>(ResolvedClass::from_bytes(&entry.bytes)?)
+        })?;
+        for path in classpath {
+            resolved.extend(resolve_archive_classes(path, workers)?);
+        }
+        Ok(MappingClassResolver::from_classpath(resolved))
+    }
+
     pub fn rewrite(
         &mut self,
         output_path: Option<&Path>,
-        mut transform: Option<&mut dyn ApplyClassTransform>,
+        transform: Option<&mut dyn ApplyClassTransform>,
+        options: RewriteOptions<'_>,
+    ) -> Result<PathBuf> {
+        let transform = match transform {
+            Some(transform) => EntryTransform::Exclusive(transform),
+            None => EntryTransform::None,
+        };
+        self.rewrite_entries(output_path, transform, options)
+    }
+
+    /// Rewrite the archive with a transform that may run on several worker threads at once.
+    ///
+    /// With `options.workers` above one, every class is lifted, transformed, and
+    /// lowered on a worker while the ZIP entries are still written in their
+    /// original order.
+    pub fn rewrite_shared(
+        &mut self,
+        output_path: Option<&Path>,
+        transform: Option<&dyn ApplySharedClassTransform>,
+        options: RewriteOptions<'_>,
+    ) -> Result<PathBuf> {
+        let transform = match transform {
+            Some(transform) => EntryTransform::Shared(transform),
+            None => EntryTransform::None,
+        };
+        self.rewrite_entries(output_path, transform, options)
+    }
+
+    fn rewrite_entries(
+        &mut self,
+        output_path: Option<&Path>,
+        mut transform: EntryTransform<'_>,
         options: RewriteOptions<'_>,
     ) -> Result<PathBuf> {
         let destination = output_path
@@ -250,28 +404,22 @@ impl JarFile {
         }
         let temp_path = temporary_archive_path(&destination);
         let mut source = ZipArchive::new(File::open(&self.filename)?)?;
-        let no_transform = transform.is_none();
+        let workers = options.worker_count();
+        let window_len = rewrite_window_len(workers);
 
         {
             let file = File::create(&temp_path)?;
             let mut writer = ZipWriter::new(file);
-            for entry in &self.entries {
-                if let Some(index) = entry.original_index
-                    && should_raw_copy_entry(entry, no_transform, options)
-                {
-                    let source_entry = source.by_index(index)?;
-                    let archive_name = archive_name(&entry.filename);
-                    if source_entry.name() == archive_name {
-                        writer.raw_copy_file(source_entry)?;
-                    } else {
-                        writer.raw_copy_file_rename(source_entry, archive_name)?;
+            for window in self.entries.chunks(window_len) {
+                let encoded = encode_window(window, &mut transform, workers, options)?;
+                for (entry, encoded) in window.iter().zip(encoded) {
+                    match (encoded, entry.original_index) {
+                        (Some(bytes), _) => write_entry(&mut writer, entry, &bytes)?,
+                        (None, Some(index)) if can_raw_copy_entry(entry) => {
+                            raw_copy_entry(&mut writer, &mut source, index, entry)?;
+                        }
+                        (None, _) => write_entry(&mut writer, entry, &entry.bytes)?,
                     }
-                    continue;
-                }
-                if let Some(transform_ref) = transform.as_deref_mut() {
-                    write_entry(&mut writer, entry, Some(transform_ref), options)?;
-                } else {
-                    write_entry(&mut writer, entry, None, options)?;
                 }
             }
             writer.finish()?;
@@ -295,38 +443,387 @@ impl JarFile {
     }
 }
 
-pub fn read_jar_bytes(path: &Path) -> io::Result<Vec<u8>> {
-    fs::read(path)
+/// An open archive whose entry bytes are decompressed on demand.
+///
+/// Opening only reads the central directory, so listing a large archive or
+/// inspecting a handful of its entries does not pay for decompressing the rest.
+pub struct ArchiveReader {
+    archive: ZipArchive<File>,
 }
 
-pub fn inventory_jar(path: &Path) -> io::Result<JarInventory> {
-    let jar = JarFile::open(path).map_err(io::Error::other)?;
-    let mut class_entries = Vec::new();
-    let mut resource_entries = Vec::new();
-    let mut total_bytes = 0_usize;
-    for entry in jar.entries {
-        total_bytes += entry.bytes.len();
-        if is_class_filename(&entry) {
-            class_entries.push(RawClassStub {
-                entry_name: entry.filename,
-                bytes: entry.bytes,
-            });
-        } else if !entry.metadata.is_dir {
-            resource_entries.push(ResourceEntryStub {
-                entry_name: entry.filename,
-                byte_len: entry.bytes.len(),
+impl ArchiveReader {
+    pub fn open(path: &Path) -> Result<Self> {
+        Ok(Self {
+            archive: ZipArchive::new(File::open(path)?)?,
+        })
+    }
+
+    pub fn len(&self) -> usize {
+        self.archive.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.archive.len() == 0
+    }
+
+    /// Every entry's name and metadata, with empty `bytes`.
+    pub fn entries(&mut self) -> Result<Vec<JarInfo>> {
+        (0..self.archive.len())
+            .map(|index| read_archive_entry(&mut self.archive, index, |_| false))
+            .collect()
+    }
+
+    /// Decompress the bytes of the entry at `index`.
+    pub fn read_bytes(&mut self, index: usize) -> Result<Vec<u8>> {
+        Ok(read_archive_entry(&mut self.archive, index, |_| true)?.bytes)
+    }
+
+    /// Every entry's identity, in central-directory order.
+    pub fn identities(&mut self) -> Result<Vec<EntryIdentity>> {
+        (0..self.archive.len())
+            .map(|index| self.identity(index))
+            .collect()
+    }
+
+    /// Index of the entry matching `identity`, trying `hint` first.
+    ///
+    /// Returns `None` if no entry has the same name, CRC-32 and size, for
+    /// example because the file was replaced by a rewrite that changed it.
+    pub fn find_entry(&mut self, hint: usize, identity: &EntryIdentity) -> Result<Option<usize>> {
+        if hint < self.archive.len() && self.identity(hint)? == *identity {
+            return Ok(Some(hint));
+        }
+        for index in 0..self.archive.len() {
+            if self.identity(index)? == *identity {
+                return Ok(Some(index));
+            }
+        }
+        Ok(None)
+    }
+
+    fn identity(&mut self, index: usize) -> Result<EntryIdentity> {
+        let entry = self.archive.by_index_raw(index)?;
+        Ok(EntryIdentity {
+            name: entry.name().to_owned(),
+            crc32: entry.crc32(),
+            size: entry.size(),
+        })
+    }
+}
+
+/// Name, CRC-32 and uncompressed size of an archive entry.
+///
+/// Lets [`ArchiveReader::find_entry`] recognise an entry again after the
+/// archive file has been reopened, possibly with different contents.
+#[derive(Debug, Clone, PartialEq, Eq)]
+pub struct EntryIdentity {
+    pub name: String,
+    pub crc32: u32,
+    pub size: u64,
+}
+
+/// A memory-mapped archive that serves stored entries without copying them.
+///
+/// Stored (uncompressed) entries are handed out as slices of the mapping, so
+/// parse-only workloads can feed them straight to
+/// [`ClassReader::new`](pytecode_engine::reader::ClassReader::new); deflated
+/// entries are inflated on demand, concurrently when called from several
+/// threads. The archive must not be modified on disk while it is mapped.
+///
+/// Inflated entries are checked against their CRC-32 by the ZIP reader.
+/// Borrowed stored entries are not, since that would read every byte up
+/// front; use [`Self::verify_entry`] to check one explicitly.
+pub struct MappedArchive {
+    map: Arc<Mmap>,
+    entries: Vec<MappedEntry>,
+    archive: ZipArchive<io::Cursor<SharedMap>>,
+}
+
+/// Name and metadata of one entry in a [`MappedArchive`].
+#[derive(Debug, Clone, PartialEq, Eq)]
+pub struct MappedEntry {
+    pub filename: String,
+    pub metadata: JarEntryMetadata,
+    /// Uncompressed size in bytes.
+    pub size: u64,
+    pub crc32: u32,
+    stored: Option<Range<usize>>,
+}
+
+impl MappedEntry {
+    /// Whether the entry's bytes can be borrowed from the mapping.
+    pub const fn is_stored(&self) -> bool {
+        self.stored.is_some()
+    }
+
+    pub fn is_class(&self) -> bool {
+        !self.metadata.is_dir && self.filename.ends_with(".class")
+    }
+}
+
+/// Shares one mapping between the ZIP reader and the slices handed to callers.
+#[derive(Clone)]
+struct SharedMap(Arc<Mmap>);
+
+impl AsRef<[u8]> for SharedMap {
+    fn as_ref(&self) -> &[u8] {
+        &self.0
+    }
+}
+
+impl MappedArchive {
+    pub fn open(path: &Path) -> Result<Self> {
+        let file = File::open(path)?;
+        // SAFETY: the mapping is read-only and callers must not modify the
+        // archive on disk while it is open, as documented on the type.
+        let map = Arc::new(unsafe { Mmap::map(&file)? });
+        let mut archive = ZipArchive::new(io::Cursor::new(SharedMap(Arc::clone(&map))))?;
+        let mut entries = Vec::with_capacity(archive.len());
+        for index in 0..archive.len() {
+            let info = read_archive_entry(&mut archive, index, |_| false)?;
+            let raw = archive.by_index_raw(index)?;
+            let stored = if info.metadata.compression_method == CompressionMethod::Stored {
+                stored_data_range(&map, raw.header_start(), raw.compressed_size())
+            } else {
+                None
+            };
+            entries.push(MappedEntry {
+                filename: info.filename,
+                metadata: info.metadata,
+                size: raw.size(),
+                crc32: raw.crc32(),
+                stored,
             });
         }
+        Ok(Self {
+            map,
+            entries,
+            archive,
+        })
+    }
+
+    pub fn entries(&self) -> &[MappedEntry] {
+        &self.entries
+    }
+
+    /// Bytes of the entry at `index`, borrowed from the mapping when stored.
+    pub fn entry_bytes(&self, index: usize) -> Result<Cow<'_, [u8]>> {
+        let entry = self.entries.get(index).ok_or_else(|| {
+            ArchiveError::Io(io::Error::new(
+                io::ErrorKind::NotFound,
+                format!("archive entry index out of range: {index}"),
+            ))
+        })?;
+        if let Some(range) = &entry.stored {
+            return Ok(Cow::Borrowed(&self.map[range.clone()]));
+        }
+        if entry.metadata.is_dir {
+            return Ok(Cow::Borrowed(&[]));
+        }
+        // Cloning shares the parsed central directory, and gives this call its
+        // own cursor over the mapping.
+        let mut archive = self.archive.clone();
+        let mut bytes = Vec::with_capacity(usize::try_from(entry.size).unwrap_or(0));
+        archive.by_index(index)?.read_to_end(&mut bytes)?;
+        Ok(Cow::Owned(bytes))
     }
-    Ok(JarInventory {
-        class_entries,
-        resource_entries,
-        total_bytes,
+
+    /// Check the entry at `index` against the CRC-32 in the central directory.
+    pub fn verify_entry(&self, index: usize) -> Result<()> {
+        let bytes = self.entry_bytes(index)?;
+        let entry = &self.entries[index];
+        if entry.metadata.is_dir || crc32fast::hash(&bytes) == entry.crc32 {
+            return Ok(());
+        }
+        Err(ArchiveError::Io(io::Error::new(
+            io::ErrorKind::InvalidData,
+            format!("CRC-32 mismatch in archive entry: {}", entry.filename),
+        )))
+    }
+
+    /// Every class entry, borrowed from the mapping where stored, and the
+    /// size of every resource. Stored entries are not CRC-checked; see
+    /// [`Self::verify_entry`].
+    pub fn inventory(&self) -> Result<JarInventory<'_>> {
+        let mut class_entries = Vec::new();
+        let mut resource_entries = Vec::new();
+        let mut total_bytes = 0_usize;
+        for (index, entry) in self.entries.iter().enumerate() {
+            if entry.metadata.is_dir {
+                continue;
+            }
+            let byte_len = usize::try_from(entry.size).map_err(io::Error::other)?;
+            total_bytes += byte_len;
+            if entry.is_class() {
+                class_entries.push(MappedClassStub {
+                    entry_name: entry.filename.clone(),
+                    bytes: self.entry_bytes(index)?,
+                });
+            } else {
+                resource_entries.push(ResourceEntryStub {
+                    entry_name: entry.filename.clone(),
+                    byte_len,
+                });
+            }
+        }
+        Ok(JarInventory {
+            class_entries,
+            resource_entries,
+            total_bytes,
+        })
+    }
+
+    /// Collect every field, method and type reference made by `classes`.
+    ///
+    /// Entries are inflated on the scanning threads, up to `workers` of them
+    /// (`0` = all cores); rows follow the order of `classes`.
+    pub fn scan_references(
+        &self,
+        classes: &[ClassSource<'_>],
+        workers: usize,
+    ) -> Result<ReferenceTable> {
+        let tables = try_parallel_map(classes, worker_count(workers), |class| -> Result<_> {
+            let bytes = match class {
+                ClassSource::Entry(index) => self.entry_bytes(*index)?,
+                ClassSource::Bytes(bytes) => Cow::Borrowed(*bytes),
+            };
+            Ok(scan_class_references(&bytes)?)
+        })?;
+        Ok(ReferenceTable::merge(tables))
+    }
+}
+
+/// Where [`scan_archive_references`] reads one class from.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum ClassSource<'a> {
+    /// The entry at this index of the source archive.
+    Entry(usize),
+    /// Bytes held in memory, such as a modified entry.
+    Bytes(&'a [u8]),
+}
+
+/// Collect the references made by `classes`, reading unmodified ones from
+/// `source_path`.
+///
+/// The archive is memory-mapped only if some class is a
+/// [`ClassSource::Entry`]; see [`MappedArchive::scan_references`].
+pub fn scan_archive_references(
+    source_path: &Path,
+    classes: &[ClassSource<'_>],
+    workers: usize,
+) -> Result<ReferenceTable> {
+    let in_memory = classes
+        .iter()
+        .map_while(|class| match class {
+            ClassSource::Bytes(bytes) => Some(*bytes),
+            ClassSource::Entry(_) => None,
+        })
+        .collect::<Vec<_>>();
+    if in_memory.len() < classes.len() {
+        return MappedArchive::open(source_path)?.scan_references(classes, workers);
+    }
+    Ok(scan_references(&in_memory, workers)?)
+}
+
+/// Locate the data of a stored entry from its local file header.
+fn stored_data_range(map: &[u8], header_start: u64, len: u64) -> Option<Range<usize>> {
+    const LOCAL_HEADER_SIGNATURE: u32 = 0x0403_4b50;
+    const LOCAL_HEADER_LEN: usize = 30;
+    let header_start = usize::try_from(header_start).ok()?;
+    let header = map.get(header_start..header_start.checked_add(LOCAL_HEADER_LEN)?)?;
+    if u32::from_le_bytes([header[0], header[1], header[2], header[3]]) != LOCAL_HEADER_SIGNATURE {
+        return None;
+    }
+    let name_len = usize::from(u16::from_le_bytes([header[26], header[27]]));
+    let extra_len = usize::from(u16::from_le_bytes([header[28], header[29]]));
+    let start = header_start + LOCAL_HEADER_LEN + name_len + extra_len;
+    let end = start.checked_add(usize::try_from(len).ok()?)?;
+    (end <= map.len()).then_some(start..end)
+}
+
+/// Rewrite `source_path` into `output_path` one entry at a time.
+///
+/// Unlike [`JarFile::rewrite`], the source archive is never loaded as a whole:
+/// each class that needs relowering is decompressed, transformed, and written
+/// straight to the output, and every other entry is raw-copied where its
+/// metadata allows. Peak memory is bounded by the largest entry times the
+/// rewrite window (a single entry when `options.workers` is `1`). Passing the
+/// same path for source and output replaces the archive atomically.
+pub fn rewrite_streaming(
+    source_path: &Path,
+    output_path: &Path,
+    transform: Option<&mut dyn ApplyClassTransform>,
+    options: RewriteOptions<'_>,
+) -> Result<PathBuf> {
+    let transform = match transform {
+        Some(transform) => EntryTransform::Exclusive(transform),
+        None => EntryTransform::None,
+    };
+    stream_entries(source_path, output_path, transform, options)
+}
+
+/// Streaming counterpart of [`JarFile::rewrite_shared`].
+pub fn rewrite_streaming_shared(
+    source_path: &Path,
+    output_path: &Path,
+    transform: Option<&dyn ApplySharedClassTransform>,
+    options: RewriteOptions<'_>,
+) -> Result<PathBuf> {
+    let transform = match transform {
+        Some(transform) => EntryTransform::Shared(transform),
+        None => EntryTransform::None,
+    };
+    stream_entries(source_path, output_path, transform, options)
+}
+
+/// [`JarFile::class_resolver`] for an archive on disk, as used by [`rewrite_streaming`].
+///
+/// The archive is memory-mapped rather than loaded, so stored class entries
+/// are parsed in place.
+pub fn archive_class_resolver(
+    path: &Path,
+    classpath: &[PathBuf],
+    workers: usize,
+) -> Result<MappingClassResolver> {
+    let mut resolved = resolve_archive_classes(path, workers)?;
+    for path in classpath {
+        resolved.extend(resolve_archive_classes(path, workers)?);
+    }
+    Ok(MappingClassResolver::from_classpath(resolved))
+}
+
+/// Resolve every class entry of the archive at `path`, in archive order.
+fn resolve_archive_classes(path: &Path, workers: usize) -> Result<Vec<ResolvedClass>> {
+    let archive = MappedArchive::open(path)?;
+    let classes = archive
+        .entries()
+        .iter()
+        .enumerate()
+        .filter(|(_, entry)| entry.is_class())
+        .map(|(index, _)| index)
+        .collect::<Vec<_>>();
+    try_parallel_map(&classes, worker_count(workers), |&index| {
+        Ok(ResolvedClass::from_bytes(&archive.entry_bytes(index)?)?)
     })
 }
 
+pub fn read_jar_bytes(path: &Path) -> io::Result<Vec<u8>> {
+    fs::read(path)
+}
+
+/// Inventory `archive`; see [`MappedArchive::inventory`].
+pub fn inventory_jar(archive: &MappedArchive) -> io::Result<JarInventory<'_>> {
+    archive.inventory().map_err(io::Error::other)
+}
+
+/// Read and copy every class entry of the archive at `path`.
 pub fn parse_jar_classes(path: &Path) -> io::Result<Vec<RawClassStub>> {
-    Ok(inventory_jar(path)?.class_entries)
+    let archive = MappedArchive::open(path).map_err(io::Error::other)?;
+    Ok(inventory_jar(&archive)?
+        .class_entries
+        .into_iter()
+        .map(MappedClassStub::into_owned)
+        .collect())
 }
 
 pub const fn phase5_support() -> ArchiveSupport {
@@ -343,82 +840,244 @@ pub const fn phase0_support() -> ArchiveSupport {
 fn read_archive_entries(path: &Path) -> Result<Vec<JarInfo>> {
     let file = File::open(path)?;
     let mut archive = ZipArchive::new(file)?;
-    let mut entries = Vec::new();
-    for index in 0..archive.len() {
-        let mut entry = archive.by_index(index)?;
-        let is_dir = entry.is_dir();
-        let filename = normalize_filename(entry.name(), is_dir)?;
-        let mut bytes = Vec::with_capacity(usize::try_from(entry.size()).unwrap_or(0));
-        if !is_dir {
-            entry.read_to_end(&mut bytes)?;
-        }
-        entries.push(JarInfo {
-            filename,
-            bytes,
-            metadata: JarEntryMetadata {
-                compression_method: entry.compression(),
-                last_modified: entry.last_modified().unwrap_or_default(),
-                unix_mode: entry.unix_mode(),
-                system: System::Unknown,
-                comment: entry.comment().as_bytes().to_vec(),
-                extra_data: entry
-                    .extra_data()
-                    .map_or_else(Vec::new, std::borrow::ToOwned::to_owned),
-                is_dir,
-            },
-            original_index: Some(index),
-        });
+    (0..archive.len())
+        .map(|index| read_archive_entry(&mut archive, index, |_| true))
+        .collect()
+}
+
+/// Read the metadata of entry `index`, decompressing its bytes only when
+/// `load_bytes` asks for them.
+fn read_archive_entry<R: Read + Seek>(
+    archive: &mut ZipArchive<R>,
+    index: usize,
+    load_bytes: impl FnOnce(&JarInfo) -> bool,
+) -> Result<JarInfo> {
+    let mut entry = archive.by_index(index)?;
+    let is_dir = entry.is_dir();
+    let filename = normalize_filename(entry.name(), is_dir)?;
+    let mut info = JarInfo {
+        filename,
+        bytes: Vec::new(),
+        metadata: JarEntryMetadata {
+            compression_method: entry.compression(),
+            last_modified: entry.last_modified().unwrap_or_default(),
+            unix_mode: entry.unix_mode(),
+            system: System::Unknown,
+            comment: entry.comment().as_bytes().to_vec(),
+            extra_data: entry
+                .extra_data()
+                .map_or_else(Vec::new, std::borrow::ToOwned::to_owned),
+            is_dir,
+        },
+        original_index: Some(index),
+    };
+    if !is_dir && load_bytes(&info) {
+        info.bytes
+            .reserve(usize::try_from(entry.size()).unwrap_or(0));
+        entry.read_to_end(&mut info.bytes)?;
     }
-    Ok(entries)
+    Ok(info)
 }
 
-fn should_raw_copy_entry(entry: &JarInfo, no_transform: bool, options: RewriteOptions<'_>) -> bool {
-    no_transform
-        && options.frame_mode == FrameComputationMode::Preserve
-        && options.debug_info == DebugInfoPolicy::Preserve
-        && options.resolver.is_none()
-        && entry.original_index.is_some()
+/// Whether `entry` can be copied compressed from its source archive as-is.
+fn can_raw_copy_entry(entry: &JarInfo) -> bool {
+    entry.original_index.is_some()
         && entry.metadata.comment.is_empty()
         && entry.metadata.extra_data.is_empty()
 }
 
-fn write_entry(
+fn raw_copy_entry<R: Read + Seek>(
     writer: &mut ZipWriter<File>,
+    source: &mut ZipArchive<R>,
+    index: usize,
     entry: &JarInfo,
-    transform: Option<&mut dyn ApplyClassTransform>,
+) -> Result<()> {
+    let source_entry = source.by_index(index)?;
+    let archive_name = archive_name(&entry.filename);
+    if source_entry.name() == archive_name {
+        writer.raw_copy_file(source_entry)?;
+    } else {
+        writer.raw_copy_file_rename(source_entry, archive_name)?;
+    }
+    Ok(())
+}
+
+const fn rewrite_window_len(workers: usize) -> usize {
+    if workers > 1 {
+        workers.saturating_mul(PARALLEL_WINDOW_PER_WORKER)
+    } else {
+        1
+    }
+}
+
+fn stream_entries(
+    source_path: &Path,
+    output_path: &Path,
+    mut transform: EntryTransform<'_>,
+    options: RewriteOptions<'_>,
+) -> Result<PathBuf> {
+    if let Some(parent) = output_path.parent() {
+        fs::create_dir_all(parent)?;
+    }
+    let temp_path = temporary_archive_path(output_path);
+    let written = stream_into(source_path, &temp_path, &mut transform, options);
+    if let Err(error) = written {
+        let _ = fs::remove_file(&temp_path);
+        return Err(error);
+    }
+    fs::rename(&temp_path, output_path)?;
+    Ok(output_path.to_path_buf())
+}
+
+fn stream_into(
+    source_path: &Path,
+    temp_path: &Path,
+    transform: &mut EntryTransform<'_>,
     options: RewriteOptions<'_>,
 ) -> Result<()> {
-    if entry.metadata.is_dir {
-        writer.add_directory(archive_name(&entry.filename), file_options(entry)?)?;
-        return Ok(());
+    let mut source = ZipArchive::new(File::open(source_path)?)?;
+    let mut writer = ZipWriter::new(File::create(temp_path)?);
+    let has_transform = !transform.is_none();
+    let workers = options.worker_count();
+    let window_len = rewrite_window_len(workers);
+    let mut window = Vec::with_capacity(window_len);
+    for index in 0..source.len() {
+        window.push(read_archive_entry(&mut source, index, |entry| {
+            should_relower_entry(entry, has_transform, options) || !can_raw_copy_entry(entry)
+        })?);
+        if window.len() == window_len || index + 1 == source.len() {
+            let encoded = encode_window(&window, transform, workers, options)?;
+            for (entry, encoded) in window.drain(..).zip(encoded) {
+                match (encoded, entry.original_index) {
+                    (Some(bytes), _) => write_entry(&mut writer, &entry, &bytes)?,
+                    (None, Some(index)) if can_raw_copy_entry(&entry) => {
+                        raw_copy_entry(&mut writer, &mut source, index, &entry)?;
+                    }
+                    (None, _) => write_entry(&mut writer, &entry, &entry.bytes)?,
+                }
+            }
+        }
     }
+    writer.finish()?;
+    Ok(())
+}
 
-    let bytes: Cow<'_, [u8]> = if is_class_filename(entry) {
-        let should_relower = transform.is_some()
-            || options.frame_mode == FrameComputationMode::Recompute
-            || options.debug_info != DebugInfoPolicy::Preserve
-            || options.resolver.is_some();
-        if should_relower {
-            let mut model = pytecode_engine::model::ClassModel::from_bytes(&entry.bytes)?;
-            if let Some(transform) = transform {
-                transform.apply(&mut model)?;
+fn should_relower_entry(entry: &JarInfo, has_transform: bool, options: RewriteOptions<'_>) -> bool {
+    is_class_filename(entry) && (has_transform || options_force_relower(options))
+}
+
+/// Whether the lowering options change classes even when no transform touches them.
+fn options_force_relower(options: RewriteOptions<'_>) -> bool {
+    options.frame_mode == FrameComputationMode::Recompute
+        || options.debug_info != DebugInfoPolicy::Preserve
+        || options.resolver.is_some()
+}
+
+/// Lift, transform, and lower the classes of one window of entries.
+///
+/// Returns the re-encoded bytes for every entry that had to be relowered and
+/// `None` for entries that are written from their stored bytes, including
+/// classes the transform rules out before lifting or reports as unmodified.
+/// Errors are reported for the first failing entry in archive order.
+fn encode_window(
+    window: &[JarInfo],
+    transform: &mut EntryTransform<'_>,
+    workers: usize,
+    options: RewriteOptions<'_>,
+) -> Result<Vec<Option<Vec<u8>>>> {
+    let has_transform = !transform.is_none();
+    let relower = |entry: &JarInfo| should_relower_entry(entry, has_transform, options);
+    let force_relower = options_force_relower(options);
+    match transform {
+        EntryTransform::Exclusive(transform) => {
+            // Exclusive transforms are not `Sync`, so the prefilter runs here
+            // and only the lift and lower fan out to the workers.
+            let selected = window
+                .iter()
+                .map(|entry| {
+                    let lift =
+                        relower(entry) && (force_relower || transform.may_apply(&entry.bytes));
+                    (entry, lift)
+                })
+                .collect::<Vec<_>>();
+            let lifted = parallel_map(
+                &selected,
+                workers,
+                |(entry, lift)| -> pytecode_engine::Result<Option<ClassModel>> {
+                    if *lift {
+                        ClassModel::from_bytes(&entry.bytes).map(Some)
+                    } else {
+                        Ok(None)
+                    }
+                },
+            );
+            let mut models = Vec::with_capacity(lifted.len());
+            for model in lifted {
+                let mut model = model?;
+                if let Some(lifted) = model.as_mut()
+                    && !transform.apply_tracked(lifted)?
+                    && !force_relower
+                {
+                    model = None;
+                }
+                models.push(model);
             }
-            let classfile = model.to_classfile_with_options(
-                options.debug_info,
-                options.frame_mode,
-                options.resolver,
-            )?;
-            Cow::Owned(pytecode_engine::write_class(&classfile)?)
-        } else {
-            Cow::Borrowed(&entry.bytes)
+            parallel_map(&models, workers, |model| {
+                model
+                    .as_ref()
+                    .map(|model| lower_class(model, options))
+                    .transpose()
+            })
+            .into_iter()
+            .collect()
         }
-    } else {
-        Cow::Borrowed(&entry.bytes)
-    };
+        EntryTransform::Shared(transform) => {
+            let transform: &dyn ApplySharedClassTransform = *transform;
+            parallel_map(window, workers, |entry| -> Result<Option<Vec<u8>>> {
+                if !relower(entry) || !(force_relower || transform.may_apply_shared(&entry.bytes)) {
+                    return Ok(None);
+                }
+                let mut model = ClassModel::from_bytes(&entry.bytes)?;
+                if !transform.apply_shared_tracked(&mut model)? && !force_relower {
+                    return Ok(None);
+                }
+                lower_class(&model, options).map(Some)
+            })
+            .into_iter()
+            .collect()
+        }
+        EntryTransform::None => parallel_map(window, workers, |entry| -> Result<Option<Vec<u8>>> {
+            if !relower(entry) {
+                return Ok(None);
+            }
+            let model = ClassModel::from_bytes(&entry.bytes)?;
+            lower_class(&model, options).map(Some)
+        })
+        .into_iter()
+        .collect(),
+    }
+}
+
+fn lower_class(model: &ClassModel, options: RewriteOptions<'_>) -> Result<Vec<u8>> {
+    let classfile = model.to_classfile_with_options(
+        options.debug_info,
+        options.frame_mode,
+        options
+            .resolver
+            .map(|resolver| resolver as &dyn ClassResolver),
+    )?;
+    Ok(pytecode_engine::write_class(&classfile)?)
+}
+
+fn write_entry(writer: &mut ZipWriter<File>, entry: &JarInfo, bytes: &[u8]) -> Result<()> {
+    if entry.metadata.is_dir {
+        writer.add_directory(archive_name(&entry.filename), file_options(entry)?)?;
+        return Ok(());
+    }
 
     let file_options = file_options(entry)?;
     writer.start_file(archive_name(&entry.filename), file_options)?;
-    writer.write_all(&bytes)?;
+    writer.write_all(bytes)?;
     Ok(())
 }
 
@@ -1,19 +1,31 @@
-use pytecode_archive::{JarFile, RewriteOptions};
-use pytecode_engine::constants::{MAGIC, MethodAccessFlags};
+use pytecode_archive::{
+    ArchiveError, ArchiveReader, ClassSource, ClasspathResolver, HierarchyIndex, JarFile,
+    MappedArchive, RewriteOptions, archive_class_resolver, classpath_key, inventory_jar,
+    rewrite_streaming, scan_archive_references,
+};
+use pytecode_engine::analysis::{ClassResolver, common_superclass, is_subtype, scan_references};
+use pytecode_engine::constants::{ClassAccessFlags, MAGIC, MethodAccessFlags};
 use pytecode_engine::fixtures::compiled_fixture_paths_for;
 use pytecode_engine::indexes::*;
 use pytecode_engine::model::{ClassModel, CodeItem, FrameComputationMode};
 use pytecode_engine::modified_utf8::decode_modified_utf8;
 use pytecode_engine::parse_class;
 use pytecode_engine::raw::{AttributeInfo, ConstantPoolEntry, Instruction};
-use pytecode_engine::transform::{Pipeline, class_named, method_named, on_code, on_methods};
+use pytecode_engine::transform::matcher_spec::ClassMatcherSpec;
+use pytecode_engine::transform::pipeline_spec::{PipelineSpec, TransformAction};
+use pytecode_engine::transform::transform_spec::ClassTransformSpec;
+use pytecode_engine::transform::{
+    Pipeline, class_named, method_named, on_code, on_methods, tracked_shared,
+};
+use std::borrow::Cow;
 use std::fs;
 use std::fs::File;
 use std::io::Write;
 use std::path::{Path, PathBuf};
+use std::sync::Arc;
 use std::time::{SystemTime, UNIX_EPOCH};
-use zip::ZipWriter;
 use zip::write::SimpleFileOptions;
+use zip::{CompressionMethod, ZipWriter};
 
 type TestResult<T> = Result<T, Box<dyn std::error::Error + Send + Sync>>;
 
@@ -154,6 +166,703 @@ fn rewrite_applies_method_transform_and_preserves_resource() -> TestResult<()> {
     Ok(())
 }
 
+#[test]
+fn rewrite_copies_classes_the_transform_leaves_untouched() -> TestResult<()> {
+    let temp_dir = fresh_temp_dir("archive-untouched");
+    let jar_path = temp_dir.join("input.jar");
+    // Trailing bytes survive only a verbatim copy; relowering drops them.
+    let mut hello = fixture_bytes("HelloWorld.java", "HelloWorld.class");
+    hello.extend_from_slice(b"trailer");
+    let mut control_flow = fixture_bytes("ControlFlowExample.java", "ControlFlowExample.class");
+    control_flow.extend_from_slice(b"trailer");
+    make_jar(
+        &jar_path,
+        &[
+            ("HelloWorld.class", &hello),
+            ("ControlFlowExample.class", &control_flow),
+        ],
+    )?;
+
+    let mut exclusive = Pipeline::of(on_methods(
+        |method, _owner| {
+            method.access_flags |= MethodAccessFlags::FINAL;
+            Ok(())
+        },
+        Some(method_named("main")),
+        Some(class_named("HelloWorld")),
+    ));
+    let shared = tracked_shared(|model: &mut ClassModel| {
+        if model.name != "HelloWorld" {
+            return Ok(false);
+        }
+        for method in &mut model.methods {
+            method.access_flags |= MethodAccessFlags::FINAL;
+        }
+        Ok(true)
+    });
+
+    let exclusive_path = temp_dir.join("exclusive.jar");
+    JarFile::open(&jar_path)?.rewrite(
+        Some(&exclusive_path),
+        Some(&mut exclusive),
+        RewriteOptions::default(),
+    )?;
+    let shared_path = temp_dir.join("shared.jar");
+    JarFile::open(&jar_path)?.rewrite_shared(
+        Some(&shared_path),
+        Some(&shared),
+        RewriteOptions {
+            workers: 2,
+            ..RewriteOptions::default()
+        },
+    )?;
+
+    for path in [&exclusive_path, &shared_path] {
+        let rewritten = JarFile::open(path)?;
+        let entry = |name: &str| {
+            rewritten
+                .entries
+                .iter()
+                .find(|entry| entry.filename == name)
+                .expect("entry should exist")
+        };
+        assert_eq!(entry("ControlFlowExample.class").bytes, control_flow);
+        let touched = &entry("HelloWorld.class").bytes;
+        assert!(!touched.ends_with(b"trailer"));
+        assert!(method_flags(touched, "main").contains(MethodAccessFlags::FINAL));
+    }
+    Ok(())
+}
+
+#[test]
+fn rewrite_with_compiled_pipeline_skips_lifting_unmatched_classes() -> TestResult<()> {
+    let temp_dir = fresh_temp_dir("archive-prefilter");
+    let jar_path = temp_dir.join("input.jar");
+    let hello = fixture_bytes("HelloWorld.java", "HelloWorld.class");
+    // Only the header of this class is readable, so lifting it would fail.
+    let control_flow = fixture_bytes("ControlFlowExample.java", "ControlFlowExample.class");
+    let unliftable = &control_flow[..control_flow.len() - 1];
+    make_jar(
+        &jar_path,
+        &[
+            ("HelloWorld.class", &hello),
+            ("ControlFlowExample.class", unliftable),
+        ],
+    )?;
+    let pipeline = PipelineSpec::new()
+        .on_classes(
+            ClassMatcherSpec::Named("HelloWorld".into()),
+            TransformAction::BuiltIn(ClassTransformSpec::AddAccessFlags(
+                ClassAccessFlags::FINAL.bits(),
+            )),
+        )
+        .compile();
+
+    for workers in [1, 2] {
+        let out_path = temp_dir.join(format!("output-{workers}.jar"));
+        JarFile::open(&jar_path)?.rewrite_shared(
+            Some(&out_path),
+            Some(&pipeline),
+            RewriteOptions {
+                workers,
+                ..RewriteOptions::default()
+            },
+        )?;
+        let rewritten = JarFile::open(&out_path)?;
+        assert_eq!(rewritten.entries[1].bytes, unliftable);
+        let hello = parse_class(&rewritten.entries[0].bytes)?;
+        assert!(hello.access_flags.contains(ClassAccessFlags::FINAL));
+    }
+    Ok(())
+}
+
+#[test]
+fn parallel_rewrite_matches_serial_rewrite() -> TestResult<()> {
+    let temp_dir = fresh_temp_dir("archive-parallel");
+    let jar_path = temp_dir.join("input.jar");
+    let serial_path = temp_dir.join("serial.jar");
+    let parallel_path = temp_dir.join("parallel.jar");
+    let mut fixtures = Vec::new();
+    for path in compiled_fixture_paths_for("PatternMatching.java")? {
+        let name = path
+            .file_name()
+            .and_then(|name| name.to_str())
+            .expect("fixture name should be utf-8")
+            .to_owned();
+        fixtures.push((name, fs::read(&path)?));
+    }
+    fixtures.sort_by(|left, right| left.0.cmp(&right.0));
+    let mut entries = fixtures
+        .iter()
+        .map(|(name, bytes)| (name.as_str(), bytes.as_slice()))
+        .collect::<Vec<_>>();
+    entries.insert(1, ("README.txt", b"fixture"));
+    make_jar(&jar_path, &entries)?;
+
+    let transform = |model: &mut ClassModel| -> pytecode_engine::Result<()> {
+        for method in &mut model.methods {
+            method.access_flags |= MethodAccessFlags::SYNTHETIC;
+        }
+        Ok(())
+    };
+
+    let mut jar = JarFile::open(&jar_path)?;
+    jar.rewrite_shared(
+        Some(&serial_path),
+        Some(&transform),
+        RewriteOptions::default(),
+    )?;
+    let mut jar = JarFile::open(&jar_path)?;
+    jar.rewrite_shared(
+        Some(&parallel_path),
+        Some(&transform),
+        RewriteOptions {
+            workers: 4,
+            ..RewriteOptions::default()
+        },
+    )?;
+
+    let serial = JarFile::open(&serial_path)?;
+    let parallel = JarFile::open(&parallel_path)?;
+    assert_eq!(
+        parallel
+            .entries
+            .iter()
+            .map(|entry| entry.filename.as_str())
+            .collect::<Vec<_>>(),
+        entries.iter().map(|(name, _)| *name).collect::<Vec<_>>()
+    );
+    for (serial_entry, parallel_entry) in serial.entries.iter().zip(&parallel.entries) {
+        assert_eq!(serial_entry.filename, parallel_entry.filename);
+        assert_eq!(serial_entry.bytes, parallel_entry.bytes);
+    }
+    Ok(())
+}
+
+#[test]
+fn lift_classes_borrows_entries_in_archive_order() -> TestResult<()> {
+    let temp_dir = fresh_temp_dir("archive-lift-classes");
+    let jar_path = temp_dir.join("input.jar");
+    let hello = fixture_bytes("HelloWorld.java", "HelloWorld.class");
+    make_jar(
+        &jar_path,
+        &[
+            ("b/HelloWorld.class", &hello),
+            ("README.txt", b"fixture"),
+            ("a/HelloWorld.class", &hello),
+        ],
+    )?;
+
+    let jar = JarFile::open(&jar_path)?;
+    let (classes, resources) = jar.parse_classes();
+    assert_eq!(classes.len(), 2);
+    assert_eq!(resources.len(), 1);
+    assert!(std::ptr::eq(classes[0].0, &jar.entries[0]));
+
+    let lifted = jar.lift_classes(0)?;
+    let names = lifted
+        .iter()
+        .map(|(entry, _model)| entry.filename.as_str())
+        .collect::<Vec<_>>();
+    assert_eq!(names, ["b/HelloWorld.class", "a/HelloWorld.class"]);
+    for (_entry, model) in &lifted {
+        assert_eq!(model.to_bytes()?, hello);
+    }
+    Ok(())
+}
+
+#[test]
+fn scan_references_covers_class_entries_in_archive_order() -> TestResult<()> {
+    let temp_dir = fresh_temp_dir("archive-scan-references");
+    let jar_path = temp_dir.join("input.jar");
+    let hello = fixture_bytes("HelloWorld.java", "HelloWorld.class");
+    let showcase = fixture_bytes("InstructionShowcase.java", "InstructionShowcase.class");
+    make_jar(
+        &jar_path,
+        &[
+            ("b/HelloWorld.class", &hello),
+            ("README.txt", b"fixture"),
+            ("a/InstructionShowcase.class", &showcase),
+        ],
+    )?;
+
+    let table = JarFile::open(&jar_path)?.scan_references(0)?;
+    assert_eq!(table, scan_references(&[&hello, &showcase], 1)?);
+    let text = |id: u32| table.strings[id as usize].as_str();
+    assert_eq!(text(table.classes[0]), "HelloWorld");
+    assert!((0..table.len()).any(|row| {
+        table.opcodes[row] == 0xB2
+            && text(table.owners[row]) == "java/lang/System"
+            && text(table.names[row]) == "out"
+    }));
+    Ok(())
+}
+
+#[test]
+fn scan_archive_references_reads_unmodified_entries_from_the_source() -> TestResult<()> {
+    let temp_dir = fresh_temp_dir("archive-scan-sources");
+    let jar_path = temp_dir.join("input.jar");
+    let hello = fixture_bytes("HelloWorld.java", "HelloWorld.class");
+    let showcase = fixture_bytes("InstructionShowcase.java", "InstructionShowcase.class");
+    make_jar(
+        &jar_path,
+        &[("HelloWorld.class", &hello), ("README.txt", b"fixture")],
+    )?;
+
+    let classes = [ClassSource::Bytes(&showcase), ClassSource::Entry(0)];
+    let expected = scan_references(&[&showcase, &hello], 1)?;
+    assert_eq!(scan_archive_references(&jar_path, &classes, 2)?, expected);
+    assert_eq!(
+        scan_archive_references(&temp_dir.join("missing.jar"), &classes[..1], 1)?,
+        scan_references(&[&showcase], 1)?
+    );
+    assert!(scan_archive_references(&jar_path, &[ClassSource::Entry(1)], 1).is_err());
+    Ok(())
+}
+
+#[test]
+fn class_resolver_covers_archive_and_classpath_without_lifting() -> TestResult<()> {
+    let temp_dir = fresh_temp_dir("archive-class-resolver");
+    let jar_path = temp_dir.join("input.jar");
+    let classpath_path = temp_dir.join("classpath.jar");
+    let mut classes = compiled_fixture_paths_for("HierarchyFixture.java")?
+        .into_iter()
+        .map(|path| {
+            let bytes = fs::read(&path)?;
+            let name = ClassModel::from_bytes(&bytes)?.name;
+            Ok((format!("{name}.class"), bytes))
+        })
+        .collect::<TestResult<Vec<_>>>()?;
+    classes.sort();
+    let fixture = classes
+        .iter()
+        .position(|(entry, _)| entry == "fixture/hierarchy/HierarchyFixture.class")
+        .expect("fixture class should compile");
+    let archive_entries = [(classes[fixture].0.as_str(), classes[fixture].1.as_slice())];
+    // The classpath repeats the archive's class; the archive's copy shadows it.
+    let classpath_entries = classes
+        .iter()
+        .map(|(entry, bytes)| (entry.as_str(), bytes.as_slice()))
+        .collect::<Vec<_>>();
+    make_jar(&jar_path, &archive_entries)?;
+    make_jar(&classpath_path, &classpath_entries)?;
+
+    let jar = JarFile::open(&jar_path)?;
+    let classpath = [classpath_path];
+    let fixture_name = "fixture/hierarchy/HierarchyFixture";
+    for resolver in [
+        jar.class_resolver(&classpath, 0)?,
+        archive_class_resolver(&jar_path, &classpath, 1)?,
+    ] {
+        assert!(is_subtype(
+            &resolver,
+            fixture_name,
+            "fixture/hierarchy/Trainable"
+        )?);
+        assert_eq!(
+            common_superclass(&resolver, fixture_name, "fixture/hierarchy/Mammal")?,
+            "fixture/hierarchy/Mammal"
+        );
+        assert!(
+            resolver
+                .resolve_class(fixture_name)
+                .is_some_and(|resolved| resolved.find_method("train", "()V").is_some())
+        );
+    }
+    assert!(
+        jar.class_resolver(&[], 1)?
+            .resolve_class("fixture/hierarchy/Mammal")
+            .is_none()
+    );
+    Ok(())
+}
+
+#[test]
+fn classpath_resolver_indexes_jars_and_directories_lazily() -> TestResult<()> {
+    let temp_dir = fresh_temp_dir("classpath-resolver");
+    let jar_path = temp_dir.join("classes.jar");
+    let class_dir = temp_dir.join("classes");
+    let mut classes = compiled_fixture_paths_for("HierarchyFixture.java")?
+        .into_iter()
+        .map(|path| {
+            let bytes = fs::read(&path)?;
+            let name = ClassModel::from_bytes(&bytes)?.name;
+            Ok((name, bytes))
+        })
+        .collect::<TestResult<Vec<_>>>()?;
+    classes.sort();
+    // The JAR holds the interfaces, the directory everything else.
+    let (interfaces, others): (Vec<_>, Vec<_>) = classes
+        .iter()
+        .partition(|(name, _)| name.ends_with("Trainable") || name.ends_with("Pet"));
+    assert!(!interfaces.is_empty() && !others.is_empty());
+    let jar_entries = interfaces
+        .iter()
+        .map(|(name, bytes)| (format!("{name}.class"), bytes.as_slice()))
+        .collect::<Vec<_>>();
+    make_jar(
+        &jar_path,
+        &jar_entries
+            .iter()
+            .map(|(entry, bytes)| (entry.as_str(), *bytes))
+            .collect::<Vec<_>>(),
+    )?;
+    for (name, bytes) in &others {
+        let path = class_dir.join(format!("{name}.class"));
+        fs::create_dir_all(path.parent().expect("class path has a parent"))?;
+        fs::write(path, bytes)?;
+    }
+    // A symlink back to the root must not make the directory walk loop.
+    #[cfg(unix)]
+    std::os::unix::fs::symlink(&class_dir, class_dir.join("fixture").join("loop"))?;
+
+    let resolver = ClasspathResolver::with_capacity(&[class_dir, jar_path], 2)?;
+    assert_eq!(resolver.len(), classes.len());
+    assert_eq!(resolver.cached_len(), 0);
+    let fixture_name = "fixture/hierarchy/HierarchyFixture";
+    assert!(resolver.contains(fixture_name));
+    assert!(is_subtype(
+        &resolver,
+        fixture_name,
+        "fixture/hierarchy/Trainable"
+    )?);
+    assert_eq!(
+        common_superclass(&resolver, fixture_name, "fixture/hierarchy/Mammal")?,
+        "fixture/hierarchy/Mammal"
+    );
+    assert_eq!(resolver.cached_len(), 2);
+    // Hierarchy answers are memoized even after their classes leave the cache.
+    let superclasses = resolver.superclass_names(fixture_name)?;
+    assert!(Arc::ptr_eq(
+        &superclasses,
+        &resolver.clone().superclass_names(fixture_name)?
+    ));
+    assert_eq!(
+        superclasses.last().map(String::as_str),
+        Some("java/lang/Object")
+    );
+    assert!(
+        resolver
+            .resolve_class(fixture_name)
+            .is_some_and(|resolved| resolved.find_method("train", "()V").is_some())
+    );
+    assert!(resolver.resolve_class("java/lang/Object").is_some());
+    assert!(
+        resolver
+            .resolve_class("fixture/hierarchy/Missing")
+            .is_none()
+    );
+    Ok(())
+}
+
+#[test]
+fn hierarchy_index_roundtrips_and_rebuilds_when_the_classpath_changes() -> TestResult<()> {
+    let temp_dir = fresh_temp_dir("hierarchy-index");
+    let jar_path = temp_dir.join("classes.jar");
+    let index_path = temp_dir.join("cache").join("classes.idx");
+    let mut classes = compiled_fixture_paths_for("HierarchyFixture.java")?
+        .into_iter()
+        .map(|path| {
+            let bytes = fs::read(&path)?;
+            let name = ClassModel::from_bytes(&bytes)?.name;
+            Ok((format!("{name}.class"), bytes))
+        })
+        .collect::<TestResult<Vec<_>>>()?;
+    classes.sort();
+    let entries = classes
+        .iter()
+        .map(|(entry, bytes)| (entry.as_str(), bytes.as_slice()))
+        .collect::<Vec<_>>();
+    make_jar(&jar_path, &entries)?;
+    let classpath = [jar_path.clone()];
+
+    let index = HierarchyIndex::load_or_build(&classpath, &index_path, 0)?;
+    assert_eq!(index.key(), classpath_key(&classpath)?);
+    assert_eq!(index.len(), classes.len());
+    let expected = archive_class_resolver(&jar_path, &[], 1)?;
+    for resolved in index.classes() {
+        assert_eq!(Some(&resolved), expected.get(&resolved.name));
+    }
+    let fixture_name = "fixture/hierarchy/HierarchyFixture";
+    assert!(is_subtype(
+        &index,
+        fixture_name,
+        "fixture/hierarchy/Trainable"
+    )?);
+    assert_eq!(
+        common_superclass(&index, fixture_name, "fixture/hierarchy/Mammal")?,
+        "fixture/hierarchy/Mammal"
+    );
+    assert!(Arc::ptr_eq(
+        &index.supertype_names(fixture_name)?,
+        &index.clone().supertype_names(fixture_name)?
+    ));
+    assert!(index.resolve_class("java/lang/Object").is_some());
+    assert!(index.resolve_class("fixture/hierarchy/Missing").is_none());
+    assert_eq!(
+        index.to_mapping_resolver().resolve_class(fixture_name),
+        index.resolve_class(fixture_name)
+    );
+
+    // A second run reuses the file as written.
+    let written = fs::read(&index_path)?;
+    let reopened = HierarchyIndex::load_or_build(&classpath, &index_path, 1)?;
+    assert_eq!(reopened.key(), index.key());
+    assert_eq!(fs::read(&index_path)?, written);
+
+    // Changing the JAR changes the key and rebuilds the index.
+    make_jar(&jar_path, &entries[..1])?;
+    let rebuilt = HierarchyIndex::load_or_build(&classpath, &index_path, 1)?;
+    assert_ne!(rebuilt.key(), index.key());
+    assert_eq!(rebuilt.len(), 1);
+
+    // A cache that cannot be replaced, as on Windows while it is mapped, is
+    // bypassed for the run without leaving the fresh file behind.
+    let blocked_path = temp_dir.join("cache").join("blocked.idx");
+    fs::create_dir_all(blocked_path.join("occupied"))?;
+    let bypassed = HierarchyIndex::load_or_build(&classpath, &blocked_path, 1)?;
+    assert_eq!(bypassed.key(), rebuilt.key());
+    assert_eq!(bypassed.len(), 1);
+    assert!(
+        fs::read_dir(temp_dir.join("cache"))?
+            .map(|entry| Ok(entry?.file_name()))
+            .collect::<TestResult<Vec<_>>>()?
+            .iter()
+            .all(|name| !name.to_string_lossy().ends_with(".tmp"))
+    );
+
+    fs::write(&index_path, b"not an index")?;
+    assert!(matches!(
+        HierarchyIndex::open(&index_path),
+        Err(ArchiveError::InvalidHierarchyIndex(_))
+    ));
+    assert_eq!(
+        HierarchyIndex::load_or_build(&classpath, &index_path, 1)?.len(),
+        1
+    );
+
+    // Directory roots are indexed and keyed by the class files below them.
+    let class_dir = temp_dir.join("classes");
+    for (entry, bytes) in &classes {
+        let path = class_dir.join(entry);
+        fs::create_dir_all(path.parent().expect("class path has a parent"))?;
+        fs::write(path, bytes)?;
+    }
+    let dir_classpath = [class_dir.clone()];
+    let dir_index_path = temp_dir.join("cache").join("dir.idx");
+    let dir_index = HierarchyIndex::load_or_build(&dir_classpath, &dir_index_path, 0)?;
+    assert_eq!(dir_index.len(), classes.len());
+    assert_eq!(dir_index.key(), classpath_key(&dir_classpath)?);
+    assert!(is_subtype(
+        &dir_index,
+        fixture_name,
+        "fixture/hierarchy/Trainable"
+    )?);
+    fs::remove_file(class_dir.join(&classes[0].0))?;
+    let dir_rebuilt = HierarchyIndex::load_or_build(&dir_classpath, &dir_index_path, 1)?;
+    assert_ne!(dir_rebuilt.key(), dir_index.key());
+    assert_eq!(dir_rebuilt.len(), classes.len() - 1);
+    Ok(())
+}
+
+#[test]
+fn streaming_rewrite_matches_in_memory_rewrite() -> TestResult<()> {
+    let temp_dir = fresh_temp_dir("archive-streaming");
+    let jar_path = temp_dir.join("input.jar");
+    let in_memory_path = temp_dir.join("in-memory.jar");
+    let streamed_path = temp_dir.join("streamed.jar");
+    let class_bytes = fixture_bytes("HelloWorld.java", "HelloWorld.class");
+    make_jar(
+        &jar_path,
+        &[
+            ("META-INF/MANIFEST.MF", b"Manifest-Version: 1.0\n"),
+            ("HelloWorld.class", &class_bytes),
+            ("README.txt", b"fixture"),
+        ],
+    )?;
+    let make_transform = || {
+        Pipeline::of(on_methods(
+            |method, _owner| {
+                method.access_flags |= MethodAccessFlags::FINAL;
+                Ok(())
+            },
+            Some(method_named("main")),
+            Some(class_named("HelloWorld")),
+        ))
+    };
+
+    let mut jar = JarFile::open(&jar_path)?;
+    jar.rewrite(
+        Some(&in_memory_path),
+        Some(&mut make_transform()),
+        RewriteOptions::default(),
+    )?;
+    let destination = rewrite_streaming(
+        &jar_path,
+        &streamed_path,
+        Some(&mut make_transform()),
+        RewriteOptions::default(),
+    )?;
+    assert_eq!(destination, streamed_path);
+
+    let in_memory = JarFile::open(&in_memory_path)?;
+    let streamed = JarFile::open(&streamed_path)?;
+    assert_eq!(
+        streamed
+            .entries
+            .iter()
+            .map(|entry| (entry.filename.as_str(), entry.bytes.as_slice()))
+            .collect::<Vec<_>>(),
+        in_memory
+            .entries
+            .iter()
+            .map(|entry| (entry.filename.as_str(), entry.bytes.as_slice()))
+            .collect::<Vec<_>>()
+    );
+    let streamed_class = streamed
+        .entries
+        .iter()
+        .find(|entry| entry.filename == "HelloWorld.class")
+        .expect("streamed class should exist");
+    assert!(method_flags(&streamed_class.bytes, "main").contains(MethodAccessFlags::FINAL));
+    Ok(())
+}
+
+#[test]
+fn archive_reader_lists_entries_without_reading_bytes() -> TestResult<()> {
+    let temp_dir = fresh_temp_dir("archive-reader");
+    let jar_path = temp_dir.join("input.jar");
+    let class_bytes = fixture_bytes("HelloWorld.java", "HelloWorld.class");
+    make_jar(
+        &jar_path,
+        &[
+            ("HelloWorld.class", &class_bytes),
+            ("README.txt", b"fixture"),
+        ],
+    )?;
+
+    let mut reader = ArchiveReader::open(&jar_path)?;
+    assert_eq!(reader.len(), 2);
+    let entries = reader.entries()?;
+    assert_eq!(
+        entries
+            .iter()
+            .map(|entry| entry.filename.as_str())
+            .collect::<Vec<_>>(),
+        vec!["HelloWorld.class", "README.txt"]
+    );
+    assert!(entries.iter().all(|entry| entry.bytes.is_empty()));
+    assert_eq!(entries[1].original_index(), Some(1));
+    assert_eq!(reader.read_bytes(1)?, b"fixture");
+    assert_eq!(reader.read_bytes(0)?, class_bytes);
+    Ok(())
+}
+
+#[test]
+fn archive_reader_finds_entries_by_identity_after_the_file_changes() -> TestResult<()> {
+    let temp_dir = fresh_temp_dir("archive-reader-identity");
+    let jar_path = temp_dir.join("input.jar");
+    make_jar(
+        &jar_path,
+        &[
+            ("first.txt", b"first"),
+            ("second.txt", b"second"),
+            ("third.txt", b"third"),
+        ],
+    )?;
+    let identities = ArchiveReader::open(&jar_path)?.identities()?;
+    assert_eq!(identities[1].name, "second.txt");
+    assert_eq!(identities[1].size, 6);
+
+    make_jar(
+        &jar_path,
+        &[("second.txt", b"second"), ("third.txt", b"THIRD")],
+    )?;
+    let mut reader = ArchiveReader::open(&jar_path)?;
+    assert_eq!(reader.find_entry(1, &identities[1])?, Some(0));
+    assert_eq!(reader.read_bytes(0)?, b"second");
+    assert_eq!(reader.find_entry(2, &identities[2])?, None);
+    assert_eq!(reader.find_entry(0, &identities[0])?, None);
+    Ok(())
+}
+
+#[test]
+fn mapped_archive_borrows_stored_entries() -> TestResult<()> {
+    let temp_dir = fresh_temp_dir("archive-mapped");
+    let jar_path = temp_dir.join("input.jar");
+    let class_bytes = fixture_bytes("HelloWorld.java", "HelloWorld.class");
+    {
+        let mut writer = ZipWriter::new(File::create(&jar_path)?);
+        writer.add_directory("pkg/", SimpleFileOptions::default())?;
+        writer.start_file(
+            "pkg/HelloWorld.class",
+            SimpleFileOptions::default().compression_method(CompressionMethod::Stored),
+        )?;
+        writer.write_all(&class_bytes)?;
+        writer.start_file("README.txt", SimpleFileOptions::default())?;
+        writer.write_all(b"fixture")?;
+        writer.finish()?;
+    }
+
+    let archive = MappedArchive::open(&jar_path)?;
+    let entries = archive.entries();
+    assert_eq!(entries.len(), 3);
+    assert!(entries[1].is_class());
+    assert!(entries[1].is_stored());
+    assert!(!entries[2].is_stored());
+    let class = archive.entry_bytes(1)?;
+    assert!(matches!(class, Cow::Borrowed(_)));
+    assert_eq!(class.as_ref(), class_bytes.as_slice());
+    assert_eq!(parse_class(&class)?.magic, MAGIC);
+    assert_eq!(archive.entry_bytes(2)?.as_ref(), b"fixture");
+    assert!(archive.entry_bytes(0)?.is_empty());
+
+    assert_eq!(entries[1].crc32, crc32fast::hash(&class_bytes));
+    archive.verify_entry(1)?;
+    archive.verify_entry(2)?;
+
+    let inventory = inventory_jar(&archive)?;
+    assert_eq!(inventory.class_entries.len(), 1);
+    assert!(matches!(inventory.class_entries[0].bytes, Cow::Borrowed(_)));
+    assert_eq!(
+        inventory.class_entries[0].bytes.as_ref(),
+        class_bytes.as_slice()
+    );
+    assert_eq!(inventory.resource_entries[0].byte_len, 7);
+    assert_eq!(inventory.total_bytes, class_bytes.len() + 7);
+    Ok(())
+}
+
+#[test]
+fn mapped_archive_verifies_stored_entries_only_on_request() -> TestResult<()> {
+    let temp_dir = fresh_temp_dir("archive-mapped-crc");
+    let jar_path = temp_dir.join("input.jar");
+    {
+        let mut writer = ZipWriter::new(File::create(&jar_path)?);
+        writer.start_file(
+            "README.txt",
+            SimpleFileOptions::default().compression_method(CompressionMethod::Stored),
+        )?;
+        writer.write_all(b"fixture")?;
+        writer.finish()?;
+    }
+    let mut bytes = fs::read(&jar_path)?;
+    let data = bytes
+        .windows(7)
+        .position(|window| window == b"fixture")
+        .expect("stored data should be in the archive");
+    bytes[data] = b'F';
+    fs::write(&jar_path, bytes)?;
+
+    let archive = MappedArchive::open(&jar_path)?;
+    assert_eq!(archive.entry_bytes(0)?.as_ref(), b"Fixture");
+    let error = archive
+        .verify_entry(0)
+        .expect_err("corrupt entry should fail");
+    assert!(error.to_string().contains("CRC-32 mismatch"));
+    Ok(())
+}
+
 #[test]
 fn rewrite_can_add_and_remove_entries() -> TestResult<()> {
     let temp_dir = fresh_temp_dir("archive-add-remove");
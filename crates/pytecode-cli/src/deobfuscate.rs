@@ -1,5 +1,5 @@
 use crate::{CliResult, relative_to_repo};
-use pytecode_archive::{JarFile, RewriteOptions};
+use pytecode_archive::{JarFile, MappedArchive, RewriteOptions};
 use pytecode_engine::model::{
     ClassModel, CodeItem, DebugInfoPolicy, FrameComputationMode, Label, LdcValue,
 };
@@ -112,16 +112,16 @@ impl ClassRewriteStats {
 }
 
 pub fn analyze_deobfuscation(jar: &Path) -> CliResult<DeobfuscationAnalysisReport> {
-    let jar_file = JarFile::open(jar)?;
+    let archive = MappedArchive::open(jar)?;
     let mut class_metrics = Vec::new();
 
-    for entry in jar_file
-        .entries
-        .iter()
-        .filter(|entry| !entry.metadata.is_dir && entry.filename.ends_with(".class"))
-    {
-        let model = ClassModel::from_bytes(&entry.bytes)?;
-        class_metrics.push(class_metrics_from_model(&model, entry.bytes.len()));
+    for (index, entry) in archive.entries().iter().enumerate() {
+        if !entry.is_class() {
+            continue;
+        }
+        let bytes = archive.entry_bytes(index)?;
+        let model = ClassModel::from_bytes(&bytes)?;
+        class_metrics.push(class_metrics_from_model(&model, bytes.len()));
     }
 
     let mut package_stats = HashMap::<String, (usize, usize)>::new();
@@ -252,6 +252,7 @@ pub fn rewrite_deobfuscation(jar: &Path, output: &Path) -> CliResult<Deobfuscati
             frame_mode: FrameComputationMode::Recompute,
             resolver: None,
             debug_info: DebugInfoPolicy::Preserve,
+            workers: 1,
         },
     )?;
 
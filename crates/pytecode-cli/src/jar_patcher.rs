@@ -13,7 +13,7 @@ use pytecode_engine::transform::{
     ClassMatcher, FieldMatcher, Matcher, MethodMatcher, Pipeline, all_of, class_access,
     class_access_any, class_name_matches, class_named, extends, field_access, field_access_any,
     field_descriptor, field_name_matches, field_named, implements, method_access,
-    method_access_any, method_descriptor, method_name_matches, method_named, not_,
+    method_access_any, method_descriptor, method_name_matches, method_named, not_, tracked,
 };
 use regex::Regex;
 use serde::{Deserialize, Serialize};
@@ -467,6 +467,7 @@ pub fn patch_jar(jar: &Path, output: &Path, rules_path: &Path) -> CliResult<JarP
             frame_mode: plan.options.frame_mode.into(),
             resolver: None,
             debug_info: plan.options.debug_info.into(),
+            workers: 1,
         },
     )?;
     let rules = stats_handles
@@ -527,9 +528,9 @@ fn build_pipeline(plan: &PatchPlan) -> CliResult<PipelineBuild> {
                 let matcher = build_class_matcher(matcher)?;
                 let action = action.clone();
                 let stats_ref = Arc::clone(&stats);
-                pipeline = pipeline.then(move |model: &mut ClassModel| {
+                pipeline = pipeline.then(tracked(move |model: &mut ClassModel| {
                     if !matcher.matches(model) {
-                        return Ok(());
+                        return Ok(false);
                     }
                     let changed = apply_class_action(model, &action);
                     let mut stats = stats_ref
@@ -541,8 +542,8 @@ fn build_pipeline(plan: &PatchPlan) -> CliResult<PipelineBuild> {
                         stats.changed_classes += 1;
                         stats.changed_targets += 1;
                     }
-                    Ok(())
-                });
+                    Ok(changed)
+                }));
                 kinds.push("class".to_owned());
             }
             PatchRule::Field {
@@ -555,14 +556,14 @@ fn build_pipeline(plan: &PatchPlan) -> CliResult<PipelineBuild> {
                 let field_matcher = build_field_matcher(matcher)?;
                 let action = action.clone();
                 let stats_ref = Arc::clone(&stats);
-                pipeline = pipeline.then(move |model: &mut ClassModel| {
+                pipeline = pipeline.then(tracked(move |model: &mut ClassModel| {
                     if !owner_matcher.matches(model) {
-                        return Ok(());
+                        return Ok(false);
                     }
                     let (matched_targets, changed_targets) =
                         apply_field_action(model, &field_matcher, &action);
                     if matched_targets == 0 {
-                        return Ok(());
+                        return Ok(false);
                     }
                     let mut stats = stats_ref
                         .lock()
@@ -573,8 +574,8 @@ fn build_pipeline(plan: &PatchPlan) -> CliResult<PipelineBuild> {
                         stats.changed_classes += 1;
                         stats.changed_targets += changed_targets;
                     }
-                    Ok(())
-                });
+                    Ok(changed_targets > 0)
+                }));
                 kinds.push("field".to_owned());
             }
             PatchRule::Method {
@@ -595,9 +596,9 @@ fn build_pipeline(plan: &PatchPlan) -> CliResult<PipelineBuild> {
                     .flatten()
                     .collect::<Vec<_>>();
                 let stats_ref = Arc::clone(&stats);
-                pipeline = pipeline.then(move |model: &mut ClassModel| {
+                pipeline = pipeline.then(tracked(move |model: &mut ClassModel| {
                     if !owner_matcher.matches(model) {
-                        return Ok(());
+                        return Ok(false);
                     }
                     let (matched_targets, changed_targets) = apply_method_actions(
                         model,
@@ -606,7 +607,7 @@ fn build_pipeline(plan: &PatchPlan) -> CliResult<PipelineBuild> {
                         &code_actions,
                     );
                     if matched_targets == 0 {
-                        return Ok(());
+                        return Ok(false);
                     }
                     let mut stats = stats_ref
                         .lock()
@@ -617,8 +618,8 @@ fn build_pipeline(plan: &PatchPlan) -> CliResult<PipelineBuild> {
                         stats.changed_classes += 1;
                         stats.changed_targets += changed_targets;
                     }
-                    Ok(())
-                });
+                    Ok(changed_targets > 0)
+                }));
                 kinds.push("method".to_owned());
             }
         }
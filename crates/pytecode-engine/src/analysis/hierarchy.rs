@@ -4,8 +4,14 @@ use crate::indexes::{ClassIndex, Utf8Index};
 use crate::model::{ClassModel, MethodModel};
 use crate::raw::ClassFile;
 use crate::raw::ConstantPoolEntry;
+use crate::reader::{ReadLevel, parse_class_at};
 use crate::{Result as EngineResult, modified_utf8::decode_modified_utf8};
+use rustc_hash::{FxBuildHasher, FxHashMap};
+use std::borrow::Cow;
 use std::collections::{HashMap, HashSet, VecDeque};
+use std::hash::BuildHasher;
+use std::ops::Deref;
+use std::sync::{Arc, OnceLock, RwLock};
 
 pub const JAVA_LANG_OBJECT: &str = "java/lang/Object";
 
@@ -50,6 +56,25 @@ impl ResolvedClass {
         }
     }
 
+    /// The implicit `java/lang/Object` assumed when no definition is supplied.
+    pub fn java_lang_object() -> &'static Self {
+        static OBJECT: OnceLock<ResolvedClass> = OnceLock::new();
+        OBJECT.get_or_init(|| ResolvedClass {
+            name: JAVA_LANG_OBJECT.to_owned(),
+            super_name: None,
+            interfaces: Vec::new(),
+            access_flags: ClassAccessFlags::PUBLIC | ClassAccessFlags::SUPER,
+            methods: Vec::new(),
+        })
+    }
+
+    /// Resolve a class straight from its bytes, read at [`ReadLevel::Members`].
+    ///
+    /// Attribute payloads (including `Code`) are skipped rather than decoded.
+    pub fn from_bytes(bytes: &[u8]) -> EngineResult<Self> {
+        Self::from_classfile(&parse_class_at(bytes, ReadLevel::Members)?)
+    }
+
     pub fn from_classfile(classfile: &ClassFile) -> EngineResult<Self> {
         let name = cp_class_name(classfile, classfile.this_class)?;
         let super_name = if classfile.super_class.value() == 0 {
@@ -108,24 +133,193 @@ pub struct InheritedMethod {
 
 pub trait ClassResolver {
     fn resolve_class(&self, class_name: &str) -> Option<ResolvedClass>;
+
+    /// Names of the superclasses of `class_name`, nearest first.
+    ///
+    /// Same order as [`iter_superclasses`]. Resolvers that can memoize
+    /// hierarchy queries override this; [`common_superclass`] only needs names.
+    fn superclass_names(&self, class_name: &str) -> Result<Arc<[String]>, AnalysisError> {
+        collect_superclass_names(class_name, |name| self.resolve_class(name).map(Cow::Owned))
+    }
+
+    /// Names of every proper supertype of `class_name`, as visited by [`iter_supertypes`].
+    fn supertype_names(&self, class_name: &str) -> Result<Arc<HashSet<String>>, AnalysisError> {
+        collect_supertype_names(class_name, |name| self.resolve_class(name).map(Cow::Owned))
+    }
+
+    /// The nearest superclass shared by two classes; see [`common_superclass`].
+    fn common_superclass(
+        &self,
+        left_name: &str,
+        right_name: &str,
+    ) -> Result<String, AnalysisError> {
+        nearest_common_superclass(left_name, right_name, |name| self.superclass_names(name))
+    }
+}
+
+/// Number of independently locked shards in the common-superclass memo.
+const MEMO_SHARDS: usize = 16;
+
+/// Memoized hierarchy queries for a resolver that numbers its classes.
+///
+/// Resolvers assign each class they define a dense id below the `len` given
+/// to [`HierarchyMemo::new`] and pass it with every query; names without an id
+/// are answered but not cached. Only successful lookups are cached, so
+/// unresolved classes and cycles are reported again on every query.
+#[derive(Debug)]
+pub struct HierarchyMemo {
+    superclasses: Vec<OnceLock<Arc<[String]>>>,
+    supertypes: Vec<OnceLock<Arc<HashSet<String>>>>,
+    common_superclasses: [RwLock<FxHashMap<(usize, usize), String>>; MEMO_SHARDS],
+}
+
+impl HierarchyMemo {
+    pub fn new(len: usize) -> Self {
+        Self {
+            superclasses: (0..len).map(|_| OnceLock::new()).collect(),
+            supertypes: (0..len).map(|_| OnceLock::new()).collect(),
+            common_superclasses: Default::default(),
+        }
+    }
+
+    /// [`ClassResolver::superclass_names`] for the class with `id`, resolving through `lookup`.
+    pub fn superclass_names<D: Deref<Target = ResolvedClass>>(
+        &self,
+        id: Option<usize>,
+        class_name: &str,
+        lookup: impl Fn(&str) -> Option<D>,
+    ) -> Result<Arc<[String]>, AnalysisError> {
+        match id {
+            Some(id) => memoized(&self.superclasses[id], || {
+                collect_superclass_names(class_name, lookup)
+            }),
+            None => collect_superclass_names(class_name, lookup),
+        }
+    }
+
+    /// [`ClassResolver::supertype_names`] for the class with `id`, resolving through `lookup`.
+    pub fn supertype_names<D: Deref<Target = ResolvedClass>>(
+        &self,
+        id: Option<usize>,
+        class_name: &str,
+        lookup: impl Fn(&str) -> Option<D>,
+    ) -> Result<Arc<HashSet<String>>, AnalysisError> {
+        match id {
+            Some(id) => memoized(&self.supertypes[id], || {
+                collect_supertype_names(class_name, lookup)
+            }),
+            None => collect_supertype_names(class_name, lookup),
+        }
+    }
+
+    /// [`ClassResolver::common_superclass`] for classes with ids `ids`.
+    pub fn common_superclass(
+        &self,
+        ids: (Option<usize>, Option<usize>),
+        left_name: &str,
+        right_name: &str,
+        superclass_names: impl Fn(&str) -> Result<Arc<[String]>, AnalysisError>,
+    ) -> Result<String, AnalysisError> {
+        let (Some(left), Some(right)) = ids else {
+            return nearest_common_superclass(left_name, right_name, superclass_names);
+        };
+        // The superclass graph is a tree, so the result does not depend on argument order.
+        let key = (left.min(right), left.max(right));
+        let shard = &self.common_superclasses[FxBuildHasher.hash_one(key) as usize % MEMO_SHARDS];
+        if let Some(merged) = shard
+            .read()
+            .expect("common superclass memo lock poisoned")
+            .get(&key)
+        {
+            return Ok(merged.clone());
+        }
+        let merged = nearest_common_superclass(left_name, right_name, superclass_names)?;
+        shard
+            .write()
+            .expect("common superclass memo lock poisoned")
+            .insert(key, merged.clone());
+        Ok(merged)
+    }
+}
+
+/// Immutable class table plus memoized hierarchy queries.
+///
+/// Class ids index `classes`; `java/lang/Object` always gets id
+/// `classes.len()`.
+#[derive(Debug)]
+struct ResolverState {
+    classes: Vec<ResolvedClass>,
+    index: HashMap<String, usize>,
+    memo: HierarchyMemo,
+}
+
+impl ResolverState {
+    fn new(classes: Vec<ResolvedClass>, index: HashMap<String, usize>) -> Self {
+        let memo = HierarchyMemo::new(classes.len() + 1);
+        Self {
+            classes,
+            index,
+            memo,
+        }
+    }
+
+    fn id(&self, class_name: &str) -> Option<usize> {
+        if class_name == JAVA_LANG_OBJECT {
+            return Some(self.classes.len());
+        }
+        self.index.get(class_name).copied()
+    }
+}
+
+fn memoized<T: ?Sized>(
+    cell: &OnceLock<Arc<T>>,
+    compute: impl FnOnce() -> Result<Arc<T>, AnalysisError>,
+) -> Result<Arc<T>, AnalysisError> {
+    if let Some(cached) = cell.get() {
+        return Ok(cached.clone());
+    }
+    let computed = compute()?;
+    Ok(cell.get_or_init(|| computed).clone())
 }
 
-#[derive(Debug, Clone, Default)]
+/// A [`ClassResolver`] over an in-memory set of classes.
+///
+/// The class table is immutable and shared behind an [`Arc`], so clones are
+/// cheap and a single resolver can be used by reference from many worker
+/// threads. Superclass chains, supertype sets and common-superclass results
+/// are memoized on first use and shared by every clone, so one resolver
+/// reused across a whole JAR rewrite walks each class's hierarchy once.
+#[derive(Debug, Clone)]
 pub struct MappingClassResolver {
-    classes: HashMap<String, ResolvedClass>,
+    state: Arc<ResolverState>,
+}
+
+impl Default for MappingClassResolver {
+    fn default() -> Self {
+        Self {
+            state: Arc::new(ResolverState::new(Vec::new(), HashMap::new())),
+        }
+    }
 }
 
 impl MappingClassResolver {
     pub fn new(classes: impl IntoIterator<Item = ResolvedClass>) -> Result<Self, AnalysisError> {
-        let mut mapping = HashMap::new();
+        let mut resolved_classes = Vec::new();
+        let mut index = HashMap::new();
         for resolved in classes {
-            if mapping.insert(resolved.name.clone(), resolved).is_some() {
+            if index
+                .insert(resolved.name.clone(), resolved_classes.len())
+                .is_some()
+            {
                 return Err(AnalysisError::InvalidControlFlow {
                     reason: "duplicate resolved class name".to_owned(),
                 });
             }
+            resolved_classes.push(resolved);
         }
-        Ok(Self { classes: mapping })
+        Ok(Self {
+            state: Arc::new(ResolverState::new(resolved_classes, index)),
+        })
     }
 
     pub fn from_models(
@@ -171,20 +365,86 @@ impl MappingClassResolver {
         }
         Self::new(classes)
     }
+
+    /// Build a resolver straight from classfile bytes.
+    ///
+    /// Each class is read at [`ReadLevel::Members`], so attribute payloads
+    /// (including `Code`) are skipped rather than decoded.
+    pub fn from_bytes<B: AsRef<[u8]>>(
+        class_bytes: impl IntoIterator<Item = B>,
+    ) -> Result<Self, AnalysisError> {
+        let mut classes = Vec::new();
+        for bytes in class_bytes {
+            let resolved = ResolvedClass::from_bytes(bytes.as_ref()).map_err(|error| {
+                AnalysisError::InvalidControlFlow {
+                    reason: error.to_string(),
+                }
+            })?;
+            classes.push(resolved);
+        }
+        Self::new(classes)
+    }
+
+    /// Build a resolver from classes in classpath order.
+    ///
+    /// Unlike [`Self::new`], duplicate names are not an error: the first
+    /// definition wins and later ones are shadowed, as on a JVM classpath.
+    pub fn from_classpath(classes: impl IntoIterator<Item = ResolvedClass>) -> Self {
+        let mut resolved_classes = Vec::new();
+        let mut index = HashMap::new();
+        for resolved in classes {
+            if !index.contains_key(&resolved.name) {
+                index.insert(resolved.name.clone(), resolved_classes.len());
+                resolved_classes.push(resolved);
+            }
+        }
+        Self {
+            state: Arc::new(ResolverState::new(resolved_classes, index)),
+        }
+    }
+
+    /// Borrow a class without cloning it, as [`ClassResolver::resolve_class`] would return.
+    pub fn get(&self, class_name: &str) -> Option<&ResolvedClass> {
+        if class_name == JAVA_LANG_OBJECT {
+            return Some(ResolvedClass::java_lang_object());
+        }
+        self.state
+            .index
+            .get(class_name)
+            .map(|&id| &self.state.classes[id])
+    }
 }
 
 impl ClassResolver for MappingClassResolver {
     fn resolve_class(&self, class_name: &str) -> Option<ResolvedClass> {
-        if class_name == JAVA_LANG_OBJECT {
-            return Some(ResolvedClass {
-                name: JAVA_LANG_OBJECT.to_owned(),
-                super_name: None,
-                interfaces: Vec::new(),
-                access_flags: ClassAccessFlags::PUBLIC | ClassAccessFlags::SUPER,
-                methods: Vec::new(),
-            });
-        }
-        self.classes.get(class_name).cloned()
+        self.get(class_name).cloned()
+    }
+
+    fn superclass_names(&self, class_name: &str) -> Result<Arc<[String]>, AnalysisError> {
+        let id = self.state.id(class_name);
+        self.state
+            .memo
+            .superclass_names(id, class_name, |name| self.get(name))
+    }
+
+    fn supertype_names(&self, class_name: &str) -> Result<Arc<HashSet<String>>, AnalysisError> {
+        let id = self.state.id(class_name);
+        self.state
+            .memo
+            .supertype_names(id, class_name, |name| self.get(name))
+    }
+
+    fn common_superclass(
+        &self,
+        left_name: &str,
+        right_name: &str,
+    ) -> Result<String, AnalysisError> {
+        let ids = (self.state.id(left_name), self.state.id(right_name));
+        self.state
+            .memo
+            .common_superclass(ids, left_name, right_name, |name| {
+                self.superclass_names(name)
+            })
     }
 }
 
@@ -193,52 +453,95 @@ pub fn iter_superclasses(
     class_name: &str,
 ) -> Result<Vec<ResolvedClass>, AnalysisError> {
     let mut out = Vec::new();
+    walk_superclasses(
+        class_name,
+        |name| resolver.resolve_class(name).map(Cow::Owned),
+        |resolved| out.push(resolved.clone()),
+    )?;
+    Ok(out)
+}
+
+pub fn iter_supertypes(
+    resolver: &dyn ClassResolver,
+    class_name: &str,
+) -> Result<Vec<ResolvedClass>, AnalysisError> {
+    let mut out = Vec::new();
+    walk_supertypes(
+        class_name,
+        |name| resolver.resolve_class(name).map(Cow::Owned),
+        |resolved| out.push(resolved.into_owned()),
+    )?;
+    Ok(out)
+}
+
+fn collect_superclass_names<D: Deref<Target = ResolvedClass>>(
+    class_name: &str,
+    lookup: impl Fn(&str) -> Option<D>,
+) -> Result<Arc<[String]>, AnalysisError> {
+    let mut names = Vec::new();
+    walk_superclasses(class_name, lookup, |resolved| {
+        names.push(resolved.name.clone())
+    })?;
+    Ok(names.into())
+}
+
+fn collect_supertype_names<D: Deref<Target = ResolvedClass>>(
+    class_name: &str,
+    lookup: impl Fn(&str) -> Option<D>,
+) -> Result<Arc<HashSet<String>>, AnalysisError> {
+    let mut names = HashSet::new();
+    walk_supertypes(class_name, lookup, |resolved| {
+        names.insert(resolved.name.clone());
+    })?;
+    Ok(Arc::new(names))
+}
+
+fn walk_superclasses<D: Deref<Target = ResolvedClass>>(
+    class_name: &str,
+    lookup: impl Fn(&str) -> Option<D>,
+    mut visit: impl FnMut(&ResolvedClass),
+) -> Result<(), AnalysisError> {
     let mut seen = HashSet::new();
-    let mut current = resolve_class(resolver, class_name)?;
+    let mut current = require_class(&lookup, class_name)?;
     while let Some(super_name) = current.super_name.clone() {
         if !seen.insert(super_name.clone()) {
             return Err(AnalysisError::HierarchyCycle {
                 cycle: seen.into_iter().collect(),
             });
         }
-        let resolved = resolve_class(resolver, &super_name)?;
-        out.push(resolved.clone());
-        current = resolved;
+        current = require_class(&lookup, &super_name)?;
+        visit(&current);
     }
     if current.name != JAVA_LANG_OBJECT && seen.insert(JAVA_LANG_OBJECT.to_owned()) {
-        out.push(resolve_class(resolver, JAVA_LANG_OBJECT)?);
+        visit(&*require_class(&lookup, JAVA_LANG_OBJECT)?);
     }
-    Ok(out)
+    Ok(())
 }
 
-pub fn iter_supertypes(
-    resolver: &dyn ClassResolver,
+fn walk_supertypes<D: Deref<Target = ResolvedClass>>(
     class_name: &str,
-) -> Result<Vec<ResolvedClass>, AnalysisError> {
-    let mut out = Vec::new();
+    lookup: impl Fn(&str) -> Option<D>,
+    mut visit: impl FnMut(D),
+) -> Result<(), AnalysisError> {
     let mut seen = HashSet::new();
     let mut queue = VecDeque::new();
-    let resolved = resolve_class(resolver, class_name)?;
-    if let Some(super_name) = resolved.super_name {
-        queue.push_back(super_name);
-    }
-    for interface in resolved.interfaces {
-        queue.push_back(interface);
+    let resolved = require_class(&lookup, class_name)?;
+    if let Some(super_name) = &resolved.super_name {
+        queue.push_back(super_name.clone());
     }
+    queue.extend(resolved.interfaces.iter().cloned());
     while let Some(name) = queue.pop_front() {
         if !seen.insert(name.clone()) {
             continue;
         }
-        let resolved = resolve_class(resolver, &name)?;
-        if let Some(super_name) = resolved.super_name.clone() {
-            queue.push_back(super_name);
+        let resolved = require_class(&lookup, &name)?;
+        if let Some(super_name) = &resolved.super_name {
+            queue.push_back(super_name.clone());
         }
-        for interface in &resolved.interfaces {
-            queue.push_back(interface.clone());
-        }
-        out.push(resolved);
+        queue.extend(resolved.interfaces.iter().cloned());
+        visit(resolved);
     }
-    Ok(out)
+    Ok(())
 }
 
 pub fn is_subtype(
@@ -249,15 +552,25 @@ pub fn is_subtype(
     if child_name == target_name {
         return Ok(true);
     }
-    Ok(iter_supertypes(resolver, child_name)?
-        .into_iter()
-        .any(|resolved| resolved.name == target_name))
+    Ok(resolver.supertype_names(child_name)?.contains(target_name))
 }
 
+/// The nearest superclass shared by two classes.
+///
+/// Arrays merge to `java/lang/Object`. Only superclass chains are compared,
+/// so two classes that share an interface still merge to their common class.
 pub fn common_superclass(
     resolver: &dyn ClassResolver,
     left_name: &str,
     right_name: &str,
+) -> Result<String, AnalysisError> {
+    resolver.common_superclass(left_name, right_name)
+}
+
+fn nearest_common_superclass(
+    left_name: &str,
+    right_name: &str,
+    superclass_names: impl Fn(&str) -> Result<Arc<[String]>, AnalysisError>,
 ) -> Result<String, AnalysisError> {
     if left_name == right_name {
         return Ok(left_name.to_owned());
@@ -265,27 +578,16 @@ pub fn common_superclass(
     if left_name.starts_with('[') || right_name.starts_with('[') {
         return Ok(JAVA_LANG_OBJECT.to_owned());
     }
-    let mut left_ancestors = vec![left_name.to_owned()];
-    left_ancestors.extend(
-        iter_superclasses(resolver, left_name)?
-            .into_iter()
-            .map(|resolved| resolved.name),
-    );
-    let right_ancestors = {
-        let mut names = vec![right_name.to_owned()];
-        names.extend(
-            iter_superclasses(resolver, right_name)?
-                .into_iter()
-                .map(|resolved| resolved.name),
-        );
-        names
+    let left_ancestors = superclass_names(left_name)?;
+    let right_ancestors = superclass_names(right_name)?;
+    let is_right_ancestor = |name: &str| {
+        name == right_name || right_ancestors.iter().any(|candidate| candidate == name)
     };
-    for name in left_ancestors {
-        if right_ancestors.iter().any(|candidate| candidate == &name) {
-            return Ok(name);
-        }
-    }
-    Ok(JAVA_LANG_OBJECT.to_owned())
+    Ok(std::iter::once(left_name)
+        .chain(left_ancestors.iter().map(String::as_str))
+        .find(|name| is_right_ancestor(name))
+        .unwrap_or(JAVA_LANG_OBJECT)
+        .to_owned())
 }
 
 pub fn find_overridden_methods(
@@ -347,15 +649,13 @@ fn package_name(class_name: &str) -> &str {
         .map_or("", |(package, _)| package)
 }
 
-fn resolve_class(
-    resolver: &dyn ClassResolver,
+fn require_class<D>(
+    lookup: impl Fn(&str) -> Option<D>,
     class_name: &str,
-) -> Result<ResolvedClass, AnalysisError> {
-    resolver
-        .resolve_class(class_name)
-        .ok_or_else(|| AnalysisError::UnresolvedClass {
-            class_name: class_name.to_owned(),
-        })
+) -> Result<D, AnalysisError> {
+    lookup(class_name).ok_or_else(|| AnalysisError::UnresolvedClass {
+        class_name: class_name.to_owned(),
+    })
 }
 
 fn cp_utf8(classfile: &ClassFile, index: Utf8Index) -> EngineResult<String> {
@@ -0,0 +1,381 @@
+//! Frame recomputation seeded from a method's original `StackMapTable`.
+//!
+//! The instructions are cut into segments at every label the original frames
+//! were declared at. A segment is clean when its items, the declared label
+//! that follows it and the exception handlers active at its start all match
+//! the baseline; blocks made only of clean segments start from their declared
+//! frames and are never simulated. Blocks touched by an edit are simulated as
+//! in [`super::simulate`], and a declared frame that an edited predecessor
+//! widens is re-simulated in turn until the frames reconverge.
+
+use super::interpreter::{self, SimFrame, TypeTable};
+use super::{
+    AnalysisError, BlockWorklist, ClassResolver, FrameComputationResult, FrameState,
+    StackMapFrameState, build_cfg, initial_frame, recompute_frames,
+};
+use crate::constants::MethodAccessFlags;
+use crate::model::{CodeItem, CodeModel, ExceptionHandler, Label, VarInsn};
+use std::collections::HashMap;
+use std::ops::Range;
+
+/// The code a method's original frames were computed for.
+#[derive(Debug, Clone, Copy)]
+pub struct FrameBaseline<'a> {
+    pub instructions: &'a [CodeItem],
+    pub exception_handlers: &'a [ExceptionHandler],
+    /// The frame declared at each labelled stack-map offset, with category-2
+    /// values followed by `Top` as in [`FrameState`].
+    pub frames: &'a [(Label, FrameState)],
+    pub max_stack: u16,
+    pub max_locals: u16,
+}
+
+/// Recompute frames, re-simulating only the blocks an edit can affect.
+///
+/// Falls back to [`recompute_frames`] when the baseline cannot be trusted for
+/// `code`: the exception handlers changed, the method uses `jsr`/`ret`, or
+/// the declared frames disagree with the edited code.
+pub fn recompute_frames_incremental(
+    code: &CodeModel,
+    class_name: &str,
+    method_name: &str,
+    descriptor: &str,
+    access_flags: MethodAccessFlags,
+    baseline: &FrameBaseline<'_>,
+    resolver: Option<&dyn ClassResolver>,
+) -> Result<FrameComputationResult, AnalysisError> {
+    let initial = initial_frame(class_name, method_name, descriptor, access_flags)?;
+    match simulate_incremental(code, &initial, baseline, resolver) {
+        Ok(Some(result)) => Ok(result),
+        Ok(None) | Err(_) => recompute_frames(
+            code,
+            class_name,
+            method_name,
+            descriptor,
+            access_flags,
+            resolver,
+        ),
+    }
+}
+
+/// A run of items between two declared labels.
+#[derive(Debug)]
+struct Segment {
+    /// The declared label it starts at, or `None` at the start of the method.
+    start: Option<Label>,
+    items: Range<usize>,
+    next: Option<Label>,
+    /// Indices of the exception handlers covering its first item.
+    handlers: Vec<usize>,
+}
+
+fn segments(
+    instructions: &[CodeItem],
+    declared: &HashMap<&Label, usize>,
+    handler_edges: &HashMap<&Label, Vec<(usize, bool)>>,
+    handler_count: usize,
+) -> Vec<Segment> {
+    let mut active = vec![false; handler_count];
+    let mut segments = Vec::new();
+    let mut current = Segment {
+        start: None,
+        items: 0..0,
+        next: None,
+        handlers: Vec::new(),
+    };
+    for (index, item) in instructions.iter().enumerate() {
+        let CodeItem::Label(label) = item else {
+            continue;
+        };
+        for &(handler, opens) in handler_edges.get(label).into_iter().flatten() {
+            active[handler] = opens;
+        }
+        if declared.contains_key(label) {
+            current.items.end = index;
+            current.next = Some(label.clone());
+            segments.push(current);
+            current = Segment {
+                start: Some(label.clone()),
+                items: index + 1..index + 1,
+                next: None,
+                handlers: (0..handler_count).filter(|&h| active[h]).collect(),
+            };
+        }
+    }
+    current.items.end = instructions.len();
+    segments.push(current);
+    segments
+}
+
+fn uses_subroutines(code: &CodeModel) -> bool {
+    code.instructions.iter().any(|item| {
+        matches!(
+            item,
+            CodeItem::Var(VarInsn { opcode: 0xA9, .. })
+                | CodeItem::Branch(crate::model::BranchInsn {
+                    opcode: 0xA8 | 0xC9,
+                    ..
+                })
+        )
+    })
+}
+
+/// Block-level worklist over the blocks an edit may affect.
+struct Worklist {
+    anchored: Vec<bool>,
+    dirty: Vec<bool>,
+    predecessors: Vec<Vec<usize>>,
+    successors: Vec<Vec<usize>>,
+    pending: BlockWorklist,
+}
+
+impl Worklist {
+    /// Mark `block` for simulation, together with every block it needs.
+    ///
+    /// A block without a declared frame takes its entry frame from all of its
+    /// predecessors, so they are marked too; blocks without declared frames
+    /// that `block` flows into are marked so none of their inputs is skipped.
+    fn mark_dirty(&mut self, block: usize) {
+        let mut pending = vec![block];
+        while let Some(block) = pending.pop() {
+            if self.dirty[block] {
+                continue;
+            }
+            self.dirty[block] = true;
+            if self.anchored[block] {
+                self.pending.push(block);
+            } else {
+                pending.extend_from_slice(&self.predecessors[block]);
+            }
+            pending.extend(
+                self.successors[block]
+                    .iter()
+                    .copied()
+                    .filter(|&successor| !self.anchored[successor]),
+            );
+        }
+    }
+}
+
+/// The incremental fixpoint, or `None` when the baseline does not apply.
+fn simulate_incremental(
+    code: &CodeModel,
+    initial: &FrameState,
+    baseline: &FrameBaseline<'_>,
+    resolver: Option<&dyn ClassResolver>,
+) -> Result<Option<FrameComputationResult>, AnalysisError> {
+    if code.exception_handlers != baseline.exception_handlers || uses_subroutines(code) {
+        return Ok(None);
+    }
+    let mut declared = HashMap::with_capacity(baseline.frames.len());
+    for (index, (label, _)) in baseline.frames.iter().enumerate() {
+        if declared.insert(label, index).is_some() {
+            return Ok(None);
+        }
+    }
+    let mut handler_edges: HashMap<&Label, Vec<(usize, bool)>> = HashMap::new();
+    for (index, handler) in code.exception_handlers.iter().enumerate() {
+        handler_edges
+            .entry(&handler.start)
+            .or_default()
+            .push((index, true));
+        handler_edges
+            .entry(&handler.end)
+            .or_default()
+            .push((index, false));
+    }
+    let handler_count = code.exception_handlers.len();
+    let original = segments(
+        baseline.instructions,
+        &declared,
+        &handler_edges,
+        handler_count,
+    );
+    let original = original
+        .iter()
+        .map(|segment| (segment.start.as_ref(), segment))
+        .collect::<HashMap<_, _>>();
+    let current = segments(&code.instructions, &declared, &handler_edges, handler_count);
+
+    let cfg = build_cfg(code)?;
+    let mut table = TypeTable::new(resolver);
+    let block_count = cfg.blocks.len();
+    let mut entry_frames: Vec<Option<SimFrame>> = vec![None; block_count];
+    let mut worklist = Worklist {
+        anchored: vec![false; block_count],
+        dirty: vec![false; block_count],
+        predecessors: vec![Vec::new(); block_count],
+        successors: vec![Vec::new(); block_count],
+        pending: BlockWorklist::new(&cfg),
+    };
+    for block in &cfg.blocks {
+        let successors = block
+            .normal_successors
+            .iter()
+            .copied()
+            .chain(block.exception_successors.iter().map(|edge| edge.target));
+        for successor in successors {
+            if !worklist.successors[block.block_index].contains(&successor) {
+                worklist.successors[block.block_index].push(successor);
+                worklist.predecessors[successor].push(block.block_index);
+            }
+        }
+    }
+
+    // Declared frames anchor the blocks whose leaders their labels precede.
+    let max_locals = usize::from(baseline.max_locals);
+    let entry_block = cfg.block_starting_at(cfg.entry_node)?;
+    entry_frames[entry_block] = Some(table.frame(initial));
+    worklist.anchored[entry_block] = true;
+    let mut pending_frames = Vec::new();
+    for (code_index, item) in code.instructions.iter().enumerate() {
+        if let CodeItem::Label(label) = item {
+            if let Some(&frame) = declared.get(label) {
+                pending_frames.push(frame);
+            }
+            continue;
+        }
+        if pending_frames.is_empty() {
+            continue;
+        }
+        let node = cfg.code_index_to_node[&code_index];
+        let block = cfg.node_to_block[node];
+        if cfg.blocks[block].start_node != node {
+            pending_frames.clear();
+            continue;
+        }
+        for frame in pending_frames.drain(..) {
+            let mut declared_frame = table.frame(&baseline.frames[frame].1);
+            if declared_frame.locals.len() < max_locals {
+                declared_frame
+                    .locals
+                    .resize(max_locals, interpreter::SimType::Top);
+            }
+            // The method entry state must fit any frame declared at its start.
+            if let Some(existing) = &entry_frames[block]
+                && declared_frame.merge_from(&existing.stack, &existing.locals, &mut table)?
+            {
+                return Ok(None);
+            }
+            entry_frames[block] = Some(declared_frame);
+        }
+        worklist.anchored[block] = true;
+    }
+
+    for segment in &current {
+        let clean = original.get(&segment.start.as_ref()).is_some_and(|before| {
+            before.next == segment.next
+                && before.handlers == segment.handlers
+                && baseline.instructions[before.items.clone()]
+                    == code.instructions[segment.items.clone()]
+        });
+        if clean {
+            continue;
+        }
+        for code_index in segment.items.clone() {
+            if let Some(&node) = cfg.code_index_to_node.get(&code_index) {
+                worklist.mark_dirty(cfg.node_to_block[node]);
+            }
+        }
+    }
+
+    let mut max_stack = usize::from(baseline.max_stack);
+    let mut max_locals = max_locals;
+    let throwable = table.object("java/lang/Throwable");
+    while let Some(block_index) = worklist.pending.pop() {
+        let mut state =
+            entry_frames[block_index]
+                .clone()
+                .ok_or_else(|| AnalysisError::InvalidControlFlow {
+                    reason: "worklist block missing entry frame".to_owned(),
+                })?;
+        let block = &cfg.blocks[block_index];
+        for node_index in block.start_node..block.end_node {
+            max_stack = max_stack.max(state.stack.len());
+            max_locals = max_locals.max(state.locals.len());
+            let node = &cfg.nodes[node_index];
+            let item = &code.instructions[node.code_index];
+            for exception_edge in &node.exception_successors {
+                let caught = match &exception_edge.catch_type {
+                    Some(catch_type) => table.object(catch_type),
+                    None => throwable,
+                };
+                propagate(
+                    cfg.block_starting_at(exception_edge.target)?,
+                    &[caught],
+                    &state.locals,
+                    &mut entry_frames,
+                    &mut worklist,
+                    &mut table,
+                )?;
+            }
+            interpreter::step(
+                item,
+                &mut state,
+                &mut table,
+                node.code_index,
+                (node_index + 1 < cfg.nodes.len()).then_some(node_index + 1),
+            )?;
+            max_stack = max_stack.max(state.stack.len());
+            max_locals = max_locals.max(state.locals.len());
+            if node_index + 1 == block.end_node {
+                for &successor in &node.normal_successors {
+                    propagate(
+                        cfg.block_starting_at(successor)?,
+                        &state.stack,
+                        &state.locals,
+                        &mut entry_frames,
+                        &mut worklist,
+                        &mut table,
+                    )?;
+                }
+            }
+        }
+    }
+
+    let frames = cfg
+        .blocks
+        .iter()
+        .zip(&entry_frames)
+        .filter(|(block, _)| block.start_node != cfg.entry_node)
+        .filter_map(|(block, frame)| {
+            let frame = table.frame_state(frame.as_ref()?);
+            Some(StackMapFrameState {
+                code_index: cfg.nodes[block.start_node].code_index,
+                locals: frame.locals,
+                stack: frame.stack,
+            })
+        })
+        .collect();
+    Ok(Some(FrameComputationResult {
+        max_stack: max_stack as u16,
+        max_locals: max_locals as u16,
+        frames,
+    }))
+}
+
+/// Merge into `target`'s entry frame, re-simulating it if the frame widened.
+fn propagate(
+    target: usize,
+    stack: &[interpreter::SimType],
+    locals: &[interpreter::SimType],
+    entry_frames: &mut [Option<SimFrame>],
+    worklist: &mut Worklist,
+    table: &mut TypeTable<'_>,
+) -> Result<(), AnalysisError> {
+    let changed = match &mut entry_frames[target] {
+        Some(existing) => existing.merge_from(stack, locals, table)?,
+        None => {
+            entry_frames[target] = Some(SimFrame {
+                stack: stack.to_vec(),
+                locals: locals.to_vec(),
+            });
+            true
+        }
+    };
+    if changed {
+        worklist.mark_dirty(target);
+        worklist.pending.push(target);
+    }
+    Ok(())
+}
@@ -0,0 +1,723 @@
+//! Frame interpreter behind [`super::simulate`].
+//!
+//! Class names and `ret` target sets are interned into a per-method
+//! [`TypeTable`], so verification types are `Copy` and frames are mutated in
+//! place. Only block entry frames are converted back to [`VType`].
+
+use super::{
+    AnalysisError, ClassResolver, FrameState, JAVA_LANG_OBJECT, VType, common_superclass,
+    merge_return_targets, vtype_from_descriptor,
+};
+use crate::descriptors::{ReturnType, parse_field_descriptor, parse_method_descriptor, slot_size};
+use crate::model::{CodeItem, LdcValue, VarInsn};
+use crate::raw::{ArrayType, Instruction};
+use rustc_hash::FxHashMap;
+
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Hash)]
+pub(super) struct ClassId(u32);
+
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Hash)]
+pub(super) struct TargetsId(u32);
+
+/// A [`VType`] whose class names and `ret` targets live in a [`TypeTable`].
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Hash)]
+pub(super) enum SimType {
+    Top,
+    Integer,
+    Float,
+    Long,
+    Double,
+    Null,
+    ReturnAddress(TargetsId),
+    Object(ClassId),
+    UninitializedThis,
+    Uninitialized { code_index: usize, class: ClassId },
+}
+
+impl SimType {
+    fn is_category2(self) -> bool {
+        matches!(self, Self::Long | Self::Double)
+    }
+
+    fn is_reference(self) -> bool {
+        matches!(
+            self,
+            Self::Null | Self::Object(_) | Self::UninitializedThis | Self::Uninitialized { .. }
+        )
+    }
+}
+
+#[derive(Debug, Clone, Copy)]
+struct InvokeEffect {
+    arg_slots: usize,
+    returns: Option<SimType>,
+}
+
+/// Interning and memo tables for one simulation.
+pub(super) struct TypeTable<'r> {
+    resolver: Option<&'r dyn ClassResolver>,
+    names: Vec<String>,
+    name_ids: FxHashMap<String, ClassId>,
+    targets: Vec<Vec<usize>>,
+    target_ids: FxHashMap<Vec<usize>, TargetsId>,
+    merges: FxHashMap<(ClassId, ClassId), ClassId>,
+    array_of: FxHashMap<ClassId, ClassId>,
+    component_of: FxHashMap<ClassId, ClassId>,
+    fields: FxHashMap<String, (usize, SimType)>,
+    invokes: FxHashMap<String, InvokeEffect>,
+}
+
+impl<'r> TypeTable<'r> {
+    pub(super) fn new(resolver: Option<&'r dyn ClassResolver>) -> Self {
+        Self {
+            resolver,
+            names: Vec::new(),
+            name_ids: FxHashMap::default(),
+            targets: Vec::new(),
+            target_ids: FxHashMap::default(),
+            merges: FxHashMap::default(),
+            array_of: FxHashMap::default(),
+            component_of: FxHashMap::default(),
+            fields: FxHashMap::default(),
+            invokes: FxHashMap::default(),
+        }
+    }
+
+    pub(super) fn class(&mut self, name: &str) -> ClassId {
+        if let Some(&id) = self.name_ids.get(name) {
+            return id;
+        }
+        let id = ClassId(self.names.len() as u32);
+        self.names.push(name.to_owned());
+        self.name_ids.insert(name.to_owned(), id);
+        id
+    }
+
+    pub(super) fn object(&mut self, name: &str) -> SimType {
+        SimType::Object(self.class(name))
+    }
+
+    fn name(&self, id: ClassId) -> &str {
+        &self.names[id.0 as usize]
+    }
+
+    fn return_address(&mut self, targets: Vec<usize>) -> SimType {
+        if let Some(&id) = self.target_ids.get(&targets) {
+            return SimType::ReturnAddress(id);
+        }
+        let id = TargetsId(self.targets.len() as u32);
+        self.targets.push(targets.clone());
+        self.target_ids.insert(targets, id);
+        SimType::ReturnAddress(id)
+    }
+
+    fn targets(&self, id: TargetsId) -> &[usize] {
+        &self.targets[id.0 as usize]
+    }
+
+    pub(super) fn intern(&mut self, value: &VType) -> SimType {
+        match value {
+            VType::Top => SimType::Top,
+            VType::Integer => SimType::Integer,
+            VType::Float => SimType::Float,
+            VType::Long => SimType::Long,
+            VType::Double => SimType::Double,
+            VType::Null => SimType::Null,
+            VType::ReturnAddress(targets) => self.return_address(targets.clone()),
+            VType::Object(name) => self.object(name),
+            VType::UninitializedThis => SimType::UninitializedThis,
+            VType::Uninitialized {
+                code_index,
+                class_name,
+            } => SimType::Uninitialized {
+                code_index: *code_index,
+                class: self.class(class_name),
+            },
+        }
+    }
+
+    pub(super) fn vtype(&self, value: SimType) -> VType {
+        match value {
+            SimType::Top => VType::Top,
+            SimType::Integer => VType::Integer,
+            SimType::Float => VType::Float,
+            SimType::Long => VType::Long,
+            SimType::Double => VType::Double,
+            SimType::Null => VType::Null,
+            SimType::ReturnAddress(id) => VType::ReturnAddress(self.targets(id).to_vec()),
+            SimType::Object(id) => VType::Object(self.name(id).to_owned()),
+            SimType::UninitializedThis => VType::UninitializedThis,
+            SimType::Uninitialized { code_index, class } => VType::Uninitialized {
+                code_index,
+                class_name: self.name(class).to_owned(),
+            },
+        }
+    }
+
+    pub(super) fn frame(&mut self, state: &FrameState) -> SimFrame {
+        SimFrame {
+            stack: state.stack.iter().map(|value| self.intern(value)).collect(),
+            locals: state
+                .locals
+                .iter()
+                .map(|value| self.intern(value))
+                .collect(),
+        }
+    }
+
+    pub(super) fn frame_state(&self, frame: &SimFrame) -> FrameState {
+        FrameState {
+            stack: frame.stack.iter().map(|value| self.vtype(*value)).collect(),
+            locals: frame
+                .locals
+                .iter()
+                .map(|value| self.vtype(*value))
+                .collect(),
+        }
+    }
+
+    /// Interned equivalent of [`super::merge_vtypes`], memoizing class merges.
+    fn merge(&mut self, left: SimType, right: SimType) -> SimType {
+        if left == right {
+            return left;
+        }
+        match (left, right) {
+            (SimType::ReturnAddress(left), SimType::ReturnAddress(right)) => {
+                let merged = merge_return_targets(self.targets(left), self.targets(right));
+                self.return_address(merged)
+            }
+            (SimType::Null, other) | (other, SimType::Null) if other.is_reference() => other,
+            (SimType::Object(left), SimType::Object(right)) => {
+                let key = (left, right);
+                if let Some(&merged) = self.merges.get(&key) {
+                    return SimType::Object(merged);
+                }
+                let merged = match self.resolver {
+                    Some(resolver) => {
+                        common_superclass(resolver, self.name(left), self.name(right))
+                            .unwrap_or_else(|_| JAVA_LANG_OBJECT.to_owned())
+                    }
+                    None => JAVA_LANG_OBJECT.to_owned(),
+                };
+                let merged = self.class(&merged);
+                self.merges.insert(key, merged);
+                SimType::Object(merged)
+            }
+            _ => SimType::Top,
+        }
+    }
+
+    fn field(&mut self, descriptor: &str) -> Result<(usize, SimType), AnalysisError> {
+        if let Some(&effect) = self.fields.get(descriptor) {
+            return Ok(effect);
+        }
+        let parsed = parse_field_descriptor(descriptor).map_err(invalid_descriptor)?;
+        let effect = (
+            slot_size(&parsed),
+            self.intern(&vtype_from_descriptor(&parsed)),
+        );
+        self.fields.insert(descriptor.to_owned(), effect);
+        Ok(effect)
+    }
+
+    fn invoke(&mut self, descriptor: &str) -> Result<InvokeEffect, AnalysisError> {
+        if let Some(&effect) = self.invokes.get(descriptor) {
+            return Ok(effect);
+        }
+        let parsed = parse_method_descriptor(descriptor).map_err(invalid_descriptor)?;
+        let returns = match &parsed.return_type {
+            ReturnType::Void => None,
+            ReturnType::Field(field) => Some(self.intern(&vtype_from_descriptor(field))),
+        };
+        let effect = InvokeEffect {
+            arg_slots: parsed.parameter_types.iter().map(slot_size).sum(),
+            returns,
+        };
+        self.invokes.insert(descriptor.to_owned(), effect);
+        Ok(effect)
+    }
+
+    fn array_of(&mut self, element: ClassId) -> ClassId {
+        if let Some(&array) = self.array_of.get(&element) {
+            return array;
+        }
+        let name = self.name(element);
+        let array_name = if name.starts_with('[') {
+            format!("[{name}")
+        } else {
+            format!("[L{name};")
+        };
+        let array = self.class(&array_name);
+        self.array_of.insert(element, array);
+        array
+    }
+
+    /// The type `aaload` pushes for an array reference of type `array`.
+    fn component_of(&mut self, array: SimType) -> SimType {
+        let SimType::Object(array) = array else {
+            return self.object(JAVA_LANG_OBJECT);
+        };
+        if let Some(&component) = self.component_of.get(&array) {
+            return SimType::Object(component);
+        }
+        let name = self.name(array);
+        let component = match name.strip_prefix('[') {
+            Some(component) if component.starts_with('L') && component.ends_with(';') => {
+                component[1..component.len() - 1].to_owned()
+            }
+            Some(component) if component.starts_with('[') => component.to_owned(),
+            _ => JAVA_LANG_OBJECT.to_owned(),
+        };
+        let component = self.class(&component);
+        self.component_of.insert(array, component);
+        SimType::Object(component)
+    }
+}
+
+fn invalid_descriptor(error: crate::EngineError) -> AnalysisError {
+    AnalysisError::InvalidControlFlow {
+        reason: error.to_string(),
+    }
+}
+
+/// A mutable frame of interned verification types.
+#[derive(Debug, Clone, PartialEq, Eq, Default)]
+pub(super) struct SimFrame {
+    pub(super) stack: Vec<SimType>,
+    pub(super) locals: Vec<SimType>,
+}
+
+impl SimFrame {
+    fn push(&mut self, value: SimType) {
+        self.stack.push(value);
+        if value.is_category2() {
+            self.stack.push(SimType::Top);
+        }
+    }
+
+    fn pop(&mut self, slots: usize) -> Result<(), AnalysisError> {
+        let available = self.stack.len();
+        let remaining = available
+            .checked_sub(slots)
+            .ok_or(AnalysisError::StackUnderflow {
+                needed: slots,
+                available,
+            })?;
+        self.stack.truncate(remaining);
+        Ok(())
+    }
+
+    fn pop_value(&mut self) -> Result<SimType, AnalysisError> {
+        self.stack.pop().ok_or(AnalysisError::StackUnderflow {
+            needed: 1,
+            available: 0,
+        })
+    }
+
+    fn peek(&self, depth: usize) -> Result<SimType, AnalysisError> {
+        let index =
+            self.stack
+                .len()
+                .checked_sub(depth + 1)
+                .ok_or(AnalysisError::StackUnderflow {
+                    needed: depth + 1,
+                    available: self.stack.len(),
+                })?;
+        Ok(self.stack[index])
+    }
+
+    fn set_local(&mut self, index: usize, value: SimType) {
+        let width = if value.is_category2() { 2 } else { 1 };
+        if self.locals.len() < index + width {
+            self.locals.resize(index + width, SimType::Top);
+        }
+        self.locals[index] = value;
+        if value.is_category2() {
+            self.locals[index + 1] = SimType::Top;
+        }
+    }
+
+    fn get_local(&self, index: usize) -> Result<SimType, AnalysisError> {
+        match self.locals.get(index) {
+            None => Err(AnalysisError::InvalidLocal {
+                index,
+                reason: "slot is out of range".to_owned(),
+            }),
+            Some(SimType::Top) => Err(AnalysisError::InvalidLocal {
+                index,
+                reason: "slot is not initialized".to_owned(),
+            }),
+            Some(value) => Ok(*value),
+        }
+    }
+
+    /// Merge an incoming frame into this one in place; report whether it changed.
+    pub(super) fn merge_from(
+        &mut self,
+        stack: &[SimType],
+        locals: &[SimType],
+        table: &mut TypeTable<'_>,
+    ) -> Result<bool, AnalysisError> {
+        if self.stack.len() != stack.len() {
+            return Err(AnalysisError::TypeMerge {
+                reason: format!(
+                    "stack depths differ at join point: {} vs {}",
+                    self.stack.len(),
+                    stack.len()
+                ),
+            });
+        }
+        let mut changed = false;
+        for (existing, incoming) in self.stack.iter_mut().zip(stack) {
+            let merged = table.merge(*existing, *incoming);
+            changed |= merged != *existing;
+            *existing = merged;
+        }
+        if self.locals.len() < locals.len() {
+            self.locals.resize(locals.len(), SimType::Top);
+            changed = true;
+        }
+        for (index, existing) in self.locals.iter_mut().enumerate() {
+            let incoming = locals.get(index).copied().unwrap_or(SimType::Top);
+            let merged = table.merge(*existing, incoming);
+            changed |= merged != *existing;
+            *existing = merged;
+        }
+        Ok(changed)
+    }
+}
+
+/// Node indices a `ret` may return to, or `None` for statically known successors.
+pub(super) fn dynamic_successors(
+    item: &CodeItem,
+    state: &SimFrame,
+    table: &TypeTable<'_>,
+) -> Option<Vec<usize>> {
+    match item {
+        CodeItem::Var(var) if var.opcode == 0xA9 => match state.get_local(var.slot as usize) {
+            Ok(SimType::ReturnAddress(targets)) => Some(table.targets(targets).to_vec()),
+            _ => Some(Vec::new()),
+        },
+        _ => None,
+    }
+}
+
+/// Apply the effect of one instruction to `state` in place.
+pub(super) fn step(
+    item: &CodeItem,
+    state: &mut SimFrame,
+    table: &mut TypeTable<'_>,
+    code_index: usize,
+    next_node: Option<usize>,
+) -> Result<(), AnalysisError> {
+    match item {
+        CodeItem::Raw(raw) => step_raw_opcode(raw.opcode(), raw, state, table),
+        CodeItem::Var(var) => step_var(var, state, table),
+        CodeItem::IInc(iinc) => {
+            if state.get_local(iinc.slot as usize)? != SimType::Integer {
+                return Err(AnalysisError::InvalidLocal {
+                    index: iinc.slot as usize,
+                    reason: "iinc requires integer local".to_owned(),
+                });
+            }
+            Ok(())
+        }
+        CodeItem::Field(field) => {
+            let (slots, field_type) = table.field(&field.descriptor)?;
+            match field.opcode {
+                0xB2 => state.push(field_type),
+                0xB3 => state.pop(slots)?,
+                0xB4 => {
+                    state.pop(1)?;
+                    state.push(field_type);
+                }
+                0xB5 => state.pop(slots + 1)?,
+                opcode => return Err(AnalysisError::UnsupportedInstruction { opcode }),
+            }
+            Ok(())
+        }
+        CodeItem::Method(method) => {
+            let effect = table.invoke(&method.descriptor)?;
+            state.pop(effect.arg_slots)?;
+            if method.opcode != 0xB8 {
+                let receiver = state.pop_value()?;
+                if method.opcode == 0xB7 && method.name == "<init>" {
+                    let replacement = table.object(&method.owner);
+                    initialize_receiver(state, receiver, replacement);
+                }
+            }
+            if let Some(returns) = effect.returns {
+                state.push(returns);
+            }
+            Ok(())
+        }
+        CodeItem::InterfaceMethod(method) => {
+            let effect = table.invoke(&method.descriptor)?;
+            state.pop(effect.arg_slots + 1)?;
+            if let Some(returns) = effect.returns {
+                state.push(returns);
+            }
+            Ok(())
+        }
+        CodeItem::InvokeDynamic(insn) => {
+            let effect = table.invoke(&insn.descriptor)?;
+            state.pop(effect.arg_slots)?;
+            if let Some(returns) = effect.returns {
+                state.push(returns);
+            }
+            Ok(())
+        }
+        CodeItem::Type(insn) => {
+            match insn.opcode {
+                0xBB => {
+                    let class = table.class(&insn.descriptor);
+                    state.push(SimType::Uninitialized { code_index, class });
+                }
+                0xBD => {
+                    state.pop(1)?;
+                    let element = table.class(&insn.descriptor);
+                    state.push(SimType::Object(table.array_of(element)));
+                }
+                0xC0 => {
+                    state.pop(1)?;
+                    state.push(table.object(&insn.descriptor));
+                }
+                0xC1 => {
+                    state.pop(1)?;
+                    state.push(SimType::Integer);
+                }
+                opcode => return Err(AnalysisError::UnsupportedInstruction { opcode }),
+            }
+            Ok(())
+        }
+        CodeItem::Ldc(insn) => {
+            let value = match &insn.value {
+                LdcValue::Int(_) => SimType::Integer,
+                LdcValue::FloatBits(_) => SimType::Float,
+                LdcValue::Long(_) => SimType::Long,
+                LdcValue::DoubleBits(_) => SimType::Double,
+                LdcValue::String(_) => table.object("java/lang/String"),
+                LdcValue::Class(_) => table.object("java/lang/Class"),
+                LdcValue::MethodType(_) => table.object("java/lang/invoke/MethodType"),
+                LdcValue::MethodHandle(_) => table.object("java/lang/invoke/MethodHandle"),
+                LdcValue::Dynamic(dynamic) => table.field(&dynamic.descriptor)?.1,
+            };
+            state.push(value);
+            Ok(())
+        }
+        CodeItem::MultiANewArray(insn) => {
+            state.pop(insn.dimensions as usize)?;
+            state.push(table.object(&insn.descriptor));
+            Ok(())
+        }
+        CodeItem::Branch(branch) => {
+            let pops = match branch.opcode {
+                0x99..=0x9E | 0xC6 | 0xC7 => 1,
+                0x9F..=0xA6 => 2,
+                0xA7 => 0,
+                0xA8 => {
+                    let return_target =
+                        next_node.ok_or_else(|| AnalysisError::InvalidControlFlow {
+                            reason: "jsr/jsr_w requires a reachable continuation instruction"
+                                .to_owned(),
+                        })?;
+                    state.push(table.return_address(vec![return_target]));
+                    return Ok(());
+                }
+                opcode => return Err(AnalysisError::UnsupportedInstruction { opcode }),
+            };
+            state.pop(pops)
+        }
+        CodeItem::LookupSwitch(_) | CodeItem::TableSwitch(_) => state.pop(1),
+        CodeItem::Label(_) => Err(AnalysisError::InvalidControlFlow {
+            reason: "labels do not execute".to_owned(),
+        }),
+    }
+}
+
+fn step_var(
+    var: &VarInsn,
+    state: &mut SimFrame,
+    table: &TypeTable<'_>,
+) -> Result<(), AnalysisError> {
+    let slot = var.slot as usize;
+    match var.opcode {
+        0x15 => state.push(SimType::Integer),
+        0x16 => state.push(SimType::Long),
+        0x17 => state.push(SimType::Float),
+        0x18 => state.push(SimType::Double),
+        0x19 => {
+            let value = state.get_local(slot)?;
+            state.push(value);
+        }
+        0x36 => {
+            state.pop(1)?;
+            state.set_local(slot, SimType::Integer);
+        }
+        0x37 => {
+            state.pop(2)?;
+            state.set_local(slot, SimType::Long);
+        }
+        0x38 => {
+            state.pop(1)?;
+            state.set_local(slot, SimType::Float);
+        }
+        0x39 => {
+            state.pop(2)?;
+            state.set_local(slot, SimType::Double);
+        }
+        0x3A => {
+            let value = state.pop_value()?;
+            state.set_local(slot, value);
+        }
+        0xA9 => {
+            let returns = match state.get_local(slot)? {
+                SimType::ReturnAddress(targets) => !table.targets(targets).is_empty(),
+                _ => false,
+            };
+            if !returns {
+                return Err(AnalysisError::InvalidLocal {
+                    index: slot,
+                    reason: "ret requires returnAddress local".to_owned(),
+                });
+            }
+        }
+        opcode => return Err(AnalysisError::UnsupportedInstruction { opcode }),
+    }
+    Ok(())
+}
+
+fn step_raw_opcode(
+    opcode: u8,
+    raw: &Instruction,
+    state: &mut SimFrame,
+    table: &mut TypeTable<'_>,
+) -> Result<(), AnalysisError> {
+    // Pop `slots` stack slots, then push `value`.
+    fn replace(state: &mut SimFrame, slots: usize, value: SimType) -> Result<(), AnalysisError> {
+        state.pop(slots)?;
+        state.push(value);
+        Ok(())
+    }
+    // Replace the top `depth` slots with `order`, given as depths below the top.
+    fn shuffle(state: &mut SimFrame, depth: usize, order: &[usize]) -> Result<(), AnalysisError> {
+        let mut values = [SimType::Top; 4];
+        for (index, value) in values.iter_mut().enumerate().take(depth) {
+            *value = state.peek(index)?;
+        }
+        state.stack.truncate(state.stack.len() - depth);
+        state.stack.extend(order.iter().map(|&depth| values[depth]));
+        Ok(())
+    }
+
+    match opcode {
+        0x00 | 0xB1 => Ok(()),
+        0x01 => {
+            state.push(SimType::Null);
+            Ok(())
+        }
+        0x02..=0x08 | 0x10 | 0x11 => {
+            state.push(SimType::Integer);
+            Ok(())
+        }
+        0x09..=0x0A => {
+            state.push(SimType::Long);
+            Ok(())
+        }
+        0x0B..=0x0D => {
+            state.push(SimType::Float);
+            Ok(())
+        }
+        0x0E..=0x0F => {
+            state.push(SimType::Double);
+            Ok(())
+        }
+        0x57 => state.pop(1),
+        0x58 => state.pop(2),
+        0x59 => shuffle(state, 1, &[0, 0]),
+        0x5A => shuffle(state, 2, &[0, 1, 0]),
+        0x5B => shuffle(state, 3, &[0, 2, 1, 0]),
+        0x5C => shuffle(state, 2, &[1, 0, 1, 0]),
+        0x5D => shuffle(state, 3, &[1, 0, 2, 1, 0]),
+        0x5E => shuffle(state, 4, &[1, 0, 3, 2, 1, 0]),
+        0x5F => shuffle(state, 2, &[0, 1]),
+        0x60 | 0x64 | 0x68 | 0x6C | 0x70 | 0x74 | 0x78 | 0x7A | 0x7C | 0x7E | 0x80 | 0x82 => {
+            replace(state, 2, SimType::Integer)
+        }
+        0x61 | 0x65 | 0x69 | 0x6D | 0x71 | 0x75 | 0x79 | 0x7B | 0x7D | 0x7F | 0x81 | 0x83 => {
+            replace(state, 4, SimType::Long)
+        }
+        0x62 | 0x66 | 0x6A | 0x6E | 0x72 | 0x76 => replace(state, 2, SimType::Float),
+        0x63 | 0x67 | 0x6B | 0x6F | 0x73 | 0x77 => replace(state, 4, SimType::Double),
+        0x85 => replace(state, 1, SimType::Long),
+        0x86 => replace(state, 1, SimType::Float),
+        0x87 => replace(state, 1, SimType::Double),
+        0x88 => replace(state, 2, SimType::Integer),
+        0x89 => replace(state, 2, SimType::Float),
+        0x8A => replace(state, 2, SimType::Double),
+        0x8B | 0x91 | 0x92 | 0x93 => replace(state, 1, SimType::Integer),
+        0x8C => replace(state, 1, SimType::Long),
+        0x8D => replace(state, 1, SimType::Double),
+        0x8E => replace(state, 2, SimType::Integer),
+        0x8F => replace(state, 2, SimType::Long),
+        0x90 => replace(state, 2, SimType::Float),
+        0x94..=0x98 => {
+            let pops = if opcode == 0x94 || opcode >= 0x97 {
+                4
+            } else {
+                2
+            };
+            replace(state, pops, SimType::Integer)
+        }
+        0x2E | 0x33..=0x35 => replace(state, 2, SimType::Integer),
+        0x2F => replace(state, 2, SimType::Long),
+        0x30 => replace(state, 2, SimType::Float),
+        0x31 => replace(state, 2, SimType::Double),
+        0x32 => {
+            let array = state.peek(1)?;
+            let component = table.component_of(array);
+            replace(state, 2, component)
+        }
+        0x4F | 0x51 | 0x53..=0x56 => state.pop(3),
+        0x50 | 0x52 => state.pop(4),
+        0xBE => replace(state, 1, SimType::Integer),
+        0xAC | 0xAE | 0xB0 | 0xC2 | 0xC3 | 0xBF => state.pop(1),
+        0xAD | 0xAF => state.pop(2),
+        0xBC => {
+            let descriptor = match raw {
+                Instruction::NewArray(insn) => newarray_descriptor(insn.atype),
+                _ => "[I",
+            };
+            let array = table.object(descriptor);
+            replace(state, 1, array)
+        }
+        opcode => Err(AnalysisError::UnsupportedInstruction { opcode }),
+    }
+}
+
+fn initialize_receiver(state: &mut SimFrame, receiver: SimType, replacement: SimType) {
+    if !matches!(
+        receiver,
+        SimType::UninitializedThis | SimType::Uninitialized { .. }
+    ) {
+        return;
+    }
+    for value in state.stack.iter_mut().chain(state.locals.iter_mut()) {
+        if *value == receiver {
+            *value = replacement;
+        }
+    }
+}
+
+fn newarray_descriptor(atype: ArrayType) -> &'static str {
+    match atype {
+        ArrayType::Boolean => "[Z",
+        ArrayType::Char => "[C",
+        ArrayType::Float => "[F",
+        ArrayType::Double => "[D",
+        ArrayType::Byte => "[B",
+        ArrayType::Short => "[S",
+        ArrayType::Int => "[I",
+        ArrayType::Long => "[J",
+    }
+}
@@ -1,11 +1,16 @@
 mod hierarchy;
+mod incremental;
+mod interpreter;
+mod references;
 mod verify;
 
 pub use hierarchy::{
-    ClassResolver, InheritedMethod, JAVA_LANG_OBJECT, MappingClassResolver, ResolvedClass,
-    ResolvedMethod, common_superclass, find_overridden_methods, is_subtype, iter_superclasses,
-    iter_supertypes,
+    ClassResolver, HierarchyMemo, InheritedMethod, JAVA_LANG_OBJECT, MappingClassResolver,
+    ResolvedClass, ResolvedMethod, common_superclass, find_overridden_methods, is_subtype,
+    iter_superclasses, iter_supertypes,
 };
+pub use incremental::{FrameBaseline, recompute_frames_incremental};
+pub use references::{ReferenceTable, scan_class_references, scan_references};
 pub use verify::{
     Category, Diagnostic, FailFastError, Location, Severity, verify_classfile,
     verify_classfile_with_options, verify_classmodel, verify_classmodel_with_options,
@@ -13,15 +18,11 @@ pub use verify::{
 
 use crate::constants::MethodAccessFlags;
 use crate::descriptors::{
-    BaseType, FieldDescriptor, ReturnType, parse_field_descriptor, parse_method_descriptor,
-    slot_size,
+    BaseType, FieldDescriptor, parse_field_descriptor, parse_method_descriptor,
 };
-use crate::model::{
-    BranchInsn, CodeItem, CodeModel, FieldInsn, IIncInsn, InterfaceMethodInsn, InvokeDynamicInsn,
-    LdcInsn, LdcValue, MethodInsn, MultiANewArrayInsn, TypeInsn, VarInsn,
-};
-use crate::raw::ArrayType;
-use std::collections::{HashMap, HashSet, VecDeque};
+use crate::model::{CodeItem, CodeModel, VarInsn};
+use interpreter::{SimFrame, SimType, TypeTable};
+use std::collections::{HashMap, HashSet};
 use thiserror::Error;
 
 #[derive(Debug, Clone, PartialEq, Eq, Error)]
@@ -165,20 +166,87 @@ pub struct ControlFlowNode {
     pub is_jump_target: bool,
 }
 
+/// A maximal straight-line run of CFG nodes `start_node..end_node`.
+///
+/// Control only enters at `start_node` and only leaves through the last node
+/// or an exception edge. Successor indices refer to other blocks.
+#[derive(Debug, Clone, PartialEq, Eq)]
+pub struct BasicBlock {
+    pub block_index: usize,
+    pub start_node: usize,
+    pub end_node: usize,
+    pub normal_successors: Vec<usize>,
+    pub exception_successors: Vec<ExceptionSuccessor>,
+}
+
+/// Control flow of a method at two granularities: one node per executable
+/// instruction, and the basic blocks those nodes group into.
 #[derive(Debug, Clone, PartialEq, Eq)]
 pub struct ControlFlowGraph {
     pub entry_node: usize,
     pub nodes: Vec<ControlFlowNode>,
+    pub blocks: Vec<BasicBlock>,
+    pub node_to_block: Vec<usize>,
     pub code_index_to_node: HashMap<usize, usize>,
     pub label_targets: HashMap<crate::model::Label, Option<usize>>,
 }
 
+impl ControlFlowGraph {
+    /// The block starting at `node`, or an error if `node` is not a block leader.
+    fn block_starting_at(&self, node: usize) -> Result<usize, AnalysisError> {
+        match self.node_to_block.get(node) {
+            Some(&block) if self.blocks[block].start_node == node => Ok(block),
+            _ => Err(AnalysisError::InvalidControlFlow {
+                reason: "control transfers into the middle of a basic block".to_owned(),
+            }),
+        }
+    }
+}
+
+/// The fixpoint of [`simulate`]: one entry frame per basic block.
 #[derive(Debug, Clone, PartialEq, Eq)]
 pub struct SimulationResult {
     pub cfg: ControlFlowGraph,
-    pub entry_frames: Vec<Option<FrameState>>,
+    pub block_entry_frames: Vec<Option<FrameState>>,
     pub max_stack: u16,
     pub max_locals: u16,
+    /// Number of times a block was taken off the worklist and simulated.
+    pub iterations: usize,
+}
+
+impl SimulationResult {
+    /// Expand the block entry frames into one entry frame per CFG node.
+    ///
+    /// Each reachable block is replayed straight-line from its entry frame,
+    /// so this is a single pass over the instructions. Unreachable nodes get
+    /// `None`.
+    pub fn instruction_frames(
+        &self,
+        code: &CodeModel,
+    ) -> Result<Vec<Option<FrameState>>, AnalysisError> {
+        let mut frames = vec![None; self.cfg.nodes.len()];
+        let mut table = TypeTable::new(None);
+        for (block, entry) in self.cfg.blocks.iter().zip(&self.block_entry_frames) {
+            let Some(entry) = entry else {
+                continue;
+            };
+            let mut state = table.frame(entry);
+            let body = block.start_node..block.end_node;
+            for (node, slot) in self.cfg.nodes[body.clone()].iter().zip(&mut frames[body]) {
+                *slot = Some(table.frame_state(&state));
+                if node.node_index + 1 < block.end_node {
+                    interpreter::step(
+                        &code.instructions[node.code_index],
+                        &mut state,
+                        &mut table,
+                        node.code_index,
+                        Some(node.node_index + 1),
+                    )?;
+                }
+            }
+        }
+        Ok(frames)
+    }
 }
 
 #[derive(Debug, Clone, PartialEq, Eq)]
@@ -437,14 +505,56 @@ pub fn build_cfg(code: &CodeModel) -> Result<ControlFlowGraph, AnalysisError> {
         }
     }
 
+    let mut leaders = leaders.into_iter().collect::<Vec<_>>();
+    leaders.sort_unstable();
+    let mut node_to_block = vec![0; nodes.len()];
+    let mut blocks = Vec::with_capacity(leaders.len());
+    for (block_index, &start_node) in leaders.iter().enumerate() {
+        let end_node = leaders.get(block_index + 1).copied().unwrap_or(nodes.len());
+        node_to_block[start_node..end_node].fill(block_index);
+        blocks.push(BasicBlock {
+            block_index,
+            start_node,
+            end_node,
+            normal_successors: Vec::new(),
+            exception_successors: Vec::new(),
+        });
+    }
+    for block in &mut blocks {
+        for successor in &nodes[block.end_node - 1].normal_successors {
+            let successor = node_to_block[*successor];
+            if !block.normal_successors.contains(&successor) {
+                block.normal_successors.push(successor);
+            }
+        }
+        for node in &nodes[block.start_node..block.end_node] {
+            for edge in &node.exception_successors {
+                let edge = ExceptionSuccessor {
+                    target: node_to_block[edge.target],
+                    catch_type: edge.catch_type.clone(),
+                };
+                if !block.exception_successors.contains(&edge) {
+                    block.exception_successors.push(edge);
+                }
+            }
+        }
+    }
+
     Ok(ControlFlowGraph {
         entry_node: 0,
         nodes,
+        blocks,
+        node_to_block,
         code_index_to_node,
         label_targets,
     })
 }
 
+/// Compute the entry frame of every reachable basic block.
+///
+/// The worklist runs over blocks; inside a block instructions are simulated
+/// straight-line without storing intermediate frames. Use
+/// [`SimulationResult::instruction_frames`] for a per-instruction view.
 pub fn simulate(
     code: &CodeModel,
     class_name: &str,
@@ -454,78 +564,170 @@ pub fn simulate(
     resolver: Option<&dyn ClassResolver>,
 ) -> Result<SimulationResult, AnalysisError> {
     let cfg = build_cfg(code)?;
-    let mut entry_frames = vec![None; cfg.nodes.len()];
-    let mut worklist = VecDeque::new();
-    entry_frames[cfg.entry_node] = Some(initial_frame(
-        class_name,
-        method_name,
-        descriptor,
-        access_flags,
-    )?);
-    worklist.push_back(cfg.entry_node);
+    let mut table = TypeTable::new(resolver);
+    let mut entry_frames: Vec<Option<SimFrame>> = vec![None; cfg.blocks.len()];
+    let mut worklist = BlockWorklist::new(&cfg);
+    let entry_block = cfg.block_starting_at(cfg.entry_node)?;
+    let initial = initial_frame(class_name, method_name, descriptor, access_flags)?;
+    entry_frames[entry_block] = Some(table.frame(&initial));
+    worklist.push(entry_block);
     let mut max_stack = 0_usize;
     let mut max_locals = 0_usize;
+    let mut iterations = 0_usize;
+    let throwable = table.object("java/lang/Throwable");
 
-    while let Some(node_index) = worklist.pop_front() {
-        let state =
-            entry_frames[node_index]
+    while let Some(block_index) = worklist.pop() {
+        iterations += 1;
+        let mut state =
+            entry_frames[block_index]
                 .clone()
                 .ok_or_else(|| AnalysisError::InvalidControlFlow {
-                    reason: "worklist node missing entry frame".to_owned(),
+                    reason: "worklist block missing entry frame".to_owned(),
                 })?;
-        max_stack = max_stack.max(state.stack_depth());
-        max_locals = max_locals.max(state.locals.len());
-        let code_index = cfg.nodes[node_index].code_index;
-        let item = &code.instructions[code_index];
+        let block = &cfg.blocks[block_index];
+        for node_index in block.start_node..block.end_node {
+            max_stack = max_stack.max(state.stack.len());
+            max_locals = max_locals.max(state.locals.len());
+            let node = &cfg.nodes[node_index];
+            let item = &code.instructions[node.code_index];
+
+            for exception_edge in &node.exception_successors {
+                let caught = match &exception_edge.catch_type {
+                    Some(catch_type) => table.object(catch_type),
+                    None => throwable,
+                };
+                propagate(
+                    cfg.block_starting_at(exception_edge.target)?,
+                    &[caught],
+                    &state.locals,
+                    &mut entry_frames,
+                    &mut worklist,
+                    &mut table,
+                )?;
+            }
 
-        for exception_edge in &cfg.nodes[node_index].exception_successors {
-            let stack = vec![match &exception_edge.catch_type {
-                Some(catch_type) => VType::Object(catch_type.clone()),
-                None => VType::Object("java/lang/Throwable".to_owned()),
-            }];
-            let handler_state = FrameState {
-                stack,
-                locals: state.locals.clone(),
+            let is_last = node_index + 1 == block.end_node;
+            let dynamic = if is_last {
+                interpreter::dynamic_successors(item, &state, &table)
+            } else {
+                None
             };
-            propagate(
-                exception_edge.target,
-                handler_state,
-                &mut entry_frames,
-                &mut worklist,
-                resolver,
-            )?;
-        }
-
-        let next_state = simulate_item(
-            item,
-            &state,
-            class_name,
-            code_index,
-            (node_index + 1 < cfg.nodes.len()).then_some(node_index + 1),
-        )?;
-        max_stack = max_stack.max(next_state.stack_depth());
-        max_locals = max_locals.max(next_state.locals.len());
-        let normal_successors = dynamic_successors(item, &state)
-            .unwrap_or_else(|| cfg.nodes[node_index].normal_successors.clone());
-        for successor in &normal_successors {
-            propagate(
-                *successor,
-                next_state.clone(),
-                &mut entry_frames,
-                &mut worklist,
-                resolver,
+            interpreter::step(
+                item,
+                &mut state,
+                &mut table,
+                node.code_index,
+                (node_index + 1 < cfg.nodes.len()).then_some(node_index + 1),
             )?;
+            max_stack = max_stack.max(state.stack.len());
+            max_locals = max_locals.max(state.locals.len());
+            if is_last {
+                let successors = dynamic.as_deref().unwrap_or(&node.normal_successors);
+                for &successor in successors {
+                    propagate(
+                        cfg.block_starting_at(successor)?,
+                        &state.stack,
+                        &state.locals,
+                        &mut entry_frames,
+                        &mut worklist,
+                        &mut table,
+                    )?;
+                }
+            }
         }
     }
 
     Ok(SimulationResult {
         cfg,
-        entry_frames,
+        block_entry_frames: entry_frames
+            .iter()
+            .map(|frame| frame.as_ref().map(|frame| table.frame_state(frame)))
+            .collect(),
         max_stack: max_stack as u16,
         max_locals: max_locals as u16,
+        iterations,
     })
 }
 
+/// Blocks waiting to be simulated, always yielding the earliest in reverse postorder.
+///
+/// Visiting a block only after its forward predecessors lets each join see
+/// most of its inputs at once, so acyclic regions settle in a single pass and
+/// only loop headers are revisited. Membership is a bitset over
+/// reverse-postorder positions, so pushing an already pending block is O(1).
+struct BlockWorklist {
+    position: Vec<usize>,
+    order: Vec<usize>,
+    pending: Vec<u64>,
+    first_word: usize,
+}
+
+impl BlockWorklist {
+    fn new(cfg: &ControlFlowGraph) -> Self {
+        let block_count = cfg.blocks.len();
+        let successors = |block: usize| {
+            let block = &cfg.blocks[block];
+            block
+                .normal_successors
+                .iter()
+                .copied()
+                .chain(block.exception_successors.iter().map(|edge| edge.target))
+        };
+        let mut visited = vec![false; block_count];
+        let mut postorder = Vec::with_capacity(block_count);
+        let entry = cfg.node_to_block.get(cfg.entry_node).copied().unwrap_or(0);
+        let mut stack = Vec::new();
+        if entry < block_count {
+            visited[entry] = true;
+            stack.push((entry, successors(entry)));
+        }
+        while let Some((block, children)) = stack.last_mut() {
+            let block = *block;
+            match children.find(|&child| !visited[child]) {
+                Some(child) => {
+                    visited[child] = true;
+                    stack.push((child, successors(child)));
+                }
+                None => {
+                    postorder.push(block);
+                    stack.pop();
+                }
+            }
+        }
+        // Blocks only reachable through `ret` come after every static successor.
+        let mut order = postorder.into_iter().rev().collect::<Vec<_>>();
+        order.extend((0..block_count).filter(|&block| !visited[block]));
+        let mut position = vec![0; block_count];
+        for (index, &block) in order.iter().enumerate() {
+            position[block] = index;
+        }
+        Self {
+            position,
+            order,
+            pending: vec![0; block_count.div_ceil(64)],
+            first_word: usize::MAX,
+        }
+    }
+
+    fn push(&mut self, block: usize) {
+        let position = self.position[block];
+        self.pending[position / 64] |= 1 << (position % 64);
+        self.first_word = self.first_word.min(position / 64);
+    }
+
+    fn pop(&mut self) -> Option<usize> {
+        while let Some(word) = self.pending.get_mut(self.first_word) {
+            if *word != 0 {
+                let bit = word.trailing_zeros() as usize;
+                *word &= *word - 1;
+                return Some(self.order[self.first_word * 64 + bit]);
+            }
+            self.first_word += 1;
+        }
+        None
+    }
+}
+
 pub fn recompute_frames(
     code: &CodeModel,
     class_name: &str,
@@ -543,15 +745,20 @@ pub fn recompute_frames(
         resolver,
     )?;
     let mut frames = Vec::new();
-    for node in &simulation.cfg.nodes {
-        if node.node_index == simulation.cfg.entry_node || !node.is_block_start {
+    for (block, frame) in simulation
+        .cfg
+        .blocks
+        .iter()
+        .zip(simulation.block_entry_frames)
+    {
+        if block.start_node == simulation.cfg.entry_node {
             continue;
         }
-        if let Some(frame) = &simulation.entry_frames[node.node_index] {
+        if let Some(frame) = frame {
             frames.push(StackMapFrameState {
-                code_index: node.code_index,
-                locals: frame.locals.clone(),
-                stack: frame.stack.clone(),
+                code_index: simulation.cfg.nodes[block.start_node].code_index,
+                locals: frame.locals,
+                stack: frame.stack,
             });
         }
     }
@@ -562,7 +769,7 @@ pub fn recompute_frames(
     })
 }
 
-fn initial_frame(
+pub(crate) fn initial_frame(
     class_name: &str,
     method_name: &str,
     descriptor: &str,
@@ -595,525 +802,28 @@ fn initial_frame(
 
 fn propagate(
     target: usize,
-    candidate: FrameState,
-    entry_frames: &mut [Option<FrameState>],
-    worklist: &mut VecDeque<usize>,
-    resolver: Option<&dyn ClassResolver>,
+    stack: &[SimType],
+    locals: &[SimType],
+    entry_frames: &mut [Option<SimFrame>],
+    worklist: &mut BlockWorklist,
+    table: &mut TypeTable<'_>,
 ) -> Result<(), AnalysisError> {
-    let changed = match &entry_frames[target] {
-        Some(existing) => {
-            let merged = merge_frames(existing, &candidate, resolver)?;
-            if merged != *existing {
-                entry_frames[target] = Some(merged);
-                true
-            } else {
-                false
-            }
-        }
+    let changed = match &mut entry_frames[target] {
+        Some(existing) => existing.merge_from(stack, locals, table)?,
         None => {
-            entry_frames[target] = Some(candidate);
+            entry_frames[target] = Some(SimFrame {
+                stack: stack.to_vec(),
+                locals: locals.to_vec(),
+            });
             true
         }
     };
-    if changed && !worklist.contains(&target) {
-        worklist.push_back(target);
+    if changed {
+        worklist.push(target);
     }
     Ok(())
 }
 
-fn merge_frames(
-    left: &FrameState,
-    right: &FrameState,
-    resolver: Option<&dyn ClassResolver>,
-) -> Result<FrameState, AnalysisError> {
-    if left.stack.len() != right.stack.len() {
-        return Err(AnalysisError::TypeMerge {
-            reason: format!(
-                "stack depths differ at join point: {} vs {}",
-                left.stack.len(),
-                right.stack.len()
-            ),
-        });
-    }
-    let stack = left
-        .stack
-        .iter()
-        .zip(&right.stack)
-        .map(|(left, right)| merge_vtypes(left, right, resolver))
-        .collect::<Vec<_>>();
-    let max_locals = left.locals.len().max(right.locals.len());
-    let mut locals = Vec::with_capacity(max_locals);
-    for index in 0..max_locals {
-        let left_value = left.locals.get(index).unwrap_or(&VType::Top);
-        let right_value = right.locals.get(index).unwrap_or(&VType::Top);
-        locals.push(merge_vtypes(left_value, right_value, resolver));
-    }
-    Ok(FrameState { stack, locals })
-}
-
-fn simulate_item(
-    item: &CodeItem,
-    state: &FrameState,
-    class_name: &str,
-    code_index: usize,
-    next_node: Option<usize>,
-) -> Result<FrameState, AnalysisError> {
-    match item {
-        CodeItem::Raw(raw) => simulate_raw_opcode(raw.opcode(), state, raw, code_index),
-        CodeItem::Var(var) => simulate_var(var, state),
-        CodeItem::IInc(iinc) => simulate_iinc(iinc, state),
-        CodeItem::Field(field) => simulate_field(field, state),
-        CodeItem::Method(method) => simulate_method(method, state, class_name),
-        CodeItem::InterfaceMethod(method) => simulate_interface_method(method, state),
-        CodeItem::InvokeDynamic(insn) => simulate_invokedynamic(insn, state),
-        CodeItem::Type(insn) => simulate_type(insn, state, code_index),
-        CodeItem::Ldc(insn) => simulate_ldc(insn, state),
-        CodeItem::MultiANewArray(insn) => simulate_multianewarray(insn, state),
-        CodeItem::Branch(branch) => simulate_branch(branch, state, next_node),
-        CodeItem::LookupSwitch(_) | CodeItem::TableSwitch(_) => {
-            let (next, _) = state.pop(1)?;
-            Ok(next)
-        }
-        CodeItem::Label(_) => Err(AnalysisError::InvalidControlFlow {
-            reason: "labels do not execute".to_owned(),
-        }),
-    }
-}
-
-fn simulate_var(var: &VarInsn, state: &FrameState) -> Result<FrameState, AnalysisError> {
-    match var.opcode {
-        0x15 => Ok(state.push([VType::Integer])),
-        0x16 => Ok(state.push([VType::Long])),
-        0x17 => Ok(state.push([VType::Float])),
-        0x18 => Ok(state.push([VType::Double])),
-        0x19 => Ok(state.push([state.get_local(var.slot as usize)?.clone()])),
-        0x36 => {
-            let (next, _) = state.pop(1)?;
-            Ok(next.set_local(var.slot as usize, VType::Integer))
-        }
-        0x37 => {
-            let (next, _) = state.pop(2)?;
-            Ok(next.set_local(var.slot as usize, VType::Long))
-        }
-        0x38 => {
-            let (next, _) = state.pop(1)?;
-            Ok(next.set_local(var.slot as usize, VType::Float))
-        }
-        0x39 => {
-            let (next, _) = state.pop(2)?;
-            Ok(next.set_local(var.slot as usize, VType::Double))
-        }
-        0x3A => {
-            let (next, popped) = state.pop(1)?;
-            let value = popped
-                .first()
-                .cloned()
-                .ok_or(AnalysisError::StackUnderflow {
-                    needed: 1,
-                    available: 0,
-                })?;
-            Ok(next.set_local(var.slot as usize, value))
-        }
-        0xA9 => {
-            let value = state.get_local(var.slot as usize)?;
-            if matches!(value, VType::ReturnAddress(targets) if !targets.is_empty()) {
-                Ok(state.clone())
-            } else {
-                Err(AnalysisError::InvalidLocal {
-                    index: var.slot as usize,
-                    reason: "ret requires returnAddress local".to_owned(),
-                })
-            }
-        }
-        opcode => Err(AnalysisError::UnsupportedInstruction { opcode }),
-    }
-}
-
-fn simulate_iinc(iinc: &IIncInsn, state: &FrameState) -> Result<FrameState, AnalysisError> {
-    let value = state.get_local(iinc.slot as usize)?;
-    if !matches!(value, VType::Integer) {
-        return Err(AnalysisError::InvalidLocal {
-            index: iinc.slot as usize,
-            reason: "iinc requires integer local".to_owned(),
-        });
-    }
-    Ok(state.clone())
-}
-
-fn simulate_field(field: &FieldInsn, state: &FrameState) -> Result<FrameState, AnalysisError> {
-    let descriptor = parse_field_descriptor(&field.descriptor).map_err(|error| {
-        AnalysisError::InvalidControlFlow {
-            reason: error.to_string(),
-        }
-    })?;
-    let field_type = vtype_from_descriptor(&descriptor);
-    let field_slots = slot_size(&descriptor);
-    match field.opcode {
-        0xB2 => Ok(state.push([field_type])),
-        0xB3 => {
-            let (next, _) = state.pop(field_slots)?;
-            Ok(next)
-        }
-        0xB4 => {
-            let (next, _) = state.pop(1)?;
-            Ok(next.push([field_type]))
-        }
-        0xB5 => {
-            let (next, _) = state.pop(field_slots + 1)?;
-            Ok(next)
-        }
-        opcode => Err(AnalysisError::UnsupportedInstruction { opcode }),
-    }
-}
-
-fn simulate_method(
-    method: &MethodInsn,
-    state: &FrameState,
-    _class_name: &str,
-) -> Result<FrameState, AnalysisError> {
-    let parsed = parse_method_descriptor(&method.descriptor).map_err(|error| {
-        AnalysisError::InvalidControlFlow {
-            reason: error.to_string(),
-        }
-    })?;
-    let arg_slots = parsed.parameter_types.iter().map(slot_size).sum::<usize>();
-    let (after_args, _) = state.pop(arg_slots)?;
-    let receiver_state = if method.opcode == 0xB8 {
-        after_args
-    } else {
-        let (after_receiver, receiver) = after_args.pop(1)?;
-        if method.opcode == 0xB7 && method.name == "<init>" {
-            let replacement = VType::Object(method.owner.clone());
-            initialize_receiver(&after_receiver, receiver.first().cloned(), replacement)
-        } else {
-            after_receiver
-        }
-    };
-    match &parsed.return_type {
-        ReturnType::Void => Ok(receiver_state),
-        ReturnType::Field(field) => Ok(receiver_state.push([vtype_from_descriptor(field)])),
-    }
-}
-
-fn simulate_interface_method(
-    method: &InterfaceMethodInsn,
-    state: &FrameState,
-) -> Result<FrameState, AnalysisError> {
-    let parsed = parse_method_descriptor(&method.descriptor).map_err(|error| {
-        AnalysisError::InvalidControlFlow {
-            reason: error.to_string(),
-        }
-    })?;
-    let arg_slots = parsed.parameter_types.iter().map(slot_size).sum::<usize>();
-    let (after_args, _) = state.pop(arg_slots)?;
-    let (after_receiver, _) = after_args.pop(1)?;
-    match &parsed.return_type {
-        ReturnType::Void => Ok(after_receiver),
-        ReturnType::Field(field) => Ok(after_receiver.push([vtype_from_descriptor(field)])),
-    }
-}
-
-fn simulate_invokedynamic(
-    insn: &InvokeDynamicInsn,
-    state: &FrameState,
-) -> Result<FrameState, AnalysisError> {
-    let parsed = parse_method_descriptor(&insn.descriptor).map_err(|error| {
-        AnalysisError::InvalidControlFlow {
-            reason: error.to_string(),
-        }
-    })?;
-    let arg_slots = parsed.parameter_types.iter().map(slot_size).sum::<usize>();
-    let (after_args, _) = state.pop(arg_slots)?;
-    match &parsed.return_type {
-        ReturnType::Void => Ok(after_args),
-        ReturnType::Field(field) => Ok(after_args.push([vtype_from_descriptor(field)])),
-    }
-}
-
-fn simulate_type(
-    insn: &TypeInsn,
-    state: &FrameState,
-    code_index: usize,
-) -> Result<FrameState, AnalysisError> {
-    match insn.opcode {
-        0xBB => Ok(state.push([VType::Uninitialized {
-            code_index,
-            class_name: insn.descriptor.clone(),
-        }])),
-        0xBD => {
-            let (next, _) = state.pop(1)?;
-            Ok(next.push([VType::Object(anewarray_descriptor(&insn.descriptor))]))
-        }
-        0xC0 => {
-            let (next, _) = state.pop(1)?;
-            Ok(next.push([VType::Object(insn.descriptor.clone())]))
-        }
-        0xC1 => {
-            let (next, _) = state.pop(1)?;
-            Ok(next.push([VType::Integer]))
-        }
-        opcode => Err(AnalysisError::UnsupportedInstruction { opcode }),
-    }
-}
-
-fn simulate_ldc(insn: &LdcInsn, state: &FrameState) -> Result<FrameState, AnalysisError> {
-    let value = match &insn.value {
-        LdcValue::Int(_) => VType::Integer,
-        LdcValue::FloatBits(_) => VType::Float,
-        LdcValue::Long(_) => VType::Long,
-        LdcValue::DoubleBits(_) => VType::Double,
-        LdcValue::String(_) => VType::Object("java/lang/String".to_owned()),
-        LdcValue::Class(_) => VType::Object("java/lang/Class".to_owned()),
-        LdcValue::MethodType(_) => VType::Object("java/lang/invoke/MethodType".to_owned()),
-        LdcValue::MethodHandle(_) => VType::Object("java/lang/invoke/MethodHandle".to_owned()),
-        LdcValue::Dynamic(dynamic) => {
-            let descriptor = parse_field_descriptor(&dynamic.descriptor).map_err(|error| {
-                AnalysisError::InvalidControlFlow {
-                    reason: error.to_string(),
-                }
-            })?;
-            vtype_from_descriptor(&descriptor)
-        }
-    };
-    Ok(state.push([value]))
-}
-
-fn simulate_multianewarray(
-    insn: &MultiANewArrayInsn,
-    state: &FrameState,
-) -> Result<FrameState, AnalysisError> {
-    let (next, _) = state.pop(insn.dimensions as usize)?;
-    Ok(next.push([VType::Object(insn.descriptor.clone())]))
-}
-
-fn simulate_branch(
-    branch: &BranchInsn,
-    state: &FrameState,
-    next_node: Option<usize>,
-) -> Result<FrameState, AnalysisError> {
-    let pops = match branch.opcode {
-        0x99..=0x9E | 0xC6 | 0xC7 => 1,
-        0x9F..=0xA6 => 2,
-        0xA7 => 0,
-        0xA8 => return simulate_jsr(state, next_node),
-        opcode => return Err(AnalysisError::UnsupportedInstruction { opcode }),
-    };
-    Ok(state.pop(pops)?.0)
-}
-
-fn simulate_jsr(state: &FrameState, next_node: Option<usize>) -> Result<FrameState, AnalysisError> {
-    let return_target = next_node.ok_or_else(|| AnalysisError::InvalidControlFlow {
-        reason: "jsr/jsr_w requires a reachable continuation instruction".to_owned(),
-    })?;
-    Ok(state.push([VType::ReturnAddress(vec![return_target])]))
-}
-
-fn dynamic_successors(item: &CodeItem, state: &FrameState) -> Option<Vec<usize>> {
-    match item {
-        CodeItem::Var(var) if var.opcode == 0xA9 => match state.get_local(var.slot as usize) {
-            Ok(VType::ReturnAddress(targets)) => Some(targets.clone()),
-            _ => Some(Vec::new()),
-        },
-        _ => None,
-    }
-}
-
-fn simulate_raw_opcode(
-    opcode: u8,
-    state: &FrameState,
-    raw: &crate::raw::Instruction,
-    _code_index: usize,
-) -> Result<FrameState, AnalysisError> {
-    match opcode {
-        0x00 => Ok(state.clone()),
-        0x01 => Ok(state.push([VType::Null])),
-        0x02..=0x08 | 0x10 | 0x11 => Ok(state.push([VType::Integer])),
-        0x09..=0x0A => Ok(state.push([VType::Long])),
-        0x0B..=0x0D => Ok(state.push([VType::Float])),
-        0x0E..=0x0F => Ok(state.push([VType::Double])),
-        0x57 => Ok(state.pop(1)?.0),
-        0x58 => Ok(state.pop(2)?.0),
-        0x59 => {
-            let value = state.peek(0)?.clone();
-            Ok(FrameState {
-                stack: [state.stack.clone(), vec![value]].concat(),
-                locals: state.locals.clone(),
-            })
-        }
-        0x5A => {
-            let v1 = state.peek(0)?.clone();
-            let v2 = state.peek(1)?.clone();
-            Ok(FrameState {
-                stack: [
-                    state.stack[..state.stack.len() - 2].to_vec(),
-                    vec![v1.clone(), v2, v1],
-                ]
-                .concat(),
-                locals: state.locals.clone(),
-            })
-        }
-        0x5B => {
-            let v1 = state.peek(0)?.clone();
-            let v2 = state.peek(1)?.clone();
-            let v3 = state.peek(2)?.clone();
-            Ok(FrameState {
-                stack: [
-                    state.stack[..state.stack.len() - 3].to_vec(),
-                    vec![v1.clone(), v3, v2, v1],
-                ]
-                .concat(),
-                locals: state.locals.clone(),
-            })
-        }
-        0x5C => {
-            let v1 = state.peek(0)?.clone();
-            let v2 = state.peek(1)?.clone();
-            Ok(FrameState {
-                stack: [state.stack.clone(), vec![v2, v1]].concat(),
-                locals: state.locals.clone(),
-            })
-        }
-        0x5D => {
-            let v1 = state.peek(0)?.clone();
-            let v2 = state.peek(1)?.clone();
-            let v3 = state.peek(2)?.clone();
-            Ok(FrameState {
-                stack: [
-                    state.stack[..state.stack.len() - 3].to_vec(),
-                    vec![v2.clone(), v1.clone(), v3, v2, v1],
-                ]
-                .concat(),
-                locals: state.locals.clone(),
-            })
-        }
-        0x5E => {
-            let v1 = state.peek(0)?.clone();
-            let v2 = state.peek(1)?.clone();
-            let v3 = state.peek(2)?.clone();
-            let v4 = state.peek(3)?.clone();
-            Ok(FrameState {
-                stack: [
-                    state.stack[..state.stack.len() - 4].to_vec(),
-                    vec![v2.clone(), v1.clone(), v4, v3, v2, v1],
-                ]
-                .concat(),
-                locals: state.locals.clone(),
-            })
-        }
-        0x5F => {
-            let v1 = state.peek(0)?.clone();
-            let v2 = state.peek(1)?.clone();
-            Ok(FrameState {
-                stack: [state.stack[..state.stack.len() - 2].to_vec(), vec![v1, v2]].concat(),
-                locals: state.locals.clone(),
-            })
-        }
-        0x60 | 0x64 | 0x68 | 0x6C | 0x70 | 0x74 | 0x78 | 0x7A | 0x7C | 0x7E | 0x80 | 0x82 => {
-            Ok(state.pop(2)?.0.push([VType::Integer]))
-        }
-        0x61 | 0x65 | 0x69 | 0x6D | 0x71 | 0x75 | 0x79 | 0x7B | 0x7D | 0x7F | 0x81 | 0x83 => {
-            Ok(state.pop(4)?.0.push([VType::Long]))
-        }
-        0x62 | 0x66 | 0x6A | 0x6E | 0x72 | 0x76 => Ok(state.pop(2)?.0.push([VType::Float])),
-        0x63 | 0x67 | 0x6B | 0x6F | 0x73 | 0x77 => Ok(state.pop(4)?.0.push([VType::Double])),
-        0x85 => Ok(state.pop(1)?.0.push([VType::Long])),
-        0x86 => Ok(state.pop(1)?.0.push([VType::Float])),
-        0x87 => Ok(state.pop(1)?.0.push([VType::Double])),
-        0x88 => Ok(state.pop(2)?.0.push([VType::Integer])),
-        0x89 => Ok(state.pop(2)?.0.push([VType::Float])),
-        0x8A => Ok(state.pop(2)?.0.push([VType::Double])),
-        0x8B | 0x91 | 0x92 | 0x93 => Ok(state.pop(1)?.0.push([VType::Integer])),
-        0x8C => Ok(state.pop(1)?.0.push([VType::Long])),
-        0x8D => Ok(state.pop(1)?.0.push([VType::Double])),
-        0x8E => Ok(state.pop(2)?.0.push([VType::Integer])),
-        0x8F => Ok(state.pop(2)?.0.push([VType::Long])),
-        0x90 => Ok(state.pop(2)?.0.push([VType::Float])),
-        0x94..=0x98 => {
-            let pops = if opcode == 0x94 || opcode >= 0x97 {
-                4
-            } else {
-                2
-            };
-            Ok(state.pop(pops)?.0.push([VType::Integer]))
-        }
-        0x2E | 0x33..=0x35 => Ok(state.pop(2)?.0.push([VType::Integer])),
-        0x2F => Ok(state.pop(2)?.0.push([VType::Long])),
-        0x30 => Ok(state.pop(2)?.0.push([VType::Float])),
-        0x31 => Ok(state.pop(2)?.0.push([VType::Double])),
-        0x32 => {
-            let (next, popped) = state.pop(2)?;
-            let array = popped
-                .get(1)
-                .cloned()
-                .unwrap_or(VType::Object(JAVA_LANG_OBJECT.to_owned()));
-            Ok(next.push([aaload_type(&array)]))
-        }
-        0x4F | 0x51 | 0x53..=0x56 => Ok(state.pop(3)?.0),
-        0x50 | 0x52 => Ok(state.pop(4)?.0),
-        0xAC | 0xAE | 0xB0 | 0xBE | 0xC2 | 0xC3 => {
-            let push = if opcode == 0xBE {
-                Some(VType::Integer)
-            } else {
-                None
-            };
-            let next = state.pop(1)?.0;
-            Ok(match push {
-                Some(value) => next.push([value]),
-                None => next,
-            })
-        }
-        0xAD | 0xAF => Ok(state.pop(2)?.0),
-        0xB1 => Ok(state.clone()),
-        0xBF => Ok(state.pop(1)?.0),
-        0xBC => {
-            let (next, _) = state.pop(1)?;
-            let descriptor = match raw {
-                crate::raw::Instruction::NewArray(insn) => newarray_descriptor(insn.atype),
-                _ => "[I".to_owned(),
-            };
-            Ok(next.push([VType::Object(descriptor)]))
-        }
-        opcode => Err(AnalysisError::UnsupportedInstruction { opcode }),
-    }
-}
-
-fn initialize_receiver(
-    state: &FrameState,
-    receiver: Option<VType>,
-    replacement: VType,
-) -> FrameState {
-    let Some(receiver) = receiver else {
-        return state.clone();
-    };
-    match receiver {
-        VType::UninitializedThis | VType::Uninitialized { .. } => FrameState {
-            stack: state
-                .stack
-                .iter()
-                .map(|value| {
-                    if value == &receiver {
-                        replacement.clone()
-                    } else {
-                        value.clone()
-                    }
-                })
-                .collect(),
-            locals: state
-                .locals
-                .iter()
-                .map(|value| {
-                    if value == &receiver {
-                        replacement.clone()
-                    } else {
-                        value.clone()
-                    }
-                })
-                .collect(),
-        },
-        _ => state.clone(),
-    }
-}
-
 fn branch_targets(item: &CodeItem) -> Vec<crate::model::Label> {
     match item {
         CodeItem::Branch(branch) => vec![branch.target.clone()],
@@ -1183,41 +893,3 @@ fn descriptor_component(descriptor: &FieldDescriptor) -> String {
         }
     }
 }
-
-fn newarray_descriptor(atype: ArrayType) -> String {
-    match atype {
-        ArrayType::Boolean => "[Z".to_owned(),
-        ArrayType::Char => "[C".to_owned(),
-        ArrayType::Float => "[F".to_owned(),
-        ArrayType::Double => "[D".to_owned(),
-        ArrayType::Byte => "[B".to_owned(),
-        ArrayType::Short => "[S".to_owned(),
-        ArrayType::Int => "[I".to_owned(),
-        ArrayType::Long => "[J".to_owned(),
-    }
-}
-
-fn anewarray_descriptor(descriptor: &str) -> String {
-    if descriptor.starts_with('[') {
-        format!("[{descriptor}")
-    } else {
-        format!("[L{descriptor};")
-    }
-}
-
-fn aaload_type(array: &VType) -> VType {
-    let VType::Object(class_name) = array else {
-        return VType::Object(JAVA_LANG_OBJECT.to_owned());
-    };
-    if !class_name.starts_with('[') {
-        return VType::Object(JAVA_LANG_OBJECT.to_owned());
-    }
-    let component = &class_name[1..];
-    if component.starts_with('L') && component.ends_with(';') {
-        return VType::Object(component[1..component.len() - 1].to_owned());
-    }
-    if component.starts_with('[') {
-        return VType::Object(component.to_owned());
-    }
-    VType::Object(JAVA_LANG_OBJECT.to_owned())
-}
@@ -0,0 +1,278 @@
+//! Columnar field, method and type references across many classes.
+//!
+//! Classes are read at [`ReadLevel::Lazy`] and only their `Code` attributes
+//! are decoded. Each class interns its strings by constant-pool index, so a
+//! name is decoded once per class however often it is referenced; the
+//! per-class tables are then merged into one shared string table.
+
+use crate::indexes::{ClassIndex, CpIndex, NameAndTypeIndex, Utf8Index};
+use crate::modified_utf8::decode_modified_utf8;
+use crate::parallel::{try_parallel_map, worker_count};
+use crate::raw::{AttributeInfo, ConstantPoolEntry, Instruction};
+use crate::reader::{ReadLevel, decode_attribute, parse_class_at};
+use crate::{EngineError, EngineErrorKind, Result};
+use rustc_hash::FxHashMap;
+
+/// One row per reference, with every string an index into
+/// [`ReferenceTable::strings`].
+///
+/// Index 0 is always the empty string, used for the owner of an
+/// `invokedynamic` call site and the name and descriptor of a type
+/// reference. Rows appear in input class order, then method order, then
+/// bytecode order.
+#[derive(Debug, Clone, PartialEq, Eq)]
+pub struct ReferenceTable {
+    pub strings: Vec<String>,
+    /// The class containing the reference.
+    pub classes: Vec<u32>,
+    /// Name and descriptor of the method containing the reference.
+    pub methods: Vec<u32>,
+    pub method_descriptors: Vec<u32>,
+    /// Bytecode offset of the referencing instruction.
+    pub offsets: Vec<u32>,
+    pub opcodes: Vec<u8>,
+    pub owners: Vec<u32>,
+    pub names: Vec<u32>,
+    pub descriptors: Vec<u32>,
+}
+
+impl Default for ReferenceTable {
+    fn default() -> Self {
+        Self {
+            strings: vec![String::new()],
+            classes: Vec::new(),
+            methods: Vec::new(),
+            method_descriptors: Vec::new(),
+            offsets: Vec::new(),
+            opcodes: Vec::new(),
+            owners: Vec::new(),
+            names: Vec::new(),
+            descriptors: Vec::new(),
+        }
+    }
+}
+
+impl ReferenceTable {
+    pub fn len(&self) -> usize {
+        self.opcodes.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.opcodes.is_empty()
+    }
+
+    /// Concatenate per-class tables in order, re-interning their strings
+    /// into one shared table.
+    pub fn merge(tables: Vec<ReferenceTable>) -> Self {
+        let rows = tables.iter().map(ReferenceTable::len).sum();
+        let mut merged = ReferenceTable {
+            strings: Vec::new(),
+            classes: Vec::with_capacity(rows),
+            methods: Vec::with_capacity(rows),
+            method_descriptors: Vec::with_capacity(rows),
+            offsets: Vec::with_capacity(rows),
+            opcodes: Vec::with_capacity(rows),
+            owners: Vec::with_capacity(rows),
+            names: Vec::with_capacity(rows),
+            descriptors: Vec::with_capacity(rows),
+        };
+        let mut interned = FxHashMap::<String, u32>::default();
+        interned.insert(String::new(), 0);
+        for table in tables {
+            let ids = table
+                .strings
+                .into_iter()
+                .map(|value| {
+                    let next = interned.len() as u32;
+                    *interned.entry(value).or_insert(next)
+                })
+                .collect::<Vec<_>>();
+            let remap = |column: Vec<u32>, into: &mut Vec<u32>| {
+                into.extend(column.into_iter().map(|id| ids[id as usize]));
+            };
+            remap(table.classes, &mut merged.classes);
+            remap(table.methods, &mut merged.methods);
+            remap(table.method_descriptors, &mut merged.method_descriptors);
+            remap(table.owners, &mut merged.owners);
+            remap(table.names, &mut merged.names);
+            remap(table.descriptors, &mut merged.descriptors);
+            merged.offsets.extend(table.offsets);
+            merged.opcodes.extend(table.opcodes);
+        }
+        merged.strings = vec![String::new(); interned.len()];
+        for (value, id) in interned {
+            merged.strings[id as usize] = value;
+        }
+        merged
+    }
+}
+
+/// Scan every field, method and type reference in `classes` on up to
+/// `workers` threads (`0` uses every available core).
+///
+/// Covers field access, `invoke*` (including `invokedynamic`), `new`,
+/// `anewarray`, `checkcast`, `instanceof`, `multianewarray` and `ldc` of a
+/// class constant.
+pub fn scan_references<B>(classes: &[B], workers: usize) -> Result<ReferenceTable>
+where
+    B: AsRef<[u8]> + Sync,
+{
+    let tables = try_parallel_map(classes, worker_count(workers), |bytes| {
+        scan_class_references(bytes.as_ref())
+    })?;
+    Ok(ReferenceTable::merge(tables))
+}
+
+/// Scan the references made by a single class; see [`scan_references`].
+pub fn scan_class_references(bytes: &[u8]) -> Result<ReferenceTable> {
+    let classfile = parse_class_at(bytes, ReadLevel::Lazy)?;
+    let pool = &classfile.constant_pool;
+    let mut strings = PoolStrings {
+        pool,
+        ids: vec![None; pool.len()],
+        table: ReferenceTable::default(),
+    };
+    let class = strings.class(classfile.this_class)?;
+    for method in &classfile.methods {
+        let name = strings.utf8(method.name_index)?;
+        let descriptor = strings.utf8(method.descriptor_index)?;
+        for attribute in &method.attributes {
+            let is_code = match attribute {
+                AttributeInfo::Code(_) => true,
+                AttributeInfo::Unknown(raw) => raw.name == "Code",
+                _ => false,
+            };
+            if !is_code {
+                continue;
+            }
+            let decoded = decode_attribute(attribute, pool)?;
+            let AttributeInfo::Code(code) = decoded.as_ref() else {
+                continue;
+            };
+            for instruction in &code.code {
+                let Some([owner, member_name, member_descriptor]) =
+                    strings.reference(instruction)?
+                else {
+                    continue;
+                };
+                let table = &mut strings.table;
+                table.classes.push(class);
+                table.methods.push(name);
+                table.method_descriptors.push(descriptor);
+                table.offsets.push(instruction.offset());
+                table.opcodes.push(instruction.opcode());
+                table.owners.push(owner);
+                table.names.push(member_name);
+                table.descriptors.push(member_descriptor);
+            }
+        }
+    }
+    Ok(strings.table)
+}
+
+/// Interns a class's constant-pool strings into its table, keyed by index.
+struct PoolStrings<'a> {
+    pool: &'a [Option<ConstantPoolEntry>],
+    ids: Vec<Option<u32>>,
+    table: ReferenceTable,
+}
+
+impl PoolStrings<'_> {
+    fn entry(&self, index: u16) -> Result<&ConstantPoolEntry> {
+        self.pool
+            .get(usize::from(index))
+            .and_then(Option::as_ref)
+            .ok_or_else(|| EngineError::new(0, EngineErrorKind::InvalidConstantPoolIndex { index }))
+    }
+
+    fn utf8(&mut self, index: Utf8Index) -> Result<u32> {
+        let raw = index.value();
+        if let Some(id) = self.ids.get(usize::from(raw)).copied().flatten() {
+            return Ok(id);
+        }
+        let ConstantPoolEntry::Utf8(info) = self.entry(raw)? else {
+            return Err(not_a(raw, "Utf8"));
+        };
+        let value = decode_modified_utf8(&info.bytes)?;
+        let id = self.table.strings.len() as u32;
+        self.table.strings.push(value);
+        self.ids[usize::from(raw)] = Some(id);
+        Ok(id)
+    }
+
+    fn class(&mut self, index: ClassIndex) -> Result<u32> {
+        let raw = index.value();
+        let ConstantPoolEntry::Class(info) = self.entry(raw)? else {
+            return Err(not_a(raw, "Class"));
+        };
+        self.utf8(info.name_index)
+    }
+
+    fn name_and_type(&mut self, index: NameAndTypeIndex) -> Result<[u32; 2]> {
+        let raw = index.value();
+        let ConstantPoolEntry::NameAndType(info) = self.entry(raw)? else {
+            return Err(not_a(raw, "NameAndType"));
+        };
+        let (name, descriptor) = (info.name_index, info.descriptor_index);
+        Ok([self.utf8(name)?, self.utf8(descriptor)?])
+    }
+
+    fn member(&mut self, index: CpIndex) -> Result<[u32; 3]> {
+        let raw = index.value();
+        let (class_index, name_and_type_index) = match self.entry(raw)? {
+            ConstantPoolEntry::FieldRef(info) => (info.class_index, info.name_and_type_index),
+            ConstantPoolEntry::MethodRef(info) => (info.class_index, info.name_and_type_index),
+            ConstantPoolEntry::InterfaceMethodRef(info) => {
+                (info.class_index, info.name_and_type_index)
+            }
+            _ => return Err(not_a(raw, "member reference")),
+        };
+        let owner = self.class(class_index)?;
+        let [name, descriptor] = self.name_and_type(name_and_type_index)?;
+        Ok([owner, name, descriptor])
+    }
+
+    /// `[owner, name, descriptor]` of the reference `instruction` makes, if any.
+    fn reference(&mut self, instruction: &Instruction) -> Result<Option<[u32; 3]>> {
+        let type_ref = |strings: &mut Self, index: u16| -> Result<Option<[u32; 3]>> {
+            Ok(Some([strings.class(ClassIndex::from(index))?, 0, 0]))
+        };
+        match instruction {
+            Instruction::ConstantPoolIndexWide(insn) => match insn.opcode {
+                0xB2..=0xB8 => self.member(insn.index).map(Some),
+                0xBB | 0xBD | 0xC0 | 0xC1 => type_ref(self, insn.index.value()),
+                0x13 if matches!(self.entry(insn.index.value())?, ConstantPoolEntry::Class(_)) => {
+                    type_ref(self, insn.index.value())
+                }
+                _ => Ok(None),
+            },
+            Instruction::ConstantPoolIndex1 {
+                opcode: 0x12,
+                index,
+                ..
+            } if matches!(self.entry(u16::from(*index))?, ConstantPoolEntry::Class(_)) => {
+                type_ref(self, u16::from(*index))
+            }
+            Instruction::InvokeInterface(insn) => self.member(insn.index).map(Some),
+            Instruction::InvokeDynamic(insn) => {
+                let raw = insn.index.value();
+                let ConstantPoolEntry::InvokeDynamic(info) = self.entry(raw)? else {
+                    return Err(not_a(raw, "InvokeDynamic"));
+                };
+                let [name, descriptor] = self.name_and_type(info.name_and_type_index)?;
+                Ok(Some([0, name, descriptor]))
+            }
+            Instruction::MultiANewArray { index, .. } => type_ref(self, index.value()),
+            _ => Ok(None),
+        }
+    }
+}
+
+fn not_a(index: u16, kind: &str) -> EngineError {
+    EngineError::new(
+        0,
+        EngineErrorKind::InvalidModelState {
+            reason: format!("constant-pool entry {index} is not {kind}"),
+        },
+    )
+}
@@ -16,6 +16,11 @@ impl<'a> ByteReader<'a> {
         self.offset
     }
 
+    #[inline]
+    pub(crate) fn bytes(&self) -> &'a [u8] {
+        self.bytes
+    }
+
     #[inline]
     pub(crate) fn remaining(&self) -> usize {
         self.bytes.len().saturating_sub(self.offset)
@@ -82,10 +87,9 @@ impl ByteWriter {
         }
     }
 
-    pub(crate) fn with_capacity(capacity: usize) -> Self {
-        Self {
-            bytes: Vec::with_capacity(capacity),
-        }
+    /// Append to `bytes` rather than a fresh buffer.
+    pub(crate) fn from_vec(bytes: Vec<u8>) -> Self {
+        Self { bytes }
     }
 
     #[inline]
@@ -9,6 +9,7 @@ pub mod fixtures;
 pub mod indexes;
 pub mod model;
 pub mod modified_utf8;
+pub mod parallel;
 pub mod raw;
 pub mod reader;
 pub mod signatures;
@@ -21,5 +22,8 @@ pub use indexes::{
     BootstrapMethodIndex, ClassIndex, CpIndex, FieldRefIndex, MethodRefIndex, ModuleIndex,
     NameAndTypeIndex, PackageIndex, Utf8Index,
 };
-pub use reader::{ClassReader, parse_class, parse_class_bytes, parse_instructions};
-pub use writer::{ClassWriter, write_class};
+pub use reader::{
+    ClassHeader, ClassReader, ReadLevel, decode_attribute, parse_class, parse_class_at,
+    parse_class_bytes, parse_classes, parse_instructions, read_class_header,
+};
+pub use writer::{ClassWriter, write_class, write_class_into};
@@ -2,8 +2,12 @@ mod constant_pool_builder;
 mod debug_info;
 mod labels;
 mod operands;
+mod table;
 
-use crate::analysis::{ClassResolver, FrameComputationResult, VType, recompute_frames};
+use crate::analysis::{
+    ClassResolver, FrameBaseline, FrameComputationResult, FrameState, VType, initial_frame,
+    recompute_frames, recompute_frames_incremental,
+};
 pub use constant_pool_builder::ConstantPoolBuilder;
 pub use debug_info::{DebugInfoPolicy, DebugInfoState};
 pub use labels::{
@@ -14,19 +18,23 @@ pub use operands::{
     DynamicValue, FieldInsn, IIncInsn, InterfaceMethodInsn, InvokeDynamicInsn, LdcInsn, LdcValue,
     MethodHandleValue, MethodInsn, MultiANewArrayInsn, TypeInsn, VarInsn,
 };
+pub use table::{InstructionTable, MISSING_LABEL, OperandKind};
 
 use crate::constants::{ClassAccessFlags, FieldAccessFlags, MAGIC, MethodAccessFlags};
 use crate::descriptors::{is_valid_field_descriptor, is_valid_method_descriptor};
 use crate::indexes::{ClassIndex, CpIndex, Utf8Index};
+use crate::parallel::{try_parallel_map, worker_count};
 use crate::raw::{
     AttributeInfo, Branch, ClassFile, CodeAttribute, ConstantPoolEntry, FieldInfo, Instruction,
     InvokeDynamicInsn as RawInvokeDynamicInsn, InvokeInterfaceInsn as RawInvokeInterfaceInsn,
     LookupSwitchInsn as RawLookupSwitchInsn, MatchOffsetPair, MethodInfo, RawClassStub,
-    TableSwitchInsn as RawTableSwitchInsn, UnknownAttribute, WideInstruction,
+    StackMapFrameInfo, TableSwitchInsn as RawTableSwitchInsn, UnknownAttribute,
+    VerificationTypeInfo, WideInstruction,
 };
 use crate::transform::InsnMatcher;
-use crate::{EngineError, EngineErrorKind, Result, parse_class, write_class};
+use crate::{EngineError, EngineErrorKind, Result, decode_attribute, parse_class, write_class};
 use rustc_hash::FxHashMap;
+use std::borrow::Cow;
 use std::collections::BTreeMap;
 
 #[derive(Debug, Clone, PartialEq, Eq)]
@@ -147,6 +155,11 @@ impl CodeModel {
         &self.nested_attribute_layout
     }
 
+    /// Export the instructions as a columnar [`InstructionTable`].
+    pub fn instruction_table(&self) -> InstructionTable {
+        InstructionTable::from_code(self)
+    }
+
     /// Find the indexes of all instructions matching `matcher`.
     pub fn find_insns(&self, matcher: &InsnMatcher) -> Vec<usize> {
         self.instructions
@@ -292,6 +305,38 @@ enum MethodAttributeLayout {
 struct OriginalCodeShape {
     instructions: Vec<CodeItem>,
     exception_handlers: Vec<ExceptionHandler>,
+    code_length: u32,
+    max_stack: u16,
+    max_locals: u16,
+    /// Owner, descriptor and `static`-ness the original frames were verified against.
+    frame_context: FrameContext,
+    stack_map: Option<OriginalStackMap>,
+}
+
+#[derive(Debug, Clone, PartialEq, Eq)]
+struct FrameContext {
+    class_name: String,
+    descriptor: String,
+    is_static: bool,
+    is_constructor: bool,
+}
+
+impl FrameContext {
+    fn of(class_name: &str, method: &MethodModel) -> Self {
+        Self {
+            class_name: class_name.to_owned(),
+            descriptor: method.descriptor.clone(),
+            is_static: method.access_flags.contains(MethodAccessFlags::STATIC),
+            is_constructor: method.name == "<init>",
+        }
+    }
+}
+
+/// The lifted `StackMapTable`, with the label at each frame's offset if it has one.
+#[derive(Debug, Clone, PartialEq, Eq)]
+struct OriginalStackMap {
+    entries: Vec<StackMapFrameInfo>,
+    labels: Vec<Option<Label>>,
 }
 
 impl MethodModel {
@@ -338,10 +383,31 @@ pub fn lift_classes(raw_classes: &[RawClassStub]) -> Result<Vec<ClassModel>> {
     raw_classes.iter().map(ClassModel::from_raw_class).collect()
 }
 
+/// [`lift_classes`] on up to `workers` threads (`0` = all cores), in input order.
+pub fn lift_classes_parallel(
+    raw_classes: &[RawClassStub],
+    workers: usize,
+) -> Result<Vec<ClassModel>> {
+    try_parallel_map(
+        raw_classes,
+        worker_count(workers),
+        ClassModel::from_raw_class,
+    )
+}
+
 pub fn lower_models(models: &[ClassModel]) -> Result<Vec<RawClassStub>> {
     models.iter().map(ClassModel::lower_to_raw_class).collect()
 }
 
+/// [`lower_models`] on up to `workers` threads (`0` = all cores), in input order.
+pub fn lower_models_parallel(models: &[ClassModel], workers: usize) -> Result<Vec<RawClassStub>> {
+    try_parallel_map(
+        models,
+        worker_count(workers),
+        ClassModel::lower_to_raw_class,
+    )
+}
+
 impl ClassModel {
     pub fn from_raw_class(raw_class: &RawClassStub) -> Result<Self> {
         let classfile = parse_class(&raw_class.bytes)?;
@@ -358,6 +424,18 @@ impl ClassModel {
         Ok(model)
     }
 
+    /// Lift a batch of classfiles on up to `workers` threads (`0` = all cores).
+    ///
+    /// Results keep input order; the first failing input in that order is reported.
+    pub fn from_bytes_many<B: AsRef<[u8]> + Sync>(
+        classes: &[B],
+        workers: usize,
+    ) -> Result<Vec<Self>> {
+        try_parallel_map(classes, worker_count(workers), |bytes| {
+            Self::from_bytes(bytes.as_ref())
+        })
+    }
+
     pub fn from_classfile(classfile: &ClassFile) -> Result<Self> {
         let cp = ConstantPoolBuilder::from_pool(&classfile.constant_pool);
         let name = cp.resolve_class_name(classfile.this_class)?;
@@ -374,12 +452,12 @@ impl ClassModel {
         let fields = classfile
             .fields
             .iter()
-            .map(|field| lift_field_model(field, &cp))
+            .map(|field| lift_field_model(field, &cp, &classfile.constant_pool))
             .collect::<Result<Vec<_>>>()?;
         let methods = classfile
             .methods
             .iter()
-            .map(|method| lift_method_model(method, &cp))
+            .map(|method| lift_method_model(method, &name, &cp, &classfile.constant_pool))
             .collect::<Result<Vec<_>>>()?;
 
         Ok(Self {
@@ -392,7 +470,7 @@ impl ClassModel {
             interfaces,
             fields,
             methods,
-            attributes: classfile.attributes.clone(),
+            attributes: decode_raw_attributes(&classfile.attributes, &classfile.constant_pool)?,
             constant_pool: cp,
             debug_info_state: DebugInfoState::Fresh,
         })
@@ -500,44 +578,67 @@ pub fn mark_method_debug_info_stale(method: &mut MethodModel) {
     }
 }
 
-fn lift_field_model(field: &FieldInfo, cp: &ConstantPoolBuilder) -> Result<FieldModel> {
+/// Clone `attributes`, decoding any that a lazy read kept as raw bytes.
+fn decode_raw_attributes(
+    attributes: &[AttributeInfo],
+    pool: &[Option<ConstantPoolEntry>],
+) -> Result<Vec<AttributeInfo>> {
+    attributes
+        .iter()
+        .map(|attribute| decode_attribute(attribute, pool).map(Cow::into_owned))
+        .collect()
+}
+
+fn lift_field_model(
+    field: &FieldInfo,
+    cp: &ConstantPoolBuilder,
+    pool: &[Option<ConstantPoolEntry>],
+) -> Result<FieldModel> {
     Ok(FieldModel {
         access_flags: field.access_flags,
         name: cp.resolve_utf8(field.name_index)?,
         descriptor: cp.resolve_utf8(field.descriptor_index)?,
-        attributes: field.attributes.clone(),
+        attributes: decode_raw_attributes(&field.attributes, pool)?,
     })
 }
 
-fn lift_method_model(method: &MethodInfo, cp: &ConstantPoolBuilder) -> Result<MethodModel> {
-    let mut code = None;
-    let mut attributes = Vec::new();
-    let mut attribute_layout = Vec::new();
+fn lift_method_model(
+    method: &MethodInfo,
+    class_name: &str,
+    cp: &ConstantPoolBuilder,
+    pool: &[Option<ConstantPoolEntry>],
+) -> Result<MethodModel> {
+    let mut lifted = MethodModel {
+        access_flags: method.access_flags,
+        name: cp.resolve_utf8(method.name_index)?,
+        descriptor: cp.resolve_utf8(method.descriptor_index)?,
+        code: None,
+        pre_built_code_bytes: None,
+        attributes: Vec::new(),
+        attribute_layout: Vec::new(),
+    };
     for attribute in &method.attributes {
-        match attribute {
+        let attribute = decode_attribute(attribute, pool)?;
+        match attribute.as_ref() {
             AttributeInfo::Code(code_attr) => {
-                code = Some(lift_code_model(code_attr, cp)?);
-                attribute_layout.push(MethodAttributeLayout::Code);
+                let frame_context = FrameContext::of(class_name, &lifted);
+                lifted.code = Some(lift_code_model(code_attr, cp, frame_context)?);
+                lifted.attribute_layout.push(MethodAttributeLayout::Code);
             }
             _ => {
-                attributes.push(attribute.clone());
-                attribute_layout.push(MethodAttributeLayout::Other);
+                lifted.attributes.push(attribute.into_owned());
+                lifted.attribute_layout.push(MethodAttributeLayout::Other);
             }
         }
     }
-
-    Ok(MethodModel {
-        access_flags: method.access_flags,
-        name: cp.resolve_utf8(method.name_index)?,
-        descriptor: cp.resolve_utf8(method.descriptor_index)?,
-        code,
-        pre_built_code_bytes: None,
-        attributes,
-        attribute_layout,
-    })
+    Ok(lifted)
 }
 
-fn lift_code_model(code: &CodeAttribute, cp: &ConstantPoolBuilder) -> Result<CodeModel> {
+fn lift_code_model(
+    code: &CodeAttribute,
+    cp: &ConstantPoolBuilder,
+    frame_context: FrameContext,
+) -> Result<CodeModel> {
     let mut labels_by_offset = BTreeMap::new();
     let end_offset = code.code_length;
 
@@ -555,6 +656,7 @@ fn lift_code_model(code: &CodeAttribute, cp: &ConstantPoolBuilder) -> Result<Cod
     let mut local_variable_types = Vec::new();
     let mut attributes = Vec::new();
     let mut layout = Vec::new();
+    let mut stack_map_entries = None;
     for attribute in &code.attributes {
         match parse_debug_attribute(attribute, cp, &mut labels_by_offset)? {
             ParsedDebugAttribute::LineNumbers(entries) => {
@@ -570,6 +672,9 @@ fn lift_code_model(code: &CodeAttribute, cp: &ConstantPoolBuilder) -> Result<Cod
                 layout.push(NestedCodeAttributeLayout::LocalVariableTypes);
             }
             ParsedDebugAttribute::StackMapTable(attribute) => {
+                if let AttributeInfo::StackMapTable(table) = &attribute {
+                    stack_map_entries = Some(table.entries.clone());
+                }
                 attributes.push(attribute);
                 layout.push(NestedCodeAttributeLayout::StackMapTable);
             }
@@ -592,6 +697,20 @@ fn lift_code_model(code: &CodeAttribute, cp: &ConstantPoolBuilder) -> Result<Cod
         label_for_existing_offset(&mut labels_by_offset, &entry.end);
     }
 
+    let stack_map = stack_map_entries.map(|entries| {
+        let mut offset = None;
+        let labels = entries
+            .iter()
+            .map(|entry| {
+                let delta = u32::from(stack_map_offset_delta(entry));
+                let current = offset.map_or(delta, |previous: u32| previous + delta + 1);
+                offset = Some(current);
+                labels_by_offset.get(&current).cloned()
+            })
+            .collect();
+        OriginalStackMap { entries, labels }
+    });
+
     let mut instructions = Vec::new();
     for instruction in &code.code {
         if let Some(label) = labels_by_offset.get(&instruction.offset()) {
@@ -632,6 +751,11 @@ fn lift_code_model(code: &CodeAttribute, cp: &ConstantPoolBuilder) -> Result<Cod
     let original_code_shape = OriginalCodeShape {
         instructions: instructions.clone(),
         exception_handlers: exception_handlers.clone(),
+        code_length: end_offset,
+        max_stack: code.max_stack,
+        max_locals: code.max_locals,
+        frame_context,
+        stack_map,
     };
 
     Ok(CodeModel {
@@ -973,22 +1097,50 @@ fn lower_code_model(
     frame_mode: FrameComputationMode,
     resolver: Option<&dyn ClassResolver>,
 ) -> Result<CodeAttribute> {
+    let layout = compute_code_layout(code, cp)?;
+    let frame_mode = if frame_mode == FrameComputationMode::Recompute
+        && original_frames_reusable(code, method, class_name, layout.code_length)
+    {
+        FrameComputationMode::Preserve
+    } else {
+        frame_mode
+    };
     if frame_mode == FrameComputationMode::Preserve {
         ensure_frame_sensitive_attrs_supported(code)?;
     }
-    let layout = compute_code_layout(code, cp)?;
     let frame_result = if frame_mode == FrameComputationMode::Recompute {
-        Some(
-            recompute_frames(
+        let recomputed = match original_frames(code, method, class_name, cp) {
+            Some(frames) => {
+                let original = code
+                    .original_code_shape
+                    .as_ref()
+                    .expect("original frames come from the original code shape");
+                recompute_frames_incremental(
+                    code,
+                    class_name,
+                    &method.name,
+                    &method.descriptor,
+                    method.access_flags,
+                    &FrameBaseline {
+                        instructions: &original.instructions,
+                        exception_handlers: &original.exception_handlers,
+                        frames: &frames,
+                        max_stack: original.max_stack,
+                        max_locals: original.max_locals,
+                    },
+                    resolver,
+                )
+            }
+            None => recompute_frames(
                 code,
                 class_name,
                 &method.name,
                 &method.descriptor,
                 method.access_flags,
                 resolver,
-            )
-            .map_err(|error| model_error(error.to_string()))?,
-        )
+            ),
+        };
+        Some(recomputed.map_err(|error| model_error(error.to_string()))?)
     } else {
         None
     };
@@ -2125,6 +2277,146 @@ fn ensure_frame_sensitive_attrs_supported(code: &CodeModel) -> Result<()> {
     Ok(())
 }
 
+/// Whether recomputing frames for `code` would only reproduce its original ones.
+///
+/// Holds when the method still has its lifted `StackMapTable` and neither its
+/// instructions, its exception handlers, nor the owner, descriptor and
+/// `static` flag its entry frame derives from have changed, and the lowered
+/// code is as long as the original so the table's offsets still line up. Such
+/// methods keep their original `StackMapTable` and `max_stack`/`max_locals`
+/// under [`FrameComputationMode::Recompute`] instead of being simulated again.
+fn original_frames_reusable(
+    code: &CodeModel,
+    method: &MethodModel,
+    class_name: &str,
+    code_length: u32,
+) -> bool {
+    let Some(original) = &code.original_code_shape else {
+        return false;
+    };
+    original.code_length == code_length
+        && original.frame_context == FrameContext::of(class_name, method)
+        && code
+            .attributes
+            .iter()
+            .any(|attribute| stack_map_attr_name(attribute) == Some("StackMapTable"))
+        && !code_shape_edited(code)
+}
+
+/// Decode the lifted `StackMapTable` of `code` into frames keyed by label.
+///
+/// Returns `None` when the frames cannot seed an incremental recomputation:
+/// the method had no `StackMapTable`, its owner or signature changed since
+/// lifting, or a frame holds an `uninitialized(offset)` type, whose `new`
+/// instruction has no label to follow it through edits.
+fn original_frames(
+    code: &CodeModel,
+    method: &MethodModel,
+    class_name: &str,
+    cp: &ConstantPoolBuilder,
+) -> Option<Vec<(Label, FrameState)>> {
+    let original = code.original_code_shape.as_ref()?;
+    let stack_map = original.stack_map.as_ref()?;
+    if original.frame_context != FrameContext::of(class_name, method) {
+        return None;
+    }
+    let initial = initial_frame(
+        class_name,
+        &method.name,
+        &method.descriptor,
+        method.access_flags,
+    )
+    .ok()?;
+    // Stack-map locals list a long or double once; frame states give it two slots.
+    let mut locals = Vec::with_capacity(initial.locals.len());
+    let mut slots = initial.locals.into_iter();
+    while let Some(value) = slots.next() {
+        if matches!(value, VType::Long | VType::Double) {
+            slots.next();
+        }
+        locals.push(value);
+    }
+    let verification_type = |value: &VerificationTypeInfo| match value {
+        VerificationTypeInfo::Top => Some(VType::Top),
+        VerificationTypeInfo::Integer => Some(VType::Integer),
+        VerificationTypeInfo::Float => Some(VType::Float),
+        VerificationTypeInfo::Double => Some(VType::Double),
+        VerificationTypeInfo::Long => Some(VType::Long),
+        VerificationTypeInfo::Null => Some(VType::Null),
+        VerificationTypeInfo::UninitializedThis => Some(VType::UninitializedThis),
+        VerificationTypeInfo::Object { cpool_index } => {
+            cp.resolve_class_name(*cpool_index).ok().map(VType::Object)
+        }
+        VerificationTypeInfo::Uninitialized { .. } => None,
+    };
+    let slot_form = |values: &[VType]| {
+        let mut slots = Vec::with_capacity(values.len());
+        for value in values {
+            slots.push(value.clone());
+            if matches!(value, VType::Long | VType::Double) {
+                slots.push(VType::Top);
+            }
+        }
+        slots
+    };
+
+    let mut frames = Vec::new();
+    for (entry, label) in stack_map.entries.iter().zip(&stack_map.labels) {
+        let stack = match entry {
+            StackMapFrameInfo::Same { .. } | StackMapFrameInfo::SameExtended { .. } => Vec::new(),
+            StackMapFrameInfo::SameLocals1StackItem { stack, .. }
+            | StackMapFrameInfo::SameLocals1StackItemExtended { stack, .. } => {
+                vec![verification_type(stack)?]
+            }
+            StackMapFrameInfo::Chop { frame_type, .. } => {
+                let chopped = usize::from(251_u8.checked_sub(*frame_type)?);
+                locals.truncate(locals.len().checked_sub(chopped)?);
+                Vec::new()
+            }
+            StackMapFrameInfo::Append {
+                locals: appended, ..
+            } => {
+                for value in appended {
+                    locals.push(verification_type(value)?);
+                }
+                Vec::new()
+            }
+            StackMapFrameInfo::Full {
+                locals: full,
+                stack,
+                ..
+            } => {
+                locals = full.iter().map(verification_type).collect::<Option<_>>()?;
+                stack.iter().map(verification_type).collect::<Option<_>>()?
+            }
+        };
+        if let Some(label) = label {
+            frames.push((
+                label.clone(),
+                FrameState {
+                    stack: slot_form(&stack),
+                    locals: slot_form(&locals),
+                },
+            ));
+        }
+    }
+    Some(frames)
+}
+
+fn stack_map_offset_delta(entry: &StackMapFrameInfo) -> u16 {
+    match entry {
+        StackMapFrameInfo::Same { frame_type } => u16::from(*frame_type),
+        StackMapFrameInfo::SameLocals1StackItem { frame_type, .. } => {
+            u16::from(frame_type.saturating_sub(64))
+        }
+        StackMapFrameInfo::SameLocals1StackItemExtended { offset_delta, .. }
+        | StackMapFrameInfo::Chop { offset_delta, .. }
+        | StackMapFrameInfo::SameExtended { offset_delta, .. }
+        | StackMapFrameInfo::Append { offset_delta, .. }
+        | StackMapFrameInfo::Full { offset_delta, .. } => *offset_delta,
+    }
+}
+
 fn code_shape_edited(code: &CodeModel) -> bool {
     let Some(original) = &code.original_code_shape else {
         return false;
@@ -2282,3 +2574,368 @@ fn rebase_instruction(instruction: &Instruction, offset: u32) -> Instruction {
         }),
     }
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::fixtures::compiled_fixture_paths_for;
+
+    fn object(name: &str) -> VType {
+        VType::Object(name.to_owned())
+    }
+
+    fn frame(locals: Vec<VType>, stack: Vec<VType>) -> FrameState {
+        FrameState { stack, locals }
+    }
+
+    /// A static `m(I)V` whose lifted `StackMapTable` is `entries`, one label per entry.
+    fn lifted_stack_map(entries: Vec<StackMapFrameInfo>) -> (MethodModel, Vec<Label>) {
+        let labels = (0..entries.len())
+            .map(|index| Label::named(format!("frame{index}")))
+            .collect::<Vec<_>>();
+        let mut method = MethodModel::new(
+            MethodAccessFlags::STATIC,
+            "m".to_owned(),
+            "(I)V".to_owned(),
+            None,
+            Vec::new(),
+        );
+        let mut code = CodeModel::new(3, 4, DebugInfoState::Fresh);
+        code.original_code_shape = Some(OriginalCodeShape {
+            instructions: Vec::new(),
+            exception_handlers: Vec::new(),
+            code_length: 0,
+            max_stack: 3,
+            max_locals: 4,
+            frame_context: FrameContext::of("Owner", &method),
+            stack_map: Some(OriginalStackMap {
+                entries,
+                labels: labels.iter().cloned().map(Some).collect(),
+            }),
+        });
+        method.code = Some(code);
+        (method, labels)
+    }
+
+    fn frames_of(
+        method: &MethodModel,
+        cp: &ConstantPoolBuilder,
+    ) -> Option<Vec<(Label, FrameState)>> {
+        let code = method.code.as_ref().expect("method should have code");
+        original_frames(code, method, "Owner", cp)
+    }
+
+    #[test]
+    fn original_frames_decode_each_frame_kind() -> Result<()> {
+        let mut cp = ConstantPoolBuilder::new();
+        let string = cp.add_class("java/lang/String")?;
+        let (mut method, labels) = lifted_stack_map(vec![
+            StackMapFrameInfo::Same { frame_type: 3 },
+            StackMapFrameInfo::Append {
+                frame_type: 253,
+                offset_delta: 4,
+                locals: vec![
+                    VerificationTypeInfo::Long,
+                    VerificationTypeInfo::Object {
+                        cpool_index: string,
+                    },
+                ],
+            },
+            StackMapFrameInfo::SameLocals1StackItem {
+                frame_type: 66,
+                stack: VerificationTypeInfo::Null,
+            },
+            StackMapFrameInfo::Chop {
+                frame_type: 250,
+                offset_delta: 1,
+            },
+            StackMapFrameInfo::Full {
+                frame_type: 255,
+                offset_delta: 7,
+                locals: vec![VerificationTypeInfo::Float, VerificationTypeInfo::Double],
+                stack: vec![
+                    VerificationTypeInfo::Object {
+                        cpool_index: string,
+                    },
+                    VerificationTypeInfo::Long,
+                ],
+            },
+            StackMapFrameInfo::SameExtended {
+                frame_type: 251,
+                offset_delta: 300,
+            },
+        ]);
+        let wide = vec![VType::Integer, VType::Long, VType::Top];
+        let full = vec![VType::Float, VType::Double, VType::Top];
+        let expected = [
+            frame(vec![VType::Integer], Vec::new()),
+            frame(
+                vec![
+                    VType::Integer,
+                    VType::Long,
+                    VType::Top,
+                    object("java/lang/String"),
+                ],
+                Vec::new(),
+            ),
+            frame(
+                vec![
+                    VType::Integer,
+                    VType::Long,
+                    VType::Top,
+                    object("java/lang/String"),
+                ],
+                vec![VType::Null],
+            ),
+            frame(wide.clone(), Vec::new()),
+            frame(
+                full.clone(),
+                vec![object("java/lang/String"), VType::Long, VType::Top],
+            ),
+            frame(full, Vec::new()),
+        ];
+        assert_eq!(
+            frames_of(&method, &cp),
+            Some(labels.iter().cloned().zip(expected.clone()).collect())
+        );
+
+        // A frame without a label is dropped but still shapes the frames after it.
+        let code = method.code.as_mut().expect("method should have code");
+        let shape = code
+            .original_code_shape
+            .as_mut()
+            .expect("code should be lifted");
+        shape
+            .stack_map
+            .as_mut()
+            .expect("code should have frames")
+            .labels[1] = None;
+        let frames = frames_of(&method, &cp).expect("frames should decode");
+        assert_eq!(frames.len(), 5);
+        assert_eq!(frames[2], (labels[3].clone(), frame(wide, Vec::new())));
+        Ok(())
+    }
+
+    #[test]
+    fn original_frames_reject_frames_that_cannot_seed_recomputation() {
+        let cp = ConstantPoolBuilder::new();
+        let (method, _) = lifted_stack_map(vec![
+            StackMapFrameInfo::Same { frame_type: 0 },
+            StackMapFrameInfo::Full {
+                frame_type: 255,
+                offset_delta: 2,
+                locals: vec![VerificationTypeInfo::Integer],
+                stack: vec![VerificationTypeInfo::Uninitialized { offset: 0 }],
+            },
+        ]);
+        assert_eq!(frames_of(&method, &cp), None);
+
+        let (method, _) = lifted_stack_map(vec![StackMapFrameInfo::Same { frame_type: 0 }]);
+        assert!(frames_of(&method, &cp).is_some());
+        let code = method.code.as_ref().expect("method should have code");
+        assert_eq!(original_frames(code, &method, "Renamed", &cp), None);
+    }
+
+    #[test]
+    fn stack_map_offset_delta_reads_implicit_and_explicit_deltas() {
+        let extended = |offset_delta| {
+            [
+                StackMapFrameInfo::SameLocals1StackItemExtended {
+                    frame_type: 247,
+                    offset_delta,
+                    stack: VerificationTypeInfo::Top,
+                },
+                StackMapFrameInfo::Chop {
+                    frame_type: 249,
+                    offset_delta,
+                },
+                StackMapFrameInfo::SameExtended {
+                    frame_type: 251,
+                    offset_delta,
+                },
+                StackMapFrameInfo::Append {
+                    frame_type: 252,
+                    offset_delta,
+                    locals: vec![VerificationTypeInfo::Top],
+                },
+                StackMapFrameInfo::Full {
+                    frame_type: 255,
+                    offset_delta,
+                    locals: Vec::new(),
+                    stack: Vec::new(),
+                },
+            ]
+        };
+        assert_eq!(
+            stack_map_offset_delta(&StackMapFrameInfo::Same { frame_type: 63 }),
+            63
+        );
+        assert_eq!(
+            stack_map_offset_delta(&StackMapFrameInfo::SameLocals1StackItem {
+                frame_type: 64,
+                stack: VerificationTypeInfo::Top,
+            }),
+            0
+        );
+        assert_eq!(
+            stack_map_offset_delta(&StackMapFrameInfo::SameLocals1StackItem {
+                frame_type: 127,
+                stack: VerificationTypeInfo::Top,
+            }),
+            63
+        );
+        for entry in extended(1000) {
+            assert_eq!(stack_map_offset_delta(&entry), 1000, "{entry:?}");
+        }
+    }
+
+    /// Decode `entries` straight from the JVMS frame-type ranges, keyed by offset.
+    fn reference_frames(
+        entries: &[StackMapFrameInfo],
+        initial: &FrameState,
+        cp: &ConstantPoolBuilder,
+    ) -> Vec<(u32, FrameState)> {
+        let vtype = |value: &VerificationTypeInfo| match value {
+            VerificationTypeInfo::Top => vec![VType::Top],
+            VerificationTypeInfo::Integer => vec![VType::Integer],
+            VerificationTypeInfo::Float => vec![VType::Float],
+            VerificationTypeInfo::Long => vec![VType::Long, VType::Top],
+            VerificationTypeInfo::Double => vec![VType::Double, VType::Top],
+            VerificationTypeInfo::Null => vec![VType::Null],
+            VerificationTypeInfo::UninitializedThis => vec![VType::UninitializedThis],
+            VerificationTypeInfo::Object { cpool_index } => vec![VType::Object(
+                cp.resolve_class_name(*cpool_index)
+                    .expect("class should resolve"),
+            )],
+            VerificationTypeInfo::Uninitialized { .. } => panic!("fixture frames are initialized"),
+        };
+        // One group of slots per stack-map value, so chopping drops whole values.
+        let mut locals = Vec::new();
+        let mut slots = initial.locals.iter();
+        while let Some(value) = slots.next() {
+            let mut group = vec![value.clone()];
+            if matches!(value, VType::Long | VType::Double) {
+                group.extend(slots.next().cloned());
+            }
+            locals.push(group);
+        }
+        let mut offset: Option<u32> = None;
+        let mut frames = Vec::new();
+        for entry in entries {
+            let frame_type = entry.frame_type();
+            let (delta, stack) = match (frame_type, entry) {
+                (0..=63, _) => (u32::from(frame_type), Vec::new()),
+                (64..=127, StackMapFrameInfo::SameLocals1StackItem { stack, .. }) => {
+                    (u32::from(frame_type) - 64, vtype(stack))
+                }
+                (
+                    247,
+                    StackMapFrameInfo::SameLocals1StackItemExtended {
+                        offset_delta,
+                        stack,
+                        ..
+                    },
+                ) => (u32::from(*offset_delta), vtype(stack)),
+                (248..=250, StackMapFrameInfo::Chop { offset_delta, .. }) => {
+                    locals.truncate(locals.len() - usize::from(251 - frame_type));
+                    (u32::from(*offset_delta), Vec::new())
+                }
+                (251, StackMapFrameInfo::SameExtended { offset_delta, .. }) => {
+                    (u32::from(*offset_delta), Vec::new())
+                }
+                (
+                    252..=254,
+                    StackMapFrameInfo::Append {
+                        offset_delta,
+                        locals: appended,
+                        ..
+                    },
+                ) => {
+                    locals.extend(appended.iter().map(vtype));
+                    (u32::from(*offset_delta), Vec::new())
+                }
+                (
+                    255,
+                    StackMapFrameInfo::Full {
+                        offset_delta,
+                        locals: full,
+                        stack,
+                        ..
+                    },
+                ) => {
+                    locals = full.iter().map(vtype).collect();
+                    (
+                        u32::from(*offset_delta),
+                        stack.iter().flat_map(vtype).collect(),
+                    )
+                }
+                _ => panic!("frame type {frame_type} does not match {entry:?}"),
+            };
+            let current = offset.map_or(delta, |previous| previous + delta + 1);
+            offset = Some(current);
+            frames.push((current, frame(locals.concat(), stack)));
+        }
+        frames
+    }
+
+    #[test]
+    fn original_frames_match_the_stack_maps_of_a_compiled_class() -> Result<()> {
+        let path = compiled_fixture_paths_for("PatternMatching.java")
+            .expect("fixture paths should load")
+            .into_iter()
+            .find(|path| path.ends_with("PatternMatching.class"))
+            .expect("PatternMatching.class should be compiled");
+        let bytes = std::fs::read(path).expect("fixture bytes should read");
+        let classfile = parse_class(&bytes)?;
+        let model = ClassModel::from_classfile(&classfile)?;
+        let mut cp = model.constant_pool.clone();
+        let mut frame_types = Vec::new();
+        for (raw, method) in classfile.methods.iter().zip(&model.methods) {
+            let Some(code) = &method.code else {
+                continue;
+            };
+            let Some(entries) = raw.attributes.iter().find_map(|attribute| match attribute {
+                AttributeInfo::Code(code) => code.attributes.iter().find_map(stack_map_entries),
+                _ => None,
+            }) else {
+                continue;
+            };
+            frame_types.extend(entries.iter().map(StackMapFrameInfo::frame_type));
+            let initial = initial_frame(
+                &model.name,
+                &method.name,
+                &method.descriptor,
+                method.access_flags,
+            )
+            .expect("descriptor should parse");
+            let expected = reference_frames(entries, &initial, &cp);
+
+            let layout = compute_code_layout(code, &mut cp)?;
+            let frames = original_frames(code, method, &model.name, &cp)
+                .expect("frames should decode")
+                .into_iter()
+                .map(|(label, state)| (layout.label_offsets[&label], state))
+                .collect::<Vec<_>>();
+            assert_eq!(frames, expected, "{}", method.name);
+        }
+        assert!(
+            frame_types
+                .iter()
+                .any(|frame_type| (248..=250).contains(frame_type))
+        );
+        assert!(
+            frame_types
+                .iter()
+                .any(|frame_type| (252..=254).contains(frame_type))
+        );
+        assert!(frame_types.contains(&255));
+        Ok(())
+    }
+
+    fn stack_map_entries(attribute: &AttributeInfo) -> Option<&Vec<StackMapFrameInfo>> {
+        match attribute {
+            AttributeInfo::StackMapTable(table) => Some(&table.entries),
+            _ => None,
+        }
+    }
+}
@@ -0,0 +1,286 @@
+use super::{CodeItem, CodeModel, Label, LdcValue};
+use crate::raw::Instruction;
+use rustc_hash::FxHashMap;
+
+/// What the three operand columns of an [`InstructionTable`] row hold.
+#[repr(u8)]
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Hash)]
+pub enum OperandKind {
+    /// A label; no operands.
+    Label = 0,
+    /// An instruction without operands.
+    None = 1,
+    /// `bipush`, `sipush` or `newarray`: the immediate (or array type) as `i32`.
+    Int = 2,
+    /// Owner, name and descriptor string indices.
+    Field = 3,
+    /// Owner, name and descriptor string indices.
+    Method = 4,
+    /// `invokeinterface`, or an interface-owned `invokestatic`/`invokespecial`:
+    /// owner, name and descriptor string indices.
+    InterfaceMethod = 5,
+    /// The type's string index.
+    Type = 6,
+    /// The local slot.
+    Var = 7,
+    /// The local slot and the increment as `i32`.
+    IInc = 8,
+    /// The raw bits.
+    LdcInt = 9,
+    /// The raw bits.
+    LdcFloat = 10,
+    /// The high and low halves of the raw bits.
+    LdcLong = 11,
+    /// The high and low halves of the raw bits.
+    LdcDouble = 12,
+    /// The string's string index.
+    LdcString = 13,
+    /// The class name's string index.
+    LdcClass = 14,
+    /// The descriptor's string index.
+    LdcMethodType = 15,
+    /// Owner, name and descriptor string indices of the handle's target.
+    LdcMethodHandle = 16,
+    /// Name and descriptor string indices, then the bootstrap method index.
+    LdcDynamic = 17,
+    /// Name and descriptor string indices, then the bootstrap method index.
+    InvokeDynamic = 18,
+    /// The descriptor's string index and the dimension count.
+    MultiANewArray = 19,
+    /// The row of the target label.
+    Branch = 20,
+    /// The row of the default label, then the start and length of the cases
+    /// in [`InstructionTable::switch_keys`] and [`InstructionTable::switch_targets`].
+    LookupSwitch = 21,
+    /// As [`OperandKind::LookupSwitch`], with one case per key from `low` to `high`.
+    TableSwitch = 22,
+}
+
+/// Row index recorded for a branch target that is not in the instruction list.
+pub const MISSING_LABEL: u32 = u32::MAX;
+
+/// A columnar snapshot of [`CodeModel::instructions`], one row per item.
+///
+/// Strings are interned into [`InstructionTable::strings`] and referenced by
+/// index; branch targets are the rows of their labels. Operand columns a
+/// row's kind does not use are zero.
+#[derive(Debug, Clone, Default, PartialEq, Eq)]
+pub struct InstructionTable {
+    pub opcodes: Vec<u8>,
+    pub kinds: Vec<OperandKind>,
+    pub operands: Vec<[u32; 3]>,
+    pub strings: Vec<String>,
+    pub switch_keys: Vec<i32>,
+    pub switch_targets: Vec<u32>,
+}
+
+impl InstructionTable {
+    pub fn from_code(code: &CodeModel) -> Self {
+        let items = &code.instructions;
+        let label_rows = items
+            .iter()
+            .enumerate()
+            .filter_map(|(row, item)| match item {
+                CodeItem::Label(label) => Some((label, row as u32)),
+                _ => None,
+            })
+            .collect::<FxHashMap<_, _>>();
+        let label_row = |label: &Label| label_rows.get(label).copied().unwrap_or(MISSING_LABEL);
+
+        let mut table = Self {
+            opcodes: Vec::with_capacity(items.len()),
+            kinds: Vec::with_capacity(items.len()),
+            operands: Vec::with_capacity(items.len()),
+            ..Self::default()
+        };
+        let mut strings = StringTable::default();
+
+        for item in items {
+            let (opcode, kind, operands) = match item {
+                CodeItem::Label(_) => (0, OperandKind::Label, [0; 3]),
+                CodeItem::Raw(insn) => match insn {
+                    Instruction::Byte { opcode, value, .. } => {
+                        (*opcode, OperandKind::Int, [i32::from(*value) as u32, 0, 0])
+                    }
+                    Instruction::Short { opcode, value, .. } => {
+                        (*opcode, OperandKind::Int, [i32::from(*value) as u32, 0, 0])
+                    }
+                    Instruction::NewArray(insn) => {
+                        (0xBC, OperandKind::Int, [u32::from(insn.atype as u8), 0, 0])
+                    }
+                    _ => (insn.opcode(), OperandKind::None, [0; 3]),
+                },
+                CodeItem::Field(insn) => (
+                    insn.opcode,
+                    OperandKind::Field,
+                    [
+                        strings.intern(&insn.owner),
+                        strings.intern(&insn.name),
+                        strings.intern(&insn.descriptor),
+                    ],
+                ),
+                CodeItem::Method(insn) => (
+                    insn.opcode,
+                    if insn.is_interface {
+                        OperandKind::InterfaceMethod
+                    } else {
+                        OperandKind::Method
+                    },
+                    [
+                        strings.intern(&insn.owner),
+                        strings.intern(&insn.name),
+                        strings.intern(&insn.descriptor),
+                    ],
+                ),
+                CodeItem::InterfaceMethod(insn) => (
+                    0xB9,
+                    OperandKind::InterfaceMethod,
+                    [
+                        strings.intern(&insn.owner),
+                        strings.intern(&insn.name),
+                        strings.intern(&insn.descriptor),
+                    ],
+                ),
+                CodeItem::Type(insn) => (
+                    insn.opcode,
+                    OperandKind::Type,
+                    [strings.intern(&insn.descriptor), 0, 0],
+                ),
+                CodeItem::Var(insn) => {
+                    (insn.opcode, OperandKind::Var, [u32::from(insn.slot), 0, 0])
+                }
+                CodeItem::IInc(insn) => (
+                    0x84,
+                    OperandKind::IInc,
+                    [u32::from(insn.slot), i32::from(insn.value) as u32, 0],
+                ),
+                CodeItem::Ldc(insn) => match &insn.value {
+                    LdcValue::Int(bits) => (0x12, OperandKind::LdcInt, [*bits, 0, 0]),
+                    LdcValue::FloatBits(bits) => (0x12, OperandKind::LdcFloat, [*bits, 0, 0]),
+                    LdcValue::Long(bits) => (
+                        0x14,
+                        OperandKind::LdcLong,
+                        [(*bits >> 32) as u32, *bits as u32, 0],
+                    ),
+                    LdcValue::DoubleBits(bits) => (
+                        0x14,
+                        OperandKind::LdcDouble,
+                        [(*bits >> 32) as u32, *bits as u32, 0],
+                    ),
+                    LdcValue::String(value) => {
+                        (0x12, OperandKind::LdcString, [strings.intern(value), 0, 0])
+                    }
+                    LdcValue::Class(name) => {
+                        (0x12, OperandKind::LdcClass, [strings.intern(name), 0, 0])
+                    }
+                    LdcValue::MethodType(descriptor) => (
+                        0x12,
+                        OperandKind::LdcMethodType,
+                        [strings.intern(descriptor), 0, 0],
+                    ),
+                    LdcValue::MethodHandle(handle) => (
+                        0x12,
+                        OperandKind::LdcMethodHandle,
+                        [
+                            strings.intern(&handle.owner),
+                            strings.intern(&handle.name),
+                            strings.intern(&handle.descriptor),
+                        ],
+                    ),
+                    LdcValue::Dynamic(dynamic) => (
+                        0x12,
+                        OperandKind::LdcDynamic,
+                        [
+                            strings.intern(&dynamic.name),
+                            strings.intern(&dynamic.descriptor),
+                            u32::from(dynamic.bootstrap_method_attr_index.value()),
+                        ],
+                    ),
+                },
+                CodeItem::InvokeDynamic(insn) => (
+                    0xBA,
+                    OperandKind::InvokeDynamic,
+                    [
+                        strings.intern(&insn.name),
+                        strings.intern(&insn.descriptor),
+                        u32::from(insn.bootstrap_method_attr_index.value()),
+                    ],
+                ),
+                CodeItem::MultiANewArray(insn) => (
+                    0xC5,
+                    OperandKind::MultiANewArray,
+                    [
+                        strings.intern(&insn.descriptor),
+                        u32::from(insn.dimensions),
+                        0,
+                    ],
+                ),
+                CodeItem::Branch(insn) => (
+                    insn.opcode,
+                    OperandKind::Branch,
+                    [label_row(&insn.target), 0, 0],
+                ),
+                CodeItem::LookupSwitch(insn) => {
+                    let start = table.switch_keys.len() as u32;
+                    for (key, target) in &insn.pairs {
+                        table.switch_keys.push(*key);
+                        table.switch_targets.push(label_row(target));
+                    }
+                    (
+                        0xAB,
+                        OperandKind::LookupSwitch,
+                        [
+                            label_row(&insn.default_target),
+                            start,
+                            insn.pairs.len() as u32,
+                        ],
+                    )
+                }
+                CodeItem::TableSwitch(insn) => {
+                    let start = table.switch_keys.len() as u32;
+                    for (key, target) in (insn.low..=insn.high).zip(&insn.targets) {
+                        table.switch_keys.push(key);
+                        table.switch_targets.push(label_row(target));
+                    }
+                    (
+                        0xAA,
+                        OperandKind::TableSwitch,
+                        [
+                            label_row(&insn.default_target),
+                            start,
+                            table.switch_keys.len() as u32 - start,
+                        ],
+                    )
+                }
+            };
+            table.opcodes.push(opcode);
+            table.kinds.push(kind);
+            table.operands.push(operands);
+        }
+        table.strings = strings.strings;
+        table
+    }
+
+    pub fn len(&self) -> usize {
+        self.opcodes.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.opcodes.is_empty()
+    }
+}
+
+#[derive(Default)]
+struct StringTable<'a> {
+    indices: FxHashMap<&'a str, u32>,
+    strings: Vec<String>,
+}
+
+impl<'a> StringTable<'a> {
+    fn intern(&mut self, value: &'a str) -> u32 {
+        *self.indices.entry(value).or_insert_with(|| {
+            self.strings.push(value.to_owned());
+            (self.strings.len() - 1) as u32
+        })
+    }
+}
@@ -0,0 +1,102 @@
+//! Order-preserving fan-out over scoped worker threads for batch APIs.
+
+use std::num::NonZeroUsize;
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::thread;
+
+/// Resolve a requested worker count: `0` means the machine's available parallelism.
+pub fn worker_count(workers: usize) -> usize {
+    match workers {
+        0 => thread::available_parallelism().map_or(1, NonZeroUsize::get),
+        workers => workers,
+    }
+}
+
+/// Map `items` through `f` on up to `workers` scoped threads, preserving input order.
+///
+/// `workers` is taken literally (resolve `0` with [`worker_count`] first). A
+/// panic on any worker is re-raised on the calling thread.
+pub fn parallel_map<T, R, F>(items: &[T], workers: usize, f: F) -> Vec<R>
+where
+    T: Sync,
+    R: Send,
+    F: Fn(&T) -> R + Sync,
+{
+    let workers = workers.min(items.len());
+    if workers <= 1 {
+        return items.iter().map(f).collect();
+    }
+    let next = AtomicUsize::new(0);
+    let mut slots = Vec::with_capacity(items.len());
+    slots.resize_with(items.len(), || None);
+    thread::scope(|scope| {
+        let next = &next;
+        let f = &f;
+        let handles = (0..workers)
+            .map(|_| {
+                scope.spawn(move || {
+                    let mut results = Vec::new();
+                    loop {
+                        let index = next.fetch_add(1, Ordering::Relaxed);
+                        let Some(item) = items.get(index) else {
+                            break;
+                        };
+                        results.push((index, f(item)));
+                    }
+                    results
+                })
+            })
+            .collect::<Vec<_>>();
+        for handle in handles {
+            let results = handle
+                .join()
+                .unwrap_or_else(|payload| std::panic::resume_unwind(payload));
+            for (index, result) in results {
+                slots[index] = Some(result);
+            }
+        }
+    });
+    slots
+        .into_iter()
+        .map(|slot| slot.expect("every slot is filled by a worker"))
+        .collect()
+}
+
+/// Like [`parallel_map`] for fallible work, returning the first error in input order.
+pub fn try_parallel_map<T, R, E, F>(items: &[T], workers: usize, f: F) -> Result<Vec<R>, E>
+where
+    T: Sync,
+    R: Send,
+    E: Send,
+    F: Fn(&T) -> Result<R, E> + Sync,
+{
+    parallel_map(items, workers, f).into_iter().collect()
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn parallel_map_preserves_input_order() {
+        let items = (0..257).collect::<Vec<u32>>();
+        let doubled = parallel_map(&items, 4, |value| value * 2);
+        assert_eq!(
+            doubled,
+            items.iter().map(|value| value * 2).collect::<Vec<_>>()
+        );
+    }
+
+    #[test]
+    fn try_parallel_map_reports_first_error_in_input_order() {
+        let items = (0..64).collect::<Vec<u32>>();
+        let result = try_parallel_map(&items, 8, |value| {
+            if *value % 10 == 7 {
+                Err(*value)
+            } else {
+                Ok(*value)
+            }
+        });
+        assert_eq!(result, Err(7));
+    }
+}
@@ -1,7 +1,10 @@
+use crate::Result;
 use crate::constants::{ClassAccessFlags, FieldAccessFlags, MethodAccessFlags};
 use crate::indexes::{ClassIndex, Utf8Index};
 use crate::raw::attributes::AttributeInfo;
 use crate::raw::constant_pool::ConstantPoolEntry;
+use crate::reader::decode_attribute;
+use std::borrow::Cow;
 
 #[derive(Debug, Clone, PartialEq, Eq)]
 pub struct FieldInfo {
@@ -33,3 +36,27 @@ pub struct ClassFile {
     pub methods: Vec<MethodInfo>,
     pub attributes: Vec<AttributeInfo>,
 }
+
+impl ClassFile {
+    /// Decode, in place, every attribute a [`ReadLevel::Lazy`] read kept raw.
+    ///
+    /// [`ReadLevel::Lazy`]: crate::ReadLevel::Lazy
+    pub fn decode_attributes(&mut self) -> Result<()> {
+        let constant_pool = &self.constant_pool;
+        let decode_all = |attributes: &mut Vec<AttributeInfo>| -> Result<()> {
+            for attribute in attributes.iter_mut() {
+                if let Cow::Owned(decoded) = decode_attribute(attribute, constant_pool)? {
+                    *attribute = decoded;
+                }
+            }
+            Ok(())
+        };
+        for field in &mut self.fields {
+            decode_all(&mut field.attributes)?;
+        }
+        for method in &mut self.methods {
+            decode_all(&mut method.attributes)?;
+        }
+        decode_all(&mut self.attributes)
+    }
+}
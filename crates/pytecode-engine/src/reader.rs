@@ -39,54 +39,60 @@ use crate::raw::instructions::{
     LookupSwitchInsn, MatchOffsetPair, NewArrayInsn, TableSwitchInsn, WideInstruction,
     operand_kind, validate_wide_opcode,
 };
+use std::borrow::Cow;
+
+/// How much of a classfile [`ClassReader::read_class_at`] decodes.
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Default)]
+pub enum ReadLevel {
+    /// The constant pool, access flags, this/super class, and interfaces.
+    /// Fields, methods, and attributes are left empty.
+    Header,
+    /// The header plus every field and method (flags, name, descriptor).
+    /// Attribute payloads are skipped by length and left empty.
+    Members,
+    /// The whole classfile, with every class, field, and method attribute
+    /// kept as raw bytes in [`AttributeInfo::Unknown`]. The writer emits those
+    /// bytes verbatim; [`decode_attribute`] and [`ClassFile::decode_attributes`]
+    /// turn them into typed attributes on demand.
+    Lazy,
+    /// The whole classfile, including attributes and decoded `Code`.
+    #[default]
+    Full,
+}
 
 pub struct ClassReader<'a> {
     reader: ByteReader<'a>,
-    constant_pool: Vec<Option<ConstantPoolEntry>>,
+    constant_pool: Cow<'a, [Option<ConstantPoolEntry>]>,
 }
 
 impl<'a> ClassReader<'a> {
     pub fn new(bytes: &'a [u8]) -> Self {
         Self {
             reader: ByteReader::new(bytes),
-            constant_pool: Vec::new(),
+            constant_pool: Cow::Borrowed(&[]),
         }
     }
 
-    pub fn read_class(mut self) -> Result<ClassFile> {
-        let magic = self.reader.read_u4()?;
-        if magic != MAGIC {
-            return Err(EngineError::new(
-                0,
-                EngineErrorKind::InvalidMagic {
-                    found: magic,
-                    expected: MAGIC,
-                },
-            ));
-        }
-
-        let minor_version = self.reader.read_u2()?;
-        let major_version = self.reader.read_u2()?;
-        validate_class_version(major_version, minor_version)?;
+    pub fn read_class(self) -> Result<ClassFile> {
+        self.read_class_at(ReadLevel::Full)
+    }
 
-        let constant_pool_count = self.reader.read_u2()? as usize;
-        if constant_pool_count == 0 {
-            return Err(EngineError::new(
-                self.reader.offset(),
-                EngineErrorKind::InvalidAttribute {
-                    reason: "constant_pool_count must be at least 1".to_owned(),
-                },
-            ));
-        }
-        self.constant_pool = vec![None; constant_pool_count];
+    /// Read the classfile, decoding only as much as `level` asks for.
+    ///
+    /// Lower levels return a [`ClassFile`] whose skipped tables are empty, so
+    /// they suit hierarchy resolution and inventories but not round-tripping.
+    pub fn read_class_at(mut self, level: ReadLevel) -> Result<ClassFile> {
+        let (magic, minor_version, major_version, constant_pool_count) = self.read_preamble()?;
+        let mut constant_pool = vec![None; constant_pool_count];
 
         let mut index = 1_usize;
         while index < constant_pool_count {
             let entry = self.read_constant_pool_entry()?;
             let is_wide = entry.is_wide();
-            self.constant_pool[index] = Some(entry);
+            constant_pool[index] = Some(entry);
             index += if is_wide { 2 } else { 1 };
         }
+        self.constant_pool = Cow::Owned(constant_pool);
 
         let access_flags = ClassAccessFlags::from_bits_retain(self.reader.read_u2()?);
         let this_class = ClassIndex::from(self.reader.read_u2()?);
@@ -97,26 +103,28 @@ impl<'a> ClassReader<'a> {
             .map(|_| self.reader.read_u2().map(ClassIndex::from))
             .collect::<Result<Vec<_>>>()?;
 
-        let fields_count = self.reader.read_u2()? as usize;
-        let fields = (0..fields_count)
-            .map(|_| self.read_field())
-            .collect::<Result<Vec<_>>>()?;
+        let (fields, methods, attributes) = if level == ReadLevel::Header {
+            (Vec::new(), Vec::new(), Vec::new())
+        } else {
+            let fields_count = self.reader.read_u2()? as usize;
+            let fields = (0..fields_count)
+                .map(|_| self.read_field(level))
+                .collect::<Result<Vec<_>>>()?;
 
-        let methods_count = self.reader.read_u2()? as usize;
-        let methods = (0..methods_count)
-            .map(|_| self.read_method())
-            .collect::<Result<Vec<_>>>()?;
+            let methods_count = self.reader.read_u2()? as usize;
+            let methods = (0..methods_count)
+                .map(|_| self.read_method(level))
+                .collect::<Result<Vec<_>>>()?;
 
-        let attributes_count = self.reader.read_u2()? as usize;
-        let attributes = (0..attributes_count)
-            .map(|_| self.read_attribute())
-            .collect::<Result<Vec<_>>>()?;
+            let attributes = self.read_attributes(level)?;
+            (fields, methods, attributes)
+        };
 
         Ok(ClassFile {
             magic,
             minor_version,
             major_version,
-            constant_pool: self.constant_pool,
+            constant_pool: self.constant_pool.into_owned(),
             access_flags,
             this_class,
             super_class,
@@ -127,14 +135,113 @@ impl<'a> ClassReader<'a> {
         })
     }
 
-    fn read_field(&mut self) -> Result<FieldInfo> {
+    /// Read only the class header: version, access flags, this/super class, and interfaces.
+    ///
+    /// The constant pool is scanned for entry offsets without materializing
+    /// entries, and fields, methods, and attributes are never read. Only the
+    /// names the header references are decoded.
+    pub fn read_header(mut self) -> Result<ClassHeader> {
+        let (_magic, minor_version, major_version, constant_pool_count) = self.read_preamble()?;
+        let mut entry_offsets = vec![0_usize; constant_pool_count];
+        let mut index = 1_usize;
+        while index < constant_pool_count {
+            entry_offsets[index] = self.reader.offset();
+            index += if self.skip_constant_pool_entry()? {
+                2
+            } else {
+                1
+            };
+        }
+
+        let access_flags = ClassAccessFlags::from_bits_retain(self.reader.read_u2()?);
+        let this_class = self.reader.read_u2()?;
+        let super_class = self.reader.read_u2()?;
+        let interfaces_count = self.reader.read_u2()? as usize;
+        let interfaces = (0..interfaces_count)
+            .map(|_| self.reader.read_u2())
+            .collect::<Result<Vec<_>>>()?;
+
+        let bytes = self.reader.bytes();
+        let class_name = |index| header_class_name(bytes, &entry_offsets, index);
+        Ok(ClassHeader {
+            version: (major_version, minor_version),
+            access_flags,
+            name: class_name(this_class)?,
+            super_name: match super_class {
+                0 => None,
+                index => Some(class_name(index)?),
+            },
+            interfaces: interfaces
+                .into_iter()
+                .map(class_name)
+                .collect::<Result<Vec<_>>>()?,
+        })
+    }
+
+    /// Read the magic number, version, and constant pool count.
+    fn read_preamble(&mut self) -> Result<(u32, u16, u16, usize)> {
+        let magic = self.reader.read_u4()?;
+        if magic != MAGIC {
+            return Err(EngineError::new(
+                0,
+                EngineErrorKind::InvalidMagic {
+                    found: magic,
+                    expected: MAGIC,
+                },
+            ));
+        }
+
+        let minor_version = self.reader.read_u2()?;
+        let major_version = self.reader.read_u2()?;
+        validate_class_version(major_version, minor_version)?;
+
+        let constant_pool_count = self.reader.read_u2()? as usize;
+        if constant_pool_count == 0 {
+            return Err(EngineError::new(
+                self.reader.offset(),
+                EngineErrorKind::InvalidAttribute {
+                    reason: "constant_pool_count must be at least 1".to_owned(),
+                },
+            ));
+        }
+        Ok((magic, minor_version, major_version, constant_pool_count))
+    }
+
+    /// Skip one constant pool entry, returning whether it occupies two slots.
+    fn skip_constant_pool_entry(&mut self) -> Result<bool> {
+        let offset = self.reader.offset();
+        let tag = ConstantPoolTag::try_from(self.reader.read_u1()?)
+            .map_err(|kind| EngineError::new(offset, kind))?;
+        let len = match tag {
+            ConstantPoolTag::Utf8 => self.reader.read_u2()? as usize,
+            ConstantPoolTag::Class
+            | ConstantPoolTag::String
+            | ConstantPoolTag::MethodType
+            | ConstantPoolTag::Module
+            | ConstantPoolTag::Package => 2,
+            ConstantPoolTag::MethodHandle => 3,
+            ConstantPoolTag::Integer
+            | ConstantPoolTag::Float
+            | ConstantPoolTag::FieldRef
+            | ConstantPoolTag::MethodRef
+            | ConstantPoolTag::InterfaceMethodRef
+            | ConstantPoolTag::NameAndType
+            | ConstantPoolTag::Dynamic
+            | ConstantPoolTag::InvokeDynamic => 4,
+            ConstantPoolTag::Long | ConstantPoolTag::Double => 8,
+        };
+        self.reader.read_bytes(len)?;
+        Ok(matches!(
+            tag,
+            ConstantPoolTag::Long | ConstantPoolTag::Double
+        ))
+    }
+
+    fn read_field(&mut self, level: ReadLevel) -> Result<FieldInfo> {
         let access_flags = FieldAccessFlags::from_bits_retain(self.reader.read_u2()?);
         let name_index = Utf8Index::from(self.reader.read_u2()?);
         let descriptor_index = Utf8Index::from(self.reader.read_u2()?);
-        let attributes_count = self.reader.read_u2()? as usize;
-        let attributes = (0..attributes_count)
-            .map(|_| self.read_attribute())
-            .collect::<Result<Vec<_>>>()?;
+        let attributes = self.read_attributes(level)?;
         Ok(FieldInfo {
             access_flags,
             name_index,
@@ -143,14 +250,11 @@ impl<'a> ClassReader<'a> {
         })
     }
 
-    fn read_method(&mut self) -> Result<MethodInfo> {
+    fn read_method(&mut self, level: ReadLevel) -> Result<MethodInfo> {
         let access_flags = MethodAccessFlags::from_bits_retain(self.reader.read_u2()?);
         let name_index = Utf8Index::from(self.reader.read_u2()?);
         let descriptor_index = Utf8Index::from(self.reader.read_u2()?);
-        let attributes_count = self.reader.read_u2()? as usize;
-        let attributes = (0..attributes_count)
-            .map(|_| self.read_attribute())
-            .collect::<Result<Vec<_>>>()?;
+        let attributes = self.read_attributes(level)?;
         Ok(MethodInfo {
             access_flags,
             name_index,
@@ -159,6 +263,39 @@ impl<'a> ClassReader<'a> {
         })
     }
 
+    /// Read an attribute table at `level`: skipped, kept raw, or fully decoded.
+    fn read_attributes(&mut self, level: ReadLevel) -> Result<Vec<AttributeInfo>> {
+        let attributes_count = self.reader.read_u2()? as usize;
+        match level {
+            ReadLevel::Header | ReadLevel::Members => {
+                for _ in 0..attributes_count {
+                    self.reader.read_u2()?;
+                    let length = self.reader.read_u4()? as usize;
+                    self.reader.read_bytes(length)?;
+                }
+                Ok(Vec::new())
+            }
+            ReadLevel::Lazy => (0..attributes_count)
+                .map(|_| self.read_raw_attribute())
+                .collect(),
+            ReadLevel::Full => (0..attributes_count)
+                .map(|_| self.read_attribute())
+                .collect(),
+        }
+    }
+
+    fn read_raw_attribute(&mut self) -> Result<AttributeInfo> {
+        let name_index = Utf8Index::from(self.reader.read_u2()?);
+        let attribute_length = self.reader.read_u4()?;
+        let info = self.reader.read_bytes(attribute_length as usize)?.to_vec();
+        Ok(AttributeInfo::Unknown(UnknownAttribute {
+            attribute_name_index: name_index,
+            attribute_length,
+            name: self.constant_pool_utf8(name_index.value())?,
+            info,
+        }))
+    }
+
     fn read_attribute(&mut self) -> Result<AttributeInfo> {
         let name_index = Utf8Index::from(self.reader.read_u2()?);
         let attribute_length = self.reader.read_u4()?;
@@ -1055,14 +1192,106 @@ impl<'a> ClassReader<'a> {
     }
 }
 
+/// The class-level facts that precede the field table.
+///
+/// Enough to evaluate class matchers without lifting the class; see
+/// [`ClassReader::read_header`].
+#[derive(Debug, Clone, PartialEq, Eq)]
+pub struct ClassHeader {
+    /// `(major, minor)`, ordered like [`ClassModel::version`](crate::model::ClassModel::version).
+    pub version: (u16, u16),
+    pub access_flags: ClassAccessFlags,
+    pub name: String,
+    pub super_name: Option<String>,
+    pub interfaces: Vec<String>,
+}
+
+/// Resolve the `CONSTANT_Class` entry at `index` to its name using scanned entry offsets.
+fn header_class_name(bytes: &[u8], entry_offsets: &[usize], index: u16) -> Result<String> {
+    let mut class_entry = header_entry(bytes, entry_offsets, index, ConstantPoolTag::Class)?;
+    let name_index = class_entry.read_u2()?;
+    let mut utf8_entry = header_entry(bytes, entry_offsets, name_index, ConstantPoolTag::Utf8)?;
+    let length = utf8_entry.read_u2()? as usize;
+    decode_modified_utf8(utf8_entry.read_bytes(length)?)
+}
+
+/// A reader positioned just past the tag of the entry at `index`, if it has the expected tag.
+fn header_entry<'a>(
+    bytes: &'a [u8],
+    entry_offsets: &[usize],
+    index: u16,
+    tag: ConstantPoolTag,
+) -> Result<ByteReader<'a>> {
+    match entry_offsets.get(index as usize) {
+        Some(&offset) if offset != 0 && bytes.get(offset) == Some(&(tag as u8)) => {
+            Ok(ByteReader::new(&bytes[offset + 1..]))
+        }
+        _ => Err(EngineError::new(
+            0,
+            EngineErrorKind::InvalidConstantPoolIndex { index },
+        )),
+    }
+}
+
 pub fn parse_class(bytes: &[u8]) -> Result<ClassFile> {
     ClassReader::new(bytes).read_class()
 }
 
+/// Parse a classfile at the given [`ReadLevel`]; see [`ClassReader::read_class_at`].
+pub fn parse_class_at(bytes: &[u8], level: ReadLevel) -> Result<ClassFile> {
+    ClassReader::new(bytes).read_class_at(level)
+}
+
+/// Decode an attribute that [`ReadLevel::Lazy`] kept as raw bytes.
+///
+/// Typed attributes are borrowed back unchanged, as are raw attributes whose
+/// name the reader does not recognise. Nested attributes (inside `Code` or
+/// `Record`) are decoded along with their parent.
+pub fn decode_attribute<'a>(
+    attribute: &'a AttributeInfo,
+    constant_pool: &[Option<ConstantPoolEntry>],
+) -> Result<Cow<'a, AttributeInfo>> {
+    let AttributeInfo::Unknown(raw) = attribute else {
+        return Ok(Cow::Borrowed(attribute));
+    };
+    let reader = ClassReader {
+        reader: ByteReader::new(&[]),
+        constant_pool: Cow::Borrowed(constant_pool),
+    };
+    match reader.parse_attribute_payload(
+        raw.attribute_name_index,
+        raw.attribute_length,
+        &raw.name,
+        &raw.info,
+        0,
+        "attribute parser did not consume the full payload",
+    )? {
+        AttributeInfo::Unknown(_) => Ok(Cow::Borrowed(attribute)),
+        decoded => Ok(Cow::Owned(decoded)),
+    }
+}
+
+/// Read just the header of a classfile; see [`ClassReader::read_header`].
+pub fn read_class_header(bytes: &[u8]) -> Result<ClassHeader> {
+    ClassReader::new(bytes).read_header()
+}
+
 pub fn parse_class_bytes(bytes: impl AsRef<[u8]>) -> Result<ClassFile> {
     parse_class(bytes.as_ref())
 }
 
+/// Parse a batch of classfiles on up to `workers` threads (`0` = all cores).
+///
+/// Results keep input order; the first failing input in that order is reported.
+pub fn parse_classes<B: AsRef<[u8]> + Sync>(
+    classes: &[B],
+    workers: usize,
+) -> Result<Vec<ClassFile>> {
+    crate::parallel::try_parallel_map(classes, crate::parallel::worker_count(workers), |bytes| {
+        parse_class(bytes.as_ref())
+    })
+}
+
 pub fn parse_instructions(bytes: &[u8]) -> Result<Vec<Instruction>> {
     let mut reader = ByteReader::new(bytes);
     let mut instructions = Vec::new();
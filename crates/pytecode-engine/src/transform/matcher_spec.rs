@@ -7,6 +7,7 @@
 
 use crate::constants::{ClassAccessFlags, FieldAccessFlags, MethodAccessFlags};
 use crate::model::{ClassModel, CodeItem, FieldModel, LdcValue, MethodModel};
+use crate::reader::ClassHeader;
 use regex::Regex;
 use std::fmt;
 
@@ -701,25 +702,58 @@ impl CompiledClassMatcher {
 
     /// Evaluate against a [`ClassModel`].
     pub fn matches(&self, model: &ClassModel) -> bool {
+        self.matches_view(&ClassView {
+            name: &model.name,
+            access_flags: model.access_flags,
+            super_name: model.super_name.as_deref(),
+            interfaces: &model.interfaces,
+            major_version: model.version.0,
+        })
+    }
+
+    /// Evaluate against a [`ClassHeader`] read without lifting the class.
+    ///
+    /// Every class matcher only inspects header data, so this agrees with
+    /// [`matches`](Self::matches) on the lifted model.
+    pub fn matches_header(&self, header: &ClassHeader) -> bool {
+        self.matches_view(&ClassView {
+            name: &header.name,
+            access_flags: header.access_flags,
+            super_name: header.super_name.as_deref(),
+            interfaces: &header.interfaces,
+            major_version: header.version.0,
+        })
+    }
+
+    fn matches_view(&self, class: &ClassView<'_>) -> bool {
         match self {
             Self::Any => true,
-            Self::Named(name) => model.name == *name,
-            Self::NameMatches(re) => re.is_match(&model.name),
-            Self::AccessAll(flags) => model.access_flags.contains(*flags),
-            Self::AccessAny(flags) => model.access_flags.intersects(*flags),
-            Self::IsPackagePrivate => !model.access_flags.contains(ClassAccessFlags::PUBLIC),
-            Self::Extends(name) => model.super_name.as_deref() == Some(name.as_str()),
-            Self::Implements(name) => model.interfaces.iter().any(|i| i == name),
-            Self::Version(major) => model.version.0 == *major,
-            Self::VersionAtLeast(major) => model.version.0 >= *major,
-            Self::VersionBelow(major) => model.version.0 < *major,
-            Self::And(matchers) => matchers.iter().all(|m| m.matches(model)),
-            Self::Or(matchers) => matchers.iter().any(|m| m.matches(model)),
-            Self::Not(matcher) => !matcher.matches(model),
+            Self::Named(name) => class.name == name,
+            Self::NameMatches(re) => re.is_match(class.name),
+            Self::AccessAll(flags) => class.access_flags.contains(*flags),
+            Self::AccessAny(flags) => class.access_flags.intersects(*flags),
+            Self::IsPackagePrivate => !class.access_flags.contains(ClassAccessFlags::PUBLIC),
+            Self::Extends(name) => class.super_name == Some(name.as_str()),
+            Self::Implements(name) => class.interfaces.iter().any(|i| i == name),
+            Self::Version(major) => class.major_version == *major,
+            Self::VersionAtLeast(major) => class.major_version >= *major,
+            Self::VersionBelow(major) => class.major_version < *major,
+            Self::And(matchers) => matchers.iter().all(|m| m.matches_view(class)),
+            Self::Or(matchers) => matchers.iter().any(|m| m.matches_view(class)),
+            Self::Not(matcher) => !matcher.matches_view(class),
         }
     }
 }
 
+/// The class-level data class matchers evaluate, borrowed from a model or a header.
+struct ClassView<'a> {
+    name: &'a str,
+    access_flags: ClassAccessFlags,
+    super_name: Option<&'a str>,
+    interfaces: &'a [String],
+    major_version: u16,
+}
+
 /// A [`FieldMatcherSpec`] compiled for repeated evaluation.
 pub enum CompiledFieldMatcher {
     Any,
@@ -13,6 +13,25 @@ use std::sync::Arc;
 
 pub trait ApplyClassTransform {
     fn apply(&mut self, model: &mut ClassModel) -> Result<()>;
+
+    /// Apply the transform and report whether it may have modified `model`.
+    ///
+    /// Archive rewrites copy classes reported as unmodified from the source
+    /// archive instead of relowering them. The default treats every applied
+    /// class as modified.
+    fn apply_tracked(&mut self, model: &mut ClassModel) -> Result<bool> {
+        self.apply(model)?;
+        Ok(true)
+    }
+
+    /// Cheap check on raw classfile bytes, run before a class is lifted.
+    ///
+    /// Returning `false` promises the transform would leave the class
+    /// untouched, so archive rewrites copy it without lifting it at all. The
+    /// default keeps every class.
+    fn may_apply(&self, _class_bytes: &[u8]) -> bool {
+        true
+    }
 }
 
 impl<F> ApplyClassTransform for F
@@ -24,6 +43,85 @@ where
     }
 }
 
+/// A class transform that may be applied to several models concurrently.
+///
+/// Archive rewrites with more than one worker call [`apply_shared`] from
+/// worker threads, so implementations must not rely on exclusive access.
+///
+/// [`apply_shared`]: ApplySharedClassTransform::apply_shared
+pub trait ApplySharedClassTransform: Sync {
+    fn apply_shared(&self, model: &mut ClassModel) -> Result<()>;
+
+    /// Shared counterpart of [`ApplyClassTransform::apply_tracked`].
+    fn apply_shared_tracked(&self, model: &mut ClassModel) -> Result<bool> {
+        self.apply_shared(model)?;
+        Ok(true)
+    }
+
+    /// Shared counterpart of [`ApplyClassTransform::may_apply`].
+    fn may_apply_shared(&self, _class_bytes: &[u8]) -> bool {
+        true
+    }
+}
+
+impl<F> ApplySharedClassTransform for F
+where
+    F: Fn(&mut ClassModel) -> Result<()> + Sync,
+{
+    fn apply_shared(&self, model: &mut ClassModel) -> Result<()> {
+        self(model)
+    }
+}
+
+/// A transform closure that reports whether it modified the class it was given.
+///
+/// Built with [`tracked`] or [`tracked_shared`].
+#[derive(Debug, Clone)]
+pub struct Tracked<F>(F);
+
+/// Wrap a closure returning `Ok(modified)` so archive rewrites can skip
+/// relowering classes it leaves untouched.
+pub fn tracked<F>(transform: F) -> Tracked<F>
+where
+    F: FnMut(&mut ClassModel) -> Result<bool>,
+{
+    Tracked(transform)
+}
+
+/// Like [`tracked`], for a closure that can run on several rewrite workers at once.
+pub fn tracked_shared<F>(transform: F) -> Tracked<F>
+where
+    F: Fn(&mut ClassModel) -> Result<bool> + Sync,
+{
+    Tracked(transform)
+}
+
+impl<F> ApplyClassTransform for Tracked<F>
+where
+    F: FnMut(&mut ClassModel) -> Result<bool>,
+{
+    fn apply(&mut self, model: &mut ClassModel) -> Result<()> {
+        (self.0)(model).map(drop)
+    }
+
+    fn apply_tracked(&mut self, model: &mut ClassModel) -> Result<bool> {
+        (self.0)(model)
+    }
+}
+
+impl<F> ApplySharedClassTransform for Tracked<F>
+where
+    F: Fn(&mut ClassModel) -> Result<bool> + Sync,
+{
+    fn apply_shared(&self, model: &mut ClassModel) -> Result<()> {
+        (self.0)(model).map(drop)
+    }
+
+    fn apply_shared_tracked(&self, model: &mut ClassModel) -> Result<bool> {
+        (self.0)(model)
+    }
+}
+
 pub type BoxClassTransform = Box<dyn ApplyClassTransform + Send>;
 
 #[derive(Default)]
@@ -53,12 +151,25 @@ impl Pipeline {
         }
         Ok(())
     }
+
+    /// Apply every transform, reporting whether any of them may have modified `model`.
+    pub fn apply_tracked(&mut self, model: &mut ClassModel) -> Result<bool> {
+        let mut modified = false;
+        for transform in &mut self.transforms {
+            modified |= transform.apply_tracked(model)?;
+        }
+        Ok(modified)
+    }
 }
 
 impl ApplyClassTransform for Pipeline {
     fn apply(&mut self, model: &mut ClassModel) -> Result<()> {
         self.apply(model)
     }
+
+    fn apply_tracked(&mut self, model: &mut ClassModel) -> Result<bool> {
+        self.apply_tracked(model)
+    }
 }
 
 impl fmt::Debug for Pipeline {
@@ -202,15 +313,15 @@ pub fn on_classes(
     mut transform: impl ApplyClassTransform + Send + 'static,
     where_matcher: Option<ClassMatcher>,
 ) -> impl ApplyClassTransform + Send {
-    move |model: &mut ClassModel| {
+    tracked(move |model: &mut ClassModel| {
         if where_matcher
             .as_ref()
             .is_some_and(|matcher| !matcher.matches(model))
         {
-            return Ok(());
+            return Ok(false);
         }
-        transform.apply(model)
-    }
+        transform.apply_tracked(model)
+    })
 }
 
 pub fn on_fields<F>(
@@ -221,14 +332,15 @@ pub fn on_fields<F>(
 where
     F: FnMut(&mut FieldModel, &ClassContext) -> Result<()> + Send + 'static,
 {
-    move |model: &mut ClassModel| {
+    tracked(move |model: &mut ClassModel| {
         if owner_matcher
             .as_ref()
             .is_some_and(|matcher| !matcher.matches(model))
         {
-            return Ok(());
+            return Ok(false);
         }
         let owner = ClassContext::from_model(model);
+        let mut applied = false;
         let original_len = model.fields.len();
         for index in 0..original_len {
             let should_apply = {
@@ -239,10 +351,11 @@ where
             };
             if should_apply {
                 transform(&mut model.fields[index], &owner)?;
+                applied = true;
             }
         }
-        Ok(())
-    }
+        Ok(applied)
+    })
 }
 
 pub fn on_methods<F>(
@@ -253,14 +366,15 @@ pub fn on_methods<F>(
 where
     F: FnMut(&mut MethodModel, &ClassContext) -> Result<()> + Send + 'static,
 {
-    move |model: &mut ClassModel| {
+    tracked(move |model: &mut ClassModel| {
         if owner_matcher
             .as_ref()
             .is_some_and(|matcher| !matcher.matches(model))
         {
-            return Ok(());
+            return Ok(false);
         }
         let owner = ClassContext::from_model(model);
+        let mut applied = false;
         let original_len = model.methods.len();
         for index in 0..original_len {
             let should_apply = {
@@ -271,10 +385,11 @@ where
             };
             if should_apply {
                 transform(&mut model.methods[index], &owner)?;
+                applied = true;
             }
         }
-        Ok(())
-    }
+        Ok(applied)
+    })
 }
 
 pub fn on_code<F>(
@@ -285,14 +400,15 @@ pub fn on_code<F>(
 where
     F: FnMut(&mut CodeModel, &MethodContext, &ClassContext) -> Result<()> + Send + 'static,
 {
-    move |model: &mut ClassModel| {
+    tracked(move |model: &mut ClassModel| {
         if owner_matcher
             .as_ref()
             .is_some_and(|matcher| !matcher.matches(model))
         {
-            return Ok(());
+            return Ok(false);
         }
         let owner = ClassContext::from_model(model);
+        let mut applied = false;
         let original_len = model.methods.len();
         for index in 0..original_len {
             let method_snapshot = MethodContext::from_method(&model.methods[index]);
@@ -306,9 +422,10 @@ where
                 continue;
             };
             transform(code, &method_snapshot, &owner)?;
+            applied = true;
         }
-        Ok(())
-    }
+        Ok(applied)
+    })
 }
 
 pub fn all_of<T: 'static>(matchers: impl IntoIterator<Item = Matcher<T>>) -> Matcher<T> {
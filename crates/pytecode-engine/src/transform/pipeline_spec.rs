@@ -5,6 +5,8 @@
 //! evaluates matchers entirely in Rust; only custom Python callbacks cross FFI.
 
 use crate::model::ClassModel;
+use crate::reader::{ClassHeader, read_class_header};
+use crate::transform::ApplySharedClassTransform;
 use crate::transform::matcher_spec::{
     ClassMatcherSpec, CompiledClassMatcher, CompiledFieldMatcher, CompiledMethodMatcher,
     FieldMatcherSpec, MethodMatcherSpec,
@@ -128,6 +130,18 @@ enum CompiledStep {
     },
 }
 
+impl CompiledStep {
+    /// The class-level matcher that gates this step.
+    fn owner_matcher(&self) -> &CompiledClassMatcher {
+        match self {
+            Self::Class { matcher, .. } => matcher,
+            Self::Field { owner_matcher, .. }
+            | Self::Method { owner_matcher, .. }
+            | Self::Code { owner_matcher, .. } => owner_matcher,
+        }
+    }
+}
+
 /// A declarative pipeline: a list of steps that Rust evaluates natively.
 #[derive(Debug, Clone, Default)]
 pub struct PipelineSpec {
@@ -256,11 +270,20 @@ impl PipelineSpec {
 impl CompiledPipeline {
     /// Apply the compiled pipeline to a single class model.
     pub fn apply(&self, model: &mut ClassModel) {
+        self.apply_tracked(model);
+    }
+
+    /// Apply the compiled pipeline, reporting whether any step may have modified `model`.
+    ///
+    /// Built-in actions report exactly what they changed; custom callbacks
+    /// count as a modification whenever their step matches.
+    pub fn apply_tracked(&self, model: &mut ClassModel) -> bool {
+        let mut modified = false;
         for step in &self.steps {
             match step {
                 CompiledStep::Class { matcher, action } => {
                     if matcher.matches(model) {
-                        Self::apply_action(action, model);
+                        modified |= Self::apply_action(action, model);
                     }
                 }
                 CompiledStep::Field {
@@ -274,7 +297,7 @@ impl CompiledPipeline {
                     // Field steps: apply built-in class transforms if any field matches
                     let has_match = model.fields.iter().any(|f| field_matcher.matches(f));
                     if has_match {
-                        Self::apply_action(action, model);
+                        modified |= Self::apply_action(action, model);
                     }
                 }
                 CompiledStep::Method {
@@ -287,7 +310,7 @@ impl CompiledPipeline {
                     }
                     let has_match = model.methods.iter().any(|m| method_matcher.matches(m));
                     if has_match {
-                        Self::apply_action(action, model);
+                        modified |= Self::apply_action(action, model);
                     }
                 }
                 CompiledStep::Code {
@@ -303,22 +326,57 @@ impl CompiledPipeline {
                             continue;
                         }
                         if let Some(code) = method.code.as_mut() {
-                            action.apply(code);
+                            modified |= action.apply_tracked(code);
                         }
                     }
                 }
             }
         }
+        modified
     }
 
-    fn apply_action(action: &TransformAction, model: &mut ClassModel) {
+    /// Whether any step's owner matcher accepts a class with this header.
+    ///
+    /// When this is `false`, [`apply`](Self::apply) leaves the class untouched.
+    pub fn may_apply(&self, header: &ClassHeader) -> bool {
+        self.steps
+            .iter()
+            .any(|step| step.owner_matcher().matches_header(header))
+    }
+
+    /// [`may_apply`](Self::may_apply) on raw classfile bytes, reading only the header.
+    ///
+    /// Bytes whose header cannot be read are kept so the full lift reports the error.
+    pub fn may_apply_to_bytes(&self, class_bytes: &[u8]) -> bool {
+        read_class_header(class_bytes).map_or(true, |header| self.may_apply(&header))
+    }
+
+    fn apply_action(action: &TransformAction, model: &mut ClassModel) -> bool {
         match action {
-            TransformAction::BuiltIn(spec) => spec.apply(model),
-            TransformAction::Custom(callback) => callback(model),
+            TransformAction::BuiltIn(spec) => spec.apply_tracked(model),
+            TransformAction::Custom(callback) => {
+                callback(model);
+                true
+            }
         }
     }
 }
 
+impl ApplySharedClassTransform for CompiledPipeline {
+    fn apply_shared(&self, model: &mut ClassModel) -> crate::Result<()> {
+        self.apply(model);
+        Ok(())
+    }
+
+    fn apply_shared_tracked(&self, model: &mut ClassModel) -> crate::Result<bool> {
+        Ok(self.apply_tracked(model))
+    }
+
+    fn may_apply_shared(&self, class_bytes: &[u8]) -> bool {
+        self.may_apply_to_bytes(class_bytes)
+    }
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -404,6 +462,63 @@ mod tests {
         assert!(!model.access_flags.contains(ClassAccessFlags::FINAL));
     }
 
+    #[test]
+    fn apply_tracked_reports_only_real_changes() {
+        let compiled = PipelineSpec::new()
+            .on_classes(
+                ClassMatcherSpec::Named("test/Foo".into()),
+                TransformAction::BuiltIn(ClassTransformSpec::AddAccessFlags(
+                    ClassAccessFlags::FINAL.bits(),
+                )),
+            )
+            .on_methods(
+                MethodMatcherSpec::Named("nonexistent".into()),
+                ClassMatcherSpec::Any,
+                TransformAction::BuiltIn(ClassTransformSpec::AddAccessFlags(
+                    ClassAccessFlags::ABSTRACT.bits(),
+                )),
+            )
+            .compile();
+
+        let mut foo = sample_class("test/Foo");
+        let mut bar = sample_class("test/Bar");
+        assert!(compiled.apply_tracked(&mut foo));
+        assert!(!compiled.apply_tracked(&mut foo), "flag is already set");
+        assert!(!compiled.apply_tracked(&mut bar));
+    }
+
+    #[test]
+    fn may_apply_checks_every_step_owner_against_the_header() {
+        let compiled = PipelineSpec::new()
+            .on_classes(
+                ClassMatcherSpec::Named("test/Foo".into()),
+                TransformAction::BuiltIn(ClassTransformSpec::AddAccessFlags(
+                    ClassAccessFlags::FINAL.bits(),
+                )),
+            )
+            .on_code(
+                MethodMatcherSpec::Any,
+                ClassMatcherSpec::Implements("java/lang/Runnable".into()),
+                CodeTransformSpec::ReplaceString {
+                    from: "a".into(),
+                    to: "b".into(),
+                },
+            )
+            .compile();
+        let header = |name: &str, interfaces: &[&str]| ClassHeader {
+            version: (52, 0),
+            access_flags: ClassAccessFlags::PUBLIC,
+            name: name.to_owned(),
+            super_name: Some("java/lang/Object".to_owned()),
+            interfaces: interfaces.iter().map(|name| (*name).to_owned()).collect(),
+        };
+
+        assert!(compiled.may_apply(&header("test/Foo", &[])));
+        assert!(compiled.may_apply(&header("test/Bar", &["java/lang/Runnable"])));
+        assert!(!compiled.may_apply(&header("test/Bar", &[])));
+        assert!(compiled.may_apply_to_bytes(b"not a classfile"));
+    }
+
     #[test]
     fn apply_all_batch() {
         let pipeline = PipelineSpec::new().on_classes(
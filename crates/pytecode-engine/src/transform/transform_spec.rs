@@ -5,6 +5,7 @@
 
 use crate::constants::{ClassAccessFlags, FieldAccessFlags, MethodAccessFlags};
 use crate::model::{ClassModel, CodeItem, CodeModel, LdcValue};
+use crate::transform::ApplySharedClassTransform;
 use crate::transform::matcher_spec::InsnMatcherSpec;
 use std::fmt;
 
@@ -69,36 +70,41 @@ impl CodeTransformSpec {
 
     /// Apply this transform to a code model, mutating it in place.
     pub fn apply(&self, code: &mut CodeModel) {
+        self.apply_tracked(code);
+    }
+
+    /// Apply this transform and report whether it changed `code`.
+    pub fn apply_tracked(&self, code: &mut CodeModel) -> bool {
         match self {
             Self::ReplaceInsn {
                 matcher,
                 replacement,
             } => {
                 let matcher = Self::compile_matcher(matcher);
-                code.replace_insns(&matcher, replacement);
+                code.replace_insns(&matcher, replacement) > 0
             }
             Self::ReplaceSequence {
                 pattern,
                 replacement,
             } => {
                 let pattern = Self::compile_pattern(pattern);
-                code.replace_sequences(&pattern, replacement);
+                code.replace_sequences(&pattern, replacement) > 0
             }
             Self::RemoveInsn { matcher } => {
                 let matcher = Self::compile_matcher(matcher);
-                code.remove_insns(&matcher);
+                code.remove_insns(&matcher) > 0
             }
             Self::RemoveSequence { pattern } => {
                 let pattern = Self::compile_pattern(pattern);
-                code.remove_sequences(&pattern);
+                code.remove_sequences(&pattern) > 0
             }
             Self::InsertBefore { matcher, items } => {
                 let matcher = Self::compile_matcher(matcher);
-                code.insert_before(&matcher, items);
+                code.insert_before(&matcher, items) > 0
             }
             Self::InsertAfter { matcher, items } => {
                 let matcher = Self::compile_matcher(matcher);
-                code.insert_after(&matcher, items);
+                code.insert_after(&matcher, items) > 0
             }
             Self::RedirectMethodCall {
                 from_owner,
@@ -108,6 +114,7 @@ impl CodeTransformSpec {
                 to_name,
                 to_descriptor,
             } => {
+                let mut changed = false;
                 for item in &mut code.instructions {
                     match item {
                         CodeItem::Method(insn)
@@ -120,6 +127,7 @@ impl CodeTransformSpec {
                             if let Some(descriptor) = to_descriptor {
                                 insn.descriptor = descriptor.clone();
                             }
+                            changed = true;
                         }
                         CodeItem::InterfaceMethod(insn)
                             if insn.owner == *from_owner
@@ -131,10 +139,12 @@ impl CodeTransformSpec {
                             if let Some(descriptor) = to_descriptor {
                                 insn.descriptor = descriptor.clone();
                             }
+                            changed = true;
                         }
                         _ => {}
                     }
                 }
+                changed
             }
             Self::RedirectFieldAccess {
                 from_owner,
@@ -142,6 +152,7 @@ impl CodeTransformSpec {
                 to_owner,
                 to_name,
             } => {
+                let mut changed = false;
                 for item in &mut code.instructions {
                     match item {
                         CodeItem::Field(insn)
@@ -149,26 +160,29 @@ impl CodeTransformSpec {
                         {
                             insn.owner = to_owner.clone();
                             insn.name = to_name.clone();
+                            changed = true;
                         }
                         _ => {}
                     }
                 }
+                changed
             }
             Self::ReplaceString { from, to } => {
+                let mut changed = false;
                 for item in &mut code.instructions {
                     if let CodeItem::Ldc(insn) = item
                         && let LdcValue::String(value) = &mut insn.value
                         && value == from
                     {
                         *value = to.clone();
+                        changed = true;
                     }
                 }
+                changed
             }
-            Self::Sequence(specs) => {
-                for spec in specs {
-                    spec.apply(code);
-                }
-            }
+            Self::Sequence(specs) => specs
+                .iter()
+                .fold(false, |changed, spec| spec.apply_tracked(code) | changed),
         }
     }
 }
@@ -286,73 +300,98 @@ pub enum ClassTransformSpec {
 impl ClassTransformSpec {
     /// Apply this transform to a class model, mutating it in place.
     pub fn apply(&self, model: &mut ClassModel) {
+        self.apply_tracked(model);
+    }
+
+    /// Apply this transform and report whether it changed `model`.
+    pub fn apply_tracked(&self, model: &mut ClassModel) -> bool {
         match self {
-            Self::RenameClass(name) => {
-                model.name = name.clone();
-            }
+            Self::RenameClass(name) => replace_if_changed(&mut model.name, name),
             Self::SetAccessFlags(flags) => {
-                model.access_flags = ClassAccessFlags::from_bits_truncate(*flags);
+                let flags = ClassAccessFlags::from_bits_truncate(*flags);
+                replace_if_changed(&mut model.access_flags, &flags)
             }
             Self::AddAccessFlags(flags) => {
-                model.access_flags |= ClassAccessFlags::from_bits_truncate(*flags);
+                let flags = model.access_flags | ClassAccessFlags::from_bits_truncate(*flags);
+                replace_if_changed(&mut model.access_flags, &flags)
             }
             Self::RemoveAccessFlags(flags) => {
-                model.access_flags &= !ClassAccessFlags::from_bits_truncate(*flags);
+                let flags = model.access_flags & !ClassAccessFlags::from_bits_truncate(*flags);
+                replace_if_changed(&mut model.access_flags, &flags)
             }
             Self::SetSuperClass(name) => {
-                model.super_name = Some(name.clone());
+                replace_if_changed(&mut model.super_name, &Some(name.clone()))
             }
             Self::AddInterface(name) => {
-                if !model.interfaces.contains(name) {
-                    model.interfaces.push(name.clone());
+                if model.interfaces.contains(name) {
+                    return false;
                 }
+                model.interfaces.push(name.clone());
+                true
             }
             Self::RemoveInterface(name) => {
+                let original_len = model.interfaces.len();
                 model.interfaces.retain(|i| i != name);
+                model.interfaces.len() != original_len
             }
             Self::RemoveMethod { name, descriptor } => {
+                let original_len = model.methods.len();
                 model.methods.retain(|m| {
                     !(m.name == *name && descriptor.as_ref().is_none_or(|d| m.descriptor == *d))
                 });
+                model.methods.len() != original_len
             }
             Self::RemoveField { name, descriptor } => {
+                let original_len = model.fields.len();
                 model.fields.retain(|f| {
                     !(f.name == *name && descriptor.as_ref().is_none_or(|d| f.descriptor == *d))
                 });
+                model.fields.len() != original_len
             }
             Self::RenameMethod { from, to } => {
+                let mut changed = false;
                 for m in &mut model.methods {
                     if m.name == *from {
-                        m.name = to.clone();
+                        changed |= replace_if_changed(&mut m.name, to);
                     }
                 }
+                changed
             }
             Self::RenameField { from, to } => {
+                let mut changed = false;
                 for f in &mut model.fields {
                     if f.name == *from {
-                        f.name = to.clone();
+                        changed |= replace_if_changed(&mut f.name, to);
                     }
                 }
+                changed
             }
             Self::SetMethodAccessFlags { name, flags } => {
+                let flags = MethodAccessFlags::from_bits_truncate(*flags);
+                let mut changed = false;
                 for m in &mut model.methods {
                     if m.name == *name {
-                        m.access_flags = MethodAccessFlags::from_bits_truncate(*flags);
+                        changed |= replace_if_changed(&mut m.access_flags, &flags);
                     }
                 }
+                changed
             }
             Self::SetFieldAccessFlags { name, flags } => {
+                let flags = FieldAccessFlags::from_bits_truncate(*flags);
+                let mut changed = false;
                 for f in &mut model.fields {
                     if f.name == *name {
-                        f.access_flags = FieldAccessFlags::from_bits_truncate(*flags);
+                        changed |= replace_if_changed(&mut f.access_flags, &flags);
                     }
                 }
+                changed
             }
             Self::CodeTransform {
                 method_name,
                 method_descriptor,
                 transform,
             } => {
+                let mut changed = false;
                 for method in &mut model.methods {
                     let matches_name = method_name.as_ref().is_none_or(|name| method.name == *name);
                     let matches_descriptor = method_descriptor
@@ -362,19 +401,38 @@ impl ClassTransformSpec {
                         && matches_descriptor
                         && let Some(code) = method.code.as_mut()
                     {
-                        transform.apply(code);
+                        changed |= transform.apply_tracked(code);
                     }
                 }
+                changed
             }
-            Self::Sequence(specs) => {
-                for spec in specs {
-                    spec.apply(model);
-                }
-            }
+            Self::Sequence(specs) => specs
+                .iter()
+                .fold(false, |changed, spec| spec.apply_tracked(model) | changed),
         }
     }
 }
 
+/// Assign `value` to `slot` unless it already holds it, reporting whether it changed.
+fn replace_if_changed<T: PartialEq + Clone>(slot: &mut T, value: &T) -> bool {
+    if slot == value {
+        return false;
+    }
+    *slot = value.clone();
+    true
+}
+
+impl ApplySharedClassTransform for ClassTransformSpec {
+    fn apply_shared(&self, model: &mut ClassModel) -> crate::Result<()> {
+        self.apply(model);
+        Ok(())
+    }
+
+    fn apply_shared_tracked(&self, model: &mut ClassModel) -> crate::Result<bool> {
+        Ok(self.apply_tracked(model))
+    }
+}
+
 impl fmt::Display for ClassTransformSpec {
     fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
         match self {
@@ -31,7 +31,25 @@ impl ClassWriter {
 }
 
 pub fn write_class(classfile: &ClassFile) -> Result<Vec<u8>> {
-    let mut writer = ByteWriter::with_capacity(4096);
+    let mut bytes = Vec::with_capacity(4096);
+    write_class_into(classfile, &mut bytes)?;
+    Ok(bytes)
+}
+
+/// Append the encoded class to `out`, so callers can reuse one buffer across
+/// many classes. `out` is left as it was if encoding fails.
+pub fn write_class_into(classfile: &ClassFile, out: &mut Vec<u8>) -> Result<()> {
+    let start = out.len();
+    let mut writer = ByteWriter::from_vec(std::mem::take(out));
+    let result = encode_class(&mut writer, classfile);
+    *out = writer.into_bytes();
+    if result.is_err() {
+        out.truncate(start);
+    }
+    result
+}
+
+fn encode_class(writer: &mut ByteWriter, classfile: &ClassFile) -> Result<()> {
     writer.write_u4(classfile.magic);
     if classfile.magic != MAGIC {
         return Err(EngineError::new(
@@ -58,7 +76,7 @@ pub fn write_class(classfile: &ClassFile) -> Result<Vec<u8>> {
     })?;
     writer.write_u2(cp_len);
     for entry in iter_constant_pool_entries(&classfile.constant_pool)? {
-        write_constant_pool_entry(&mut writer, entry);
+        write_constant_pool_entry(writer, entry);
     }
 
     writer.write_u2(classfile.access_flags.bits());
@@ -90,7 +108,7 @@ pub fn write_class(classfile: &ClassFile) -> Result<Vec<u8>> {
     })?;
     writer.write_u2(fields_len);
     for field in &classfile.fields {
-        write_field_info(&mut writer, field)?;
+        write_field_info(writer, field)?;
     }
 
     let methods_len = u16::try_from(classfile.methods.len()).map_err(|_| {
@@ -103,11 +121,11 @@ pub fn write_class(classfile: &ClassFile) -> Result<Vec<u8>> {
     })?;
     writer.write_u2(methods_len);
     for method in &classfile.methods {
-        write_method_info(&mut writer, method)?;
+        write_method_info(writer, method)?;
     }
 
-    write_attributes(&mut writer, &classfile.attributes)?;
-    Ok(writer.into_bytes())
+    write_attributes(writer, &classfile.attributes)?;
+    Ok(())
 }
 
 fn iter_constant_pool_entries(
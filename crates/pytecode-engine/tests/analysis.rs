@@ -1,16 +1,19 @@
 use pytecode_engine::analysis::{
-    ClassResolver, JAVA_LANG_OBJECT, MappingClassResolver, build_cfg, common_superclass,
-    find_overridden_methods, is_reference, is_subtype, merge_vtypes, recompute_frames,
-    vtype_from_field_descriptor_str,
+    ClassResolver, FrameBaseline, FrameState, JAVA_LANG_OBJECT, MappingClassResolver,
+    ResolvedClass, VType, build_cfg, common_superclass, find_overridden_methods, is_reference,
+    is_subtype, iter_superclasses, iter_supertypes, merge_vtypes, recompute_frames,
+    recompute_frames_incremental, scan_references, simulate, vtype_from_field_descriptor_str,
 };
 use pytecode_engine::constants::MethodAccessFlags;
 use pytecode_engine::indexes::*;
 use pytecode_engine::model::{
-    BranchInsn, ClassModel, CodeItem, CodeModel, DebugInfoPolicy, Label, VarInsn,
+    BranchInsn, ClassModel, CodeItem, CodeModel, DebugInfoPolicy, DebugInfoState, ExceptionHandler,
+    IIncInsn, Label, LdcValue, MethodInsn, TypeInsn, VarInsn,
 };
 use pytecode_engine::parse_class;
 use pytecode_engine::raw::{AttributeInfo, ConstantPoolEntry, Instruction};
 use std::fs;
+use std::sync::Arc;
 
 type TestResult<T> = Result<T, Box<dyn std::error::Error + Send + Sync>>;
 
@@ -189,6 +192,98 @@ fn hierarchy_queries_work_for_fixture_classes() -> TestResult<()> {
     Ok(())
 }
 
+#[test]
+fn resolver_memoizes_hierarchy_closures_across_clones() -> TestResult<()> {
+    let classfiles = parse_fixture_classes("HierarchyFixture.java");
+    let resolver = MappingClassResolver::from_classfile_refs(classfiles.iter())?;
+    let fixture_name = "fixture/hierarchy/HierarchyFixture";
+
+    let superclasses = resolver.superclass_names(fixture_name)?;
+    let expected = iter_superclasses(&resolver, fixture_name)?
+        .into_iter()
+        .map(|resolved| resolved.name)
+        .collect::<Vec<_>>();
+    assert_eq!(&superclasses[..], &expected[..]);
+    let supertypes = resolver.supertype_names(fixture_name)?;
+    for resolved in iter_supertypes(&resolver, fixture_name)? {
+        assert!(supertypes.contains(&resolved.name));
+    }
+
+    let shared = resolver.clone();
+    assert!(Arc::ptr_eq(
+        &superclasses,
+        &shared.superclass_names(fixture_name)?
+    ));
+    assert!(Arc::ptr_eq(
+        &supertypes,
+        &shared.supertype_names(fixture_name)?
+    ));
+    assert_eq!(
+        resolver.get(fixture_name),
+        resolver.resolve_class(fixture_name).as_ref()
+    );
+    assert!(
+        resolver
+            .superclass_names("fixture/hierarchy/Missing")
+            .is_err()
+    );
+    Ok(())
+}
+
+#[test]
+fn resolver_is_shared_across_threads_with_consistent_merges() -> TestResult<()> {
+    fn assert_send_sync<T: Send + Sync>() {}
+    assert_send_sync::<MappingClassResolver>();
+
+    let classfiles = parse_fixture_classes("HierarchyFixture.java");
+    let resolver = MappingClassResolver::from_classfile_refs(classfiles.iter())?;
+    let names = classfiles
+        .iter()
+        .map(|classfile| Ok(ResolvedClass::from_classfile(classfile)?.name))
+        .collect::<TestResult<Vec<_>>>()?;
+    let uncached = MappingClassResolver::from_classfile_refs(classfiles.iter())?;
+    let expected = names
+        .iter()
+        .flat_map(|left| names.iter().map(move |right| (left, right)))
+        .map(|(left, right)| common_superclass(&uncached, left, right))
+        .collect::<Result<Vec<_>, _>>()?;
+
+    std::thread::scope(|scope| {
+        let workers = (0..4)
+            .map(|_| {
+                scope.spawn(|| {
+                    names
+                        .iter()
+                        .flat_map(|left| names.iter().map(move |right| (left, right)))
+                        .map(|(left, right)| common_superclass(&resolver, left, right))
+                        .collect::<Result<Vec<_>, _>>()
+                })
+            })
+            .collect::<Vec<_>>();
+        for worker in workers {
+            assert_eq!(worker.join().expect("worker should not panic")?, expected);
+        }
+        Ok(())
+    })
+}
+
+#[test]
+fn resolver_from_bytes_matches_full_parse() -> TestResult<()> {
+    let paths = pytecode_engine::fixtures::compiled_fixture_paths_for("HierarchyFixture.java")?;
+    let class_bytes = paths.iter().map(fs::read).collect::<Result<Vec<_>, _>>()?;
+    let classfiles = parse_fixture_classes("HierarchyFixture.java");
+    let from_bytes = MappingClassResolver::from_bytes(&class_bytes)?;
+    let from_classfiles = MappingClassResolver::from_classfile_refs(classfiles.iter())?;
+    for classfile in &classfiles {
+        let name = ResolvedClass::from_classfile(classfile)?.name;
+        assert_eq!(
+            from_bytes.resolve_class(&name),
+            from_classfiles.resolve_class(&name)
+        );
+    }
+    Ok(())
+}
+
 #[test]
 fn cfg_tracks_branch_and_exception_edges() -> TestResult<()> {
     let branch_model =
@@ -216,6 +311,121 @@ fn cfg_tracks_branch_and_exception_edges() -> TestResult<()> {
     Ok(())
 }
 
+#[test]
+fn cfg_groups_nodes_into_basic_blocks_with_replayable_frames() -> TestResult<()> {
+    for (resource, class_file, method_name) in [
+        ("CfgFixture.java", "CfgFixture.class", "ifElse"),
+        (
+            "TryCatchExample.java",
+            "TryCatchExample.class",
+            "safeDivide",
+        ),
+    ] {
+        let mut model = ClassModel::from_bytes(&fixture_bytes(resource, class_file))?;
+        let class_name = model.name.clone();
+        let method = method_named(&mut model, method_name);
+        let (descriptor, access_flags) = (method.descriptor.clone(), method.access_flags);
+        let code = code_mut(method);
+
+        let cfg = build_cfg(code)?;
+        assert!(cfg.blocks.len() < cfg.nodes.len());
+        let mut next_node = 0;
+        for block in &cfg.blocks {
+            assert_eq!(block.start_node, next_node);
+            assert!(cfg.nodes[block.start_node].is_block_start);
+            for node in &cfg.nodes[block.start_node + 1..block.end_node] {
+                assert!(!node.is_block_start);
+            }
+            for node in block.start_node..block.end_node {
+                assert_eq!(cfg.node_to_block[node], block.block_index);
+            }
+            next_node = block.end_node;
+        }
+        assert_eq!(next_node, cfg.nodes.len());
+
+        let simulation = simulate(
+            code,
+            &class_name,
+            method_name,
+            &descriptor,
+            access_flags,
+            None,
+        )?;
+        let frames = simulation.instruction_frames(code)?;
+        assert_eq!(frames.len(), cfg.nodes.len());
+        for (block, entry) in cfg.blocks.iter().zip(&simulation.block_entry_frames) {
+            assert_eq!(&frames[block.start_node], entry);
+            for frame in &frames[block.start_node..block.end_node] {
+                assert_eq!(frame.is_some(), entry.is_some());
+            }
+        }
+    }
+    Ok(())
+}
+
+#[test]
+fn simulate_initializes_every_copy_of_an_uninitialized_receiver() -> TestResult<()> {
+    let bytes = fixture_bytes("ControlFlowExample.java", "ControlFlowExample.class");
+    let mut model = ClassModel::from_bytes(&bytes)?;
+    let class_name = model.name.clone();
+    let code = code_mut(method_named(&mut model, "branch"));
+    code.instructions = vec![
+        CodeItem::Type(TypeInsn {
+            opcode: 0xBB,
+            descriptor: "java/lang/StringBuilder".to_owned(),
+        }),
+        CodeItem::Raw(Instruction::Simple {
+            opcode: 0x59,
+            offset: 0,
+        }),
+        CodeItem::Method(MethodInsn {
+            opcode: 0xB7,
+            owner: "java/lang/StringBuilder".to_owned(),
+            name: "<init>".to_owned(),
+            descriptor: "()V".to_owned(),
+            is_interface: false,
+        }),
+        CodeItem::Var(VarInsn {
+            opcode: 0x3A,
+            slot: 1,
+        }),
+        CodeItem::Var(VarInsn {
+            opcode: 0x15,
+            slot: 0,
+        }),
+        CodeItem::Raw(Instruction::Simple {
+            opcode: 0xAC,
+            offset: 0,
+        }),
+    ];
+    code.exception_handlers.clear();
+
+    let simulation = simulate(
+        code,
+        &class_name,
+        "branch",
+        "(I)I",
+        MethodAccessFlags::PUBLIC | MethodAccessFlags::STATIC,
+        None,
+    )?;
+    assert_eq!(simulation.max_stack, 2);
+    assert_eq!(simulation.max_locals, 2);
+    let frames = simulation.instruction_frames(code)?;
+    let uninitialized = VType::Uninitialized {
+        code_index: 0,
+        class_name: "java/lang/StringBuilder".to_owned(),
+    };
+    let builder = VType::Object("java/lang/StringBuilder".to_owned());
+    let frame_at = |node: usize| frames[node].as_ref().expect("node should be reachable");
+    assert_eq!(
+        frame_at(2).stack,
+        vec![uninitialized.clone(), uninitialized]
+    );
+    assert_eq!(frame_at(3).stack, vec![builder.clone()]);
+    assert_eq!(frame_at(5).locals, vec![VType::Integer, builder]);
+    Ok(())
+}
+
 #[test]
 fn recompute_frames_allows_phase3_edit_that_used_to_fail() -> TestResult<()> {
     let bytes = fixture_bytes("ControlFlowExample.java", "ControlFlowExample.class");
@@ -281,6 +491,485 @@ fn recompute_frames_supports_legacy_jsr_ret_subroutines() -> TestResult<()> {
     Ok(())
 }
 
+/// `static int countDown(String s, int n)` with frames declaring `s` as a
+/// `CharSequence`, which simulation alone would never infer.
+struct CountDown {
+    code: CodeModel,
+    head: Label,
+    exit: Label,
+    frames: Vec<(Label, FrameState)>,
+}
+
+impl CountDown {
+    const DESCRIPTOR: &str = "(Ljava/lang/String;I)I";
+
+    fn new() -> Self {
+        let head = Label::named("head");
+        let exit = Label::named("exit");
+        let mut code = CodeModel::new(1, 2, DebugInfoState::Fresh);
+        code.instructions = vec![
+            simple(0x00),
+            CodeItem::Label(head.clone()),
+            CodeItem::Var(VarInsn {
+                opcode: 0x15,
+                slot: 1,
+            }),
+            CodeItem::Branch(BranchInsn {
+                opcode: 0x9E,
+                target: exit.clone(),
+            }),
+            CodeItem::IInc(IIncInsn { slot: 1, value: -1 }),
+            CodeItem::Branch(BranchInsn {
+                opcode: 0xA7,
+                target: head.clone(),
+            }),
+            CodeItem::Label(exit.clone()),
+            CodeItem::Var(VarInsn {
+                opcode: 0x15,
+                slot: 1,
+            }),
+            simple(0xAC),
+        ];
+        let declared = FrameState {
+            stack: Vec::new(),
+            locals: vec![
+                VType::Object("java/lang/CharSequence".to_owned()),
+                VType::Integer,
+            ],
+        };
+        let frames = vec![(head.clone(), declared.clone()), (exit.clone(), declared)];
+        Self {
+            code,
+            head,
+            exit,
+            frames,
+        }
+    }
+
+    fn baseline<'a>(&'a self, original: &'a [CodeItem]) -> FrameBaseline<'a> {
+        FrameBaseline {
+            instructions: original,
+            exception_handlers: &[],
+            frames: &self.frames,
+            max_stack: 1,
+            max_locals: 2,
+        }
+    }
+
+    /// Recompute the frames of the current code incrementally and in full.
+    fn recompute_both(
+        &self,
+        baseline: &FrameBaseline<'_>,
+    ) -> TestResult<(
+        pytecode_engine::analysis::FrameComputationResult,
+        pytecode_engine::analysis::FrameComputationResult,
+    )> {
+        let incremental = recompute_frames_incremental(
+            &self.code,
+            "CountDown",
+            "countDown",
+            Self::DESCRIPTOR,
+            MethodAccessFlags::STATIC,
+            baseline,
+            None,
+        )?;
+        let full = recompute_frames(
+            &self.code,
+            "CountDown",
+            "countDown",
+            Self::DESCRIPTOR,
+            MethodAccessFlags::STATIC,
+            None,
+        )?;
+        Ok((incremental, full))
+    }
+
+    fn insert_after(&mut self, label: &Label, offset: usize, items: Vec<CodeItem>) {
+        let at = self
+            .code
+            .instructions
+            .iter()
+            .position(|item| matches!(item, CodeItem::Label(candidate) if candidate == label))
+            .expect("label should be present")
+            + 1
+            + offset;
+        self.code.instructions.splice(at..at, items);
+    }
+
+    fn frame_at(
+        &self,
+        frames: &pytecode_engine::analysis::FrameComputationResult,
+        label: &Label,
+    ) -> Vec<VType> {
+        let code_index = self
+            .code
+            .instructions
+            .iter()
+            .position(|item| matches!(item, CodeItem::Label(candidate) if candidate == label))
+            .expect("label should be present")
+            + 1;
+        frames
+            .frames
+            .iter()
+            .find(|frame| frame.code_index == code_index)
+            .map(|frame| frame.locals.clone())
+            .expect("label should have a frame")
+    }
+}
+
+fn simple(opcode: u8) -> CodeItem {
+    CodeItem::Raw(Instruction::Simple { opcode, offset: 0 })
+}
+
+#[test]
+fn incremental_frames_keep_declared_frames_of_untouched_segments() -> TestResult<()> {
+    let mut method = CountDown::new();
+    let original = method.code.instructions.clone();
+    let exit = method.exit.clone();
+    method.insert_after(&exit, 0, vec![simple(0x00)]);
+
+    let incremental = recompute_frames_incremental(
+        &method.code,
+        "CountDown",
+        "countDown",
+        CountDown::DESCRIPTOR,
+        MethodAccessFlags::STATIC,
+        &method.baseline(&original),
+        None,
+    )?;
+    let full = recompute_frames(
+        &method.code,
+        "CountDown",
+        "countDown",
+        CountDown::DESCRIPTOR,
+        MethodAccessFlags::STATIC,
+        None,
+    )?;
+    // The loop was not re-simulated, so its declared frame survives as is.
+    assert_eq!(
+        method.frame_at(&incremental, &method.head)[0],
+        VType::Object("java/lang/CharSequence".to_owned())
+    );
+    assert_eq!(
+        method.frame_at(&full, &method.head)[0],
+        VType::Object("java/lang/String".to_owned())
+    );
+    assert_eq!((incremental.max_stack, incremental.max_locals), (1, 2));
+    Ok(())
+}
+
+#[test]
+fn incremental_frames_resimulate_declared_frames_an_edit_widens() -> TestResult<()> {
+    let mut method = CountDown::new();
+    let original = method.code.instructions.clone();
+    let head = method.head.clone();
+    // Overwrite `s` with an int inside the loop body, before the back edge.
+    method.insert_after(
+        &head,
+        3,
+        vec![
+            simple(0x03),
+            CodeItem::Var(VarInsn {
+                opcode: 0x36,
+                slot: 0,
+            }),
+        ],
+    );
+
+    let incremental = recompute_frames_incremental(
+        &method.code,
+        "CountDown",
+        "countDown",
+        CountDown::DESCRIPTOR,
+        MethodAccessFlags::STATIC,
+        &method.baseline(&original),
+        None,
+    )?;
+    let full = recompute_frames(
+        &method.code,
+        "CountDown",
+        "countDown",
+        CountDown::DESCRIPTOR,
+        MethodAccessFlags::STATIC,
+        None,
+    )?;
+    assert_eq!(method.frame_at(&incremental, &method.head)[0], VType::Top);
+    assert_eq!(method.frame_at(&incremental, &method.exit)[0], VType::Top);
+    assert_eq!(incremental, full);
+    Ok(())
+}
+
+#[test]
+fn incremental_frames_fall_back_when_exception_handlers_changed() -> TestResult<()> {
+    let method = CountDown::new();
+    let original = method.code.instructions.clone();
+    let removed = [ExceptionHandler {
+        start: method.head.clone(),
+        end: method.exit.clone(),
+        handler: method.exit.clone(),
+        catch_type: None,
+    }];
+    let baseline = FrameBaseline {
+        exception_handlers: &removed,
+        ..method.baseline(&original)
+    };
+
+    let (incremental, full) = method.recompute_both(&baseline)?;
+    // The declared `CharSequence` frames were discarded, not kept.
+    assert_eq!(
+        method.frame_at(&incremental, &method.head)[0],
+        VType::Object("java/lang/String".to_owned())
+    );
+    assert_eq!(incremental, full);
+    Ok(())
+}
+
+#[test]
+fn incremental_frames_fall_back_for_duplicate_declared_labels() -> TestResult<()> {
+    let mut method = CountDown::new();
+    let original = method.code.instructions.clone();
+    let duplicate = method.frames[0].clone();
+    method.frames.push(duplicate);
+
+    let (incremental, full) = method.recompute_both(&method.baseline(&original))?;
+    assert_eq!(
+        method.frame_at(&incremental, &method.head)[0],
+        VType::Object("java/lang/String".to_owned())
+    );
+    assert_eq!(incremental, full);
+    Ok(())
+}
+
+#[test]
+fn incremental_frames_fall_back_when_a_frame_conflicts_with_the_entry_state() -> TestResult<()> {
+    let mut method = CountDown::new();
+    let start = Label::named("start");
+    method
+        .code
+        .instructions
+        .insert(0, CodeItem::Label(start.clone()));
+    let original = method.code.instructions.clone();
+    // `s` is a `String` on entry, never an int.
+    method.frames.push((
+        start,
+        FrameState {
+            stack: Vec::new(),
+            locals: vec![VType::Integer, VType::Integer],
+        },
+    ));
+
+    let (incremental, full) = method.recompute_both(&method.baseline(&original))?;
+    assert_eq!(
+        method.frame_at(&incremental, &method.head)[0],
+        VType::Object("java/lang/String".to_owned())
+    );
+    assert_eq!(incremental, full);
+    Ok(())
+}
+
+#[test]
+fn incremental_frames_fall_back_for_jsr_subroutines() -> TestResult<()> {
+    let mut code = CodeModel::new(1, 2, DebugInfoState::Fresh);
+    install_jsr_subroutine(&mut code);
+    let subroutine = code
+        .instructions
+        .iter()
+        .find_map(|item| match item {
+            CodeItem::Label(label) => Some(label.clone()),
+            _ => None,
+        })
+        .expect("subroutine label should be present");
+    let frames = [(
+        subroutine,
+        FrameState {
+            stack: vec![VType::Object("java/lang/Object".to_owned())],
+            locals: vec![VType::Integer, VType::Top],
+        },
+    )];
+    let baseline = FrameBaseline {
+        instructions: &code.instructions,
+        exception_handlers: &[],
+        frames: &frames,
+        max_stack: 1,
+        max_locals: 2,
+    };
+
+    let incremental = recompute_frames_incremental(
+        &code,
+        "Subroutine",
+        "branch",
+        "(I)I",
+        MethodAccessFlags::STATIC,
+        &baseline,
+        None,
+    )?;
+    let full = recompute_frames(
+        &code,
+        "Subroutine",
+        "branch",
+        "(I)I",
+        MethodAccessFlags::STATIC,
+        None,
+    )?;
+    assert_eq!(incremental, full);
+    Ok(())
+}
+
+#[test]
+fn simulate_visits_each_block_once_when_no_join_widens() -> TestResult<()> {
+    for (resource, class_file, method_name) in [
+        (
+            "TryCatchExample.java",
+            "TryCatchExample.class",
+            "safeDivide",
+        ),
+        (
+            "ControlFlowExample.java",
+            "ControlFlowExample.class",
+            "denseSwitch",
+        ),
+        (
+            "ControlFlowExample.java",
+            "ControlFlowExample.class",
+            "loopSum",
+        ),
+    ] {
+        let mut model = ClassModel::from_bytes(&fixture_bytes(resource, class_file))?;
+        let class_name = model.name.clone();
+        let method = method_named(&mut model, method_name);
+        let (descriptor, access_flags) = (method.descriptor.clone(), method.access_flags);
+        let simulation = simulate(
+            code_mut(method),
+            &class_name,
+            method_name,
+            &descriptor,
+            access_flags,
+            None,
+        )?;
+        let reachable = simulation
+            .block_entry_frames
+            .iter()
+            .filter(|frame| frame.is_some())
+            .count();
+        assert_eq!(simulation.iterations, reachable, "{method_name}");
+    }
+    Ok(())
+}
+
+#[test]
+fn simulate_settles_loops_before_visiting_their_exits() -> TestResult<()> {
+    let mut method = CountDown::new();
+    let head = method.head.clone();
+    method.insert_after(
+        &head,
+        3,
+        vec![
+            simple(0x03),
+            CodeItem::Var(VarInsn {
+                opcode: 0x36,
+                slot: 0,
+            }),
+        ],
+    );
+
+    let simulation = simulate(
+        &method.code,
+        "CountDown",
+        "countDown",
+        CountDown::DESCRIPTOR,
+        MethodAccessFlags::STATIC,
+        None,
+    )?;
+    // The back edge widens `s`, so the loop head and body run twice, but the
+    // exit waits for the loop to settle and runs once.
+    assert_eq!(simulation.block_entry_frames.len(), 4);
+    assert_eq!(simulation.iterations, 6);
+    Ok(())
+}
+
+#[test]
+fn scan_references_matches_the_references_of_lifted_models() -> TestResult<()> {
+    let classes = ["InstructionShowcase.java", "LambdaShowcase.java"]
+        .into_iter()
+        .flat_map(|resource| {
+            pytecode_engine::fixtures::compiled_fixture_paths_for(resource)
+                .expect("fixture paths should load")
+        })
+        .map(|path| fs::read(path).expect("fixture bytes should read"))
+        .collect::<Vec<_>>();
+
+    let mut expected = Vec::new();
+    for bytes in &classes {
+        let model = ClassModel::from_bytes(bytes)?;
+        for method in &model.methods {
+            let Some(code) = &method.code else {
+                continue;
+            };
+            for item in &code.instructions {
+                let (owner, name, descriptor) = match item {
+                    CodeItem::Field(insn) => (&*insn.owner, &*insn.name, &*insn.descriptor),
+                    CodeItem::Method(insn) => (&*insn.owner, &*insn.name, &*insn.descriptor),
+                    CodeItem::InterfaceMethod(insn) => {
+                        (&*insn.owner, &*insn.name, &*insn.descriptor)
+                    }
+                    CodeItem::InvokeDynamic(insn) => ("", &*insn.name, &*insn.descriptor),
+                    CodeItem::Type(insn) => (&*insn.descriptor, "", ""),
+                    CodeItem::MultiANewArray(insn) => (&*insn.descriptor, "", ""),
+                    CodeItem::Ldc(insn) => match &insn.value {
+                        LdcValue::Class(name) => (&**name, "", ""),
+                        _ => continue,
+                    },
+                    _ => continue,
+                };
+                expected.push(
+                    [
+                        &*model.name,
+                        &*method.name,
+                        &*method.descriptor,
+                        owner,
+                        name,
+                        descriptor,
+                    ]
+                    .map(str::to_owned),
+                );
+            }
+        }
+    }
+
+    let table = scan_references(&classes, 2)?;
+    assert_eq!(table.strings[0], "");
+    let text = |id: u32| table.strings[id as usize].clone();
+    let actual = (0..table.len())
+        .map(|row| {
+            [
+                text(table.classes[row]),
+                text(table.methods[row]),
+                text(table.method_descriptors[row]),
+                text(table.owners[row]),
+                text(table.names[row]),
+                text(table.descriptors[row]),
+            ]
+        })
+        .collect::<Vec<_>>();
+    assert!(
+        expected
+            .iter()
+            .any(|row| row[4].is_empty() && !row[3].is_empty())
+    );
+    assert!(expected.iter().any(|row| row[3].is_empty()));
+    assert_eq!(actual, expected);
+    assert_eq!(
+        table.strings.len(),
+        table
+            .strings
+            .iter()
+            .collect::<std::collections::HashSet<_>>()
+            .len()
+    );
+    assert_eq!(scan_references(&classes, 1)?, table);
+    Ok(())
+}
+
 #[test]
 fn vtype_helpers_cover_references_and_object_merges() -> TestResult<()> {
     let int_type = vtype_from_field_descriptor_str("I")?;
@@ -1,14 +1,19 @@
+use pytecode_engine::analysis::ResolvedClass;
 use pytecode_engine::fixtures::compiled_fixture_paths_for;
 use pytecode_engine::indexes::*;
 use pytecode_engine::model::{
     BranchInsn, ClassModel, CodeItem, CodeModel, ConstantPoolBuilder, DebugInfoPolicy,
-    DebugInfoState, Label, MethodModel, VarInsn, mark_class_debug_info_stale,
-    mark_method_debug_info_stale,
+    DebugInfoState, FieldInsn, Label, LdcInsn, LdcValue, LookupSwitchInsn, MISSING_LABEL,
+    MethodModel, OperandKind, VarInsn, lift_classes_parallel, lower_models_parallel,
+    mark_class_debug_info_stale, mark_method_debug_info_stale,
 };
 use pytecode_engine::modified_utf8::decode_modified_utf8;
 use pytecode_engine::raw::{AttributeInfo, ConstantPoolEntry, Instruction};
 use pytecode_engine::transform::{insn_is_label, insn_opcode, insn_var_slot};
-use pytecode_engine::{EngineErrorKind, parse_class};
+use pytecode_engine::{
+    EngineErrorKind, ReadLevel, decode_attribute, parse_class, parse_class_at, parse_classes,
+    read_class_header, write_class,
+};
 use std::fs;
 
 fn fixture_bytes(resource_name: &str, class_name: &str) -> Vec<u8> {
@@ -179,6 +184,67 @@ fn code_model_search_helpers_find_and_count_matches() {
     );
 }
 
+#[test]
+fn instruction_table_interns_strings_and_resolves_label_rows() {
+    let mut code = CodeModel::new(2, 1, DebugInfoState::Fresh);
+    let top = Label::named("top");
+    let done = Label::named("done");
+    let get = |name: &str| {
+        CodeItem::Field(FieldInsn {
+            opcode: 0xB2,
+            owner: "p/Holder".to_owned(),
+            name: name.to_owned(),
+            descriptor: "I".to_owned(),
+        })
+    };
+    code.instructions = vec![
+        CodeItem::Label(top.clone()),
+        get("a"),
+        get("b"),
+        CodeItem::Ldc(LdcInsn {
+            value: LdcValue::Long(0x1_0000_0002),
+        }),
+        CodeItem::LookupSwitch(LookupSwitchInsn {
+            default_target: done.clone(),
+            pairs: vec![(-1, top.clone()), (7, Label::named("elsewhere"))],
+        }),
+        CodeItem::Branch(BranchInsn {
+            opcode: 0xA7,
+            target: top,
+        }),
+        CodeItem::Label(done),
+        raw_nop(),
+    ];
+
+    let table = code.instruction_table();
+    assert_eq!(table.len(), code.instructions.len());
+    assert_eq!(
+        table.opcodes,
+        vec![0, 0xB2, 0xB2, 0x14, 0xAB, 0xA7, 0, 0x00]
+    );
+    assert_eq!(
+        table.kinds,
+        vec![
+            OperandKind::Label,
+            OperandKind::Field,
+            OperandKind::Field,
+            OperandKind::LdcLong,
+            OperandKind::LookupSwitch,
+            OperandKind::Branch,
+            OperandKind::Label,
+            OperandKind::None,
+        ]
+    );
+    assert_eq!(table.strings, vec!["p/Holder", "a", "I", "b"]);
+    assert_eq!(table.operands[1], [0, 1, 2]);
+    assert_eq!(table.operands[2], [0, 3, 2]);
+    assert_eq!(table.operands[3], [1, 2, 0]);
+    assert_eq!(table.operands[4], [6, 0, 2]);
+    assert_eq!(table.operands[5], [0, 0, 0]);
+    assert_eq!(table.switch_keys, vec![-1, 7]);
+    assert_eq!(table.switch_targets, vec![0, MISSING_LABEL]);
+}
+
 #[test]
 fn code_model_edit_helpers_replace_insert_and_remove() {
     let mut code = CodeModel::new(1, 1, DebugInfoState::Fresh);
@@ -287,6 +353,157 @@ fn unchanged_hello_world_model_roundtrip_preserves_bytes() {
     assert_eq!(lowered, bytes);
 }
 
+#[test]
+fn batch_lift_matches_serial_lift_in_input_order() {
+    let fixtures = [
+        fixture_bytes("HelloWorld.java", "HelloWorld.class"),
+        fixture_bytes("ControlFlowExample.java", "ControlFlowExample.class"),
+        fixture_bytes("CfgEdgeCaseFixture.java", "CfgEdgeCaseFixture.class"),
+    ];
+    let inputs = fixtures
+        .iter()
+        .cycle()
+        .take(12)
+        .cloned()
+        .collect::<Vec<_>>();
+    let serial = inputs
+        .iter()
+        .map(|bytes| ClassModel::from_bytes(bytes).expect("fixture should lift"))
+        .collect::<Vec<_>>();
+    let batched = ClassModel::from_bytes_many(&inputs, 4).expect("batch should lift");
+    assert_eq!(batched.len(), serial.len());
+    for (left, right) in batched.iter().zip(&serial) {
+        assert_eq!(left.name, right.name);
+        assert_eq!(left.to_bytes().unwrap(), right.to_bytes().unwrap());
+    }
+
+    let parsed = parse_classes(&inputs, 0).expect("batch should parse");
+    let lowered = lower_models_parallel(&batched, 3).expect("batch should lower");
+    let relifted = lift_classes_parallel(&lowered, 2).expect("batch should relift");
+    assert_eq!(parsed.len(), inputs.len());
+    assert_eq!(relifted.len(), inputs.len());
+    for ((model, stub), bytes) in relifted.iter().zip(&lowered).zip(&inputs) {
+        assert_eq!(&stub.bytes, bytes);
+        assert_eq!(model.to_bytes().unwrap(), *bytes);
+    }
+}
+
+#[test]
+fn batch_lift_reports_first_failing_input() {
+    let good = fixture_bytes("HelloWorld.java", "HelloWorld.class");
+    let inputs = vec![good.clone(), vec![0xCA, 0xFE], good, vec![0x00]];
+    let error = ClassModel::from_bytes_many(&inputs, 4).expect_err("truncated input should fail");
+    let serial_error = ClassModel::from_bytes(&inputs[1]).expect_err("truncated input should fail");
+    assert_eq!(error.to_string(), serial_error.to_string());
+}
+
+#[test]
+fn read_class_header_matches_lifted_model() {
+    for (resource, class_name) in [
+        ("HelloWorld.java", "HelloWorld.class"),
+        ("ControlFlowExample.java", "ControlFlowExample.class"),
+        ("CfgEdgeCaseFixture.java", "CfgEdgeCaseFixture.class"),
+    ] {
+        let bytes = fixture_bytes(resource, class_name);
+        let model = ClassModel::from_bytes(&bytes).expect("fixture should lift");
+        let header = read_class_header(&bytes).expect("header should read");
+        assert_eq!(header.version, model.version);
+        assert_eq!(header.access_flags, model.access_flags);
+        assert_eq!(header.name, model.name);
+        assert_eq!(header.super_name, model.super_name);
+        assert_eq!(header.interfaces, model.interfaces);
+
+        // Members and attributes are never read, so a truncated body is fine.
+        let truncated = &bytes[..bytes.len() - 1];
+        assert!(ClassModel::from_bytes(truncated).is_err());
+        assert_eq!(
+            read_class_header(truncated).expect("header should read"),
+            header
+        );
+    }
+}
+
+#[test]
+fn partial_read_levels_keep_the_tables_they_promise() {
+    for (resource, class_name) in [
+        ("HelloWorld.java", "HelloWorld.class"),
+        ("HierarchyFixture.java", "HierarchyFixture.class"),
+    ] {
+        let bytes = fixture_bytes(resource, class_name);
+        let full = parse_class(&bytes).expect("fixture should parse");
+
+        let header = parse_class_at(&bytes, ReadLevel::Header).expect("header should parse");
+        assert_eq!(header.constant_pool, full.constant_pool);
+        assert_eq!(header.this_class, full.this_class);
+        assert_eq!(header.super_class, full.super_class);
+        assert_eq!(header.interfaces, full.interfaces);
+        assert!(header.fields.is_empty());
+        assert!(header.methods.is_empty());
+        assert!(header.attributes.is_empty());
+
+        let members = parse_class_at(&bytes, ReadLevel::Members).expect("members should parse");
+        assert_eq!(members.fields.len(), full.fields.len());
+        assert_eq!(members.methods.len(), full.methods.len());
+        for (partial, method) in members.methods.iter().zip(&full.methods) {
+            assert_eq!(partial.access_flags, method.access_flags);
+            assert_eq!(partial.name_index, method.name_index);
+            assert_eq!(partial.descriptor_index, method.descriptor_index);
+            assert!(partial.attributes.is_empty());
+        }
+        assert!(members.attributes.is_empty());
+        assert_eq!(
+            ResolvedClass::from_classfile(&members).expect("members should resolve"),
+            ResolvedClass::from_classfile(&full).expect("full class should resolve")
+        );
+        assert_eq!(
+            parse_class_at(&bytes, ReadLevel::Full).expect("full should parse"),
+            full
+        );
+    }
+}
+
+#[test]
+fn lazy_read_roundtrips_raw_attributes_and_decodes_on_demand() {
+    for (resource, class_name) in [
+        ("HelloWorld.java", "HelloWorld.class"),
+        ("HierarchyFixture.java", "HierarchyFixture.class"),
+    ] {
+        let bytes = fixture_bytes(resource, class_name);
+        let full = parse_class(&bytes).expect("fixture should parse");
+        let lazy = parse_class_at(&bytes, ReadLevel::Lazy).expect("lazy read should parse");
+
+        let raw_attributes = lazy
+            .attributes
+            .iter()
+            .chain(lazy.fields.iter().flat_map(|field| &field.attributes))
+            .chain(lazy.methods.iter().flat_map(|method| &method.attributes));
+        for attribute in raw_attributes {
+            assert!(matches!(attribute, AttributeInfo::Unknown(_)));
+        }
+        assert_eq!(write_class(&lazy).expect("lazy class should write"), bytes);
+        let lifted = |classfile| {
+            ClassModel::from_classfile(classfile)
+                .and_then(|model| model.to_bytes())
+                .expect("class should lift and lower")
+        };
+        assert_eq!(lifted(&lazy), lifted(&full));
+
+        let code = lazy.methods[0].attributes.first().expect("method has code");
+        assert_eq!(
+            decode_attribute(code, &lazy.constant_pool)
+                .expect("code should decode")
+                .as_ref(),
+            &full.methods[0].attributes[0]
+        );
+
+        let mut decoded = lazy.clone();
+        decoded
+            .decode_attributes()
+            .expect("attributes should decode");
+        assert_eq!(decoded, full);
+    }
+}
+
 #[test]
 fn static_interface_methods_preserve_interface_ref_invocations() {
     let bytes = fixture_bytes(
@@ -504,6 +721,51 @@ fn legacy_jsr_ret_methods_roundtrip_with_recomputed_frames_on_old_versions() {
     );
 }
 
+#[test]
+fn recomputed_frames_are_reused_for_methods_whose_code_did_not_change() {
+    let bytes = fixture_bytes("ControlFlowExample.java", "ControlFlowExample.class");
+    let original = parse_class(&bytes).expect("fixture should parse");
+    let original_branch = method_code_attr_named(&original, "branch");
+    let mut model = ClassModel::from_bytes(&bytes).expect("fixture should lift");
+    // Bogus limits survive only if the method's frames are not recomputed.
+    code_mut(method_named(&mut model, "branch")).max_stack = 99;
+    let loop_sum = code_mut(method_named(&mut model, "loopSum"));
+    loop_sum.max_stack = 99;
+    let insert_at = loop_sum
+        .instructions
+        .iter()
+        .position(|item| !matches!(item, CodeItem::Label(_)))
+        .expect("method should contain instruction");
+    loop_sum.instructions.insert(insert_at, raw_nop());
+
+    let lowered = model
+        .to_bytes_with_recomputed_frames(DebugInfoPolicy::Preserve, None)
+        .expect("model should lower with recomputed frames");
+    let parsed = parse_class(&lowered).expect("lowered bytes should parse");
+    let branch = method_code_attr_named(&parsed, "branch");
+    assert_eq!(branch.max_stack, 99);
+    assert_eq!(branch.max_locals, original_branch.max_locals);
+    let stack_map = |code: &pytecode_engine::raw::CodeAttribute| {
+        code.attributes
+            .iter()
+            .find(|attribute| attribute_named(attribute, "StackMapTable"))
+            .cloned()
+    };
+    assert!(stack_map(branch).is_some());
+    assert_eq!(stack_map(branch), stack_map(original_branch));
+    let loop_sum = method_code_attr_named(&parsed, "loopSum");
+    assert_ne!(loop_sum.max_stack, 99);
+    assert!(raw_code_attr_named(loop_sum, "StackMapTable"));
+
+    // Renaming the owner changes the `this` type frames were computed against.
+    model.name = "ControlFlowRenamed".to_owned();
+    let lowered = model
+        .to_bytes_with_recomputed_frames(DebugInfoPolicy::Preserve, None)
+        .expect("renamed model should lower with recomputed frames");
+    let parsed = parse_class(&lowered).expect("lowered bytes should parse");
+    assert_ne!(method_code_attr_named(&parsed, "branch").max_stack, 99);
+}
+
 #[test]
 fn edited_methods_with_stackmaptable_fail_explicitly_before_phase4() {
     let bytes = fixture_bytes("ControlFlowExample.java", "ControlFlowExample.class");
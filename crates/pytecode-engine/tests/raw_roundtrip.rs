@@ -8,7 +8,7 @@ use pytecode_engine::indexes::*;
 use pytecode_engine::modified_utf8::{decode_modified_utf8, encode_modified_utf8};
 use pytecode_engine::parse_class;
 use pytecode_engine::raw::AttributeInfo;
-use pytecode_engine::write_class;
+use pytecode_engine::{write_class, write_class_into};
 
 type TestResult<T> = Result<T, Box<dyn std::error::Error + Send + Sync>>;
 
@@ -53,6 +53,22 @@ fn writer_roundtrip_preserves_long_gap_slots() -> TestResult<()> {
     Ok(())
 }
 
+#[test]
+fn write_class_into_appends_and_restores_the_buffer_on_error() -> TestResult<()> {
+    let raw = minimal_classfile();
+    let mut parsed = parse_class(&raw)?;
+    let mut out = b"prefix".to_vec();
+    write_class_into(&parsed, &mut out)?;
+    assert_eq!(&out[..6], b"prefix");
+    assert_eq!(&out[6..], raw.as_slice());
+
+    parsed.magic = 0;
+    let err = write_class_into(&parsed, &mut out).unwrap_err();
+    assert!(matches!(err.kind, EngineErrorKind::InvalidMagic { .. }));
+    assert_eq!(out.len(), 6 + raw.len());
+    Ok(())
+}
+
 #[test]
 fn invalid_magic_and_version_return_structured_errors() {
     let mut invalid_magic = minimal_classfile();
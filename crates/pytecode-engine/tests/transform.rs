@@ -7,7 +7,7 @@ use pytecode_engine::transform::pipeline_spec::PipelineSpec;
 use pytecode_engine::transform::transform_spec::{ClassTransformSpec, CodeTransformSpec};
 use pytecode_engine::transform::{
     Pipeline, class_named, insn_ldc_string, insn_method, method_is_public, method_is_static,
-    method_name_matches, method_named, on_code, on_methods,
+    method_name_matches, method_named, on_code, on_methods, tracked,
 };
 use std::fs;
 use std::sync::{Arc, Mutex};
@@ -93,6 +93,27 @@ fn on_methods_uses_owner_and_method_matchers() -> TestResult<()> {
     Ok(())
 }
 
+#[test]
+fn pipeline_apply_tracked_reports_unmatched_classes_as_untouched() -> TestResult<()> {
+    let bytes = fixture_bytes("HelloWorld.java", "HelloWorld.class");
+    let mut model = ClassModel::from_bytes(&bytes)?;
+    let mut other_owner = Pipeline::of(on_methods(
+        |method, _owner| {
+            method.access_flags |= MethodAccessFlags::FINAL;
+            Ok(())
+        },
+        None,
+        Some(class_named("Missing")),
+    ))
+    .then(tracked(|_model: &mut ClassModel| Ok(false)));
+    assert!(!other_owner.apply_tracked(&mut model)?);
+
+    let mut untracked = Pipeline::of(|_model: &mut ClassModel| Ok(()));
+    assert!(untracked.apply_tracked(&mut model)?);
+    assert_eq!(model.to_bytes()?, bytes);
+    Ok(())
+}
+
 #[test]
 fn on_code_mutates_only_matching_method_code() -> TestResult<()> {
     let bytes = fixture_bytes("ControlFlowExample.java", "ControlFlowExample.class");
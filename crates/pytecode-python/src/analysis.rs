@@ -1,8 +1,8 @@
 use pyo3::prelude::*;
-use pyo3::types::{PyAny, PyDict};
+use pyo3::types::{PyAny, PyDict, PyTuple};
 use pytecode_engine::analysis::{
-    AnalysisError, Category, Diagnostic, InheritedMethod, ResolvedClass, ResolvedMethod, Severity,
-    common_superclass as engine_common_superclass,
+    AnalysisError, Category, ClassResolver, Diagnostic, InheritedMethod, ReferenceTable,
+    ResolvedClass, ResolvedMethod, Severity, common_superclass as engine_common_superclass,
     find_overridden_methods as engine_find_overridden_methods, is_subtype as engine_is_subtype,
     iter_superclasses as engine_iter_superclasses, iter_supertypes as engine_iter_supertypes,
     verify_classfile, verify_classfile_with_options, verify_classmodel,
@@ -11,7 +11,7 @@ use pytecode_engine::analysis::{
 use pytecode_engine::constants::MethodAccessFlags;
 use pytecode_engine::parse_class;
 
-use crate::model::{PyClassModel, PyMappingClassResolver};
+use crate::model::{PyClassModel, PyResolverRef, column_view};
 
 type PyObject = Py<PyAny>;
 
@@ -161,14 +161,16 @@ fn rust_verify_classfile(data: &[u8], fail_fast: bool) -> PyResult<Vec<PyDiagnos
 #[pyo3(signature = (model, resolver = None, *, fail_fast = false))]
 fn rust_verify_classmodel(
     model: &PyClassModel,
-    resolver: Option<&PyMappingClassResolver>,
+    resolver: Option<PyResolverRef<'_>>,
     fail_fast: bool,
 ) -> PyResult<Vec<PyDiagnostic>> {
     let diagnostics = if fail_fast {
         model.with_class_model(|inner| {
             Ok(verify_classmodel_with_options(
                 inner,
-                resolver.map(|r| &r.inner as &dyn pytecode_engine::analysis::ClassResolver),
+                resolver
+                    .as_ref()
+                    .map(|r| r.as_resolver() as &dyn ClassResolver),
                 true,
             ))
         })?
@@ -176,7 +178,9 @@ fn rust_verify_classmodel(
         model.with_class_model(|inner| {
             Ok(verify_classmodel(
                 inner,
-                resolver.map(|r| &r.inner as &dyn pytecode_engine::analysis::ClassResolver),
+                resolver
+                    .as_ref()
+                    .map(|r| r.as_resolver() as &dyn ClassResolver),
             ))
         })?
     };
@@ -203,23 +207,24 @@ fn rust_resolved_classmodel(py: Python<'_>, model: &PyClassModel) -> PyResult<Py
 #[pyo3(signature = (resolver, class_name, *, include_self = false))]
 fn rust_iter_superclasses(
     py: Python<'_>,
-    resolver: &PyMappingClassResolver,
+    resolver: PyResolverRef<'_>,
     class_name: &str,
     include_self: bool,
 ) -> PyResult<Vec<PyObject>> {
-    use pytecode_engine::analysis::ClassResolver;
-
     let mut out = Vec::new();
     if include_self {
-        let resolved = resolver.inner.resolve_class(class_name).ok_or_else(|| {
-            analysis_error_to_py(AnalysisError::UnresolvedClass {
-                class_name: class_name.to_owned(),
-            })
-        })?;
+        let resolved = resolver
+            .as_resolver()
+            .resolve_class(class_name)
+            .ok_or_else(|| {
+                analysis_error_to_py(AnalysisError::UnresolvedClass {
+                    class_name: class_name.to_owned(),
+                })
+            })?;
         out.push(resolved_class_to_py(py, &resolved)?);
     }
     out.extend(
-        engine_iter_superclasses(&resolver.inner, class_name)
+        engine_iter_superclasses(resolver.as_resolver(), class_name)
             .map_err(analysis_error_to_py)?
             .iter()
             .map(|resolved| resolved_class_to_py(py, resolved))
@@ -232,23 +237,24 @@ fn rust_iter_superclasses(
 #[pyo3(signature = (resolver, class_name, *, include_self = false))]
 fn rust_iter_supertypes(
     py: Python<'_>,
-    resolver: &PyMappingClassResolver,
+    resolver: PyResolverRef<'_>,
     class_name: &str,
     include_self: bool,
 ) -> PyResult<Vec<PyObject>> {
-    use pytecode_engine::analysis::ClassResolver;
-
     let mut out = Vec::new();
     if include_self {
-        let resolved = resolver.inner.resolve_class(class_name).ok_or_else(|| {
-            analysis_error_to_py(AnalysisError::UnresolvedClass {
-                class_name: class_name.to_owned(),
-            })
-        })?;
+        let resolved = resolver
+            .as_resolver()
+            .resolve_class(class_name)
+            .ok_or_else(|| {
+                analysis_error_to_py(AnalysisError::UnresolvedClass {
+                    class_name: class_name.to_owned(),
+                })
+            })?;
         out.push(resolved_class_to_py(py, &resolved)?);
     }
     out.extend(
-        engine_iter_supertypes(&resolver.inner, class_name)
+        engine_iter_supertypes(resolver.as_resolver(), class_name)
             .map_err(analysis_error_to_py)?
             .iter()
             .map(|resolved| resolved_class_to_py(py, resolved))
@@ -259,26 +265,26 @@ fn rust_iter_supertypes(
 
 #[pyfunction]
 fn rust_is_subtype(
-    resolver: &PyMappingClassResolver,
+    resolver: PyResolverRef<'_>,
     class_name: &str,
     super_name: &str,
 ) -> PyResult<bool> {
-    engine_is_subtype(&resolver.inner, class_name, super_name).map_err(analysis_error_to_py)
+    engine_is_subtype(resolver.as_resolver(), class_name, super_name).map_err(analysis_error_to_py)
 }
 
 #[pyfunction]
 fn rust_common_superclass(
-    resolver: &PyMappingClassResolver,
+    resolver: PyResolverRef<'_>,
     left: &str,
     right: &str,
 ) -> PyResult<String> {
-    engine_common_superclass(&resolver.inner, left, right).map_err(analysis_error_to_py)
+    engine_common_superclass(resolver.as_resolver(), left, right).map_err(analysis_error_to_py)
 }
 
 #[pyfunction]
 fn rust_find_overridden_methods(
     py: Python<'_>,
-    resolver: &PyMappingClassResolver,
+    resolver: PyResolverRef<'_>,
     class_name: &str,
     method_name: &str,
     method_descriptor: &str,
@@ -289,7 +295,7 @@ fn rust_find_overridden_methods(
         descriptor: method_descriptor.to_owned(),
         access_flags: MethodAccessFlags::from_bits_truncate(access_flags),
     };
-    engine_find_overridden_methods(&resolver.inner, class_name, &method)
+    engine_find_overridden_methods(resolver.as_resolver(), class_name, &method)
         .map_err(analysis_error_to_py)?
         .iter()
         .map(|entry| inherited_method_to_py(py, entry))
@@ -300,8 +306,93 @@ fn rust_find_overridden_methods(
 // register
 // ---------------------------------------------------------------------------
 
+#[pyclass(frozen, name = "ReferenceTable", module = "pytecode._rust")]
+pub struct PyReferenceTable {
+    len: usize,
+    strings: Py<PyTuple>,
+    classes: PyObject,
+    methods: PyObject,
+    method_descriptors: PyObject,
+    offsets: PyObject,
+    opcodes: PyObject,
+    owners: PyObject,
+    names: PyObject,
+    descriptors: PyObject,
+}
+
+impl PyReferenceTable {
+    pub(crate) fn new(py: Python<'_>, table: ReferenceTable) -> PyResult<Self> {
+        let ids = |column: &[u32]| column_view(py, column, u32::to_ne_bytes, "I");
+        Ok(Self {
+            len: table.len(),
+            classes: ids(&table.classes)?,
+            methods: ids(&table.methods)?,
+            method_descriptors: ids(&table.method_descriptors)?,
+            offsets: ids(&table.offsets)?,
+            opcodes: column_view(py, &table.opcodes, |opcode| [opcode], "B")?,
+            owners: ids(&table.owners)?,
+            names: ids(&table.names)?,
+            descriptors: ids(&table.descriptors)?,
+            strings: PyTuple::new(py, table.strings)?.unbind(),
+        })
+    }
+}
+
+#[pymethods]
+impl PyReferenceTable {
+    fn __len__(&self) -> usize {
+        self.len
+    }
+
+    #[getter]
+    fn strings(&self, py: Python<'_>) -> Py<PyTuple> {
+        self.strings.clone_ref(py)
+    }
+
+    #[getter]
+    fn classes(&self, py: Python<'_>) -> PyObject {
+        self.classes.clone_ref(py)
+    }
+
+    #[getter]
+    fn methods(&self, py: Python<'_>) -> PyObject {
+        self.methods.clone_ref(py)
+    }
+
+    #[getter]
+    fn method_descriptors(&self, py: Python<'_>) -> PyObject {
+        self.method_descriptors.clone_ref(py)
+    }
+
+    #[getter]
+    fn offsets(&self, py: Python<'_>) -> PyObject {
+        self.offsets.clone_ref(py)
+    }
+
+    #[getter]
+    fn opcodes(&self, py: Python<'_>) -> PyObject {
+        self.opcodes.clone_ref(py)
+    }
+
+    #[getter]
+    fn owners(&self, py: Python<'_>) -> PyObject {
+        self.owners.clone_ref(py)
+    }
+
+    #[getter]
+    fn names(&self, py: Python<'_>) -> PyObject {
+        self.names.clone_ref(py)
+    }
+
+    #[getter]
+    fn descriptors(&self, py: Python<'_>) -> PyObject {
+        self.descriptors.clone_ref(py)
+    }
+}
+
 pub(crate) fn register(_py: Python<'_>, module: &Bound<'_, PyModule>) -> PyResult<()> {
     module.add_class::<PyDiagnostic>()?;
+    module.add_class::<PyReferenceTable>()?;
     module.add_function(wrap_pyfunction!(rust_resolved_classfile, module)?)?;
     module.add_function(wrap_pyfunction!(rust_resolved_classmodel, module)?)?;
     module.add_function(wrap_pyfunction!(rust_iter_superclasses, module)?)?;
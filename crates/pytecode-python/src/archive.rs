@@ -2,18 +2,24 @@ use pyo3::exceptions::{PyOSError, PyTypeError, PyValueError};
 use pyo3::prelude::*;
 use pyo3::types::{PyAny, PyBytes, PyModule};
 use pyo3::wrap_pyfunction;
-use pytecode_archive::{ArchiveError, JarEntryMetadata, JarFile, JarInfo, RewriteOptions};
+use pytecode_archive::{
+    ArchiveError, ArchiveReader, ClassSource, EntryIdentity, JarEntryMetadata, JarFile, JarInfo,
+    RewriteOptions, archive_class_resolver, rewrite_streaming, rewrite_streaming_shared,
+    scan_archive_references,
+};
+use pytecode_engine::analysis::{ClassResolver, MappingClassResolver};
 use pytecode_engine::error::{EngineError, EngineErrorKind};
 use pytecode_engine::model::ClassModel;
-use pytecode_engine::transform::ApplyClassTransform;
 use pytecode_engine::transform::pipeline_spec::CompiledPipeline;
 use pytecode_engine::transform::transform_spec::ClassTransformSpec;
-use std::path::PathBuf;
+use pytecode_engine::transform::{ApplyClassTransform, ApplySharedClassTransform};
+use std::path::{Path, PathBuf};
 use std::sync::{Arc, Mutex};
 use zip::{CompressionMethod, DateTime, System};
 
+use crate::analysis::PyReferenceTable;
 use crate::model::{
-    PyClassModel, PyMappingClassResolver, parse_debug_info_policy, parse_frame_computation_mode,
+    PyClassModel, PyResolverRef, parse_debug_info_policy, parse_frame_computation_mode,
 };
 use crate::transforms::{PyClassTransform, PyCompiledPipeline, PyPipeline};
 
@@ -21,14 +27,15 @@ const CALLBACK_ABORT_REASON: &str = "__pytecode_archive_python_callback_failed__
 const PYTHON_TRANSFORM_RETURN_ERROR: &str =
     "JarFile.rewrite() Python transforms must mutate ClassModel in place and return None";
 
-fn archive_error_to_py(error: ArchiveError) -> PyErr {
+pub(crate) fn archive_error_to_py(error: ArchiveError) -> PyErr {
     match error {
         ArchiveError::Engine(inner) => crate::engine_error_to_py(inner),
         ArchiveError::EmptyFilename
         | ArchiveError::AbsolutePath(_)
         | ArchiveError::ParentTraversal(_)
         | ArchiveError::InvalidTimestamp(_)
-        | ArchiveError::NonUtf8Comment(_) => PyValueError::new_err(error.to_string()),
+        | ArchiveError::NonUtf8Comment(_)
+        | ArchiveError::InvalidHierarchyIndex(_) => PyValueError::new_err(error.to_string()),
         other => PyOSError::new_err(other.to_string()),
     }
 }
@@ -37,7 +44,9 @@ fn archive_error_to_py(error: ArchiveError) -> PyErr {
 #[derive(Clone)]
 struct PyArchiveEntryState {
     filename: String,
-    bytes: Vec<u8>,
+    /// `None` for entries read lazily; their bytes are loaded from the source
+    /// archive at `original_index` when the archive is rewritten.
+    bytes: Option<Vec<u8>>,
     compression_method: u16,
     date_time: (u16, u8, u8, u8, u8, u8),
     system: u8,
@@ -55,7 +64,7 @@ impl PyArchiveEntryState {
     #[pyo3(signature = (filename, data, compression_method, date_time, *, system=255, unix_mode=None, is_dir=false, comment=None, extra_data=None, original_index=None))]
     fn new(
         filename: String,
-        data: Vec<u8>,
+        data: Option<Vec<u8>>,
         compression_method: u16,
         date_time: (u16, u8, u8, u8, u8, u8),
         system: u8,
@@ -84,8 +93,10 @@ impl PyArchiveEntryState {
     }
 
     #[getter]
-    fn data<'py>(&self, py: Python<'py>) -> Py<PyBytes> {
-        PyBytes::new(py, &self.bytes).unbind()
+    fn data<'py>(&self, py: Python<'py>) -> Option<Py<PyBytes>> {
+        self.bytes
+            .as_ref()
+            .map(|bytes| PyBytes::new(py, bytes).unbind())
     }
 
     #[getter]
@@ -150,7 +161,7 @@ impl PyArchiveEntryState {
         let last_modified = metadata.last_modified;
         Ok(Self {
             filename,
-            bytes,
+            bytes: Some(bytes),
             compression_method,
             date_time: (
                 last_modified.year(),
@@ -195,7 +206,7 @@ impl PyArchiveEntryState {
         })?;
         Ok(JarInfo::new(
             self.filename.clone(),
-            self.bytes.clone(),
+            self.bytes.clone().unwrap_or_default(),
             JarEntryMetadata {
                 compression_method,
                 last_modified,
@@ -214,22 +225,34 @@ struct CompiledPipelineArchiveTransform<'a> {
     inner: &'a CompiledPipeline,
 }
 
-impl ApplyClassTransform for CompiledPipelineArchiveTransform<'_> {
-    fn apply(&mut self, model: &mut ClassModel) -> pytecode_engine::Result<()> {
+impl ApplySharedClassTransform for CompiledPipelineArchiveTransform<'_> {
+    fn apply_shared(&self, model: &mut ClassModel) -> pytecode_engine::Result<()> {
         self.inner.apply(model);
         Ok(())
     }
+
+    fn apply_shared_tracked(&self, model: &mut ClassModel) -> pytecode_engine::Result<bool> {
+        Ok(self.inner.apply_tracked(model))
+    }
+
+    fn may_apply_shared(&self, class_bytes: &[u8]) -> bool {
+        self.inner.may_apply_to_bytes(class_bytes)
+    }
 }
 
 struct ClassTransformArchiveTransform<'a> {
     inner: &'a ClassTransformSpec,
 }
 
-impl ApplyClassTransform for ClassTransformArchiveTransform<'_> {
-    fn apply(&mut self, model: &mut ClassModel) -> pytecode_engine::Result<()> {
+impl ApplySharedClassTransform for ClassTransformArchiveTransform<'_> {
+    fn apply_shared(&self, model: &mut ClassModel) -> pytecode_engine::Result<()> {
         self.inner.apply(model);
         Ok(())
     }
+
+    fn apply_shared_tracked(&self, model: &mut ClassModel) -> pytecode_engine::Result<bool> {
+        Ok(self.inner.apply_tracked(model))
+    }
 }
 
 struct CallbackCompiledPipelineArchiveTransform<'a> {
@@ -239,14 +262,22 @@ struct CallbackCompiledPipelineArchiveTransform<'a> {
 
 impl ApplyClassTransform for CallbackCompiledPipelineArchiveTransform<'_> {
     fn apply(&mut self, model: &mut ClassModel) -> pytecode_engine::Result<()> {
-        match self.inner.apply_to_engine_model(model) {
-            Ok(()) => Ok(()),
+        self.apply_tracked(model).map(drop)
+    }
+
+    fn apply_tracked(&mut self, model: &mut ClassModel) -> pytecode_engine::Result<bool> {
+        match self.inner.apply_to_engine_model_tracked(model) {
+            Ok(modified) => Ok(modified),
             Err(err) => {
                 store_callback_error(&self.callback_error, err);
                 Err(callback_abort_error())
             }
         }
     }
+
+    fn may_apply(&self, class_bytes: &[u8]) -> bool {
+        self.inner.inner.may_apply_to_bytes(class_bytes)
+    }
 }
 
 struct PythonCallableArchiveTransform {
@@ -324,14 +355,60 @@ fn is_callback_abort(error: &ArchiveError) -> bool {
     )
 }
 
+/// The entries a rewrite reads from.
+enum RewriteTarget<'a> {
+    /// The in-memory entries of an archive, including unsaved edits.
+    Jar(&'a mut JarFile),
+    /// An archive on disk, streamed one entry at a time.
+    Stream(&'a Path),
+}
+
+impl RewriteTarget<'_> {
+    fn rewrite(
+        &mut self,
+        output_path: Option<&Path>,
+        transform: Option<&mut dyn ApplyClassTransform>,
+        options: RewriteOptions<'_>,
+    ) -> pytecode_archive::Result<PathBuf> {
+        match self {
+            Self::Jar(jar) => jar.rewrite(output_path, transform, options),
+            Self::Stream(source_path) => rewrite_streaming(
+                source_path,
+                output_path.unwrap_or(source_path),
+                transform,
+                options,
+            ),
+        }
+    }
+
+    fn rewrite_shared(
+        &mut self,
+        output_path: Option<&Path>,
+        transform: Option<&dyn ApplySharedClassTransform>,
+        options: RewriteOptions<'_>,
+    ) -> pytecode_archive::Result<PathBuf> {
+        match self {
+            Self::Jar(jar) => jar.rewrite_shared(output_path, transform, options),
+            Self::Stream(source_path) => rewrite_streaming_shared(
+                source_path,
+                output_path.unwrap_or(source_path),
+                transform,
+                options,
+            ),
+        }
+    }
+}
+
+/// Rewrite with the interpreter detached; Python callbacks re-attach per call.
 fn rewrite_with_callback_transform(
-    jar: &mut JarFile,
-    transform: &mut dyn ApplyClassTransform,
+    py: Python<'_>,
+    target: &mut RewriteTarget<'_>,
+    transform: &mut (dyn ApplyClassTransform + Send),
     output_path: Option<PathBuf>,
     options: RewriteOptions<'_>,
     callback_error: &Arc<Mutex<Option<PyErr>>>,
 ) -> PyResult<PathBuf> {
-    match jar.rewrite(output_path.as_deref(), Some(transform), options) {
+    match py.detach(|| target.rewrite(output_path.as_deref(), Some(transform), options)) {
         Ok(path) => {
             if let Some(err) = take_callback_error(callback_error) {
                 return Err(err);
@@ -349,8 +426,21 @@ fn rewrite_with_callback_transform(
     }
 }
 
+/// Rewrite with a native transform without holding the GIL.
+fn rewrite_with_shared_transform(
+    py: Python<'_>,
+    target: &mut RewriteTarget<'_>,
+    transform: Option<&dyn ApplySharedClassTransform>,
+    output_path: Option<PathBuf>,
+    options: RewriteOptions<'_>,
+) -> PyResult<PathBuf> {
+    py.detach(|| target.rewrite_shared(output_path.as_deref(), transform, options))
+        .map_err(archive_error_to_py)
+}
+
 fn rewrite_with_pipeline(
-    jar: &mut JarFile,
+    py: Python<'_>,
+    target: &mut RewriteTarget<'_>,
     pipeline: PyRef<'_, PyPipeline>,
     output_path: Option<PathBuf>,
     options: RewriteOptions<'_>,
@@ -363,7 +453,8 @@ fn rewrite_with_pipeline(
             callback_error: callback_error.clone(),
         };
         return rewrite_with_callback_transform(
-            jar,
+            py,
+            target,
             &mut wrapped,
             output_path,
             options,
@@ -372,13 +463,13 @@ fn rewrite_with_pipeline(
     }
 
     let compiled = pipeline.spec.compile();
-    let mut wrapped = CompiledPipelineArchiveTransform { inner: &compiled };
-    jar.rewrite(output_path.as_deref(), Some(&mut wrapped), options)
-        .map_err(archive_error_to_py)
+    let wrapped = CompiledPipelineArchiveTransform { inner: &compiled };
+    rewrite_with_shared_transform(py, target, Some(&wrapped), output_path, options)
 }
 
 fn rewrite_with_compiled_pipeline(
-    jar: &mut JarFile,
+    py: Python<'_>,
+    target: &mut RewriteTarget<'_>,
     pipeline: PyRef<'_, PyCompiledPipeline>,
     output_path: Option<PathBuf>,
     options: RewriteOptions<'_>,
@@ -390,7 +481,8 @@ fn rewrite_with_compiled_pipeline(
             callback_error: callback_error.clone(),
         };
         return rewrite_with_callback_transform(
-            jar,
+            py,
+            target,
             &mut wrapped,
             output_path,
             options,
@@ -398,15 +490,14 @@ fn rewrite_with_compiled_pipeline(
         );
     }
 
-    let mut wrapped = CompiledPipelineArchiveTransform {
+    let wrapped = CompiledPipelineArchiveTransform {
         inner: &pipeline.inner,
     };
-    jar.rewrite(output_path.as_deref(), Some(&mut wrapped), options)
-        .map_err(archive_error_to_py)
+    rewrite_with_shared_transform(py, target, Some(&wrapped), output_path, options)
 }
 
 fn rewrite_with_python_callable(
-    jar: &mut JarFile,
+    target: &mut RewriteTarget<'_>,
     transform: &Bound<'_, PyAny>,
     output_path: Option<PathBuf>,
     options: RewriteOptions<'_>,
@@ -416,60 +507,143 @@ fn rewrite_with_python_callable(
         callback: transform.clone().unbind(),
         callback_error: callback_error.clone(),
     };
-    rewrite_with_callback_transform(jar, &mut wrapped, output_path, options, &callback_error)
+    rewrite_with_callback_transform(
+        transform.py(),
+        target,
+        &mut wrapped,
+        output_path,
+        options,
+        &callback_error,
+    )
+}
+
+/// The `resolver=` argument of a rewrite.
+enum RewriteResolver<'py> {
+    None,
+    Given(PyResolverRef<'py>),
+    /// Build a resolver natively from the archive being rewritten plus a classpath.
+    Auto(Vec<PathBuf>),
+}
+
+/// A resolver borrowed from Python or built for one rewrite.
+enum ChosenResolver<'a> {
+    Given(&'a (dyn ClassResolver + Sync)),
+    Built(MappingClassResolver),
+}
+
+impl ChosenResolver<'_> {
+    fn get(&self) -> &(dyn ClassResolver + Sync) {
+        match self {
+            Self::Given(resolver) => *resolver,
+            Self::Built(resolver) => resolver,
+        }
+    }
+}
+
+impl<'py> RewriteResolver<'py> {
+    fn extract(resolver: Option<&Bound<'py, PyAny>>, classpath: Vec<PathBuf>) -> PyResult<Self> {
+        let resolver = match resolver {
+            Some(resolver) if !resolver.is_none() => resolver,
+            _ if classpath.is_empty() => return Ok(Self::None),
+            _ => {
+                return Err(PyValueError::new_err(
+                    "classpath is only used with resolver=\"auto\"",
+                ));
+            }
+        };
+        if let Ok(mode) = resolver.extract::<String>() {
+            if mode == "auto" {
+                return Ok(Self::Auto(classpath));
+            }
+            return Err(PyValueError::new_err(format!(
+                "invalid resolver: {mode:?}, expected a resolver object or \"auto\""
+            )));
+        }
+        if !classpath.is_empty() {
+            return Err(PyValueError::new_err(
+                "classpath is only used with resolver=\"auto\"",
+            ));
+        }
+        resolver
+            .extract::<PyResolverRef<'py>>()
+            .map(Self::Given)
+            .map_err(|_| {
+                PyTypeError::new_err(
+                    "resolver must be a MappingClassResolver, ClasspathResolver, HierarchyIndex, \"auto\", or None",
+                )
+            })
+    }
+
+    /// Borrow the chosen resolver, building it without the GIL for `"auto"`.
+    ///
+    /// `build` receives the classpath and reads class headers only.
+    fn resolve(
+        &self,
+        py: Python<'_>,
+        build: impl FnOnce(&[PathBuf]) -> pytecode_archive::Result<MappingClassResolver> + Send,
+    ) -> PyResult<Option<ChosenResolver<'_>>> {
+        match self {
+            Self::None => Ok(None),
+            Self::Given(resolver) => Ok(Some(ChosenResolver::Given(resolver.as_resolver()))),
+            Self::Auto(classpath) => py
+                .detach(|| build(classpath))
+                .map(|resolver| Some(ChosenResolver::Built(resolver)))
+                .map_err(archive_error_to_py),
+        }
+    }
 }
 
 fn rewrite_options<'a>(
     frame_mode: Option<&Bound<'_, PyAny>>,
-    resolver: Option<&'a PyMappingClassResolver>,
+    resolver: Option<&'a (dyn ClassResolver + Sync)>,
     debug_info: &str,
+    workers: usize,
 ) -> PyResult<RewriteOptions<'a>> {
     let debug_info = parse_debug_info_policy(debug_info)?;
     let frame_mode = parse_frame_computation_mode(frame_mode)?;
     Ok(RewriteOptions {
         frame_mode,
-        resolver: resolver
-            .map(|value| &value.inner as &dyn pytecode_engine::analysis::ClassResolver),
+        resolver,
         debug_info,
+        workers,
     })
 }
 
 fn rewrite_with_transform(
-    jar: &mut JarFile,
+    target: &mut RewriteTarget<'_>,
     transform: &Bound<'_, PyAny>,
     output_path: Option<PathBuf>,
     options: RewriteOptions<'_>,
 ) -> PyResult<PathBuf> {
+    let py = transform.py();
     if let Ok(owner) = transform.getattr("__self__")
         && !owner.is_none()
     {
         if let Ok(pipeline) = owner.extract::<PyRef<'_, PyPipeline>>() {
-            return rewrite_with_pipeline(jar, pipeline, output_path, options);
+            return rewrite_with_pipeline(py, target, pipeline, output_path, options);
         }
         if let Ok(pipeline) = owner.extract::<PyRef<'_, PyCompiledPipeline>>() {
-            return rewrite_with_compiled_pipeline(jar, pipeline, output_path, options);
+            return rewrite_with_compiled_pipeline(py, target, pipeline, output_path, options);
         }
     }
 
     if let Ok(pipeline) = transform.extract::<PyRef<'_, PyPipeline>>() {
-        return rewrite_with_pipeline(jar, pipeline, output_path, options);
+        return rewrite_with_pipeline(py, target, pipeline, output_path, options);
     }
 
     if let Ok(pipeline) = transform.extract::<PyRef<'_, PyCompiledPipeline>>() {
-        return rewrite_with_compiled_pipeline(jar, pipeline, output_path, options);
+        return rewrite_with_compiled_pipeline(py, target, pipeline, output_path, options);
     }
 
     if let Ok(transform) = transform.extract::<PyRef<'_, PyClassTransform>>() {
-        let mut wrapped = ClassTransformArchiveTransform {
+        let wrapped = ClassTransformArchiveTransform {
             inner: &transform.spec,
         };
-        return jar
-            .rewrite(output_path.as_deref(), Some(&mut wrapped), options)
-            .map_err(archive_error_to_py);
+        return rewrite_with_shared_transform(py, target, Some(&wrapped), output_path, options);
     }
 
     if transform.is_callable() {
-        return rewrite_with_python_callable(jar, transform, output_path, options);
+        return rewrite_with_python_callable(target, transform, output_path, options);
     }
 
     Err(PyTypeError::new_err(
@@ -483,30 +657,68 @@ fn jar_from_state(
     entries: Vec<Py<PyArchiveEntryState>>,
 ) -> PyResult<JarFile> {
     let mut jar_entries = Vec::with_capacity(entries.len());
+    let mut deferred = Vec::new();
     for entry in entries {
         let entry = entry.borrow(py);
+        if entry.bytes.is_none() && !entry.is_dir {
+            let Some(index) = entry.original_index else {
+                return Err(PyValueError::new_err(format!(
+                    "archive entry state has no data and no source entry: {}",
+                    entry.filename
+                )));
+            };
+            deferred.push((jar_entries.len(), index));
+        }
         jar_entries.push(entry.to_jar_info()?);
     }
+    if !deferred.is_empty() {
+        py.detach(|| -> pytecode_archive::Result<()> {
+            let mut reader = ArchiveReader::open(&source_path)?;
+            for (position, index) in deferred {
+                jar_entries[position].bytes = reader.read_bytes(index)?;
+            }
+            Ok(())
+        })
+        .map_err(archive_error_to_py)?;
+    }
     Ok(JarFile::from_entries(source_path, jar_entries))
 }
 
 #[pyfunction]
-#[pyo3(signature = (source_path, transform, output_path=None, frame_mode=None, resolver=None, debug_info="preserve"))]
+#[pyo3(signature = (source_path, transform, output_path=None, frame_mode=None, resolver=None, debug_info="preserve", workers=1, classpath=Vec::new()))]
+#[allow(clippy::too_many_arguments)]
 fn rewrite_archive_with_rust_transform(
     source_path: PathBuf,
     transform: &Bound<'_, PyAny>,
     output_path: Option<PathBuf>,
     frame_mode: Option<&Bound<'_, PyAny>>,
-    resolver: Option<&PyMappingClassResolver>,
+    resolver: Option<&Bound<'_, PyAny>>,
     debug_info: &str,
+    workers: usize,
+    classpath: Vec<PathBuf>,
 ) -> PyResult<PathBuf> {
-    let options = rewrite_options(frame_mode, resolver, debug_info)?;
-    let mut jar = JarFile::open(&source_path).map_err(archive_error_to_py)?;
-    rewrite_with_transform(&mut jar, transform, output_path, options)
+    let py = transform.py();
+    let resolver = RewriteResolver::extract(resolver, classpath)?;
+    let mut jar = py
+        .detach(|| JarFile::open(&source_path))
+        .map_err(archive_error_to_py)?;
+    let resolver = resolver.resolve(py, |classpath| jar.class_resolver(classpath, workers))?;
+    let options = rewrite_options(
+        frame_mode,
+        resolver.as_ref().map(ChosenResolver::get),
+        debug_info,
+        workers,
+    )?;
+    rewrite_with_transform(
+        &mut RewriteTarget::Jar(&mut jar),
+        transform,
+        output_path,
+        options,
+    )
 }
 
 #[pyfunction]
-#[pyo3(signature = (source_path, entries, transform=None, output_path=None, frame_mode=None, resolver=None, debug_info="preserve"))]
+#[pyo3(signature = (source_path, entries, transform=None, output_path=None, frame_mode=None, resolver=None, debug_info="preserve", workers=1, classpath=Vec::new()))]
 #[allow(clippy::too_many_arguments)]
 fn rewrite_archive_state(
     py: Python<'_>,
@@ -515,35 +727,222 @@ fn rewrite_archive_state(
     transform: Option<&Bound<'_, PyAny>>,
     output_path: Option<PathBuf>,
     frame_mode: Option<&Bound<'_, PyAny>>,
-    resolver: Option<&PyMappingClassResolver>,
+    resolver: Option<&Bound<'_, PyAny>>,
     debug_info: &str,
+    workers: usize,
+    classpath: Vec<PathBuf>,
 ) -> PyResult<PathBuf> {
-    let options = rewrite_options(frame_mode, resolver, debug_info)?;
+    let resolver = RewriteResolver::extract(resolver, classpath)?;
     let mut jar = jar_from_state(py, source_path, entries)?;
+    let resolver = resolver.resolve(py, |classpath| jar.class_resolver(classpath, workers))?;
+    let options = rewrite_options(
+        frame_mode,
+        resolver.as_ref().map(ChosenResolver::get),
+        debug_info,
+        workers,
+    )?;
+    let mut target = RewriteTarget::Jar(&mut jar);
     if let Some(transform) = transform {
-        rewrite_with_transform(&mut jar, transform, output_path, options)
+        rewrite_with_transform(&mut target, transform, output_path, options)
     } else {
-        jar.rewrite(output_path.as_deref(), None, options)
-            .map_err(archive_error_to_py)
+        rewrite_with_shared_transform(py, &mut target, None, output_path, options)
     }
 }
 
 #[pyfunction]
-fn read_archive_state(source_path: PathBuf) -> PyResult<Vec<PyArchiveEntryState>> {
-    let jar = JarFile::open(&source_path).map_err(archive_error_to_py)?;
+#[pyo3(signature = (source_path, output_path, transform=None, frame_mode=None, resolver=None, debug_info="preserve", workers=1, classpath=Vec::new()))]
+#[allow(clippy::too_many_arguments)]
+fn stream_rewrite_archive(
+    py: Python<'_>,
+    source_path: PathBuf,
+    output_path: PathBuf,
+    transform: Option<&Bound<'_, PyAny>>,
+    frame_mode: Option<&Bound<'_, PyAny>>,
+    resolver: Option<&Bound<'_, PyAny>>,
+    debug_info: &str,
+    workers: usize,
+    classpath: Vec<PathBuf>,
+) -> PyResult<PathBuf> {
+    let resolver = RewriteResolver::extract(resolver, classpath)?;
+    let resolver = resolver.resolve(py, |classpath| {
+        archive_class_resolver(&source_path, classpath, workers)
+    })?;
+    let options = rewrite_options(
+        frame_mode,
+        resolver.as_ref().map(ChosenResolver::get),
+        debug_info,
+        workers,
+    )?;
+    let mut target = RewriteTarget::Stream(&source_path);
+    if let Some(transform) = transform {
+        rewrite_with_transform(&mut target, transform, Some(output_path), options)
+    } else {
+        rewrite_with_shared_transform(py, &mut target, None, Some(output_path), options)
+    }
+}
+
+/// Central-directory view of an archive that decompresses entries on demand.
+///
+/// The underlying file is reopened on the next read after [`Self::close`].
+/// Since the file may have been replaced in the meantime (for example by an
+/// in-place rewrite), reads after a reopen look each entry up by the name,
+/// CRC-32 and size it had when the reader was created, and fail rather than
+/// return another entry's bytes.
+#[pyclass(module = "pytecode._rust", name = "_ArchiveReader")]
+struct PyArchiveReader {
+    source_path: PathBuf,
+    identities: Vec<EntryIdentity>,
+    state: Mutex<ArchiveReaderState>,
+}
+
+struct ArchiveReaderState {
+    reader: Option<ArchiveReader>,
+    reopened: bool,
+}
+
+impl PyArchiveReader {
+    fn with_reader<T>(
+        &self,
+        f: impl FnOnce(&mut ArchiveReader, bool) -> pytecode_archive::Result<T>,
+    ) -> pytecode_archive::Result<T> {
+        let mut guard = self.state.lock().expect("archive reader mutex poisoned");
+        let state = &mut *guard;
+        if state.reader.is_none() {
+            state.reader = Some(ArchiveReader::open(&self.source_path)?);
+            state.reopened = true;
+        }
+        f(
+            state
+                .reader
+                .as_mut()
+                .expect("archive reader was just opened"),
+            state.reopened,
+        )
+    }
+}
+
+#[pymethods]
+impl PyArchiveReader {
+    #[new]
+    fn new(py: Python<'_>, source_path: PathBuf) -> PyResult<Self> {
+        let (reader, identities) = py
+            .detach(|| {
+                let mut reader = ArchiveReader::open(&source_path)?;
+                let identities = reader.identities()?;
+                Ok((reader, identities))
+            })
+            .map_err(archive_error_to_py)?;
+        Ok(Self {
+            source_path,
+            identities,
+            state: Mutex::new(ArchiveReaderState {
+                reader: Some(reader),
+                reopened: false,
+            }),
+        })
+    }
+
+    /// Return entry states for every entry without decompressing any data.
+    fn entry_states(&self, py: Python<'_>) -> PyResult<Vec<PyArchiveEntryState>> {
+        let entries = py
+            .detach(|| self.with_reader(|reader, _| reader.entries()))
+            .map_err(archive_error_to_py)?;
+        entries
+            .into_iter()
+            .map(|info| {
+                Ok(PyArchiveEntryState {
+                    bytes: None,
+                    ..PyArchiveEntryState::from_jar_info(info)?
+                })
+            })
+            .collect()
+    }
+
+    /// Decompress the entry at ``index``.
+    fn read<'py>(&self, py: Python<'py>, index: usize) -> PyResult<Py<PyBytes>> {
+        let bytes = py
+            .detach(|| {
+                self.with_reader(|reader, reopened| {
+                    let index = match self.identities.get(index) {
+                        Some(identity) if reopened => reader
+                            .find_entry(index, identity)?
+                            .ok_or_else(|| ArchiveError::EntryChanged(identity.name.clone()))?,
+                        _ => index,
+                    };
+                    reader.read_bytes(index)
+                })
+            })
+            .map_err(archive_error_to_py)?;
+        Ok(PyBytes::new(py, &bytes).unbind())
+    }
+
+    /// Release the underlying file handle.
+    fn close(&self) {
+        self.state
+            .lock()
+            .expect("archive reader mutex poisoned")
+            .reader
+            .take();
+    }
+}
+
+#[pyfunction]
+fn read_archive_state(py: Python<'_>, source_path: PathBuf) -> PyResult<Vec<PyArchiveEntryState>> {
+    let jar = py
+        .detach(|| JarFile::open(&source_path))
+        .map_err(archive_error_to_py)?;
     jar.entries
         .into_iter()
         .map(PyArchiveEntryState::from_jar_info)
         .collect::<PyResult<Vec<_>>>()
 }
 
+/// Scan the references made by the class entries in `entries`.
+///
+/// Entries without bytes of their own are inflated from `source_path` on the
+/// scanning threads; only in-memory (modified) entries are copied in.
+#[pyfunction]
+#[pyo3(signature = (source_path, entries, workers=1))]
+fn scan_archive_state_references(
+    py: Python<'_>,
+    source_path: PathBuf,
+    entries: Vec<Py<PyArchiveEntryState>>,
+    workers: usize,
+) -> PyResult<PyReferenceTable> {
+    let states = entries
+        .iter()
+        .map(|entry| {
+            let entry = entry.borrow(py);
+            match (&entry.bytes, entry.original_index) {
+                (Some(bytes), _) => Ok((None, bytes.clone())),
+                (None, Some(index)) => Ok((Some(index), Vec::new())),
+                (None, None) => Err(PyValueError::new_err(format!(
+                    "archive entry state has no data and no source entry: {}",
+                    entry.filename
+                ))),
+            }
+        })
+        .collect::<PyResult<Vec<_>>>()?;
+    let classes = states
+        .iter()
+        .map(|(index, bytes)| index.map_or(ClassSource::Bytes(bytes), ClassSource::Entry))
+        .collect::<Vec<_>>();
+    let table = py
+        .detach(|| scan_archive_references(&source_path, &classes, workers))
+        .map_err(archive_error_to_py)?;
+    PyReferenceTable::new(py, table)
+}
+
 pub(crate) fn register(_py: Python<'_>, module: &Bound<'_, PyModule>) -> PyResult<()> {
     module.add_class::<PyArchiveEntryState>()?;
+    module.add_class::<PyArchiveReader>()?;
     module.add_function(wrap_pyfunction!(read_archive_state, module)?)?;
     module.add_function(wrap_pyfunction!(
         rewrite_archive_with_rust_transform,
         module
     )?)?;
     module.add_function(wrap_pyfunction!(rewrite_archive_state, module)?)?;
+    module.add_function(wrap_pyfunction!(stream_rewrite_archive, module)?)?;
+    module.add_function(wrap_pyfunction!(scan_archive_state_references, module)?)?;
     Ok(())
 }
@@ -1,10 +1,14 @@
+use pyo3::buffer::PyBuffer;
 use pyo3::create_exception;
-use pyo3::exceptions::PyOSError;
+use pyo3::exceptions::{PyOSError, PyTypeError, PyValueError};
 use pyo3::prelude::*;
-use pyo3::types::{PyAny, PyBytes, PyDict, PyModule, PyType};
+use pyo3::sync::PyOnceLock;
+use pyo3::types::{PyAny, PyBytes, PyDict, PyList, PyMemoryView, PyModule, PyType};
 use pytecode_engine::raw;
 use pytecode_engine::raw::ClassFile;
-use pytecode_engine::{parse_class, write_class};
+use pytecode_engine::{ReadLevel, decode_attribute, parse_class_at, write_class_into};
+use std::borrow::Cow;
+use std::cell::RefCell;
 use std::fs;
 use std::path::PathBuf;
 use std::sync::Arc;
@@ -27,6 +31,223 @@ pub(crate) fn engine_error_to_py(error: pytecode_engine::EngineError) -> PyErr {
     MalformedClassException::new_err(error.to_string())
 }
 
+/// Classfile bytes taken from any buffer (`bytes`, `bytearray`,
+/// `memoryview`, `mmap`, ...).
+///
+/// Immutable, contiguous sources are borrowed in place. Anything writable is
+/// copied first: another thread could change it while it is parsed, and
+/// parsing may run detached from the interpreter.
+pub(crate) enum ClassBytes {
+    Borrowed(PyBuffer<u8>),
+    Copied(Vec<u8>),
+}
+
+impl ClassBytes {
+    pub(crate) fn from_object(object: &Bound<'_, PyAny>) -> PyResult<Self> {
+        let buffer = PyBuffer::<u8>::get(object)?;
+        if buffer.is_c_contiguous() && is_immutable_source(object) {
+            Ok(Self::Borrowed(buffer))
+        } else {
+            Ok(Self::Copied(buffer.to_vec(object.py())?))
+        }
+    }
+
+    pub(crate) fn as_slice(&self) -> &[u8] {
+        match self {
+            Self::Borrowed(buffer) if buffer.len_bytes() > 0 => {
+                // SAFETY: the buffer is contiguous, `len_bytes` long and kept
+                // alive by the export held in `self`; `is_immutable_source`
+                // only admits `bytes` and `ACCESS_READ` maps, so nothing in
+                // this process can write to it while it is borrowed.
+                unsafe {
+                    std::slice::from_raw_parts(buffer.buf_ptr().cast::<u8>(), buffer.len_bytes())
+                }
+            }
+            Self::Borrowed(_) => &[],
+            Self::Copied(bytes) => bytes,
+        }
+    }
+}
+
+/// Whether no one can write to the memory behind `object`'s buffer. Only
+/// exporters known to be immutable qualify: `bytes`, an `mmap` opened
+/// `ACCESS_READ`, and memoryviews over either. A read-only buffer is not
+/// enough on its own, since it may view memory that is writable elsewhere
+/// (a `toreadonly()` view of a `bytearray`, a non-writeable NumPy view).
+fn is_immutable_source(object: &Bound<'_, PyAny>) -> bool {
+    static MMAP_TYPE: PyOnceLock<Py<PyType>> = PyOnceLock::new();
+
+    if object.is_exact_instance_of::<PyBytes>() {
+        return true;
+    }
+    if object.is_exact_instance_of::<PyMemoryView>() {
+        return object
+            .getattr("obj")
+            .is_ok_and(|source| !source.is_none() && is_immutable_source(&source));
+    }
+    // An `mmap` exports a read-only buffer only when opened `ACCESS_READ`.
+    MMAP_TYPE
+        .import(object.py(), "mmap", "mmap")
+        .is_ok_and(|mmap| object.get_type().as_ptr() == mmap.as_ptr())
+        && PyBuffer::<u8>::get(object).is_ok_and(|buffer| buffer.readonly())
+}
+
+/// Scratch buffers larger than this are shrunk back after use.
+const RETAINED_SCRATCH_CAPACITY: usize = 1 << 20;
+
+thread_local! {
+    static SCRATCH: RefCell<Vec<u8>> = const { RefCell::new(Vec::new()) };
+}
+
+/// Encode into this thread's reusable scratch buffer, so repeated emission
+/// does not grow a fresh `Vec` for every class.
+fn with_scratch<R>(f: impl FnOnce(&mut Vec<u8>) -> R) -> R {
+    SCRATCH.with(|scratch| match scratch.try_borrow_mut() {
+        Ok(mut bytes) => {
+            bytes.clear();
+            let result = f(&mut bytes);
+            bytes.shrink_to(RETAINED_SCRATCH_CAPACITY);
+            result
+        }
+        // Re-entered from Python code that ran during `f`, such as a finalizer.
+        Err(_) => f(&mut Vec::new()),
+    })
+}
+
+/// Encode with `encode` and return the result as `bytes` allocated at its
+/// final size.
+pub(crate) fn emit_bytes(
+    py: Python<'_>,
+    encode: impl FnOnce(&mut Vec<u8>) -> PyResult<()>,
+) -> PyResult<Py<PyBytes>> {
+    with_scratch(|bytes| {
+        encode(bytes)?;
+        Ok(PyBytes::new(py, bytes).unbind())
+    })
+}
+
+/// Encode with `encode` into a writable buffer starting at `offset`, returning
+/// the number of bytes written. Nothing is written if the result does not fit.
+pub(crate) fn emit_into(
+    buffer: &PyBuffer<u8>,
+    offset: usize,
+    encode: impl FnOnce(&mut Vec<u8>) -> PyResult<()>,
+) -> PyResult<usize> {
+    if buffer.readonly() {
+        return Err(PyTypeError::new_err("buffer is read-only"));
+    }
+    if !buffer.is_c_contiguous() {
+        return Err(PyValueError::new_err("buffer must be C-contiguous"));
+    }
+    with_scratch(|bytes| {
+        encode(bytes)?;
+        let available = buffer.len_bytes().saturating_sub(offset);
+        if bytes.len() > available {
+            return Err(PyValueError::new_err(format!(
+                "buffer too small: {} bytes needed at offset {offset}, {available} available",
+                bytes.len()
+            )));
+        }
+        // SAFETY: the buffer is writable, contiguous and at least
+        // `offset + bytes.len()` long, and cannot overlap the scratch buffer.
+        unsafe {
+            std::ptr::copy_nonoverlapping(
+                bytes.as_ptr(),
+                buffer.buf_ptr().cast::<u8>().add(offset),
+                bytes.len(),
+            );
+        }
+        Ok(bytes.len())
+    })
+}
+
+/// Python wrappers for a list-valued getter, built on first access and reused
+/// afterwards.
+///
+/// Only read-only pyclass wrappers are cached, so a populated cache is never
+/// invalidated. Each access still returns a new list, so callers that mutate
+/// the list they get back do not change what later reads see. Clones start
+/// with an empty cache.
+struct WrapperCache<T>(PyOnceLock<Vec<Py<T>>>);
+
+impl<T> Default for WrapperCache<T> {
+    fn default() -> Self {
+        Self(PyOnceLock::new())
+    }
+}
+
+impl<T> Clone for WrapperCache<T> {
+    fn clone(&self) -> Self {
+        Self::default()
+    }
+}
+
+impl<T> WrapperCache<T> {
+    fn list<'py>(
+        &self,
+        py: Python<'py>,
+        build: impl FnOnce() -> PyResult<Vec<Py<T>>>,
+    ) -> PyResult<Bound<'py, PyList>> {
+        let items = self.0.get_or_try_init(py, build)?;
+        PyList::new(py, items.iter().map(|item| item.bind(py)))
+    }
+}
+
+/// Python wrappers for an `attributes` getter.
+///
+/// Attributes are decoded once, on first access. Those wrapped as read-only
+/// pyclasses are reused afterwards; the rest become mutable
+/// `pytecode.classfile.attributes` dataclasses, which are built afresh from
+/// the decoded attribute on every read. `to_bytes()` never sees an edit made
+/// to one, so the edit must not outlive the object it was made on.
+struct AttributeCache(PyOnceLock<Vec<CachedAttribute>>);
+
+enum CachedAttribute {
+    Shared(Py<PyAny>),
+    Rebuilt(raw::AttributeInfo),
+}
+
+impl Default for AttributeCache {
+    fn default() -> Self {
+        Self(PyOnceLock::new())
+    }
+}
+
+impl Clone for AttributeCache {
+    fn clone(&self) -> Self {
+        Self::default()
+    }
+}
+
+impl AttributeCache {
+    fn list<'a, 'py>(
+        &self,
+        py: Python<'py>,
+        decode: impl FnOnce() -> PyResult<Vec<Cow<'a, raw::AttributeInfo>>>,
+    ) -> PyResult<Bound<'py, PyList>> {
+        let cached = self.0.get_or_try_init(py, || {
+            decode()?
+                .into_iter()
+                .map(|attribute| {
+                    Ok(if wraps_read_only(&attribute) {
+                        CachedAttribute::Shared(wrap_attribute(py, &attribute)?)
+                    } else {
+                        CachedAttribute::Rebuilt(attribute.into_owned())
+                    })
+                })
+                .collect::<PyResult<Vec<_>>>()
+        })?;
+        let items = cached
+            .iter()
+            .map(|attribute| match attribute {
+                CachedAttribute::Shared(wrapper) => Ok(wrapper.clone_ref(py)),
+                CachedAttribute::Rebuilt(attribute) => wrap_attribute(py, attribute),
+            })
+            .collect::<PyResult<Vec<_>>>()?;
+        PyList::new(py, items)
+    }
+}
+
 macro_rules! wrap_pyclass {
     ($py:expr, $value:expr) => {
         Py::new($py, $value).map(|obj| obj.into_bound($py).into_any().unbind())
@@ -1479,6 +1700,18 @@ impl PyExceptionsAttr {
 #[derive(Clone)]
 pub struct PyCodeAttr {
     inner: raw::CodeAttribute,
+    code: WrapperCache<PyInsnInfo>,
+    attributes: AttributeCache,
+}
+
+impl PyCodeAttr {
+    fn new(inner: raw::CodeAttribute) -> Self {
+        Self {
+            inner,
+            code: WrapperCache::default(),
+            attributes: AttributeCache::default(),
+        }
+    }
 }
 
 #[pymethods]
@@ -1514,13 +1747,21 @@ impl PyCodeAttr {
     }
 
     #[getter]
-    fn code(&self) -> Vec<PyInsnInfo> {
-        self.inner
-            .code
-            .iter()
-            .cloned()
-            .map(|inner| PyInsnInfo { inner })
-            .collect()
+    fn code<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyList>> {
+        self.code.list(py, || {
+            self.inner
+                .code
+                .iter()
+                .map(|inner| {
+                    Py::new(
+                        py,
+                        PyInsnInfo {
+                            inner: inner.clone(),
+                        },
+                    )
+                })
+                .collect()
+        })
     }
 
     #[getter]
@@ -1544,12 +1785,10 @@ impl PyCodeAttr {
     }
 
     #[getter]
-    fn attributes(&self, py: Python<'_>) -> PyResult<Vec<Py<PyAny>>> {
-        self.inner
-            .attributes
-            .iter()
-            .map(|attribute| wrap_attribute(py, attribute))
-            .collect()
+    fn attributes<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyList>> {
+        self.attributes.list(py, || {
+            Ok(self.inner.attributes.iter().map(Cow::Borrowed).collect())
+        })
     }
 }
 
@@ -1710,6 +1949,32 @@ fn wrap_constant_pool_entry(
     }
 }
 
+/// Wrap `attributes`, decoding any that a lazy read kept as raw bytes.
+fn decode_attributes<'a>(
+    attributes: &'a [raw::AttributeInfo],
+    constant_pool: &[Option<raw::ConstantPoolEntry>],
+) -> PyResult<Vec<Cow<'a, raw::AttributeInfo>>> {
+    attributes
+        .iter()
+        .map(|attribute| decode_attribute(attribute, constant_pool).map_err(engine_error_to_py))
+        .collect()
+}
+
+/// Whether [`wrap_attribute`] wraps `attribute` in a pyclass without setters,
+/// rather than a mutable `pytecode.classfile.attributes` dataclass.
+fn wraps_read_only(attribute: &raw::AttributeInfo) -> bool {
+    matches!(
+        attribute,
+        raw::AttributeInfo::ConstantValue(_)
+            | raw::AttributeInfo::Signature(_)
+            | raw::AttributeInfo::SourceFile(_)
+            | raw::AttributeInfo::SourceDebugExtension(_)
+            | raw::AttributeInfo::Code(_)
+            | raw::AttributeInfo::Exceptions(_)
+            | raw::AttributeInfo::Unknown(_)
+    )
+}
+
 pub(crate) fn wrap_attribute(
     py: Python<'_>,
     attribute: &raw::AttributeInfo,
@@ -1739,12 +2004,7 @@ pub(crate) fn wrap_attribute(
                 inner: inner.clone(),
             }
         ),
-        raw::AttributeInfo::Code(inner) => wrap_pyclass!(
-            py,
-            PyCodeAttr {
-                inner: inner.clone(),
-            }
-        ),
+        raw::AttributeInfo::Code(inner) => wrap_pyclass!(py, PyCodeAttr::new(inner.clone())),
         raw::AttributeInfo::StackMapTable(inner) => {
             let entries = inner
                 .entries
@@ -2088,76 +2348,88 @@ pub(crate) fn wrap_attribute(
 #[pyclass(from_py_object, module = "pytecode._rust", name = "FieldInfo")]
 #[derive(Clone)]
 pub struct PyFieldInfo {
-    inner: raw::FieldInfo,
+    class: Arc<ClassFile>,
+    index: usize,
+    attributes: AttributeCache,
+}
+
+impl PyFieldInfo {
+    fn inner(&self) -> &raw::FieldInfo {
+        &self.class.fields[self.index]
+    }
 }
 
 #[pymethods]
 impl PyFieldInfo {
     #[getter]
     fn access_flags(&self, py: Python<'_>) -> PyResult<Py<PyAny>> {
-        wrap_field_access_flags(py, self.inner.access_flags)
+        wrap_field_access_flags(py, self.inner().access_flags)
     }
 
     #[getter]
     fn name_index(&self) -> u16 {
-        self.inner.name_index.into()
+        self.inner().name_index.into()
     }
 
     #[getter]
     fn descriptor_index(&self) -> u16 {
-        self.inner.descriptor_index.into()
+        self.inner().descriptor_index.into()
     }
 
     #[getter]
     fn attributes_count(&self) -> usize {
-        self.inner.attributes.len()
+        self.inner().attributes.len()
     }
 
     #[getter]
-    fn attributes(&self, py: Python<'_>) -> PyResult<Vec<Py<PyAny>>> {
-        self.inner
-            .attributes
-            .iter()
-            .map(|attribute| wrap_attribute(py, attribute))
-            .collect()
+    fn attributes<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyList>> {
+        self.attributes.list(py, || {
+            decode_attributes(&self.inner().attributes, &self.class.constant_pool)
+        })
     }
 }
 
 #[pyclass(from_py_object, module = "pytecode._rust", name = "MethodInfo")]
 #[derive(Clone)]
 pub struct PyMethodInfo {
-    inner: raw::MethodInfo,
+    class: Arc<ClassFile>,
+    index: usize,
+    attributes: AttributeCache,
+}
+
+impl PyMethodInfo {
+    fn inner(&self) -> &raw::MethodInfo {
+        &self.class.methods[self.index]
+    }
 }
 
 #[pymethods]
 impl PyMethodInfo {
     #[getter]
     fn access_flags(&self, py: Python<'_>) -> PyResult<Py<PyAny>> {
-        wrap_method_access_flags(py, self.inner.access_flags)
+        wrap_method_access_flags(py, self.inner().access_flags)
     }
 
     #[getter]
     fn name_index(&self) -> u16 {
-        self.inner.name_index.into()
+        self.inner().name_index.into()
     }
 
     #[getter]
     fn descriptor_index(&self) -> u16 {
-        self.inner.descriptor_index.into()
+        self.inner().descriptor_index.into()
     }
 
     #[getter]
     fn attributes_count(&self) -> usize {
-        self.inner.attributes.len()
+        self.inner().attributes.len()
     }
 
     #[getter]
-    fn attributes(&self, py: Python<'_>) -> PyResult<Vec<Py<PyAny>>> {
-        self.inner
-            .attributes
-            .iter()
-            .map(|attribute| wrap_attribute(py, attribute))
-            .collect()
+    fn attributes<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyList>> {
+        self.attributes.list(py, || {
+            decode_attributes(&self.inner().attributes, &self.class.constant_pool)
+        })
     }
 }
 
@@ -2165,6 +2437,20 @@ impl PyMethodInfo {
 #[derive(Clone)]
 pub struct PyClassFile {
     inner: Arc<ClassFile>,
+    fields: WrapperCache<PyFieldInfo>,
+    methods: WrapperCache<PyMethodInfo>,
+    attributes: AttributeCache,
+}
+
+impl PyClassFile {
+    pub(crate) fn new(inner: Arc<ClassFile>) -> Self {
+        Self {
+            inner,
+            fields: WrapperCache::default(),
+            methods: WrapperCache::default(),
+            attributes: AttributeCache::default(),
+        }
+    }
 }
 
 #[pymethods]
@@ -2245,13 +2531,21 @@ impl PyClassFile {
     }
 
     #[getter]
-    fn fields(&self) -> Vec<PyFieldInfo> {
-        self.inner
-            .fields
-            .iter()
-            .cloned()
-            .map(|inner| PyFieldInfo { inner })
-            .collect()
+    fn fields<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyList>> {
+        self.fields.list(py, || {
+            (0..self.inner.fields.len())
+                .map(|index| {
+                    Py::new(
+                        py,
+                        PyFieldInfo {
+                            class: Arc::clone(&self.inner),
+                            index,
+                            attributes: AttributeCache::default(),
+                        },
+                    )
+                })
+                .collect()
+        })
     }
 
     #[getter]
@@ -2265,13 +2559,21 @@ impl PyClassFile {
     }
 
     #[getter]
-    fn methods(&self) -> Vec<PyMethodInfo> {
-        self.inner
-            .methods
-            .iter()
-            .cloned()
-            .map(|inner| PyMethodInfo { inner })
-            .collect()
+    fn methods<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyList>> {
+        self.methods.list(py, || {
+            (0..self.inner.methods.len())
+                .map(|index| {
+                    Py::new(
+                        py,
+                        PyMethodInfo {
+                            class: Arc::clone(&self.inner),
+                            index,
+                            attributes: AttributeCache::default(),
+                        },
+                    )
+                })
+                .collect()
+        })
     }
 
     #[getter]
@@ -2285,17 +2587,16 @@ impl PyClassFile {
     }
 
     #[getter]
-    fn attributes(&self, py: Python<'_>) -> PyResult<Vec<Py<PyAny>>> {
-        self.inner
-            .attributes
-            .iter()
-            .map(|attribute| wrap_attribute(py, attribute))
-            .collect()
+    fn attributes<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyList>> {
+        self.attributes.list(py, || {
+            decode_attributes(&self.inner.attributes, &self.inner.constant_pool)
+        })
     }
 
     fn to_bytes<'py>(&self, py: Python<'py>) -> PyResult<Py<PyBytes>> {
-        let bytes = write_class(&self.inner).map_err(engine_error_to_py)?;
-        Ok(PyBytes::new(py, &bytes).unbind())
+        emit_bytes(py, |out| {
+            write_class_into(&self.inner, out).map_err(engine_error_to_py)
+        })
     }
 
     fn __repr__(&self) -> String {
@@ -2309,37 +2610,72 @@ impl PyClassFile {
     }
 }
 
+fn parse_read_level(s: &str) -> PyResult<ReadLevel> {
+    match s {
+        "header" => Ok(ReadLevel::Header),
+        "members" => Ok(ReadLevel::Members),
+        "lazy" => Ok(ReadLevel::Lazy),
+        "full" => Ok(ReadLevel::Full),
+        _ => Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+            "invalid read level: {s:?}, expected \"header\", \"members\", \"lazy\", or \"full\""
+        ))),
+    }
+}
+
 #[pyclass(module = "pytecode._rust", name = "ClassReader")]
 pub struct PyClassReader {
     class_info: Arc<ClassFile>,
+    /// `class_info` as returned to Python, so its wrapper caches are shared by
+    /// every access.
+    class_info_object: PyOnceLock<Py<PyClassFile>>,
 }
 
-#[pymethods]
 impl PyClassReader {
-    #[new]
-    fn new(bytes_or_bytearray: &[u8]) -> PyResult<Self> {
-        let class_info = parse_class(bytes_or_bytearray).map_err(engine_error_to_py)?;
+    fn parse(bytes: &[u8], level: &str) -> PyResult<Self> {
+        let level = parse_read_level(level)?;
+        let class_info = parse_class_at(bytes, level).map_err(engine_error_to_py)?;
         Ok(Self {
             class_info: Arc::new(class_info),
+            class_info_object: PyOnceLock::new(),
         })
     }
+}
+
+#[pymethods]
+impl PyClassReader {
+    #[new]
+    #[pyo3(signature = (bytes_or_bytearray, level = "full"))]
+    fn new(bytes_or_bytearray: &Bound<'_, PyAny>, level: &str) -> PyResult<Self> {
+        Self::parse(
+            ClassBytes::from_object(bytes_or_bytearray)?.as_slice(),
+            level,
+        )
+    }
 
     #[classmethod]
-    fn from_bytes(_cls: &Bound<'_, PyType>, bytes_or_bytearray: &[u8]) -> PyResult<Self> {
-        Self::new(bytes_or_bytearray)
+    #[pyo3(signature = (bytes_or_bytearray, level = "full"))]
+    fn from_bytes(
+        _cls: &Bound<'_, PyType>,
+        bytes_or_bytearray: &Bound<'_, PyAny>,
+        level: &str,
+    ) -> PyResult<Self> {
+        Self::new(bytes_or_bytearray, level)
     }
 
     #[classmethod]
-    fn from_file(_cls: &Bound<'_, PyType>, path: PathBuf) -> PyResult<Self> {
+    #[pyo3(signature = (path, level = "full"))]
+    fn from_file(_cls: &Bound<'_, PyType>, path: PathBuf, level: &str) -> PyResult<Self> {
         let bytes = fs::read(&path).map_err(PyOSError::new_err)?;
-        Self::new(&bytes)
+        Self::parse(&bytes, level)
     }
 
     #[getter]
-    fn class_info(&self) -> PyClassFile {
-        PyClassFile {
-            inner: self.class_info.clone(),
-        }
+    fn class_info(&self, py: Python<'_>) -> PyResult<Py<PyClassFile>> {
+        self.class_info_object
+            .get_or_try_init(py, || {
+                Py::new(py, PyClassFile::new(self.class_info.clone()))
+            })
+            .map(|class_info| class_info.clone_ref(py))
     }
 
     fn __repr__(&self) -> String {
@@ -2357,12 +2693,21 @@ pub struct PyClassWriter;
 impl PyClassWriter {
     #[staticmethod]
     fn write<'py>(py: Python<'py>, classfile: &PyClassFile) -> PyResult<Py<PyBytes>> {
-        let bytes = write_class(&classfile.inner).map_err(engine_error_to_py)?;
-        Ok(PyBytes::new(py, &bytes).unbind())
+        emit_bytes(py, |out| {
+            write_class_into(&classfile.inner, out).map_err(engine_error_to_py)
+        })
+    }
+
+    #[staticmethod]
+    #[pyo3(signature = (classfile, buffer, offset = 0))]
+    fn write_into(classfile: &PyClassFile, buffer: PyBuffer<u8>, offset: usize) -> PyResult<usize> {
+        emit_into(&buffer, offset, |out| {
+            write_class_into(&classfile.inner, out).map_err(engine_error_to_py)
+        })
     }
 }
 
-#[pymodule]
+#[pymodule(gil_used = false)]
 fn _rust(py: Python<'_>, module: &Bound<'_, PyModule>) -> PyResult<()> {
     module.add(
         "MalformedClassException",
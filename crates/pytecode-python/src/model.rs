@@ -1,25 +1,27 @@
+use pyo3::buffer::PyBuffer;
 use pyo3::exceptions::{PyIndexError, PyRuntimeError};
 use pyo3::prelude::*;
-use pyo3::types::{PyAny, PyBytes, PyDict, PyList};
+use pyo3::sync::MutexExt;
+use pyo3::types::{PyAny, PyBytes, PyDict, PyList, PyMemoryView, PyTuple};
 use pyo3::wrap_pyfunction;
-use pytecode_engine::analysis::MappingClassResolver;
+use pytecode_archive::{ClasspathResolver, DEFAULT_CLASSPATH_CACHE_CAPACITY, HierarchyIndex};
+use pytecode_engine::analysis::{ClassResolver, MappingClassResolver};
 use pytecode_engine::indexes::BootstrapMethodIndex;
 use pytecode_engine::model::{
     BranchInsn, ClassModel, CodeItem, CodeModel, ConstantPoolBuilder, DebugInfoPolicy,
     DebugInfoState, DynamicValue, ExceptionHandler, FieldInsn, FieldModel, FrameComputationMode,
-    IIncInsn, InterfaceMethodInsn, InvokeDynamicInsn, Label, LdcInsn, LdcValue, LookupSwitchInsn,
-    MethodHandleValue, MethodInsn, MethodModel, MultiANewArrayInsn, TableSwitchInsn, TypeInsn,
-    VarInsn,
+    IIncInsn, InstructionTable, InterfaceMethodInsn, InvokeDynamicInsn, Label, LdcInsn, LdcValue,
+    LookupSwitchInsn, MethodHandleValue, MethodInsn, MethodModel, MultiANewArrayInsn,
+    TableSwitchInsn, TypeInsn, VarInsn,
 };
 use pytecode_engine::raw::{ArrayType, ClassFile, Instruction, NewArrayInsn};
-use pytecode_engine::write_class;
-use std::cell::RefCell;
+use pytecode_engine::{ReadLevel, parse_class_at, write_class_into};
 use std::hash::{Hash, Hasher};
-use std::rc::Rc;
-use std::sync::Arc;
+use std::path::PathBuf;
+use std::sync::{Arc, Mutex, MutexGuard, PoisonError};
 
-use crate::PyClassFile;
 use crate::transforms::PyInsnMatcher;
+use crate::{ClassBytes, PyClassFile};
 
 type PyObject = Py<PyAny>;
 
@@ -60,7 +62,7 @@ fn resolved_class_to_py(
     Ok(dict.into_any().unbind())
 }
 
-type SharedClassState = Rc<RefCell<ClassModelState>>;
+type SharedClassState = Arc<Mutex<ClassModelState>>;
 
 struct ClassModelState {
     inner: Option<ClassModel>,
@@ -104,11 +106,20 @@ fn normalize_index(index: isize, len: usize) -> PyResult<usize> {
     Ok(normalized as usize)
 }
 
+/// Lock shared model state, detaching from the interpreter while waiting so
+/// the thread holding the lock can still attach.
+///
+/// A panic while the lock is held leaves the state as far as the panicking
+/// call got, which is still a valid model, so poisoning is ignored.
+fn lock<T>(mutex: &Mutex<T>) -> MutexGuard<'_, T> {
+    Python::attach(|py| mutex.lock_py_attached(py)).unwrap_or_else(PoisonError::into_inner)
+}
+
 fn with_live_model<R>(
     state: &SharedClassState,
     f: impl FnOnce(&ClassModelState) -> PyResult<R>,
 ) -> PyResult<R> {
-    let borrowed = state.borrow();
+    let borrowed = lock(state);
     if borrowed.inner.is_none() {
         return Err(dead_model_err());
     }
@@ -119,7 +130,7 @@ fn with_live_model_mut<R>(
     state: &SharedClassState,
     f: impl FnOnce(&mut ClassModelState) -> PyResult<R>,
 ) -> PyResult<R> {
-    let mut borrowed = state.borrow_mut();
+    let mut borrowed = lock(state);
     if borrowed.inner.is_none() {
         return Err(dead_model_err());
     }
@@ -1537,7 +1548,7 @@ enum FieldAccess {
         index: usize,
         generation: u64,
     },
-    Owned(Rc<RefCell<FieldModel>>),
+    Owned(Arc<Mutex<FieldModel>>),
 }
 
 #[derive(Clone)]
@@ -1547,7 +1558,7 @@ enum MethodAccess {
         index: usize,
         generation: u64,
     },
-    Owned(Rc<RefCell<MethodModel>>),
+    Owned(Arc<Mutex<MethodModel>>),
 }
 
 #[derive(Clone)]
@@ -1557,7 +1568,7 @@ enum CodeAccess {
         method_index: usize,
         methods_generation: u64,
     },
-    OwnedMethod(Rc<RefCell<MethodModel>>),
+    OwnedMethod(Arc<Mutex<MethodModel>>),
 }
 
 #[derive(Clone)]
@@ -1584,8 +1595,8 @@ enum AttributeOwner {
         method_index: usize,
         methods_generation: u64,
     },
-    OwnedField(Rc<RefCell<FieldModel>>),
-    OwnedMethod(Rc<RefCell<MethodModel>>),
+    OwnedField(Arc<Mutex<FieldModel>>),
+    OwnedMethod(Arc<Mutex<MethodModel>>),
 }
 
 #[derive(Clone, Copy)]
@@ -1601,12 +1612,7 @@ enum CodeListKind {
 // View objects
 // ---------------------------------------------------------------------------
 
-#[pyclass(
-    from_py_object,
-    name = "StringListView",
-    module = "pytecode._rust",
-    unsendable
-)]
+#[pyclass(from_py_object, name = "StringListView", module = "pytecode._rust")]
 #[derive(Clone)]
 pub struct PyStringListView {
     state: SharedClassState,
@@ -1644,12 +1650,7 @@ impl PyStringListView {
     }
 }
 
-#[pyclass(
-    from_py_object,
-    name = "FieldListView",
-    module = "pytecode._rust",
-    unsendable
-)]
+#[pyclass(from_py_object, name = "FieldListView", module = "pytecode._rust")]
 #[derive(Clone)]
 pub struct PyFieldListView {
     state: SharedClassState,
@@ -1691,12 +1692,7 @@ impl PyFieldListView {
     }
 }
 
-#[pyclass(
-    from_py_object,
-    name = "MethodListView",
-    module = "pytecode._rust",
-    unsendable
-)]
+#[pyclass(from_py_object, name = "MethodListView", module = "pytecode._rust")]
 #[derive(Clone)]
 pub struct PyMethodListView {
     state: SharedClassState,
@@ -1783,8 +1779,8 @@ impl AttributeOwner {
                     .ok_or_else(|| PyErr::new::<PyRuntimeError, _>("method has no code"))?;
                 Ok(code.attributes.len())
             }),
-            AttributeOwner::OwnedField(field) => Ok(field.borrow().attributes.len()),
-            AttributeOwner::OwnedMethod(method) => Ok(method.borrow().attributes.len()),
+            AttributeOwner::OwnedField(field) => Ok(lock(field).attributes.len()),
+            AttributeOwner::OwnedMethod(method) => Ok(lock(method).attributes.len()),
         }
     }
 
@@ -1833,12 +1829,12 @@ impl AttributeOwner {
                 crate::wrap_attribute(py, &attrs[normalize_index(index, attrs.len())?])
             }),
             AttributeOwner::OwnedField(field) => {
-                let borrowed = field.borrow();
+                let borrowed = lock(field);
                 let attrs = &borrowed.attributes;
                 crate::wrap_attribute(py, &attrs[normalize_index(index, attrs.len())?])
             }
             AttributeOwner::OwnedMethod(method) => {
-                let borrowed = method.borrow();
+                let borrowed = lock(method);
                 let attrs = &borrowed.attributes;
                 crate::wrap_attribute(py, &attrs[normalize_index(index, attrs.len())?])
             }
@@ -1846,12 +1842,7 @@ impl AttributeOwner {
     }
 }
 
-#[pyclass(
-    from_py_object,
-    name = "AttributeListView",
-    module = "pytecode._rust",
-    unsendable
-)]
+#[pyclass(from_py_object, name = "AttributeListView", module = "pytecode._rust")]
 #[derive(Clone)]
 pub struct PyAttributeListView {
     owner: AttributeOwner,
@@ -1875,12 +1866,7 @@ impl PyAttributeListView {
     }
 }
 
-#[pyclass(
-    from_py_object,
-    name = "CodeListView",
-    module = "pytecode._rust",
-    unsendable
-)]
+#[pyclass(from_py_object, name = "CodeListView", module = "pytecode._rust")]
 #[derive(Clone)]
 pub struct PyCodeListView {
     access: CodeAccess,
@@ -1976,7 +1962,7 @@ impl PyCodeListView {
                 f(code)
             }),
             CodeAccess::OwnedMethod(method) => {
-                let borrowed = method.borrow();
+                let borrowed = lock(method);
                 let code = borrowed
                     .code
                     .as_ref()
@@ -1991,12 +1977,7 @@ impl PyCodeListView {
 // PyCodeModel
 // ---------------------------------------------------------------------------
 
-#[pyclass(
-    from_py_object,
-    name = "CodeModel",
-    module = "pytecode._rust",
-    unsendable
-)]
+#[pyclass(from_py_object, name = "CodeModel", module = "pytecode._rust")]
 #[derive(Clone)]
 pub struct PyCodeModel {
     access: CodeAccess,
@@ -2021,7 +2002,7 @@ impl PyCodeModel {
                 f(code)
             }),
             CodeAccess::OwnedMethod(method) => {
-                let borrowed = method.borrow();
+                let borrowed = lock(method);
                 let code = borrowed
                     .code
                     .as_ref()
@@ -2122,6 +2103,11 @@ impl PyCodeModel {
         })
     }
 
+    fn instructions_table(&self, py: Python<'_>) -> PyResult<PyInstructionTable> {
+        let table = self.with_code(|code| Ok(code.instruction_table()))?;
+        PyInstructionTable::new(py, table)
+    }
+
     fn find_insns(&self, matcher: &PyInsnMatcher) -> PyResult<Vec<usize>> {
         let matcher = matcher.spec.compile();
         self.with_code(|code| {
@@ -2188,16 +2174,97 @@ impl PyCodeModel {
     }
 }
 
+// ---------------------------------------------------------------------------
+// PyInstructionTable
+// ---------------------------------------------------------------------------
+
+/// Read-only `memoryview` over `values` in native byte order, cast to `format`.
+pub(crate) fn column_view<T: Copy, const N: usize>(
+    py: Python<'_>,
+    values: &[T],
+    to_bytes: impl Fn(T) -> [u8; N],
+    format: &str,
+) -> PyResult<PyObject> {
+    let bytes = PyBytes::new_with(py, values.len() * N, |buffer| {
+        for (chunk, value) in buffer.chunks_exact_mut(N).zip(values) {
+            chunk.copy_from_slice(&to_bytes(*value));
+        }
+        Ok(())
+    })?;
+    let view = PyMemoryView::from(bytes.as_any())?;
+    if format == "B" {
+        return Ok(view.into_any().unbind());
+    }
+    Ok(view.call_method1("cast", (format,))?.unbind())
+}
+
+#[pyclass(frozen, name = "InstructionTable", module = "pytecode._rust")]
+pub struct PyInstructionTable {
+    len: usize,
+    opcodes: PyObject,
+    kinds: PyObject,
+    operands: PyObject,
+    strings: Py<PyTuple>,
+    switch_keys: PyObject,
+    switch_targets: PyObject,
+}
+
+impl PyInstructionTable {
+    fn new(py: Python<'_>, table: InstructionTable) -> PyResult<Self> {
+        Ok(Self {
+            len: table.len(),
+            opcodes: column_view(py, &table.opcodes, |value| [value], "B")?,
+            kinds: column_view(py, &table.kinds, |kind| [kind as u8], "B")?,
+            operands: column_view(py, table.operands.as_flattened(), u32::to_ne_bytes, "I")?,
+            strings: PyTuple::new(py, table.strings)?.unbind(),
+            switch_keys: column_view(py, &table.switch_keys, i32::to_ne_bytes, "i")?,
+            switch_targets: column_view(py, &table.switch_targets, u32::to_ne_bytes, "I")?,
+        })
+    }
+}
+
+#[pymethods]
+impl PyInstructionTable {
+    fn __len__(&self) -> usize {
+        self.len
+    }
+
+    #[getter]
+    fn opcodes(&self, py: Python<'_>) -> PyObject {
+        self.opcodes.clone_ref(py)
+    }
+
+    #[getter]
+    fn kinds(&self, py: Python<'_>) -> PyObject {
+        self.kinds.clone_ref(py)
+    }
+
+    #[getter]
+    fn operands(&self, py: Python<'_>) -> PyObject {
+        self.operands.clone_ref(py)
+    }
+
+    #[getter]
+    fn strings(&self, py: Python<'_>) -> Py<PyTuple> {
+        self.strings.clone_ref(py)
+    }
+
+    #[getter]
+    fn switch_keys(&self, py: Python<'_>) -> PyObject {
+        self.switch_keys.clone_ref(py)
+    }
+
+    #[getter]
+    fn switch_targets(&self, py: Python<'_>) -> PyObject {
+        self.switch_targets.clone_ref(py)
+    }
+}
+
 // ---------------------------------------------------------------------------
 // PyFieldModel
 // ---------------------------------------------------------------------------
 
-#[pyclass(
-    from_py_object,
-    name = "FieldModel",
-    module = "pytecode._rust",
-    unsendable
-)]
+#[pyclass(from_py_object, name = "FieldModel", module = "pytecode._rust")]
 #[derive(Clone)]
 pub struct PyFieldModel {
     access: FieldAccess,
@@ -2216,7 +2283,7 @@ impl PyFieldModel {
                 }
                 f(&model_state.inner.as_ref().unwrap().fields[*index])
             }),
-            FieldAccess::Owned(field) => f(&field.borrow()),
+            FieldAccess::Owned(field) => f(&lock(field)),
         }
     }
 
@@ -2236,7 +2303,7 @@ impl PyFieldModel {
                 })
             }
             FieldAccess::Owned(field) => {
-                let mut borrowed = field.borrow_mut();
+                let mut borrowed = lock(field);
                 f(&mut borrowed)
             }
         }
@@ -2260,7 +2327,7 @@ impl PyFieldModel {
             attributes: Vec::new(),
         };
         Self {
-            access: FieldAccess::Owned(Rc::new(RefCell::new(field))),
+            access: FieldAccess::Owned(Arc::new(Mutex::new(field))),
         }
     }
 
@@ -2326,12 +2393,7 @@ impl PyFieldModel {
 // PyMethodModel
 // ---------------------------------------------------------------------------
 
-#[pyclass(
-    from_py_object,
-    name = "MethodModel",
-    module = "pytecode._rust",
-    unsendable
-)]
+#[pyclass(from_py_object, name = "MethodModel", module = "pytecode._rust")]
 #[derive(Clone)]
 pub struct PyMethodModel {
     access: MethodAccess,
@@ -2350,7 +2412,7 @@ impl PyMethodModel {
                 }
                 f(&model_state.inner.as_ref().unwrap().methods[*index])
             }),
-            MethodAccess::Owned(method) => f(&method.borrow()),
+            MethodAccess::Owned(method) => f(&lock(method)),
         }
     }
 
@@ -2370,7 +2432,7 @@ impl PyMethodModel {
                 })
             }
             MethodAccess::Owned(method) => {
-                let mut borrowed = method.borrow_mut();
+                let mut borrowed = lock(method);
                 f(&mut borrowed)
             }
         }
@@ -2393,7 +2455,7 @@ impl PyMethodModel {
             Vec::new(),
         );
         Self {
-            access: MethodAccess::Owned(Rc::new(RefCell::new(method))),
+            access: MethodAccess::Owned(Arc::new(Mutex::new(method))),
         }
     }
 
@@ -2458,7 +2520,7 @@ impl PyMethodModel {
                 }))
             }),
             MethodAccess::Owned(method) => {
-                let has_code = method.borrow().code.is_some();
+                let has_code = lock(method).code.is_some();
                 Ok(has_code.then(|| PyCodeModel {
                     access: CodeAccess::OwnedMethod(method.clone()),
                 }))
@@ -2509,8 +2571,7 @@ impl PyMethodModel {
 #[pyclass(
     from_py_object,
     name = "ConstantPoolBuilder",
-    module = "pytecode._rust",
-    unsendable
+    module = "pytecode._rust"
 )]
 #[derive(Clone)]
 pub struct PyConstantPoolBuilder {
@@ -2921,11 +2982,14 @@ impl PyMappingClassResolver {
 
     #[staticmethod]
     fn from_bytes(class_bytes_list: Vec<Vec<u8>>) -> PyResult<Self> {
-        let models: Vec<ClassModel> = class_bytes_list
+        let classfiles = class_bytes_list
             .iter()
-            .map(|bytes| ClassModel::from_bytes(bytes).map_err(crate::engine_error_to_py))
+            .map(|bytes| {
+                parse_class_at(bytes, ReadLevel::Members).map_err(crate::engine_error_to_py)
+            })
             .collect::<PyResult<Vec<_>>>()?;
-        let resolver = MappingClassResolver::from_models(models).map_err(analysis_error_to_py)?;
+        let resolver =
+            MappingClassResolver::from_classfiles(classfiles).map_err(analysis_error_to_py)?;
         Ok(Self { inner: resolver })
     }
 
@@ -2943,7 +3007,6 @@ impl PyMappingClassResolver {
     }
 
     fn resolve_class(&self, py: Python<'_>, name: &str) -> PyResult<Option<PyObject>> {
-        use pytecode_engine::analysis::ClassResolver;
         match self.inner.resolve_class(name) {
             Some(rc) => Ok(Some(resolved_class_to_py(py, &rc)?)),
             None => Ok(None),
@@ -2951,6 +3014,130 @@ impl PyMappingClassResolver {
     }
 }
 
+// ---------------------------------------------------------------------------
+// PyClasspathResolver
+// ---------------------------------------------------------------------------
+
+#[pyclass(from_py_object, name = "ClasspathResolver", module = "pytecode._rust")]
+#[derive(Clone)]
+pub struct PyClasspathResolver {
+    pub(crate) inner: ClasspathResolver,
+}
+
+#[pymethods]
+impl PyClasspathResolver {
+    #[new]
+    #[pyo3(signature = (roots, cache_size = DEFAULT_CLASSPATH_CACHE_CAPACITY))]
+    fn new(py: Python<'_>, roots: Vec<PathBuf>, cache_size: usize) -> PyResult<Self> {
+        let inner = py
+            .detach(|| ClasspathResolver::with_capacity(&roots, cache_size))
+            .map_err(crate::archive::archive_error_to_py)?;
+        Ok(Self { inner })
+    }
+
+    fn resolve_class(&self, py: Python<'_>, name: &str) -> PyResult<Option<PyObject>> {
+        match self.inner.resolve_class(name) {
+            Some(rc) => Ok(Some(resolved_class_to_py(py, &rc)?)),
+            None => Ok(None),
+        }
+    }
+
+    #[getter]
+    fn cached_count(&self) -> usize {
+        self.inner.cached_len()
+    }
+
+    fn __len__(&self) -> usize {
+        self.inner.len()
+    }
+
+    fn __contains__(&self, name: &str) -> bool {
+        self.inner.contains(name)
+    }
+}
+
+// ---------------------------------------------------------------------------
+// PyHierarchyIndex
+// ---------------------------------------------------------------------------
+
+#[pyclass(from_py_object, name = "HierarchyIndex", module = "pytecode._rust")]
+#[derive(Clone)]
+pub struct PyHierarchyIndex {
+    pub(crate) inner: HierarchyIndex,
+}
+
+#[pymethods]
+impl PyHierarchyIndex {
+    #[classattr]
+    const VERSION: u32 = HierarchyIndex::VERSION;
+
+    #[staticmethod]
+    fn open(py: Python<'_>, path: PathBuf) -> PyResult<Self> {
+        let inner = py
+            .detach(|| HierarchyIndex::open(&path))
+            .map_err(crate::archive::archive_error_to_py)?;
+        Ok(Self { inner })
+    }
+
+    #[staticmethod]
+    #[pyo3(signature = (classpath, cache_path, workers = 1))]
+    fn load_or_build(
+        py: Python<'_>,
+        classpath: Vec<PathBuf>,
+        cache_path: PathBuf,
+        workers: usize,
+    ) -> PyResult<Self> {
+        let inner = py
+            .detach(|| HierarchyIndex::load_or_build(&classpath, &cache_path, workers))
+            .map_err(crate::archive::archive_error_to_py)?;
+        Ok(Self { inner })
+    }
+
+    #[getter]
+    fn key(&self) -> u64 {
+        self.inner.key()
+    }
+
+    fn resolve_class(&self, py: Python<'_>, name: &str) -> PyResult<Option<PyObject>> {
+        match self.inner.resolve_class(name) {
+            Some(rc) => Ok(Some(resolved_class_to_py(py, &rc)?)),
+            None => Ok(None),
+        }
+    }
+
+    fn to_mapping_resolver(&self, py: Python<'_>) -> PyMappingClassResolver {
+        PyMappingClassResolver {
+            inner: py.detach(|| self.inner.to_mapping_resolver()),
+        }
+    }
+
+    fn __len__(&self) -> usize {
+        self.inner.len()
+    }
+
+    fn __contains__(&self, name: &str) -> bool {
+        self.inner.contains(name)
+    }
+}
+
+/// A `resolver=` argument: any of the native resolver classes.
+#[derive(FromPyObject)]
+pub(crate) enum PyResolverRef<'py> {
+    Mapping(PyRef<'py, PyMappingClassResolver>),
+    Classpath(PyRef<'py, PyClasspathResolver>),
+    Index(PyRef<'py, PyHierarchyIndex>),
+}
+
+impl PyResolverRef<'_> {
+    pub(crate) fn as_resolver(&self) -> &(dyn ClassResolver + Sync) {
+        match self {
+            Self::Mapping(resolver) => &resolver.inner,
+            Self::Classpath(resolver) => &resolver.inner,
+            Self::Index(resolver) => &resolver.inner,
+        }
+    }
+}
+
 // ---------------------------------------------------------------------------
 // PyClassModel
 // ---------------------------------------------------------------------------
@@ -3005,31 +3192,33 @@ fn lower_class_model_bytes(
     model: &PyClassModel,
     debug_info: DebugInfoPolicy,
     frame_mode: FrameComputationMode,
-    resolver: Option<&dyn pytecode_engine::analysis::ClassResolver>,
-) -> PyResult<Vec<u8>> {
+    resolver: Option<&dyn ClassResolver>,
+    out: &mut Vec<u8>,
+) -> PyResult<()> {
     if debug_info == DebugInfoPolicy::Preserve
         && frame_mode == FrameComputationMode::Preserve
         && resolver.is_none()
     {
         return with_live_model(&model.state, |model_state| {
-            model_state
+            let classfile = model_state
                 .inner
                 .as_ref()
                 .unwrap()
-                .to_bytes()
-                .map_err(crate::engine_error_to_py)
+                .to_classfile()
+                .map_err(crate::engine_error_to_py)?;
+            write_class_into(&classfile, out).map_err(crate::engine_error_to_py)
         });
     }
 
-    write_class(&lower_class_model(model, debug_info, frame_mode, resolver)?)
-        .map_err(crate::engine_error_to_py)
+    let classfile = lower_class_model(model, debug_info, frame_mode, resolver)?;
+    write_class_into(&classfile, out).map_err(crate::engine_error_to_py)
 }
 
 fn lower_class_model(
     model: &PyClassModel,
     debug_info: DebugInfoPolicy,
     frame_mode: FrameComputationMode,
-    resolver: Option<&dyn pytecode_engine::analysis::ClassResolver>,
+    resolver: Option<&dyn ClassResolver>,
 ) -> PyResult<ClassFile> {
     with_live_model(&model.state, |model_state| {
         model_state
@@ -3046,21 +3235,22 @@ fn lower_class_model(
 fn rust_lower_classmodels(
     models: &Bound<'_, PyList>,
     frame_mode: Option<&Bound<'_, PyAny>>,
-    resolver: Option<&PyMappingClassResolver>,
+    resolver: Option<PyResolverRef<'_>>,
     debug_info: &str,
 ) -> PyResult<Vec<PyClassFile>> {
     let policy = parse_debug_info_policy(debug_info)?;
     let frame_mode = parse_frame_computation_mode(frame_mode)?;
-    let resolver =
-        resolver.map(|value| &value.inner as &dyn pytecode_engine::analysis::ClassResolver);
+    let resolver = resolver
+        .as_ref()
+        .map(|value| value.as_resolver() as &dyn ClassResolver);
 
     models
         .iter()
         .map(|item| {
             let model: PyRef<'_, PyClassModel> = item.extract()?;
-            Ok(PyClassFile {
-                inner: Arc::new(lower_class_model(&model, policy, frame_mode, resolver)?),
-            })
+            Ok(PyClassFile::new(Arc::new(lower_class_model(
+                &model, policy, frame_mode, resolver,
+            )?)))
         })
         .collect()
 }
@@ -3071,30 +3261,27 @@ fn rust_lower_classmodels_to_bytes<'py>(
     py: Python<'py>,
     models: &Bound<'py, PyList>,
     frame_mode: Option<&Bound<'py, PyAny>>,
-    resolver: Option<&PyMappingClassResolver>,
+    resolver: Option<PyResolverRef<'_>>,
     debug_info: &str,
 ) -> PyResult<Vec<Py<PyBytes>>> {
     let policy = parse_debug_info_policy(debug_info)?;
     let frame_mode = parse_frame_computation_mode(frame_mode)?;
-    let resolver =
-        resolver.map(|value| &value.inner as &dyn pytecode_engine::analysis::ClassResolver);
+    let resolver = resolver
+        .as_ref()
+        .map(|value| value.as_resolver() as &dyn ClassResolver);
 
     models
         .iter()
         .map(|item| {
             let model: PyRef<'_, PyClassModel> = item.extract()?;
-            let bytes = lower_class_model_bytes(&model, policy, frame_mode, resolver)?;
-            Ok(PyBytes::new(py, &bytes).unbind())
+            crate::emit_bytes(py, |out| {
+                lower_class_model_bytes(&model, policy, frame_mode, resolver, out)
+            })
         })
         .collect()
 }
 
-#[pyclass(
-    from_py_object,
-    name = "ClassModel",
-    module = "pytecode._rust",
-    unsendable
-)]
+#[pyclass(from_py_object, name = "ClassModel", module = "pytecode._rust")]
 #[derive(Clone)]
 pub struct PyClassModel {
     state: SharedClassState,
@@ -3103,7 +3290,7 @@ pub struct PyClassModel {
 impl PyClassModel {
     pub(crate) fn from_model(inner: ClassModel) -> Self {
         Self {
-            state: Rc::new(RefCell::new(ClassModelState::new(inner))),
+            state: Arc::new(Mutex::new(ClassModelState::new(inner))),
         }
     }
 
@@ -3126,7 +3313,7 @@ impl PyClassModel {
     }
 
     pub(crate) fn take_inner(&mut self) -> PyResult<ClassModel> {
-        let mut borrowed = self.state.borrow_mut();
+        let mut borrowed = lock(&self.state);
         borrowed.inner.take().ok_or_else(dead_model_err)
     }
 }
@@ -3136,70 +3323,107 @@ impl PyClassModel {
     // -- constructors -------------------------------------------------------
 
     #[staticmethod]
-    fn from_bytes(data: &[u8]) -> PyResult<Self> {
-        let model = ClassModel::from_bytes(data).map_err(crate::engine_error_to_py)?;
+    fn from_bytes(data: &Bound<'_, PyAny>) -> PyResult<Self> {
+        let model = ClassModel::from_bytes(ClassBytes::from_object(data)?.as_slice())
+            .map_err(crate::engine_error_to_py)?;
         Ok(Self::from_model(model))
     }
 
+    #[staticmethod]
+    #[pyo3(signature = (data, workers = 1))]
+    fn from_bytes_many<'py>(
+        py: Python<'py>,
+        data: Vec<Bound<'py, PyAny>>,
+        workers: usize,
+    ) -> PyResult<Vec<Self>> {
+        let classes = data
+            .iter()
+            .map(ClassBytes::from_object)
+            .collect::<PyResult<Vec<_>>>()?;
+        let slices = classes.iter().map(ClassBytes::as_slice).collect::<Vec<_>>();
+        let models = py
+            .detach(|| ClassModel::from_bytes_many(&slices, workers))
+            .map_err(crate::engine_error_to_py)?;
+        Ok(models.into_iter().map(Self::from_model).collect())
+    }
+
     // -- serialisation ------------------------------------------------------
 
     fn to_bytes<'py>(&self, py: Python<'py>) -> PyResult<Py<PyBytes>> {
-        let bytes = lower_class_model_bytes(
-            self,
-            DebugInfoPolicy::Preserve,
-            FrameComputationMode::Preserve,
-            None,
-        )?;
-        Ok(PyBytes::new(py, &bytes).unbind())
-    }
-
-    fn to_classfile(&self) -> PyResult<PyClassFile> {
-        Ok(PyClassFile {
-            inner: Arc::new(lower_class_model(
+        crate::emit_bytes(py, |out| {
+            lower_class_model_bytes(
                 self,
                 DebugInfoPolicy::Preserve,
                 FrameComputationMode::Preserve,
                 None,
-            )?),
+                out,
+            )
         })
     }
 
+    fn to_classfile(&self) -> PyResult<PyClassFile> {
+        Ok(PyClassFile::new(Arc::new(lower_class_model(
+            self,
+            DebugInfoPolicy::Preserve,
+            FrameComputationMode::Preserve,
+            None,
+        )?)))
+    }
+
     #[pyo3(signature = (frame_mode = None, resolver = None, debug_info = "preserve"))]
     fn to_bytes_with_options<'py>(
         &self,
         py: Python<'py>,
         frame_mode: Option<&Bound<'py, PyAny>>,
-        resolver: Option<&PyMappingClassResolver>,
+        resolver: Option<PyResolverRef<'_>>,
         debug_info: &str,
     ) -> PyResult<Py<PyBytes>> {
         let policy = parse_debug_info_policy(debug_info)?;
         let frame_mode = parse_frame_computation_mode(frame_mode)?;
-        let bytes = lower_class_model_bytes(
-            self,
-            policy,
-            frame_mode,
-            resolver.map(|r| &r.inner as &dyn pytecode_engine::analysis::ClassResolver),
-        )?;
-        Ok(PyBytes::new(py, &bytes).unbind())
+        let resolver = resolver
+            .as_ref()
+            .map(|r| r.as_resolver() as &dyn ClassResolver);
+        crate::emit_bytes(py, |out| {
+            lower_class_model_bytes(self, policy, frame_mode, resolver, out)
+        })
+    }
+
+    #[pyo3(signature = (buffer, offset = 0, frame_mode = None, resolver = None, debug_info = "preserve"))]
+    fn write_into<'py>(
+        &self,
+        buffer: PyBuffer<u8>,
+        offset: usize,
+        frame_mode: Option<&Bound<'py, PyAny>>,
+        resolver: Option<PyResolverRef<'_>>,
+        debug_info: &str,
+    ) -> PyResult<usize> {
+        let policy = parse_debug_info_policy(debug_info)?;
+        let frame_mode = parse_frame_computation_mode(frame_mode)?;
+        let resolver = resolver
+            .as_ref()
+            .map(|r| r.as_resolver() as &dyn ClassResolver);
+        crate::emit_into(&buffer, offset, |out| {
+            lower_class_model_bytes(self, policy, frame_mode, resolver, out)
+        })
     }
 
     #[pyo3(signature = (frame_mode = None, resolver = None, debug_info = "preserve"))]
     fn to_classfile_with_options(
         &self,
         frame_mode: Option<&Bound<'_, PyAny>>,
-        resolver: Option<&PyMappingClassResolver>,
+        resolver: Option<PyResolverRef<'_>>,
         debug_info: &str,
     ) -> PyResult<PyClassFile> {
         let policy = parse_debug_info_policy(debug_info)?;
         let frame_mode = parse_frame_computation_mode(frame_mode)?;
-        Ok(PyClassFile {
-            inner: Arc::new(lower_class_model(
-                self,
-                policy,
-                frame_mode,
-                resolver.map(|r| &r.inner as &dyn pytecode_engine::analysis::ClassResolver),
-            )?),
-        })
+        Ok(PyClassFile::new(Arc::new(lower_class_model(
+            self,
+            policy,
+            frame_mode,
+            resolver
+                .as_ref()
+                .map(|r| r.as_resolver() as &dyn ClassResolver),
+        )?)))
     }
 
     // -- getters ------------------------------------------------------------
@@ -3383,6 +3607,7 @@ pub(crate) fn register(_py: Python<'_>, module: &Bound<'_, PyModule>) -> PyResul
     module.add_class::<PyMethodListView>()?;
     module.add_class::<PyAttributeListView>()?;
     module.add_class::<PyCodeListView>()?;
+    module.add_class::<PyInstructionTable>()?;
     module.add_class::<PyLabel>()?;
     module.add_class::<PyLineNumberEntry>()?;
     module.add_class::<PyLocalVariableEntry>()?;
@@ -3407,6 +3632,8 @@ pub(crate) fn register(_py: Python<'_>, module: &Bound<'_, PyModule>) -> PyResul
     module.add_class::<PyTableSwitchInsn>()?;
     module.add_class::<PyConstantPoolBuilder>()?;
     module.add_class::<PyMappingClassResolver>()?;
+    module.add_class::<PyClasspathResolver>()?;
+    module.add_class::<PyHierarchyIndex>()?;
     module.add_class::<PyModelExceptionHandler>()?;
     module.add_function(wrap_pyfunction!(rust_lower_classmodels, module)?)?;
     module.add_function(wrap_pyfunction!(rust_lower_classmodels_to_bytes, module)?)?;
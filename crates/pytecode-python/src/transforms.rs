@@ -1371,11 +1371,16 @@ impl PyCompiledPipeline {
     }
 
     pub(crate) fn apply_to_engine_model(&self, model: &mut ClassModel) -> PyResult<()> {
-        self.inner.apply(model);
+        self.apply_to_engine_model_tracked(model).map(drop)
+    }
+
+    /// Apply the pipeline, reporting whether any step may have modified `model`.
+    pub(crate) fn apply_to_engine_model_tracked(&self, model: &mut ClassModel) -> PyResult<bool> {
+        let modified = self.inner.apply_tracked(model);
         if let Some(err) = self.take_callback_error() {
             return Err(err);
         }
-        Ok(())
+        Ok(modified)
     }
 }
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Callable, Iterator, Sequence
+from collections.abc import Buffer, Callable, Iterator, Sequence
 from pathlib import Path
 from typing import Literal, TypedDict
 
@@ -697,13 +697,27 @@ class ClassFile:
 class ClassReader:
     """Parse raw classfile bytes into a read-only :class:`ClassFile` view."""
 
-    def __init__(self, bytes_or_bytearray: bytes) -> None: ...
+    def __init__(
+        self, bytes_or_bytearray: Buffer, level: Literal["header", "members", "lazy", "full"] = "full"
+    ) -> None: ...
     @classmethod
-    def from_bytes(cls, bytes_or_bytearray: bytes) -> ClassReader:
-        """Create a reader from in-memory classfile bytes."""
+    def from_bytes(
+        cls, bytes_or_bytearray: Buffer, level: Literal["header", "members", "lazy", "full"] = "full"
+    ) -> ClassReader:
+        """Create a reader from in-memory classfile bytes.
+
+        Any buffer (``bytes``, ``bytearray``, ``memoryview``, ``mmap``) is
+        accepted; immutable ones are read in place and writable ones copied.
+
+        ``level="header"`` stops after the interfaces table and
+        ``level="members"`` keeps fields and methods but skips every attribute
+        payload by length; the skipped tables are left empty. ``level="lazy"``
+        keeps attributes as raw bytes that are decoded when first accessed and
+        written back verbatim otherwise.
+        """
         ...
     @classmethod
-    def from_file(cls, path: str | Path) -> ClassReader:
+    def from_file(cls, path: str | Path, level: Literal["header", "members", "lazy", "full"] = "full") -> ClassReader:
         """Read a classfile from disk and return a new reader."""
         ...
     @property
@@ -718,6 +732,10 @@ class ClassWriter:
     def write(classfile: ClassFile) -> bytes:
         """Encode a raw classfile object into JVM classfile bytes."""
         ...
+    @staticmethod
+    def write_into(classfile: ClassFile, buffer: Buffer, offset: int = 0) -> int:
+        """Encode a raw classfile object into a writable buffer and return the bytes written."""
+        ...
 
 # =============================================================================
 # Model Layer
@@ -1034,6 +1052,21 @@ class CodeListView:
     def __iter__(self) -> Iterator[CodeListItem]: ...
     def to_list(self) -> list[CodeListItem]: ...
 
+class InstructionTable:
+    def __len__(self) -> int: ...
+    @property
+    def opcodes(self) -> memoryview: ...
+    @property
+    def kinds(self) -> memoryview: ...
+    @property
+    def operands(self) -> memoryview: ...
+    @property
+    def strings(self) -> tuple[str, ...]: ...
+    @property
+    def switch_keys(self) -> memoryview: ...
+    @property
+    def switch_targets(self) -> memoryview: ...
+
 class CodeModel:
     @property
     def max_stack(self) -> int: ...
@@ -1055,6 +1088,7 @@ class CodeModel:
     def debug_info_state(self) -> str: ...
     @property
     def nested_attribute_layout(self) -> list[str]: ...
+    def instructions_table(self) -> InstructionTable: ...
     def find_insns(self, matcher: InsnMatcher) -> list[int]: ...
     def find_insn(self, matcher: InsnMatcher, start: int = 0) -> int | None: ...
     def contains_insn(self, matcher: InsnMatcher) -> bool: ...
@@ -1213,13 +1247,44 @@ class MappingClassResolver:
     def from_models(models: list[ClassModel]) -> MappingClassResolver: ...
     def resolve_class(self, name: str) -> _RustResolvedClassData | None: ...
 
+class ClasspathResolver:
+    """Hierarchy resolver over JARs and class directories, parsed lazily into an LRU cache."""
+
+    def __init__(self, roots: Sequence[str | Path], cache_size: int = 4096) -> None: ...
+    def resolve_class(self, name: str) -> _RustResolvedClassData | None: ...
+    @property
+    def cached_count(self) -> int: ...
+    def __len__(self) -> int: ...
+    def __contains__(self, name: str) -> bool: ...
+
+class HierarchyIndex:
+    """Memory-mapped on-disk hierarchy data for a classpath of JARs and class directories, keyed by their contents."""
+
+    VERSION: int
+    @staticmethod
+    def open(path: str | Path) -> HierarchyIndex: ...
+    @staticmethod
+    def load_or_build(classpath: Sequence[str | Path], cache_path: str | Path, workers: int = 1) -> HierarchyIndex: ...
+    @property
+    def key(self) -> int: ...
+    def resolve_class(self, name: str) -> _RustResolvedClassData | None: ...
+    def to_mapping_resolver(self) -> MappingClassResolver: ...
+    def __len__(self) -> int: ...
+    def __contains__(self, name: str) -> bool: ...
+
+_Resolver = MappingClassResolver | ClasspathResolver | HierarchyIndex
+
 class ClassModel:
     """Mutable symbolic view of a class for structural edits and lowering."""
 
     @staticmethod
-    def from_bytes(data: bytes) -> ClassModel:
+    def from_bytes(data: Buffer) -> ClassModel:
         """Parse classfile bytes into an editable class model."""
         ...
+    @staticmethod
+    def from_bytes_many(data: Sequence[Buffer], workers: int = 1) -> list[ClassModel]:
+        """Parse several classfiles into models on up to ``workers`` threads, preserving input order."""
+        ...
     def to_bytes(self) -> bytes:
         """Lower the current model to classfile bytes with default options."""
         ...
@@ -1229,15 +1294,25 @@ class ClassModel:
     def to_bytes_with_options(
         self,
         frame_mode: FrameComputationMode | None = None,
-        resolver: MappingClassResolver | None = None,
+        resolver: _Resolver | None = None,
         debug_info: str = "preserve",
     ) -> bytes:
         """Lower the model to bytes with explicit frame and debug-info options."""
         ...
+    def write_into(
+        self,
+        buffer: Buffer,
+        offset: int = 0,
+        frame_mode: FrameComputationMode | None = None,
+        resolver: _Resolver | None = None,
+        debug_info: str = "preserve",
+    ) -> int:
+        """Lower the model into a writable buffer and return the number of bytes written."""
+        ...
     def to_classfile_with_options(
         self,
         frame_mode: FrameComputationMode | None = None,
-        resolver: MappingClassResolver | None = None,
+        resolver: _Resolver | None = None,
         debug_info: str = "preserve",
     ) -> ClassFile:
         """Lower the model to a raw classfile object with explicit lowering options."""
@@ -1514,7 +1589,7 @@ class _ArchiveEntryState:
     def __init__(
         self,
         filename: str,
-        data: bytes,
+        data: bytes | None,
         compression_method: int,
         date_time: tuple[int, int, int, int, int, int],
         *,
@@ -1528,7 +1603,7 @@ class _ArchiveEntryState:
     @property
     def filename(self) -> str: ...
     @property
-    def data(self) -> bytes: ...
+    def data(self) -> bytes | None: ...
     @property
     def compression_method(self) -> int: ...
     @property
@@ -1546,14 +1621,22 @@ class _ArchiveEntryState:
     @property
     def original_index(self) -> int | None: ...
 
+class _ArchiveReader:
+    def __init__(self, source_path: str | Path) -> None: ...
+    def entry_states(self) -> list[_ArchiveEntryState]: ...
+    def read(self, index: int) -> bytes: ...
+    def close(self) -> None: ...
+
 def read_archive_state(source_path: str | Path) -> list[_ArchiveEntryState]: ...
 def rewrite_archive_with_rust_transform(
     source_path: str | Path,
     transform: ArchiveTransform,
     output_path: str | Path | None = None,
     frame_mode: FrameComputationMode | None = None,
-    resolver: MappingClassResolver | None = None,
+    resolver: _Resolver | Literal["auto"] | None = None,
     debug_info: str = "preserve",
+    workers: int = 1,
+    classpath: Sequence[str | Path] = (),
 ) -> Path: ...
 def rewrite_archive_state(
     source_path: str | Path,
@@ -1561,14 +1644,52 @@ def rewrite_archive_state(
     transform: ArchiveTransform | None = None,
     output_path: str | Path | None = None,
     frame_mode: FrameComputationMode | None = None,
-    resolver: MappingClassResolver | None = None,
+    resolver: _Resolver | Literal["auto"] | None = None,
     debug_info: str = "preserve",
+    workers: int = 1,
+    classpath: Sequence[str | Path] = (),
+) -> Path: ...
+def scan_archive_state_references(
+    source_path: str | Path,
+    entries: list[_ArchiveEntryState],
+    workers: int = 1,
+) -> ReferenceTable: ...
+def stream_rewrite_archive(
+    source_path: str | Path,
+    output_path: str | Path,
+    transform: ArchiveTransform | None = None,
+    frame_mode: FrameComputationMode | None = None,
+    resolver: _Resolver | Literal["auto"] | None = None,
+    debug_info: str = "preserve",
+    workers: int = 1,
+    classpath: Sequence[str | Path] = (),
 ) -> Path: ...
 
 # =============================================================================
 # Analysis
 # =============================================================================
 
+class ReferenceTable:
+    def __len__(self) -> int: ...
+    @property
+    def strings(self) -> tuple[str, ...]: ...
+    @property
+    def classes(self) -> memoryview: ...
+    @property
+    def methods(self) -> memoryview: ...
+    @property
+    def method_descriptors(self) -> memoryview: ...
+    @property
+    def offsets(self) -> memoryview: ...
+    @property
+    def opcodes(self) -> memoryview: ...
+    @property
+    def owners(self) -> memoryview: ...
+    @property
+    def names(self) -> memoryview: ...
+    @property
+    def descriptors(self) -> memoryview: ...
+
 class Diagnostic:
     @property
     def severity(self) -> str: ...
@@ -1595,21 +1716,21 @@ def rust_verify_classfile(data: bytes, *, fail_fast: bool = False) -> list[Diagn
 def rust_resolved_classfile(data: bytes) -> _RustResolvedClassData: ...
 def rust_resolved_classmodel(model: ClassModel) -> _RustResolvedClassData: ...
 def rust_iter_superclasses(
-    resolver: MappingClassResolver,
+    resolver: _Resolver,
     class_name: str,
     *,
     include_self: bool = False,
 ) -> list[_RustResolvedClassData]: ...
 def rust_iter_supertypes(
-    resolver: MappingClassResolver,
+    resolver: _Resolver,
     class_name: str,
     *,
     include_self: bool = False,
 ) -> list[_RustResolvedClassData]: ...
-def rust_is_subtype(resolver: MappingClassResolver, class_name: str, super_name: str) -> bool: ...
-def rust_common_superclass(resolver: MappingClassResolver, left: str, right: str) -> str: ...
+def rust_is_subtype(resolver: _Resolver, class_name: str, super_name: str) -> bool: ...
+def rust_common_superclass(resolver: _Resolver, left: str, right: str) -> str: ...
 def rust_find_overridden_methods(
-    resolver: MappingClassResolver,
+    resolver: _Resolver,
     class_name: str,
     method_name: str,
     method_descriptor: str,
@@ -1618,18 +1739,18 @@ def rust_find_overridden_methods(
 def rust_lower_classmodels(
     models: list[ClassModel],
     frame_mode: FrameComputationMode | None = None,
-    resolver: MappingClassResolver | None = None,
+    resolver: _Resolver | None = None,
     debug_info: str = "preserve",
 ) -> list[ClassFile]: ...
 def rust_lower_classmodels_to_bytes(
     models: list[ClassModel],
     frame_mode: FrameComputationMode | None = None,
-    resolver: MappingClassResolver | None = None,
+    resolver: _Resolver | None = None,
     debug_info: str = "preserve",
 ) -> list[bytes]: ...
 def rust_verify_classmodel(
     model: ClassModel,
-    resolver: MappingClassResolver | None = None,
+    resolver: _Resolver | None = None,
     *,
     fail_fast: bool = False,
 ) -> list[Diagnostic]: ...
@@ -4,7 +4,10 @@ This package groups the read-only analysis features that sit alongside class
 editing:
 
 - ``verify_classfile`` and ``verify_classmodel`` for structural verification
-- ``MappingClassResolver`` and hierarchy helpers for type-resolution queries
+- ``MappingClassResolver`` (also exported as ``ClassResolver``),
+  ``ClasspathResolver``, the on-disk ``HierarchyIndex`` and hierarchy helpers
+  for type-resolution queries; ``AnyClassResolver`` annotates a parameter that
+  accepts any of the three
 - lightweight dataclasses such as ``ResolvedClass`` and ``InheritedMethod`` for
   Python-friendly results
 """
@@ -13,9 +16,12 @@ from __future__ import annotations
 
 from .hierarchy import (
     JAVA_LANG_OBJECT,
+    AnyClassResolver,
+    ClasspathResolver,
     ClassResolver,
     HierarchyCycleError,
     HierarchyError,
+    HierarchyIndex,
     InheritedMethod,
     MappingClassResolver,
     ResolvedClass,
@@ -30,10 +36,13 @@ from .hierarchy import (
 from .verify import Diagnostic, verify_classfile, verify_classmodel
 
 __all__ = [
+    "AnyClassResolver",
     "ClassResolver",
+    "ClasspathResolver",
     "Diagnostic",
     "HierarchyCycleError",
     "HierarchyError",
+    "HierarchyIndex",
     "InheritedMethod",
     "JAVA_LANG_OBJECT",
     "MappingClassResolver",
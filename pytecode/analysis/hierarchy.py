@@ -87,6 +87,9 @@ class InheritedMethod:
 
 ClassResolver = _rust.MappingClassResolver
 MappingClassResolver = _rust.MappingClassResolver
+ClasspathResolver = _rust.ClasspathResolver
+HierarchyIndex = _rust.HierarchyIndex
+AnyClassResolver = MappingClassResolver | ClasspathResolver | HierarchyIndex
 
 
 class _RustResolvedMethodData(TypedDict):
@@ -110,9 +113,9 @@ class _RustInheritedMethodData(TypedDict):
     access_flags: int
 
 
-def _require_resolver(resolver: object) -> _rust.MappingClassResolver:
-    if not isinstance(resolver, _rust.MappingClassResolver):
-        raise TypeError("Hierarchy helpers require a MappingClassResolver")
+def _require_resolver(resolver: object) -> AnyClassResolver:
+    if not isinstance(resolver, (_rust.MappingClassResolver, _rust.ClasspathResolver, _rust.HierarchyIndex)):
+        raise TypeError("Hierarchy helpers require a MappingClassResolver, ClasspathResolver, or HierarchyIndex")
     return resolver
 
 
@@ -154,7 +157,7 @@ def _inherited_method_from_rust(data: object) -> InheritedMethod:
 
 
 def iter_superclasses(
-    resolver: ClassResolver,
+    resolver: AnyClassResolver,
     class_name: str,
     *,
     include_self: bool = False,
@@ -169,7 +172,7 @@ def iter_superclasses(
 
 
 def iter_supertypes(
-    resolver: ClassResolver,
+    resolver: AnyClassResolver,
     class_name: str,
     *,
     include_self: bool = False,
@@ -183,20 +186,20 @@ def iter_supertypes(
     ]
 
 
-def is_subtype(resolver: ClassResolver, class_name: str, super_name: str) -> bool:
+def is_subtype(resolver: AnyClassResolver, class_name: str, super_name: str) -> bool:
     """Return whether *class_name* is a subtype of *super_name*."""
 
     return _rust.rust_is_subtype(_require_resolver(resolver), class_name, super_name)
 
 
-def common_superclass(resolver: ClassResolver, left: str, right: str) -> str:
+def common_superclass(resolver: AnyClassResolver, left: str, right: str) -> str:
     """Return the closest common superclass of *left* and *right*."""
 
     return _rust.rust_common_superclass(_require_resolver(resolver), left, right)
 
 
 def find_overridden_methods(
-    resolver: ClassResolver,
+    resolver: AnyClassResolver,
     class_name: str,
     method: ResolvedMethod,
 ) -> tuple[InheritedMethod, ...]:
@@ -216,9 +219,12 @@ def find_overridden_methods(
 
 
 __all__ = [
+    "AnyClassResolver",
     "ClassResolver",
+    "ClasspathResolver",
     "HierarchyCycleError",
     "HierarchyError",
+    "HierarchyIndex",
     "InheritedMethod",
     "JAVA_LANG_OBJECT",
     "MappingClassResolver",
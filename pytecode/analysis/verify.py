@@ -5,7 +5,7 @@ from __future__ import annotations
 from .. import _rust
 from ..classfile import ClassFile
 from ..model import ClassModel
-from .hierarchy import MappingClassResolver
+from .hierarchy import AnyClassResolver, MappingClassResolver
 
 Diagnostic = _rust.Diagnostic
 
@@ -36,7 +36,7 @@ def verify_classfile(value: object, *, fail_fast: bool = False) -> list[Diagnost
 
 def verify_classmodel(
     value: object,
-    resolver: MappingClassResolver | None = None,
+    resolver: AnyClassResolver | None = None,
     *,
     fail_fast: bool = False,
 ) -> list[Diagnostic]:
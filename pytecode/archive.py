@@ -5,10 +5,11 @@ from __future__ import annotations
 import copy
 import os
 import zipfile
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path, PurePosixPath
+from typing import Literal
 
 from . import _rust
 from .classfile import ClassReader
@@ -19,6 +20,7 @@ __all__ = [
     "FrameComputationMode",
     "JarFile",
     "JarInfo",
+    "ReferenceTable",
     "normalize_debug_info_policy",
 ]
 
@@ -37,9 +39,13 @@ class FrameComputationMode(Enum):
     RECOMPUTE = "recompute"
 
 
+ReferenceTable = _rust.ReferenceTable
+ReferenceTable.__doc__ = "Columnar field, method, and type references with an interned string table."
+
 _RewriteTransform = (
     _rust.ClassTransform | _rust.Pipeline | _rust.CompiledPipeline | Callable[[ClassModel], object | None]
 )
+_ResolverArgument = _rust.MappingClassResolver | _rust.ClasspathResolver | _rust.HierarchyIndex
 
 
 @dataclass
@@ -57,6 +63,24 @@ class JarInfo:
     bytes: bytes
 
 
+class _LazyJarInfo(JarInfo):
+    """``JarInfo`` whose bytes are decompressed from the source archive on first access."""
+
+    def __init__(self, filename: str, zipinfo: zipfile.ZipInfo, reader: _rust._ArchiveReader, index: int) -> None:
+        self.filename = filename
+        self.zipinfo = zipinfo
+        self._reader = reader
+        self._index = index
+
+    def __getattr__(self, name: str) -> bytes:
+        # ``bytes`` stays unset until first read, then is an ordinary attribute.
+        if name != "bytes":
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        data = b"" if self.zipinfo.is_dir() else self._reader.read(self._index)
+        self.bytes = data
+        return data
+
+
 def _normalize_filename(
     filename: str | os.PathLike[str],
     *,
@@ -141,9 +165,16 @@ def _zipinfo_from_entry_state(state: _rust._ArchiveEntryState) -> zipfile.ZipInf
     return info
 
 
-def _jarinfo_from_entry_state(state: _rust._ArchiveEntryState) -> JarInfo:
+def _jarinfo_from_entry_state(
+    state: _rust._ArchiveEntryState,
+    reader: _rust._ArchiveReader | None = None,
+) -> JarInfo:
     normalized = _normalize_filename(state.filename, is_dir=state.is_dir)
-    return JarInfo(normalized, _zipinfo_from_entry_state(state), bytes(state.data))
+    zipinfo = _zipinfo_from_entry_state(state)
+    data = state.data
+    if data is None and reader is not None and state.original_index is not None:
+        return _LazyJarInfo(normalized, zipinfo, reader, state.original_index)
+    return JarInfo(normalized, zipinfo, data if data is not None else b"")
 
 
 def normalize_debug_info_policy(policy: DebugInfoPolicy | str) -> DebugInfoPolicy:
@@ -157,15 +188,26 @@ def normalize_debug_info_policy(policy: DebugInfoPolicy | str) -> DebugInfoPolic
         raise ValueError("debug_info must be one of: preserve, strip") from exc
 
 
-def _read_archive_state(
-    filename: str | os.PathLike[str],
-) -> tuple[list[zipfile.ZipInfo], dict[str, JarInfo], dict[str, _rust._ArchiveEntryState]]:
-    states = _rust.read_archive_state(os.fspath(filename))
+_ArchiveState = tuple[list[zipfile.ZipInfo], dict[str, JarInfo], dict[str, _rust._ArchiveEntryState]]
+
+
+def _read_archive_state(filename: str | os.PathLike[str]) -> _ArchiveState:
+    return _archive_state_from_entry_states(_rust.read_archive_state(os.fspath(filename)))
+
+
+def _read_lazy_archive_state(reader: _rust._ArchiveReader) -> _ArchiveState:
+    return _archive_state_from_entry_states(reader.entry_states(), reader)
+
+
+def _archive_state_from_entry_states(
+    states: list[_rust._ArchiveEntryState],
+    reader: _rust._ArchiveReader | None = None,
+) -> _ArchiveState:
     infolist: list[zipfile.ZipInfo] = []
     files: dict[str, JarInfo] = {}
     entry_states: dict[str, _rust._ArchiveEntryState] = {}
     for state in states:
-        jar_info = _jarinfo_from_entry_state(state)
+        jar_info = _jarinfo_from_entry_state(state, reader)
         infolist.append(jar_info.zipinfo)
         files[jar_info.filename] = jar_info
         entry_states[jar_info.filename] = state
@@ -182,23 +224,48 @@ class JarFile:
     Signed-JAR artifacts (``META-INF/*.SF``, ``*.RSA``, etc.) are kept as
     ordinary resources and are **not** re-signed when the archive is
     rewritten.
+
+    In lazy mode only the central directory is read up front and each
+    entry's ``JarInfo.bytes`` is decompressed on first access, so listing or
+    inspecting a few entries of a large archive costs O(central directory).
     """
 
-    def __init__(self, filename: str | os.PathLike[str]) -> None:
+    def __init__(self, filename: str | os.PathLike[str], *, lazy: bool = False) -> None:
         """Open and read a JAR archive into memory.
 
         Args:
             filename: Path to an existing JAR file on disk.
+            lazy: If ``True``, defer decompressing entry bytes until they are
+                first accessed.
         """
         self.filename = os.fspath(filename)
+        self.lazy = lazy
         self.infolist: list[zipfile.ZipInfo] = []
         self.files: dict[str, JarInfo] = {}
         self._entry_states: dict[str, _rust._ArchiveEntryState] = {}
+        self._reader: _rust._ArchiveReader | None = None
         self.read()
 
     def read(self) -> None:
         """Re-read the archive from disk, replacing all in-memory state."""
-        self.infolist, self.files, self._entry_states = _read_archive_state(self.filename)
+        self.close()
+        if self.lazy:
+            self._reader = _rust._ArchiveReader(self.filename)
+            self.infolist, self.files, self._entry_states = _read_lazy_archive_state(self._reader)
+        else:
+            self._reader = None
+            self.infolist, self.files, self._entry_states = _read_archive_state(self.filename)
+
+    def close(self) -> None:
+        """Release the file handle held open by a lazy archive.
+
+        Entries that have not been loaded yet reopen the archive on access. If the
+        archive has been replaced since, for example by an in-place ``rewrite()``,
+        each entry is looked up by name, CRC-32 and size, and reading one whose
+        contents changed raises ``OSError``.
+        """
+        if self._reader is not None:
+            self._reader.close()
 
     def add_file(
         self,
@@ -271,22 +338,55 @@ class JarFile:
                 other_files.append(jar_info)
         return classes, other_files
 
+    def scan_references(self, *, workers: int = 1) -> ReferenceTable:
+        """Collect every field, method, and type reference made by the archive's classes.
+
+        Classes are scanned natively with the GIL released, without building a
+        ``ClassModel``. Entries that have not been modified in memory are read
+        and decompressed from the archive on disk by the scanning threads. The
+        result has one row per referencing instruction, in archive order, with
+        columns ``classes``, ``methods``, ``method_descriptors``, ``offsets``
+        (bytecode index), ``opcodes``, ``owners``, ``names``, and
+        ``descriptors``. Each column is a read-only ``memoryview``; string
+        columns hold indexes into the shared ``strings`` tuple, where index 0 is
+        the empty string used for the owner of an ``invokedynamic`` call site and
+        the name and descriptor of a type reference.
+
+        Args:
+            workers: Number of native scanning threads. ``1`` scans serially and
+                ``0`` uses every available core.
+
+        Returns:
+            The columnar ``ReferenceTable``.
+
+        Raises:
+            ValueError: If *workers* is negative.
+        """
+        if workers < 0:
+            raise ValueError("workers must be >= 0")
+        classes = [state for filename, state in self._entry_states.items() if _is_class_filename(filename)]
+        return _rust.scan_archive_state_references(self.filename, classes, workers)
+
     def rewrite(
         self,
         output_path: str | os.PathLike[str] | None = None,
         *,
         transform: _RewriteTransform | None = None,
         frame_mode: FrameComputationMode = FrameComputationMode.PRESERVE,
-        resolver: _rust.MappingClassResolver | None = None,
+        resolver: _ResolverArgument | Literal["auto"] | None = None,
+        classpath: Sequence[str | os.PathLike[str]] = (),
         debug_info: DebugInfoPolicy | str = DebugInfoPolicy.PRESERVE,
         skip_debug: bool = False,
+        workers: int = 1,
     ) -> Path:
         """Write the current archive state back to disk.
 
         The rewrite always flows through the native Rust archive layer. Supported
         transforms include Rust-backed transform/pipeline objects, their bound
         ``.apply`` methods, and plain Python callables that mutate ``ClassModel``
-        in place.
+        in place. The native rewrite runs without holding the GIL, so
+        concurrent rewrites from several Python threads proceed in parallel;
+        Python callables re-acquire it only while they run.
 
         Signed-JAR artifacts under ``META-INF`` are preserved as ordinary
         resources and are **not** re-signed; if class bytes change the
@@ -299,9 +399,19 @@ class JarFile:
                 ``.apply`` method from a Rust pipeline object, or a plain
                 Python callable that mutates ``ClassModel`` in place.
             frame_mode: Frame policy to use when lowering classes.
-            resolver: Class hierarchy resolver used during frame computation.
+            resolver: Class hierarchy resolver used during frame computation,
+                or ``"auto"`` to build one natively from the headers of the
+                archive's own classes plus *classpath*.
+            classpath: Extra JAR files searched by ``resolver="auto"``. The
+                archive's own classes take precedence, then *classpath* in
+                order.
             debug_info: Policy controlling how debug attributes are emitted.
             skip_debug: If ``True``, strip debug attributes during rewrite.
+            workers: Number of native threads used to lift, transform, and
+                lower classes. ``1`` rewrites serially and ``0`` uses every
+                available core. Entries are always written in their original
+                order; Python-callable transforms still run one class at a
+                time on the calling thread.
 
         Returns:
             The resolved destination ``Path``.
@@ -309,10 +419,16 @@ class JarFile:
         Raises:
             TypeError: If *transform* is not a supported Rust-backed transform
                 or callable, if a Python transform returns a non-``None``
-                value, or if *resolver* is not a Rust mapping resolver.
+                value, or if *resolver* is not a native resolver or
+                ``"auto"``.
+            ValueError: If *workers* is negative, if *resolver* is an
+                unknown string, or if *classpath* is given without
+                ``resolver="auto"``.
         """
 
         debug_policy = normalize_debug_info_policy(debug_info)
+        if workers < 0:
+            raise ValueError("workers must be >= 0")
         if transform is not None and not _is_supported_transform(transform):
             raise TypeError(
                 "JarFile.rewrite() requires a callable transform, ClassTransform, "
@@ -325,6 +441,7 @@ class JarFile:
         original_files = self.files.copy()
         original_entry_states = self._entry_states.copy()
         effective_debug_info = _effective_rust_debug_policy(debug_policy, skip_debug=skip_debug)
+        self.close()
         try:
             _rust.rewrite_archive_state(
                 self.filename,
@@ -333,9 +450,16 @@ class JarFile:
                 output_path=destination,
                 frame_mode=frame_mode,
                 resolver=resolver,
+                classpath=[os.fspath(path) for path in classpath],
                 debug_info=effective_debug_info,
+                workers=workers,
             )
-            new_infolist, new_files, new_entry_states = _read_archive_state(destination)
+            if self.lazy:
+                new_reader = _rust._ArchiveReader(destination)
+                new_infolist, new_files, new_entry_states = _read_lazy_archive_state(new_reader)
+                self._reader = new_reader
+            else:
+                new_infolist, new_files, new_entry_states = _read_archive_state(destination)
             self.filename = os.fspath(destination)
             self.infolist = new_infolist
             self.files = new_files
@@ -347,3 +471,78 @@ class JarFile:
             self.files = original_files
             self._entry_states = original_entry_states
             raise
+
+    @staticmethod
+    def stream_rewrite(
+        source: str | os.PathLike[str],
+        output_path: str | os.PathLike[str] | None = None,
+        *,
+        transform: _RewriteTransform | None = None,
+        frame_mode: FrameComputationMode = FrameComputationMode.PRESERVE,
+        resolver: _ResolverArgument | Literal["auto"] | None = None,
+        classpath: Sequence[str | os.PathLike[str]] = (),
+        debug_info: DebugInfoPolicy | str = DebugInfoPolicy.PRESERVE,
+        skip_debug: bool = False,
+        workers: int = 1,
+    ) -> Path:
+        """Rewrite an archive on disk without loading it into memory.
+
+        Entries are read from *source* one at a time, transformed when they are
+        classes, and written straight to the destination, so peak memory is
+        bounded by the largest entry rather than the whole archive. Entries
+        that need no re-encoding are copied without being decompressed. Use
+        this instead of ``JarFile(source).rewrite(...)`` for large archives
+        that need no in-memory edits.
+
+        Args:
+            source: Path to an existing JAR file on disk.
+            output_path: Destination path.  When ``None`` *source* is
+                replaced atomically.
+            transform: Optional Rust-backed transform or pipeline, a bound
+                ``.apply`` method from a Rust pipeline object, or a plain
+                Python callable that mutates ``ClassModel`` in place.
+            frame_mode: Frame policy to use when lowering classes.
+            resolver: Class hierarchy resolver used during frame computation,
+                or ``"auto"`` to build one natively from the headers of the
+                archive's own classes plus *classpath*.
+            classpath: Extra JAR files searched by ``resolver="auto"``. The
+                archive's own classes take precedence, then *classpath* in
+                order.
+            debug_info: Policy controlling how debug attributes are emitted.
+            skip_debug: If ``True``, strip debug attributes during rewrite.
+            workers: Number of native threads used to lift, transform, and
+                lower classes. Values above ``1`` buffer a bounded window of
+                entries per worker; ``0`` uses every available core.
+
+        Returns:
+            The resolved destination ``Path``.
+
+        Raises:
+            TypeError: If *transform* is not a supported Rust-backed transform
+                or callable, if a Python transform returns a non-``None``
+                value, or if *resolver* is not a native resolver or
+                ``"auto"``.
+            ValueError: If *workers* is negative, if *resolver* is an
+                unknown string, or if *classpath* is given without
+                ``resolver="auto"``.
+        """
+
+        debug_policy = normalize_debug_info_policy(debug_info)
+        if workers < 0:
+            raise ValueError("workers must be >= 0")
+        if transform is not None and not _is_supported_transform(transform):
+            raise TypeError(
+                "JarFile.stream_rewrite() requires a callable transform, ClassTransform, "
+                "Pipeline, CompiledPipeline, or bound .apply method"
+            )
+        destination = Path(source if output_path is None else output_path)
+        return _rust.stream_rewrite_archive(
+            os.fspath(source),
+            destination,
+            transform=transform,
+            frame_mode=frame_mode,
+            resolver=resolver,
+            classpath=[os.fspath(path) for path in classpath],
+            debug_info=_effective_rust_debug_policy(debug_policy, skip_debug=skip_debug),
+            workers=workers,
+        )
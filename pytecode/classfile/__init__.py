@@ -6,10 +6,15 @@ than the mutable symbolic editing API in :mod:`pytecode.model`.
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from .. import _rust
 from .._utils import document_property as _document_property
 from .bytecode import ArrayType, InsnInfoType
 
+if TYPE_CHECKING:
+    from collections.abc import Buffer
+
 ClassFile = _rust.ClassFile
 ClassReader = _rust.ClassReader
 ClassWriter = _rust.ClassWriter
@@ -22,10 +27,22 @@ ClassReader.__doc__ = "Parse raw classfile bytes into a read-only ``ClassFile``
 _classreader_from_bytes = ClassReader.__dict__["from_bytes"]
 
 
-def _documented_classreader_from_bytes(cls: type[ClassReader], bytes_or_bytearray: bytes) -> ClassReader:
-    """Create a reader from in-memory classfile bytes."""
+def _documented_classreader_from_bytes(
+    cls: type[ClassReader], bytes_or_bytearray: Buffer, level: str = "full"
+) -> ClassReader:
+    """Create a reader from in-memory classfile bytes.
+
+    Any buffer (``bytes``, ``bytearray``, ``memoryview``, ``mmap``) is accepted. Immutable buffers such as
+    ``bytes`` or an ``ACCESS_READ`` ``mmap`` are read in place; writable ones are copied first.
 
-    return _classreader_from_bytes.__get__(cls, cls)(bytes_or_bytearray)
+    ``level`` selects how much is decoded: ``"header"`` stops after the
+    interfaces table, ``"members"`` keeps fields and methods but skips every
+    attribute payload, ``"lazy"`` keeps attributes as raw bytes until they are
+    accessed, and ``"full"`` (the default) parses everything. Skipped tables
+    are left empty.
+    """
+
+    return _classreader_from_bytes.__get__(cls, cls)(bytes_or_bytearray, level)
 
 
 ClassReader.from_bytes = classmethod(_documented_classreader_from_bytes)
@@ -33,10 +50,10 @@ ClassReader.from_bytes = classmethod(_documented_classreader_from_bytes)
 _classreader_from_file = ClassReader.__dict__["from_file"]
 
 
-def _documented_classreader_from_file(cls: type[ClassReader], path: str) -> ClassReader:
+def _documented_classreader_from_file(cls: type[ClassReader], path: str, level: str = "full") -> ClassReader:
     """Read a classfile from disk and return a new reader."""
 
-    return _classreader_from_file.__get__(cls, cls)(path)
+    return _classreader_from_file.__get__(cls, cls)(path, level)
 
 
 ClassReader.from_file = classmethod(_documented_classreader_from_file)
@@ -61,6 +78,22 @@ def _documented_classwriter_write(classfile: ClassFile) -> bytes:
 
 ClassWriter.write = staticmethod(_documented_classwriter_write)
 
+_classwriter_write_into = ClassWriter.write_into
+
+
+def _documented_classwriter_write_into(classfile: ClassFile, buffer: Buffer, offset: int = 0) -> int:
+    """Encode a raw classfile object into a writable buffer at ``offset`` and return the bytes written.
+
+    Raises ``ValueError`` without writing anything if the encoded class does not fit.
+    """
+
+    if offset < 0:
+        raise ValueError("offset must be non-negative")
+    return _classwriter_write_into(classfile, buffer, offset)
+
+
+ClassWriter.write_into = staticmethod(_documented_classwriter_write_into)
+
 __all__ = [
     "ArrayType",
     "ClassFile",
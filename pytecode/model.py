@@ -7,13 +7,16 @@ back to classfile bytes.
 
 from __future__ import annotations
 
+from enum import IntEnum
 from typing import TYPE_CHECKING
 
 from . import _rust
 from ._utils import document_property as _document_property
 
 if TYPE_CHECKING:
-    from .analysis import MappingClassResolver
+    from collections.abc import Buffer, Sequence
+
+    from .analysis import AnyClassResolver
     from .archive import FrameComputationMode
 
 
@@ -21,6 +24,7 @@ ClassModel = _rust.ClassModel
 FieldModel = _rust.FieldModel
 MethodModel = _rust.MethodModel
 CodeModel = _rust.CodeModel
+InstructionTable = _rust.InstructionTable
 ConstantPoolBuilder = _rust.ConstantPoolBuilder
 
 Label = _rust.Label
@@ -54,14 +58,35 @@ ClassModel.__doc__ = "Mutable symbolic view of a class for structural edits and
 _classmodel_from_bytes = ClassModel.from_bytes
 
 
-def _documented_classmodel_from_bytes(data: bytes) -> ClassModel:
-    """Parse classfile bytes into an editable class model."""
+def _documented_classmodel_from_bytes(data: Buffer) -> ClassModel:
+    """Parse classfile bytes into an editable class model.
+
+    ``data`` may be any buffer (``bytes``, ``bytearray``, ``memoryview``, ``mmap``). Immutable buffers
+    such as ``bytes`` or an ``ACCESS_READ`` ``mmap`` are read in place; writable ones are copied first.
+    """
 
     return _classmodel_from_bytes(data)
 
 
 ClassModel.from_bytes = staticmethod(_documented_classmodel_from_bytes)
 
+_classmodel_from_bytes_many = ClassModel.from_bytes_many
+
+
+def _documented_classmodel_from_bytes_many(data: Sequence[Buffer], workers: int = 1) -> list[ClassModel]:
+    """Parse several classfiles into models on up to ``workers`` threads, preserving input order.
+
+    ``workers=0`` uses every available core. Parsing runs with the GIL released. Immutable buffers are
+    read in place and writable ones are copied first, as in ``from_bytes``.
+    """
+
+    if workers < 0:
+        raise ValueError("workers must be non-negative")
+    return _classmodel_from_bytes_many(data, workers)
+
+
+ClassModel.from_bytes_many = staticmethod(_documented_classmodel_from_bytes_many)
+
 _classmodel_to_bytes = ClassModel.to_bytes
 
 
@@ -90,7 +115,7 @@ _classmodel_to_bytes_with_options = ClassModel.to_bytes_with_options
 def _documented_classmodel_to_bytes_with_options(
     self: ClassModel,
     frame_mode: FrameComputationMode | None = None,
-    resolver: MappingClassResolver | None = None,
+    resolver: AnyClassResolver | None = None,
     debug_info: str = "preserve",
 ) -> bytes:
     """Lower the model to bytes with explicit frame and debug-info options."""
@@ -105,13 +130,45 @@ def _documented_classmodel_to_bytes_with_options(
 
 ClassModel.to_bytes_with_options = _documented_classmodel_to_bytes_with_options
 
+_classmodel_write_into = ClassModel.write_into
+
+
+def _documented_classmodel_write_into(
+    self: ClassModel,
+    buffer: Buffer,
+    offset: int = 0,
+    frame_mode: FrameComputationMode | None = None,
+    resolver: AnyClassResolver | None = None,
+    debug_info: str = "preserve",
+) -> int:
+    """Lower the model into a writable buffer at ``offset`` and return the number of bytes written.
+
+    Takes the same options as ``to_bytes_with_options`` but skips allocating a ``bytes`` object, so a
+    ``bytearray`` or ``memoryview`` can be reused across classes. Raises ``ValueError`` without writing
+    anything if the class does not fit.
+    """
+
+    if offset < 0:
+        raise ValueError("offset must be non-negative")
+    return _classmodel_write_into(
+        self,
+        buffer,
+        offset,
+        frame_mode=frame_mode,
+        resolver=resolver,
+        debug_info=debug_info,
+    )
+
+
+ClassModel.write_into = _documented_classmodel_write_into
+
 _classmodel_to_classfile_with_options = ClassModel.to_classfile_with_options
 
 
 def _documented_classmodel_to_classfile_with_options(
     self: ClassModel,
     frame_mode: FrameComputationMode | None = None,
-    resolver: MappingClassResolver | None = None,
+    resolver: AnyClassResolver | None = None,
     debug_info: str = "preserve",
 ) -> _rust.ClassFile:
     """Lower the model to a raw classfile object with explicit lowering options."""
@@ -126,6 +183,81 @@ def _documented_classmodel_to_classfile_with_options(
 
 ClassModel.to_classfile_with_options = _documented_classmodel_to_classfile_with_options
 
+
+class OperandKind(IntEnum):
+    """Meaning of the three per-row ``InstructionTable.operands`` slots.
+
+    String operands are indexes into ``InstructionTable.strings``; branch and switch targets are the
+    rows of their labels, or ``0xFFFFFFFF`` for a label missing from the method. Unused slots are zero.
+    """
+
+    LABEL = 0
+    """A label row."""
+    NONE = 1
+    """An instruction without operands."""
+    INT = 2
+    """``bipush``/``sipush`` immediate or ``newarray`` array type, as a signed 32-bit value."""
+    FIELD = 3
+    """Owner, name, descriptor."""
+    METHOD = 4
+    """Owner, name, descriptor."""
+    INTERFACE_METHOD = 5
+    """Owner, name, descriptor of an interface method, whatever the invoke opcode."""
+    TYPE = 6
+    """Type descriptor."""
+    VAR = 7
+    """Local slot."""
+    IINC = 8
+    """Local slot, signed increment."""
+    LDC_INT = 9
+    """Raw bits."""
+    LDC_FLOAT = 10
+    """Raw bits."""
+    LDC_LONG = 11
+    """High and low 32 bits."""
+    LDC_DOUBLE = 12
+    """High and low 32 bits."""
+    LDC_STRING = 13
+    """String value."""
+    LDC_CLASS = 14
+    """Class name."""
+    LDC_METHOD_TYPE = 15
+    """Method descriptor."""
+    LDC_METHOD_HANDLE = 16
+    """Owner, name, descriptor of the handle target."""
+    LDC_DYNAMIC = 17
+    """Name, descriptor, bootstrap method index."""
+    INVOKE_DYNAMIC = 18
+    """Name, descriptor, bootstrap method index."""
+    MULTI_ANEW_ARRAY = 19
+    """Array descriptor, dimension count."""
+    BRANCH = 20
+    """Target row."""
+    LOOKUP_SWITCH = 21
+    """Default row, then start and length of the cases in ``switch_keys``/``switch_targets``."""
+    TABLE_SWITCH = 22
+    """Default row, then start and length of the cases in ``switch_keys``/``switch_targets``."""
+
+
+InstructionTable.__doc__ = "Columnar snapshot of a method body's instructions, one row per code item."
+
+_codemodel_instructions_table = CodeModel.instructions_table
+
+
+def _documented_codemodel_instructions_table(self: CodeModel) -> InstructionTable:
+    """Export every instruction in one call as compact, read-only columns.
+
+    ``opcodes`` and ``kinds`` are byte ``memoryview``s; ``operands`` holds three unsigned 32-bit slots
+    per row (row ``i`` is ``operands[3 * i : 3 * i + 3]``) interpreted according to :class:`OperandKind`.
+    Strings are interned into the ``strings`` tuple. The table is a snapshot and does not follow later
+    edits.
+    """
+
+    return _codemodel_instructions_table(self)
+
+
+CodeModel.instructions_table = _documented_codemodel_instructions_table
+
 _document_property(
     ClassModel,
     "version",
@@ -217,6 +349,7 @@ __all__ = [
     "FieldInsn",
     "FieldModel",
     "IIncInsn",
+    "InstructionTable",
     "InterfaceMethodInsn",
     "InvokeDynamicInsn",
     "Label",
@@ -230,6 +363,7 @@ __all__ = [
     "MethodModel",
     "MultiANewArrayInsn",
     "NewArrayInsn",
+    "OperandKind",
     "RawInsn",
     "ShortInsn",
     "TableSwitchInsn",
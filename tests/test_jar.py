@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, cast
 
@@ -9,6 +10,7 @@ import pytest
 import pytecode
 import pytecode.archive as jar_module
 import pytecode.classfile.attributes as attr_api
+from pytecode.analysis import MappingClassResolver
 from pytecode.archive import FrameComputationMode, JarFile, JarInfo
 from pytecode.classfile.constants import ClassAccessFlag
 from pytecode.transforms import PipelineBuilder, add_access_flags, class_named
@@ -103,6 +105,57 @@ def test_jar_empty(tmp_path: Path):
 # ---------------------------------------------------------------------------
 
 
+def test_lazy_jar_loads_entry_bytes_on_first_access(tmp_path: Path) -> None:
+    jar_path = make_compiled_jar(
+        tmp_path,
+        [TEST_RESOURCES / "HelloWorld.java"],
+        extra_files={"META-INF/MANIFEST.MF": b"Manifest-Version: 1.0\n"},
+    )
+    eager = JarFile(jar_path)
+    lazy = JarFile(jar_path, lazy=True)
+
+    assert list(lazy.files) == list(eager.files)
+    assert [info.filename for info in lazy.infolist] == [info.filename for info in eager.infolist]
+    manifest = lazy.files[str(Path("META-INF") / "MANIFEST.MF")]
+    assert manifest.bytes == b"Manifest-Version: 1.0\n"
+    assert lazy.files["HelloWorld.class"].bytes == eager.files["HelloWorld.class"].bytes
+
+
+def test_lazy_jar_rewrite_loads_untouched_entries_from_source(tmp_path: Path) -> None:
+    jar_path = make_compiled_jar(tmp_path, [TEST_RESOURCES / "HelloWorld.java"])
+    jar = JarFile(jar_path, lazy=True)
+    jar.add_file("extra/info.txt", b"added")
+
+    out_path = jar.rewrite(tmp_path / "lazy-out.jar", transform=add_access_flags(int(ClassAccessFlag.FINAL)))
+    jar.close()
+
+    rewritten = JarFile(out_path)
+    class_info = pytecode.ClassReader.from_bytes(rewritten.files["HelloWorld.class"].bytes).class_info
+    assert ClassAccessFlag.FINAL in class_info.access_flags
+    assert rewritten.files[str(Path("extra") / "info.txt")].bytes == b"added"
+    assert jar.lazy
+    assert jar.files["HelloWorld.class"].bytes == rewritten.files["HelloWorld.class"].bytes
+
+
+def test_lazy_jar_info_held_across_in_place_rewrite_reads_its_own_entry(tmp_path: Path) -> None:
+    jar_path = tmp_path / "lazy.jar"
+    with zipfile.ZipFile(jar_path, "w") as zf:
+        zf.writestr("first.txt", b"first")
+        zf.writestr("Foo.class", minimal_classfile())
+        zf.writestr("second.txt", b"second")
+    jar = JarFile(jar_path, lazy=True)
+    second = jar.files["second.txt"]
+    foo = jar.files["Foo.class"]
+    jar.remove_file("first.txt")
+
+    assert jar.rewrite(transform=add_access_flags(int(ClassAccessFlag.FINAL))) == jar_path
+
+    assert second.bytes == b"second"
+    with pytest.raises(OSError, match="changed on disk"):
+        _ = foo.bytes
+    assert jar.files["second.txt"].bytes == b"second"
+
+
 def test_parse_classes_separates_class_files(tmp_path: Path):
     jar = make_jar(
         {"Foo.class": minimal_classfile(), "README.txt": b"docs"},
@@ -180,6 +233,49 @@ def test_compiled_jar_class_count(tmp_path: Path):
     assert classes[0][1].class_info.methods_count >= 2
 
 
+def test_scan_references_reports_call_sites_as_columns(tmp_path: Path) -> None:
+    jar_path = make_compiled_jar(
+        tmp_path,
+        [TEST_RESOURCES / "HelloWorld.java"],
+        extra_files={"README.txt": b"fixture"},
+    )
+    table = JarFile(jar_path).scan_references(workers=2)
+    strings = table.strings
+    rows = [
+        (
+            strings[table.classes[row]],
+            strings[table.methods[row]],
+            table.opcodes[row],
+            strings[table.owners[row]],
+            strings[table.names[row]],
+            strings[table.descriptors[row]],
+        )
+        for row in range(len(table))
+    ]
+    assert strings[0] == ""
+    assert len(table.offsets) == len(table)
+    assert ("HelloWorld", "main", 0xB2, "java/lang/System", "out", "Ljava/io/PrintStream;") in rows
+    assert ("HelloWorld", "<init>", 0xB7, "java/lang/Object", "<init>", "()V") in rows
+
+
+def test_lazy_scan_references_reads_modified_entries_from_memory(tmp_path: Path) -> None:
+    jar_path = make_compiled_jar(tmp_path, [TEST_RESOURCES / "HelloWorld.java"])
+    hello = JarFile(jar_path).files["HelloWorld.class"].bytes
+    jar = JarFile(jar_path, lazy=True)
+    jar.add_file("copy/HelloWorld.class", hello)
+
+    table = jar.scan_references(workers=0)
+
+    assert len(table) == 2 * len(JarFile(jar_path).scan_references())
+    assert "bytes" not in vars(jar.files["HelloWorld.class"])
+
+
+def test_scan_references_rejects_negative_workers(tmp_path: Path) -> None:
+    jar = make_jar({"Foo.class": minimal_classfile()}, tmp_path / "t.jar")
+    with pytest.raises(ValueError, match="workers must be >= 0"):
+        jar.scan_references(workers=-1)
+
+
 # ---------------------------------------------------------------------------
 # Archive mutation helpers
 # ---------------------------------------------------------------------------
@@ -383,6 +479,165 @@ def test_rewrite_accepts_rust_pipeline_object(tmp_path: Path):
     assert ClassAccessFlag.FINAL in class_info.access_flags
 
 
+def test_rewrite_copies_classes_the_pipeline_leaves_untouched(tmp_path: Path) -> None:
+    # Trailing bytes survive only a verbatim copy; relowering drops them.
+    untouched = minimal_classfile() + b"trailer"
+    jar_path = make_compiled_jar(
+        tmp_path,
+        [TEST_RESOURCES / "HelloWorld.java"],
+        extra_files={"Untouched.class": untouched},
+    )
+    pipeline = (
+        PipelineBuilder()
+        .on_classes(
+            class_named("HelloWorld"),
+            add_access_flags(int(ClassAccessFlag.FINAL)),
+        )
+        .build()
+    )
+
+    rewritten = JarFile(JarFile(jar_path).rewrite(tmp_path / "rewritten.jar", transform=pipeline))
+
+    assert rewritten.files["Untouched.class"].bytes == untouched
+    class_info = pytecode.ClassReader.from_bytes(rewritten.files["HelloWorld.class"].bytes).class_info
+    assert ClassAccessFlag.FINAL in class_info.access_flags
+
+
+def test_rewrite_with_workers_matches_serial_rewrite(tmp_path: Path) -> None:
+    jar_path = make_compiled_jar(
+        tmp_path,
+        [TEST_RESOURCES / "PatternMatching.java", TEST_RESOURCES / "HelloWorld.java"],
+        extra_files={"README.txt": b"fixture"},
+    )
+    transform = add_access_flags(int(ClassAccessFlag.FINAL))
+
+    serial = JarFile(jar_path).rewrite(tmp_path / "serial.jar", transform=transform)
+    parallel = JarFile(jar_path).rewrite(tmp_path / "parallel.jar", transform=transform, workers=4)
+
+    serial_jar = JarFile(serial)
+    parallel_jar = JarFile(parallel)
+    assert list(parallel_jar.files) == list(serial_jar.files)
+    for filename, jar_info in serial_jar.files.items():
+        assert parallel_jar.files[filename].bytes == jar_info.bytes
+
+
+def test_rewrite_from_threads_produces_independent_archives(tmp_path: Path) -> None:
+    jar_path = make_compiled_jar(tmp_path, [TEST_RESOURCES / "HelloWorld.java"])
+    pipeline = (
+        PipelineBuilder()
+        .on_classes(
+            class_named("HelloWorld"),
+            add_access_flags(int(ClassAccessFlag.FINAL)),
+        )
+        .build()
+    )
+
+    def add_public(model: pytecode.ClassModel) -> None:
+        model.access_flags |= int(ClassAccessFlag.PUBLIC)
+
+    def rewrite(index: int) -> Path:
+        transform = pipeline if index % 2 == 0 else add_public
+        return JarFile(jar_path).rewrite(tmp_path / f"threaded-{index}.jar", transform=transform)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        outputs = list(executor.map(rewrite, range(8)))
+
+    for index, output in enumerate(outputs):
+        class_info = pytecode.ClassReader.from_bytes(JarFile(output).files["HelloWorld.class"].bytes).class_info
+        assert (ClassAccessFlag.FINAL in class_info.access_flags) == (index % 2 == 0)
+        assert ClassAccessFlag.PUBLIC in class_info.access_flags
+
+
+def test_stream_rewrite_matches_in_memory_rewrite(tmp_path: Path) -> None:
+    jar_path = make_compiled_jar(
+        tmp_path,
+        [TEST_RESOURCES / "HelloWorld.java"],
+        extra_files={"README.txt": b"fixture"},
+    )
+    transform = add_access_flags(int(ClassAccessFlag.FINAL))
+
+    in_memory = JarFile(jar_path).rewrite(tmp_path / "in-memory.jar", transform=transform)
+    streamed = JarFile.stream_rewrite(jar_path, tmp_path / "out" / "streamed.jar", transform=transform)
+
+    assert streamed == tmp_path / "out" / "streamed.jar"
+    in_memory_jar = JarFile(in_memory)
+    streamed_jar = JarFile(streamed)
+    assert list(streamed_jar.files) == list(in_memory_jar.files)
+    for filename, jar_info in in_memory_jar.files.items():
+        assert streamed_jar.files[filename].bytes == jar_info.bytes
+    class_info = pytecode.ClassReader.from_bytes(streamed_jar.files["HelloWorld.class"].bytes).class_info
+    assert ClassAccessFlag.FINAL in class_info.access_flags
+
+
+def test_stream_rewrite_is_atomic_when_transform_fails(tmp_path: Path) -> None:
+    jar_path = make_compiled_jar(tmp_path, [TEST_RESOURCES / "HelloWorld.java"])
+    original = jar_path.read_bytes()
+
+    def explode(model: pytecode.ClassModel) -> None:
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        JarFile.stream_rewrite(jar_path, transform=explode)
+
+    assert jar_path.read_bytes() == original
+    assert sorted(path.name for path in jar_path.parent.iterdir() if path.name.startswith(jar_path.name)) == [
+        jar_path.name
+    ]
+
+
+def test_rewrite_rejects_negative_workers(tmp_path: Path) -> None:
+    jar_path = make_compiled_jar(tmp_path, [TEST_RESOURCES / "HelloWorld.java"])
+
+    with pytest.raises(ValueError, match="workers"):
+        JarFile(jar_path).rewrite(workers=-1)
+
+
+def test_rewrite_with_auto_resolver_recomputes_frames(tmp_path: Path) -> None:
+    jar_path = make_compiled_jar(tmp_path, [TEST_RESOURCES / "PatternMatching.java"])
+    transform = add_access_flags(int(ClassAccessFlag.FINAL))
+
+    rewritten = JarFile(jar_path).rewrite(
+        tmp_path / "auto.jar",
+        transform=transform,
+        frame_mode=FrameComputationMode.RECOMPUTE,
+        resolver="auto",
+    )
+    streamed = JarFile.stream_rewrite(
+        jar_path,
+        tmp_path / "auto-streamed.jar",
+        transform=transform,
+        frame_mode=FrameComputationMode.RECOMPUTE,
+        resolver="auto",
+        classpath=[jar_path],
+    )
+
+    # "auto" must resolve exactly as an explicit resolver over the same classes.
+    class_bytes = [info.bytes for name, info in JarFile(jar_path).files.items() if name.endswith(".class")]
+    explicit = JarFile(jar_path).rewrite(
+        tmp_path / "explicit.jar",
+        transform=transform,
+        frame_mode=FrameComputationMode.RECOMPUTE,
+        resolver=MappingClassResolver.from_bytes(class_bytes),
+    )
+
+    rewritten_jar = JarFile(rewritten)
+    for other in (JarFile(streamed), JarFile(explicit)):
+        assert list(other.files) == list(rewritten_jar.files)
+        for filename, jar_info in rewritten_jar.files.items():
+            assert other.files[filename].bytes == jar_info.bytes
+
+
+def test_rewrite_rejects_invalid_auto_resolver_arguments(tmp_path: Path) -> None:
+    jar_path = make_compiled_jar(tmp_path, [TEST_RESOURCES / "HelloWorld.java"])
+
+    with pytest.raises(ValueError, match="invalid resolver"):
+        JarFile(jar_path).rewrite(tmp_path / "bad.jar", resolver=cast(Any, "manual"))
+    with pytest.raises(ValueError, match="classpath"):
+        JarFile(jar_path).rewrite(tmp_path / "bad.jar", classpath=[jar_path])
+    with pytest.raises(TypeError, match="resolver"):
+        JarFile(jar_path).rewrite(tmp_path / "bad.jar", resolver=cast(Any, object()))
+
+
 def test_rewrite_accepts_rust_class_transform_object(tmp_path: Path):
     jar_path = make_compiled_jar(tmp_path, [TEST_RESOURCES / "HelloWorld.java"])
     jar = JarFile(jar_path)
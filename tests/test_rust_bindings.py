@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import mmap
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
@@ -9,6 +11,7 @@ import pytecode.analysis as analysis
 import pytecode.classfile as classfile_api
 import pytecode.classfile.attributes as attr_api
 import pytecode.model as model_api
+from pytecode._rust import CodeAttr
 from pytecode.analysis.hierarchy import (
     MappingClassResolver as HierarchyMappingClassResolver,
 )
@@ -20,7 +23,7 @@ from pytecode.analysis.hierarchy import (
     iter_supertypes,
 )
 from pytecode.archive import FrameComputationMode
-from tests.helpers import compile_java_resource, compile_java_resource_classes
+from tests.helpers import TEST_RESOURCES, compile_java_resource, compile_java_resource_classes, make_compiled_jar
 
 rust = pytest.importorskip("pytecode._rust")
 
@@ -60,6 +63,9 @@ def test_top_level_rust_first_exports() -> None:
 
 def test_analysis_package_rust_first_exports() -> None:
     assert analysis.MappingClassResolver is rust.MappingClassResolver
+    assert analysis.ClassResolver is rust.MappingClassResolver
+    assert analysis.ClasspathResolver is rust.ClasspathResolver
+    assert analysis.HierarchyIndex is rust.HierarchyIndex
     assert analysis.Diagnostic is rust.Diagnostic
     assert callable(analysis.verify_classfile)
     assert callable(analysis.verify_classmodel)
@@ -104,6 +110,80 @@ def test_top_level_reader_writer_are_rust_backed(tmp_path: Path) -> None:
     assert pytecode.ClassWriter.write(reader.class_info) == class_bytes
 
 
+def test_classreader_partial_levels_skip_tables(tmp_path: Path) -> None:
+    class_bytes = compile_java_resource(tmp_path, "HelloWorld.java").read_bytes()
+    full = pytecode.ClassReader.from_bytes(class_bytes).class_info
+
+    header = pytecode.ClassReader.from_bytes(class_bytes, level="header").class_info
+    assert header.this_class == full.this_class
+    assert header.super_class == full.super_class
+    assert header.methods_count == 0
+    assert header.attributes_count == 0
+
+    members = pytecode.ClassReader.from_bytes(class_bytes, level="members").class_info
+    assert [method.name_index for method in members.methods] == [method.name_index for method in full.methods]
+    assert all(method.attributes_count == 0 for method in members.methods)
+    assert members.attributes_count == 0
+
+    with pytest.raises(ValueError, match="read level"):
+        pytecode.ClassReader.from_bytes(class_bytes, level="everything")  # pyright: ignore[reportArgumentType]
+
+
+def test_classreader_lazy_level_roundtrips_and_decodes_on_access(tmp_path: Path) -> None:
+    class_bytes = compile_java_resource(tmp_path, "HelloWorld.java").read_bytes()
+    full = pytecode.ClassReader.from_bytes(class_bytes).class_info
+    lazy = pytecode.ClassReader.from_bytes(class_bytes, level="lazy").class_info
+
+    assert pytecode.ClassWriter.write(lazy) == class_bytes
+    assert [type(attribute) for attribute in lazy.attributes] == [type(attribute) for attribute in full.attributes]
+    lazy_code = lazy.methods[0].attributes[0]
+    full_code = full.methods[0].attributes[0]
+    assert isinstance(lazy_code, CodeAttr)
+    assert isinstance(full_code, CodeAttr)
+    assert lazy_code.code_length == full_code.code_length
+    assert lazy.methods[0].attributes[0] is lazy_code
+
+
+def test_classfile_reuses_wrapped_members_and_attributes(tmp_path: Path) -> None:
+    class_bytes = compile_java_resource(tmp_path, "FieldShowcase.java").read_bytes()
+    reader = pytecode.ClassReader.from_bytes(class_bytes, level="lazy")
+    class_info = reader.class_info
+
+    assert reader.class_info is class_info
+    assert class_info.methods[0] is class_info.methods[0]
+    fields = class_info.fields
+    assert len(fields) > 1
+    assert all(field is again for field, again in zip(fields, class_info.fields, strict=True))
+    index, constant = next((index, field) for index, field in enumerate(fields) if field.attributes)
+    assert class_info.fields[index].attributes[0] is constant.attributes[0]
+    assert class_info.attributes[0] is class_info.attributes[0]
+    code = _first_code_attr(class_info)
+    assert _first_code_attr(class_info) is code
+    assert code.code[0] is code.code[0]
+
+    methods = class_info.methods
+    methods.clear()
+    assert class_info.methods_count == len(class_info.methods) > 0
+
+
+def test_classfile_rebuilds_mutable_attribute_dataclasses_on_each_read(tmp_path: Path) -> None:
+    class_bytes = compile_java_resource(tmp_path, "FieldShowcase.java").read_bytes()
+    class_info = pytecode.ClassReader.from_bytes(class_bytes, level="lazy").class_info
+    code = _first_code_attr(class_info)
+
+    def line_numbers() -> attr_api.LineNumberTableAttr:
+        return next(attr for attr in code.attributes if isinstance(attr, attr_api.LineNumberTableAttr))
+
+    edited = line_numbers()
+    assert edited.line_number_table
+    edited.line_number_table.clear()
+
+    fresh = line_numbers()
+    assert fresh is not edited
+    assert len(fresh.line_number_table) == fresh.line_number_table_length > 0
+    assert class_info.to_bytes() == class_bytes
+
+
 def test_top_level_classmodel_roundtrip_smoke(tmp_path: Path) -> None:
     hello_world_class = compile_java_resource(tmp_path, "HelloWorld.java")
     class_bytes = hello_world_class.read_bytes()
@@ -135,6 +215,85 @@ def test_model_lowering_matches_individual_lowering(tmp_path: Path) -> None:
     )
 
 
+def test_classmodel_from_bytes_many_matches_individual_parsing(tmp_path: Path) -> None:
+    class_paths = compile_java_resource_classes(tmp_path, "HierarchyFixture.java")
+    original_bytes = [path.read_bytes() for path in class_paths] * 3
+
+    models = pytecode.ClassModel.from_bytes_many(original_bytes, workers=4)
+
+    individual = [pytecode.ClassModel.from_bytes(class_bytes) for class_bytes in original_bytes]
+    assert [model.name for model in models] == [model.name for model in individual]
+    assert [model.to_bytes() for model in models] == [model.to_bytes() for model in individual]
+    assert pytecode.ClassModel.from_bytes_many([], workers=0) == []
+
+
+def test_classmodel_from_bytes_many_rejects_invalid_input(tmp_path: Path) -> None:
+    class_paths = compile_java_resource_classes(tmp_path, "HierarchyFixture.java")
+    with pytest.raises(rust.MalformedClassException, match="invalid magic number"):
+        pytecode.ClassModel.from_bytes_many([class_paths[0].read_bytes(), b"not a classfile"], workers=2)
+    with pytest.raises(ValueError, match="workers"):
+        pytecode.ClassModel.from_bytes_many([], workers=-1)
+
+
+def test_classmodels_can_be_edited_and_shared_across_threads(tmp_path: Path) -> None:
+    class_paths = compile_java_resource_classes(tmp_path, "HierarchyFixture.java")
+    original_bytes = [path.read_bytes() for path in class_paths] * 4
+    models = [pytecode.ClassModel.from_bytes(class_bytes) for class_bytes in original_bytes]
+
+    def finalize(model: pytecode.ClassModel) -> bytes:
+        model.access_flags |= 0x0010
+        return model.to_bytes()
+
+    shared = models[0]
+
+    def method_names(_: int) -> list[str]:
+        return [method.name for method in shared.methods]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        threaded = list(executor.map(finalize, models))
+        names = list(executor.map(method_names, range(8)))
+
+    serial = [finalize(pytecode.ClassModel.from_bytes(class_bytes)) for class_bytes in original_bytes]
+    assert threaded == serial
+    assert names == [[method.name for method in shared.methods]] * 8
+
+
+def test_readers_accept_buffers_and_write_into_caller_buffers(tmp_path: Path) -> None:
+    class_path = compile_java_resource(tmp_path, "HelloWorld.java")
+    class_bytes = class_path.read_bytes()
+
+    with class_path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        assert pytecode.ClassReader.from_bytes(mapped).class_info.to_bytes() == class_bytes
+        assert pytecode.ClassModel.from_bytes(mapped).to_bytes() == class_bytes
+        with memoryview(mapped) as view:
+            assert pytecode.ClassModel.from_bytes(view).to_bytes() == class_bytes
+    assert pytecode.ClassReader(bytearray(class_bytes)).class_info.to_bytes() == class_bytes
+    models = pytecode.ClassModel.from_bytes_many([memoryview(class_bytes), bytearray(class_bytes)], workers=2)
+    assert [model.to_bytes() for model in models] == [class_bytes, class_bytes]
+
+    writable = bytearray(class_bytes)
+    copied = pytecode.ClassModel.from_bytes_many([writable, memoryview(writable).toreadonly()], workers=2)
+    single = pytecode.ClassModel.from_bytes(writable)
+    writable[:] = b"\x00" * 4
+    assert [model.to_bytes() for model in [*copied, single]] == [class_bytes] * 3
+
+    model = models[0]
+    buffer = bytearray(len(class_bytes) + 4)
+    assert model.write_into(buffer, 4) == len(class_bytes)
+    assert bytes(buffer[4:]) == class_bytes
+    assert pytecode.ClassWriter.write_into(model.to_classfile(), memoryview(buffer)) == len(class_bytes)
+    assert bytes(buffer[: len(class_bytes)]) == class_bytes
+
+    small = bytearray(8)
+    with pytest.raises(ValueError, match="buffer too small"):
+        model.write_into(small)
+    assert small == bytearray(8)
+    with pytest.raises(TypeError, match="read-only"):
+        model.write_into(bytes(len(class_bytes)))
+    with pytest.raises(ValueError, match="offset"):
+        model.write_into(buffer, -1)
+
+
 def test_classmodel_option_helpers_accept_frame_mode_enum(tmp_path: Path) -> None:
     class_paths = compile_java_resource_classes(tmp_path, "HierarchyFixture.java")
     resolver = analysis.MappingClassResolver.from_bytes([path.read_bytes() for path in class_paths])
@@ -207,6 +366,42 @@ def test_hierarchy_helpers_accept_rust_resolver(tmp_path: Path) -> None:
     assert trainable_name in names
 
 
+def test_classpath_resolver_parses_directory_classes_lazily(tmp_path: Path) -> None:
+    class_paths = compile_java_resource_classes(tmp_path, "HierarchyFixture.java")
+    resolver = analysis.ClasspathResolver([tmp_path / "classes"], cache_size=2)
+
+    fixture_name = "fixture/hierarchy/HierarchyFixture"
+    mammal_name = "fixture/hierarchy/Mammal"
+    assert len(resolver) == len(class_paths)
+    assert fixture_name in resolver
+    assert resolver.cached_count == 0
+
+    assert is_subtype(resolver, fixture_name, "fixture/hierarchy/Trainable")
+    assert common_superclass(resolver, fixture_name, mammal_name) == mammal_name
+    assert resolver.cached_count == 2
+    assert resolver.resolve_class("fixture/hierarchy/Missing") is None
+
+
+def test_hierarchy_index_is_reused_until_the_classpath_changes(tmp_path: Path) -> None:
+    jar_path = make_compiled_jar(tmp_path, [TEST_RESOURCES / "HierarchyFixture.java"])
+    cache_path = tmp_path / "cache" / "hierarchy.idx"
+
+    index = analysis.HierarchyIndex.load_or_build([jar_path], cache_path)
+    fixture_name = "fixture/hierarchy/HierarchyFixture"
+    mammal_name = "fixture/hierarchy/Mammal"
+    assert fixture_name in index
+    assert common_superclass(index, fixture_name, mammal_name) == mammal_name
+    assert index.to_mapping_resolver().resolve_class(fixture_name) == index.resolve_class(fixture_name)
+
+    written = cache_path.read_bytes()
+    assert analysis.HierarchyIndex.load_or_build([jar_path], cache_path, workers=2).key == index.key
+    assert cache_path.read_bytes() == written
+
+    cache_path.write_bytes(b"stale")
+    with pytest.raises(ValueError, match="invalid hierarchy index"):
+        analysis.HierarchyIndex.open(cache_path)
+
+
 def test_hierarchy_factory_from_rust_models_uses_rust_resolver(tmp_path: Path) -> None:
     class_paths = compile_java_resource_classes(tmp_path, "HierarchyFixture.java")
     models = [rust.ClassModel.from_bytes(path.read_bytes()) for path in class_paths]
@@ -460,6 +655,29 @@ def test_exception_handler_from_parsed_model(tmp_path: Path) -> None:
     assert eh.handler is not None  # type: ignore[reportUnknownMemberType]
 
 
+def test_instructions_table_matches_instruction_views(tmp_path: Path) -> None:
+    hello_world_class = compile_java_resource(tmp_path, "HelloWorld.java")
+    model = pytecode.ClassModel.from_bytes(hello_world_class.read_bytes())
+    code = next(method.code for method in model.methods if method.name == "main" and method.code is not None)
+
+    table = code.instructions_table()
+    items = code.instructions.to_list()
+    assert len(table) == len(items)
+    assert len(table.operands) == 3 * len(items)
+    for row, item in enumerate(items):
+        kind = model_api.OperandKind(table.kinds[row])
+        if isinstance(item, model_api.Label):
+            assert kind is model_api.OperandKind.LABEL
+            continue
+        opcode = getattr(item, "opcode", None)
+        if opcode is not None:
+            assert table.opcodes[row] == opcode
+        if isinstance(item, model_api.FieldInsn | model_api.MethodInsn):
+            owner, name, descriptor = (table.strings[index] for index in table.operands[3 * row : 3 * row + 3])
+            assert (owner, name, descriptor) == (item.owner, item.name, item.descriptor)
+    assert model_api.OperandKind.FIELD in {model_api.OperandKind(kind) for kind in table.kinds}
+
+
 # --- Hierarchy cycle detection ---
 
 